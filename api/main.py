@@ -1,11 +1,24 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 import json
 import random
+import os
+import sys
 from datetime import datetime
 
+# src/ altındaki paylaşılan modüller
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from team_registry import REGISTRY
+from http_cache import etag_for, is_not_modified, cache_control, HEALTH_CACHE_CONTROL
+from metrics import METRICS, MetricsMiddleware, CONTENT_TYPE as METRICS_CONTENT_TYPE, stage
+from admission import AdmissionMiddleware
+
 app = FastAPI()
 
+# İstemci başına hız sınırı (429) ve yük atma (503); CORS'un içinde: reddedilen yanıtlar da CORS başlığı alır
+app.add_middleware(AdmissionMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -15,17 +28,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Teams
-TEAMS = [
-    "Arsenal", "Aston Villa", "Birmingham", "Blackburn", "Blackpool",
-    "Bolton", "Bournemouth", "Brentford", "Brighton", "Burnley",
-    "Cardiff", "Chelsea", "Crystal Palace", "Derby", "Everton",
-    "Fulham", "Hull", "Huddersfield", "Leicester", "Liverpool",
-    "Man City", "Man United", "Middlesbrough", "Newcastle",
-    "Norwich", "Portsmouth", "QPR", "Reading", "Sheffield United",
-    "Southampton", "Stoke", "Sunderland", "Swansea", "Tottenham",
-    "Watford", "West Brom", "West Ham", "Wigan", "Wolves"
-]
+# İstek sayıları ve süreleri (sunucusuz örnek başına)
+app.add_middleware(MetricsMiddleware, known_paths=("/", "/health", "/teams", "/teams/search", "/predict", "/metrics"))
+
+VALIDATE_STAGE = stage("validate")
+INFERENCE_STAGE = stage("inference")
+ANALYSIS_STAGE = stage("analysis")
+CONDITIONAL_CACHE_STATS = METRICS.cache("conditional_get")
+
+# Teams (ortak takım kaydından, bir kez sıralanır)
+TEAMS = sorted(REGISTRY.names)
+
+# Mock model sürümü (ETag ve Cache-Control için)
+MODEL_VERSION = "mock-1.0.0"
+
+# /teams yanıtı bir kez kodlanır; Vercel CDN ETag ile yeniden doğrular
+TEAMS_BODY = json.dumps({"teams": TEAMS, "count": len(TEAMS)}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+TEAMS_ETAG = etag_for(TEAMS_BODY)
+
+METRICS.gauge_function("model_info", "Aktif model sürümü (değer her zaman 1)",
+                       lambda: [({"version": MODEL_VERSION, "type": "mock"}, 1)])
 
 @app.get("/")
 async def root():
@@ -37,12 +59,14 @@ async def root():
         "endpoints": {
             "health": "/health",
             "teams": "/teams", 
-            "predict": "/predict (POST)"
+            "predict": "/predict (POST)",
+            "metrics": "/metrics"
         }
     }
 
 @app.get("/health")
-async def health():
+async def health(response: Response):
+    response.headers["Cache-Control"] = HEALTH_CACHE_CONTROL
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
@@ -51,12 +75,28 @@ async def health():
         "provider": "Vercel"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # media_type yerine başlık: Starlette text/ türlerine ikinci bir charset eklemesin
+    return Response(content=METRICS.render(),
+                    headers={"Content-Type": METRICS_CONTENT_TYPE, "Cache-Control": "no-store"})
+
 @app.get("/teams")
-async def teams():
+async def teams(request: Request):
+    headers = {"ETag": TEAMS_ETAG, "Cache-Control": cache_control(MODEL_VERSION), "Vary": "Accept-Encoding"}
+    not_modified = is_not_modified(request.headers.get("if-none-match"), TEAMS_ETAG)
+    CONDITIONAL_CACHE_STATS.record(not_modified)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(content=TEAMS_BODY, media_type="application/json", headers=headers)
+
+@app.get("/teams/search")
+async def search_teams(q: str = "", limit: int = 10):
+    matches = REGISTRY.search(q, limit=max(1, min(limit, len(TEAMS)))) if q else []
     return {
-        "teams": sorted(TEAMS),
-        "count": len(TEAMS),
-        "timestamp": datetime.now().isoformat()
+        "query": q,
+        "count": len(matches),
+        "teams": matches
     }
 
 @app.post("/predict")
@@ -67,15 +107,21 @@ async def predict(request: dict):
     if not home_team or not away_team:
         return {"error": "home_team ve away_team gerekli"}
     
-    if home_team not in TEAMS or away_team not in TEAMS:
+    with VALIDATE_STAGE.time():
+        home_team = REGISTRY.resolve(home_team)
+        away_team = REGISTRY.resolve(away_team)
+    
+    if home_team is None or away_team is None:
         return {"error": "Geçersiz takım adı"}
     
     if home_team == away_team:
         return {"error": "Aynı takım seçilemez"}
     
     # Prediction
-    prediction = generate_prediction(home_team, away_team)
-    detailed_analysis = generate_detailed_analysis(home_team, away_team)
+    with INFERENCE_STAGE.time():
+        prediction = generate_prediction(home_team, away_team)
+    with ANALYSIS_STAGE.time():
+        detailed_analysis = generate_detailed_analysis(home_team, away_team)
     
     return {
         "success": True,
@@ -100,24 +146,27 @@ async def predict(request: dict):
     }
 
 def generate_prediction(home_team, away_team):
-    home_advantage = random.uniform(0.1, 0.3)
-    home_strength = random.uniform(0.6, 0.9)
-    away_strength = random.uniform(0.5, 0.8)
+    # Aynı maç için her istekte aynı sonuç (cache için deterministik)
+    rng = random.Random(f"{home_team}|{away_team}")
+    
+    home_advantage = rng.uniform(0.1, 0.3)
+    home_strength = rng.uniform(0.6, 0.9)
+    away_strength = rng.uniform(0.5, 0.8)
     
-    home_goals = max(0, int(random.normalvariate(home_strength * 2 + home_advantage, 0.8)))
-    away_goals = max(0, int(random.normalvariate(away_strength * 1.8, 0.7)))
+    home_goals = max(0, int(rng.normalvariate(home_strength * 2 + home_advantage, 0.8)))
+    away_goals = max(0, int(rng.normalvariate(away_strength * 1.8, 0.7)))
     
     if home_goals > away_goals:
         result = "H"
-        home_prob = random.uniform(0.4, 0.7)
+        home_prob = rng.uniform(0.4, 0.7)
     elif home_goals < away_goals:
         result = "A"
-        home_prob = random.uniform(0.1, 0.3)
+        home_prob = rng.uniform(0.1, 0.3)
     else:
         result = "D"
-        home_prob = random.uniform(0.25, 0.4)
+        home_prob = rng.uniform(0.25, 0.4)
     
-    draw_prob = random.uniform(0.15, 0.3)
+    draw_prob = rng.uniform(0.15, 0.3)
     away_prob = 1.0 - home_prob - draw_prob
     
     total = home_prob + draw_prob + away_prob
@@ -125,7 +174,7 @@ def generate_prediction(home_team, away_team):
     draw_prob /= total  
     away_prob /= total
     
-    confidence = random.uniform(0.75, 0.95)
+    confidence = rng.uniform(0.75, 0.95)
     
     return {
         "home_goals": home_goals,
@@ -140,9 +189,12 @@ def generate_prediction(home_team, away_team):
     }
 
 def generate_detailed_analysis(home_team, away_team):
-    total_matches = random.randint(15, 25)
-    home_wins = random.randint(4, total_matches // 2)
-    away_wins = random.randint(3, total_matches - home_wins - 2)
+    # Aynı maç için her istekte aynı sonuç (cache için deterministik)
+    rng = random.Random(f"{home_team}|{away_team}")
+    
+    total_matches = rng.randint(15, 25)
+    home_wins = rng.randint(4, total_matches // 2)
+    away_wins = rng.randint(3, total_matches - home_wins - 2)
     draws = total_matches - home_wins - away_wins
     
     return {
@@ -151,50 +203,50 @@ def generate_detailed_analysis(home_team, away_team):
             "home_wins": home_wins,
             "away_wins": away_wins,
             "draws": draws,
-            "last_5_results": random.choices(['H', 'D', 'A'], k=5),
-            "avg_goals_per_match": round(random.uniform(2.1, 3.2), 1)
+            "last_5_results": rng.choices(['H', 'D', 'A'], k=5),
+            "avg_goals_per_match": round(rng.uniform(2.1, 3.2), 1)
         },
         "team_form": {
             "home_team": {
-                "last_5_matches": random.choices(['W', 'L', 'D'], weights=[0.5, 0.2, 0.3], k=5),
-                "goals_scored_last_5": random.randint(6, 12),
-                "goals_conceded_last_5": random.randint(3, 8),
-                "clean_sheets_last_10": random.randint(3, 7),
-                "matches_with_both_teams_scoring": random.randint(6, 9),
-                "avg_goals_per_match": round(random.uniform(1.2, 2.4), 1)
+                "last_5_matches": rng.choices(['W', 'L', 'D'], weights=[0.5, 0.2, 0.3], k=5),
+                "goals_scored_last_5": rng.randint(6, 12),
+                "goals_conceded_last_5": rng.randint(3, 8),
+                "clean_sheets_last_10": rng.randint(3, 7),
+                "matches_with_both_teams_scoring": rng.randint(6, 9),
+                "avg_goals_per_match": round(rng.uniform(1.2, 2.4), 1)
             },
             "away_team": {
-                "last_5_matches": random.choices(['W', 'L', 'D'], weights=[0.4, 0.3, 0.3], k=5),
-                "goals_scored_last_5": random.randint(4, 10),
-                "goals_conceded_last_5": random.randint(4, 9),
-                "clean_sheets_last_10": random.randint(2, 6),
-                "matches_with_both_teams_scoring": random.randint(5, 8),
-                "avg_goals_per_match": round(random.uniform(0.8, 2.0), 1)
+                "last_5_matches": rng.choices(['W', 'L', 'D'], weights=[0.4, 0.3, 0.3], k=5),
+                "goals_scored_last_5": rng.randint(4, 10),
+                "goals_conceded_last_5": rng.randint(4, 9),
+                "clean_sheets_last_10": rng.randint(2, 6),
+                "matches_with_both_teams_scoring": rng.randint(5, 8),
+                "avg_goals_per_match": round(rng.uniform(0.8, 2.0), 1)
             }
         },
         "goal_stats": {
-            "matches_over_2_5_goals": random.randint(8, 15),
-            "matches_under_2_5_goals": random.randint(5, 12),
-            "both_teams_to_score_percentage": round(random.uniform(55, 85), 1),
-            "first_half_goals_avg": round(random.uniform(0.8, 1.5), 1),
-            "second_half_goals_avg": round(random.uniform(1.2, 2.0), 1)
+            "matches_over_2_5_goals": rng.randint(8, 15),
+            "matches_under_2_5_goals": rng.randint(5, 12),
+            "both_teams_to_score_percentage": round(rng.uniform(55, 85), 1),
+            "first_half_goals_avg": round(rng.uniform(0.8, 1.5), 1),
+            "second_half_goals_avg": round(rng.uniform(1.2, 2.0), 1)
         },
         "interesting_facts": [
-            f"{home_team} son 5 ev sahibi maçında {random.randint(8, 15)} gol attı",
-            f"{away_team} son {random.randint(6, 10)} deplasman maçında sadece {random.randint(1, 3)} mağlubiyet aldı",
-            f"Bu iki takım arasındaki son {random.randint(3, 7)} maçta karşılıklı gol oldu",
-            f"Bu maçın %{random.randint(65, 85)}'inde 2.5+ gol oluyor"
+            f"{home_team} son 5 ev sahibi maçında {rng.randint(8, 15)} gol attı",
+            f"{away_team} son {rng.randint(6, 10)} deplasman maçında sadece {rng.randint(1, 3)} mağlubiyet aldı",
+            f"Bu iki takım arasındaki son {rng.randint(3, 7)} maçta karşılıklı gol oldu",
+            f"Bu maçın %{rng.randint(65, 85)}'inde 2.5+ gol oluyor"
         ],
         "key_stats": {
-            "home_team_strength": round(random.uniform(65, 85), 1),
-            "away_team_strength": round(random.uniform(60, 80), 1),
-            "home_advantage": round(random.uniform(0.12, 0.25), 2),
-            "motivation_factor": random.choice([
+            "home_team_strength": round(rng.uniform(65, 85), 1),
+            "away_team_strength": round(rng.uniform(60, 80), 1),
+            "home_advantage": round(rng.uniform(0.12, 0.25), 2),
+            "motivation_factor": rng.choice([
                 "Lig sıralaması için kritik maç",
                 "Geçen sezondan rövanş alma hırsı", 
                 "Playoff yarışı için önemli"
             ]),
-            "weather_impact": random.choice([
+            "weather_impact": rng.choice([
                 "İyi hava koşulları",
                 "Sıcak hava - tempolu oyun",
                 "Serin hava - ideal koşullar"
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ Benchmarks - Tüm hattın tekrarlanabilir ölçümleri
+Author: Berke Özkul
+Description: Veri yükleme, temizleme, özellik çıkarımı, eğitim, tahmin ve
+HTTP uç noktaları için süre/bellek ölçümleri; JSON geçmişi ve baseline'a
+göre gerileme kontrolü
+
+Kullanım:
+    python -m benchmarks                     # tüm senaryolar
+    python -m benchmarks --group data        # yalnızca veri hattı
+    python -m benchmarks --case predict      # adında 'predict' geçenler
+    python -m benchmarks --save-baseline     # sonuçları baseline olarak kaydet
+"""
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📋 Benchmark Cases - Ölçülen senaryolar
+Author: Berke Özkul
+Description: Her senaryo bir setup fonksiyonudur; hazırlığı yapar ve
+ölçülecek çağrıyı döndürür (setup süresi ölçüme dahil değildir)
+"""
+
+import glob
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+DATA_DIR = os.path.join(ROOT_DIR, 'data') + os.sep
+
+# Sabit tohum: her çalıştırmada aynı maçlar ölçülür
+SEED = 2019
+# HTTP senaryolarında ölçüm başına istek sayısı
+HTTP_REQUESTS = 50
+# _process_data tek geçiş olduğundan varsayılan olarak tüm sezonları işler;
+# train_models (~20 sn/14 sezon) son 4 sezonla ölçülür. --seasons N ikisini de ezer
+ADVANCED_SEASONS = None
+TRAIN_SEASONS = 4
+
+# Ölçüm istemcisi tek IP'den yüzlerce istek gönderir: istemci başına hız sınırı kapalı (src/admission.py)
+os.environ.setdefault('RATE_LIMIT', '0')
+# HTTP senaryolarının tahmin denetim kayıtları depo yerine geçici klasöre yazılır (src/audit_log.py)
+os.environ.setdefault('AUDIT_LOG_DIR', os.path.join(tempfile.gettempdir(), 'benchmark-audit'))
+
+CASES = {}
+
+
+class Case:
+    """Tek benchmark senaryosu"""
+
+    def __init__(self, name, group, setup, repeat, number, warmup, description):
+        self.name = name
+        self.group = group
+        self.setup = setup
+        self.repeat = repeat
+        self.number = number
+        self.warmup = warmup
+        self.description = description
+
+
+def case(name, group, repeat=5, number=1, warmup=True):
+    """
+    Senaryo kaydı için dekoratör
+
+    Args:
+        repeat (int): Ölçüm tekrarı (medyan raporlanır)
+        number (int): Tekrar başına çağrı sayısı (süre çağrı başına verilir)
+        warmup (bool): Ölçümden önce bir ısınma çağrısı yapılsın mı
+    """
+    def decorator(setup):
+        CASES[name] = Case(name, group, setup, repeat, number, warmup,
+                           (setup.__doc__ or '').strip())
+        return setup
+    return decorator
+
+
+def season_files(seasons=None):
+    """Veri klasöründeki sezon dosyaları (son N sezon)"""
+    files = sorted(glob.glob(os.path.join(DATA_DIR, 'E0*.csv')))
+    return files[-seasons:] if seasons else files
+
+
+def sample_fixtures(teams, count, seed=SEED):
+    """Tekrarlanabilir maç listesi"""
+    rng = random.Random(seed)
+    return [tuple(rng.sample(teams, 2)) for _ in range(count)]
+
+
+def load_advanced_predictor(options):
+    """Benchmark için eğitilmiş gelişmiş model (--model ile verilir)"""
+    from advanced_model import AdvancedFootballPredictor
+
+    model_path = options.get('model')
+    if not model_path or not os.path.exists(model_path):
+        raise SkipCase(f"Gelişmiş model dosyası bulunamadı: {model_path} (--model)")
+
+    predictor = AdvancedFootballPredictor()
+    if not predictor.load_model(model_path):
+        raise SkipCase(f"Model yüklenemedi: {model_path}")
+    return predictor
+
+
+def advanced_frame(options, seasons=ADVANCED_SEASONS):
+    """_process_data girdisi: ham sezonların birleşimi"""
+    import pandas as pd
+
+    files = season_files(options.get('seasons') or seasons)
+    return pd.concat([pd.read_csv(path) for path in files], ignore_index=True)
+
+
+class SkipCase(Exception):
+    """Senaryonun bu ortamda çalıştırılamadığını bildirir"""
+
+
+# ----------------------------------------------------------------------
+# Veri hattı
+# ----------------------------------------------------------------------
+@case('load_csv_pandas', 'data')
+def setup_load_csv_pandas(options):
+    """FootballDataPreprocessor.load_all_seasons (pandas)"""
+    from data_preprocessing import FootballDataPreprocessor
+
+    processor = FootballDataPreprocessor(data_path=DATA_DIR)
+    return processor.load_all_seasons
+
+
+@case('load_csv_simple', 'data')
+def setup_load_csv_simple(options):
+    """SimpleFootballDataProcessor.load_all_seasons (csv modülü)"""
+    from simple_data_processing import SimpleFootballDataProcessor
+
+    processor = SimpleFootballDataProcessor(data_path=DATA_DIR)
+    return processor.load_all_seasons
+
+
+@case('load_catalog_core', 'data')
+def setup_load_catalog_core(options):
+    """DataCatalog.load_frame (tüm ligler, ana sütunlar, compact)"""
+    from data_catalog import DataCatalog, CORE_COLUMNS
+
+    catalog = DataCatalog(DATA_DIR)
+    return lambda: catalog.load_frame(columns=CORE_COLUMNS, compact=True)
+
+
+@case('clean_data_pandas', 'data')
+def setup_clean_data_pandas(options):
+    """FootballDataPreprocessor.clean_data"""
+    from data_preprocessing import FootballDataPreprocessor
+
+    processor = FootballDataPreprocessor(data_path=DATA_DIR)
+    processor.load_all_seasons()
+    return processor.clean_data
+
+
+@case('parse_dates', 'data')
+def setup_parse_dates(options):
+    """match_dates.to_datetime (tüm maç tarihleri, önbellekli ayrıştırıcı)"""
+    from data_catalog import DataCatalog
+    from match_dates import to_datetime
+
+    dates = DataCatalog(DATA_DIR).load_frame(columns=['Date'])['Date']
+    return lambda: to_datetime(dates)
+
+
+@case('clean_data_simple', 'data')
+def setup_clean_data_simple(options):
+    """SimpleFootballDataProcessor.clean_data"""
+    from simple_data_processing import SimpleFootballDataProcessor
+
+    processor = SimpleFootballDataProcessor(data_path=DATA_DIR)
+    processor.load_all_seasons()
+    return processor.clean_data
+
+
+@case('add_form_features', 'data')
+def setup_add_form_features(options):
+    """SimpleFootballDataProcessor.add_form_features (son 5 maç)"""
+    from simple_data_processing import SimpleFootballDataProcessor
+
+    processor = SimpleFootballDataProcessor(data_path=DATA_DIR)
+    processor.load_all_seasons()
+    processor.clean_data()
+    processor.add_basic_features()
+    return lambda: processor.add_form_features(last_n_matches=5)
+
+
+@case('process_data', 'data', repeat=3)
+def setup_process_data(options):
+    """AdvancedFootballPredictor._process_data (maç öncesi özellikler)"""
+    from advanced_model import AdvancedFootballPredictor
+
+    df = advanced_frame(options)
+
+    def run():
+        # Takım istatistikleri birikimli olduğu için her çalıştırma yeni modelle başlar
+        AdvancedFootballPredictor()._process_data(df.copy())
+    return run
+
+
+@case('feature_store_load', 'data', repeat=3)
+def setup_feature_store_load(options):
+    """FeatureStore (hazır parçalar) -> AdvancedFootballPredictor.load_features (process_data karşılığı)"""
+    from advanced_model import AdvancedFootballPredictor
+    from feature_store import FeatureStore
+
+    store = FeatureStore(root=tempfile.mkdtemp(prefix='features-'), data_path=DATA_DIR)
+    store.materialize('match_features', ['E0'])
+
+    def run():
+        # Her çalıştırma yeni modelle başlar (takım kodlayıcı okuma anında kurulur)
+        AdvancedFootballPredictor().load_features(store, ['E0'])
+    return run
+
+
+@case('odds_features', 'data', number=5)
+def setup_odds_features(options):
+    """odds_features (tüm şirketler, marjsız 1X2 ve 2.5 alt/üst olasılıkları)"""
+    from data_catalog import DataCatalog
+    from odds_features import odds_features
+
+    df = DataCatalog(DATA_DIR).load_frame()
+    return lambda: odds_features(df)
+
+
+@case('match_store_lookup', 'data', number=1000)
+def setup_match_store_lookup(options):
+    """MatchStore.h2h + form (SQLite indeks araması, istek başına)"""
+    from match_store import MatchStore
+
+    store = MatchStore(path=os.path.join(tempfile.mkdtemp(), 'matches.sqlite'), data_path=DATA_DIR)
+    store.sync()
+    fixtures = iter(sample_fixtures(sorted(row['team'] for row in store.season_table('E0', '2017-2018')), 100000))
+
+    def run():
+        home_team, away_team = next(fixtures)
+        store.h2h(home_team, away_team, limit=10)
+        store.form(home_team, 5)
+        store.form(away_team, 5)
+    return run
+
+
+@case('audit_record', 'http', number=10000)
+def setup_audit_record(options):
+    """AuditLog.record (istek yolundaki denetim günlüğü maliyeti)"""
+    from audit_log import AuditLog
+
+    audit = AuditLog(directory=tempfile.mkdtemp(prefix='audit-'), capacity=1 << 20)
+    prediction = {'home_goals': 2, 'away_goals': 1, 'result': 'H',
+                  'probabilities': {'home': 0.512, 'draw': 0.251, 'away': 0.237}, 'confidence': 0.512}
+    return lambda: audit.record('predict', 'benchmark', 'Arsenal', 'Chelsea', prediction, 0.01)
+
+
+# ----------------------------------------------------------------------
+# Model
+# ----------------------------------------------------------------------
+@case('train_models', 'model', repeat=1, warmup=False)
+def setup_train_models(options):
+    """AdvancedFootballPredictor.train_models (üç model)"""
+    from advanced_model import AdvancedFootballPredictor
+
+    processed = AdvancedFootballPredictor()._process_data(advanced_frame(options, TRAIN_SEASONS))
+    return lambda: AdvancedFootballPredictor().train_models(processed)
+
+
+@case('train_simple', 'model', repeat=3)
+def setup_train_simple(options):
+    """SimpleFootballPredictor.train"""
+    from simple_data_processing import SimpleFootballDataProcessor
+    from simple_model import SimpleFootballPredictor
+
+    processor = SimpleFootballDataProcessor(data_path=DATA_DIR)
+    processor.load_all_seasons()
+    processor.clean_data()
+    processor.add_basic_features()
+    processor.add_elo_features()
+    data = processor.add_form_features(last_n_matches=5)
+    return lambda: SimpleFootballPredictor().train(data, elo=processor.elo)
+
+
+@case('fit_ratings', 'model', number=5)
+def setup_fit_ratings(options):
+    """TeamRatings.fit (Dixon-Coles, tüm sezonlar)"""
+    from data_catalog import DataCatalog, CORE_COLUMNS
+    from team_ratings import TeamRatings
+
+    df = DataCatalog(DATA_DIR).load_frame(columns=CORE_COLUMNS).dropna(subset=['FTHG', 'FTAG'])
+    arrays = (df['HomeTeam'].to_numpy(), df['AwayTeam'].to_numpy(), df['FTHG'].to_numpy(), df['FTAG'].to_numpy())
+    return lambda: TeamRatings().fit(*arrays, dixon_coles=True)
+
+
+@case('elo_timeline', 'model', number=5)
+def setup_elo_timeline(options):
+    """EloTimeline.build (tek geçiş) + 1000 tarih itibarıyla sorgu"""
+    from data_catalog import DataCatalog
+    from elo_ratings import EloTimeline
+
+    rows = DataCatalog(DATA_DIR).load_rows()
+    matches = [(row['Date'], row['HomeTeam'], row['AwayTeam'], row['FTHG'], row['FTAG']) for row in rows]
+    rng = random.Random(SEED)
+    teams = sorted({row['HomeTeam'] for row in rows})
+    queries = [(rng.choice(teams), f"{rng.randint(2006, 2019)}-{rng.randint(1, 12):02d}-01") for _ in range(1000)]
+
+    def run():
+        timeline = EloTimeline()
+        timeline.build(matches)
+        for team, as_of in queries:
+            timeline.rating(team, as_of)
+
+    return run
+
+
+@case('predict_single', 'model', number=20)
+def setup_predict_single(options):
+    """AdvancedFootballPredictor.predict_match (tek maç)"""
+    predictor = load_advanced_predictor(options)
+    fixtures = sample_fixtures(list(predictor.team_encoder.classes_), 64)
+    cursor = iter(fixtures * 1000)
+    return lambda: predictor.predict_match(*next(cursor))
+
+
+@case('predict_batch', 'model', number=5)
+def setup_predict_batch(options):
+    """AdvancedFootballPredictor.predict_matches (380 maç, bir sezon)"""
+    predictor = load_advanced_predictor(options)
+    fixtures = sample_fixtures(list(predictor.team_encoder.classes_), 380)
+    return lambda: predictor.predict_matches(fixtures)
+
+
+@case('predict_simple', 'model', number=2000)
+def setup_predict_simple(options):
+    """SimpleFootballPredictor.predict_match"""
+    from simple_model import SimpleFootballPredictor
+
+    predictor = SimpleFootballPredictor()
+    if not predictor.load_model(os.path.join(ROOT_DIR, 'models', 'simple_football_model.txt')):
+        raise SkipCase("Basit model dosyası yüklenemedi")
+    fixtures = sample_fixtures(sorted(predictor.team_strength), 64)
+    cursor = iter(fixtures * 1000)
+    return lambda: predictor.predict_match(*next(cursor))
+
+
+@case('win_probability', 'model', number=5000)
+def setup_win_probability(options):
+    """AdvancedFootballPredictor._calculate_win_probability (H/D/A)"""
+    from advanced_model import AdvancedFootballPredictor
+
+    predictor = AdvancedFootballPredictor()
+
+    def run():
+        for outcome in ('H', 'D', 'A'):
+            predictor._calculate_win_probability(1.6, 1.1, outcome)
+    return run
+
+
+# ----------------------------------------------------------------------
+# HTTP uçtan uca
+# ----------------------------------------------------------------------
+def serve_in_thread(server):
+    """http.server sunucusunu arka planda çalıştır"""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server.server_address[1]
+
+
+def post_predictions(port, fixtures, keep_alive=False):
+    """POST /predict isteklerini sırayla gönder (her yanıt tamamen okunur)"""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        for home_team, away_team in fixtures:
+            body = json.dumps({'home_team': home_team, 'away_team': away_team})
+            connection.request('POST', '/predict', body=body,
+                               headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}: {home_team} vs {away_team}")
+            if not keep_alive:
+                connection.close()
+    finally:
+        connection.close()
+
+
+@case('http_simple_api', 'http', repeat=3)
+def setup_http_simple_api(options):
+    """simple_api: 50 x POST /predict (HTTP/1.0, istek başına bağlantı)"""
+    from http.server import HTTPServer
+    from simple_api import FootballPredictionHandler
+
+    FootballPredictionHandler.load_model()
+    server = HTTPServer(('127.0.0.1', 0), FootballPredictionHandler)
+    port = serve_in_thread(server)
+    fixtures = sample_fixtures(FootballPredictionHandler.teams, HTTP_REQUESTS)
+    return lambda: post_predictions(port, fixtures)
+
+
+@case('http_advanced_api', 'http', repeat=3)
+def setup_http_advanced_api(options):
+    """advanced_api: 50 x POST /predict (ThreadingHTTPServer, model kiralama)"""
+    model_path = options.get('model')
+    if not model_path or not os.path.exists(model_path):
+        raise SkipCase(f"Gelişmiş model dosyası bulunamadı: {model_path} (--model)")
+    os.environ['MODEL_PATH'] = os.path.abspath(model_path)
+
+    from http.server import ThreadingHTTPServer
+    from advanced_api import AdvancedFootballPredictionHandler
+
+    AdvancedFootballPredictionHandler.load_model_and_data()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), AdvancedFootballPredictionHandler)
+    port = serve_in_thread(server)
+
+    predictor = load_advanced_predictor(options)
+    fixtures = sample_fixtures(list(predictor.team_encoder.classes_), HTTP_REQUESTS)
+    return lambda: post_predictions(port, fixtures)
+
+
+@case('http_fastapi', 'http', repeat=3)
+def setup_http_fastapi(options):
+    """main.py (FastAPI + uvicorn): 50 x POST /predict (keep-alive)"""
+    import socket
+    import sys
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SkipCase("uvicorn kurulu değil")
+
+    sys.path.insert(0, ROOT_DIR)
+    from main import app, TEAMS
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("uvicorn başlatılamadı")
+        time.sleep(0.05)
+
+    fixtures = sample_fixtures(TEAMS, HTTP_REQUESTS)
+    return lambda: post_predictions(port, fixtures, keep_alive=True)
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🚦 Load Generator - Asenkron yük testi
+Author: Berke Özkul
+Description: main.py, src/simple_api.py ve src/advanced_api.py sunucularını
+kalıcı bağlantılar üzerinden eşzamanlı isteklerle yükler; Flutter
+uygulamasının gönderdiği istek karışımını (health, teams, GET/POST predict)
+kullanır ve throughput, p50/p95/p99/max gecikme ile hata oranlarını tablo
+ve JSON olarak raporlar
+
+Kullanım:
+    python -m benchmarks.loadgen http://localhost:8000 -c 32 -d 30
+    python -m benchmarks.loadgen http://localhost:8000 --mix predict_post=1 --json fastapi.json --label fastapi
+    python -m benchmarks.loadgen --compare fastapi.json advanced.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.runner import format_time, write_json
+
+# Flutter uygulamasının (api_service.dart) istek dağılımına yakın varsayılan karışım
+DEFAULT_MIX = 'predict_post=5,predict_get=3,teams=1,health=1'
+DEFAULT_CONCURRENCY = 16
+DEFAULT_DURATION = 10.0
+REQUEST_TIMEOUT = 30.0
+SEED = 2019
+
+
+class HTTPError(Exception):
+    """Yanıt okunamadı veya bağlantı beklenmedik şekilde kapandı"""
+
+
+class Connection:
+    """
+    Tek HTTP/1.1 bağlantısı
+    - Sunucu izin verdiği sürece bağlantı yeniden kullanılır (keep-alive)
+    - HTTP/1.0 veya 'Connection: close' yanıtından sonra yeniden bağlanılır
+    """
+
+    def __init__(self, host, port, stats):
+        self.host = host
+        self.port = port
+        self.stats = stats
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None):
+        """
+        İsteği gönder ve yanıtın tamamını oku
+
+        Returns:
+            tuple: (durum kodu, gövde bayt sayısı)
+        """
+        reused = self.writer is not None
+        try:
+            return await self._exchange(method, path, body)
+        except (HTTPError, ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+            # Sunucu boştaki bağlantıyı kapatmış olabilir; yeni bağlantıyla bir kez dene
+            return await self._exchange(method, path, body)
+
+    async def _exchange(self, method, path, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            self.stats['connections'] += 1
+
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                "Accept: application/json", "Connection: keep-alive"]
+        if body is not None:
+            head += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        self.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + (body or b''))
+        await self.writer.drain()
+
+        try:
+            raw_head = await self.reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            raise HTTPError("bağlantı yanıt gelmeden kapandı")
+
+        lines = raw_head.decode('latin-1').split('\r\n')
+        version, _, rest = lines[0].partition(' ')
+        status = int(rest[:3])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+        if 'content-length' in headers:
+            size = int(headers['content-length'])
+            await self.reader.readexactly(size)
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            size = await self._read_chunked()
+        else:
+            # Uzunluk yoksa gövde bağlantı kapanana kadar sürer
+            size = len(await self.reader.read())
+            keep_alive = False
+
+        if not keep_alive:
+            self.close()
+        return status, size
+
+    async def _read_chunked(self):
+        size = 0
+        while True:
+            chunk_size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            if chunk_size == 0:
+                await self.reader.readuntil(b'\r\n')
+                return size
+            await self.reader.readexactly(chunk_size + 2)
+            size += chunk_size
+
+    def close(self):
+        """Bağlantıyı kapat (bir sonraki istek yeniden bağlanır)"""
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+def parse_mix(text):
+    """
+    'predict_post=5,teams=1' biçimindeki karışımı ağırlıklara çevir
+
+    Raises:
+        ValueError: Bilinmeyen uç nokta veya geçersiz ağırlık
+    """
+    mix = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        name, _, weight = item.partition('=')
+        if name not in ENDPOINTS:
+            raise ValueError(f"Bilinmeyen uç nokta: {name} (seçenekler: {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+        if mix[name] < 0:
+            raise ValueError(f"Ağırlık negatif olamaz: {item}")
+    if not mix or not sum(mix.values()):
+        raise ValueError("Karışım boş")
+    return mix
+
+
+def _health(prefix, rng, teams):
+    return 'GET', f"{prefix}/health", None
+
+
+def _teams(prefix, rng, teams):
+    return 'GET', f"{prefix}/teams", None
+
+
+def _predict_get(prefix, rng, teams):
+    home, away = rng.sample(teams, 2)
+    return 'GET', f"{prefix}/predict?{urlencode({'home': home, 'away': away})}", None
+
+
+def _predict_post(prefix, rng, teams):
+    home, away = rng.sample(teams, 2)
+    body = json.dumps({'home_team': home, 'away_team': away}).encode('utf-8')
+    return 'POST', f"{prefix}/predict", body
+
+
+# Uç nokta adı -> (method, yol, gövde) üreten fonksiyon
+ENDPOINTS = {
+    'health': _health,
+    'teams': _teams,
+    'predict_get': _predict_get,
+    'predict_post': _predict_post
+}
+
+
+def percentile(sorted_values, q):
+    """Sıralı listede en yakın sıra yöntemiyle yüzdelik"""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(q / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed):
+    """Gecikme listesi ve hata sayılarından özet"""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    error_count = sum(errors.values())
+    return {
+        'requests': count,
+        'errors': error_count,
+        'error_rate': round(error_count / count, 4) if count else 0.0,
+        'error_kinds': dict(errors),
+        'rps': round(count / elapsed, 2) if elapsed else 0.0,
+        'latency_s': {
+            'mean': sum(ordered) / count if count else None,
+            'p50': percentile(ordered, 50),
+            'p95': percentile(ordered, 95),
+            'p99': percentile(ordered, 99),
+            'max': ordered[-1] if ordered else None
+        }
+    }
+
+
+async def fetch_teams(host, port, prefix):
+    """Tahmin istekleri için takım listesini sunucudan al"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET {prefix}/teams HTTP/1.0\r\nHost: {host}:{port}\r\nAccept: application/json\r\n\r\n".encode('latin-1'))
+        await writer.drain()
+        raw = await asyncio.wait_for(reader.read(), REQUEST_TIMEOUT)
+    finally:
+        writer.close()
+
+    head, _, body = raw.partition(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    if status != 200:
+        raise HTTPError(f"{prefix}/teams HTTP {status}")
+    teams = json.loads(body).get('teams', [])
+    # Bazı sunucular takımları sözlük olarak döndürür
+    return [team['name'] if isinstance(team, dict) else team for team in teams]
+
+
+async def run_load(url, mix, concurrency, duration, max_requests=None, warmup=0.0, seed=SEED, timeout=REQUEST_TIMEOUT):
+    """
+    Yük testini çalıştır
+
+    Args:
+        url (str): Sunucu adresi (yol öneki dahil, ör. http://localhost:3000/api)
+        mix (dict): Uç nokta -> ağırlık
+        concurrency (int): Eşzamanlı bağlantı (kapalı döngü işçi) sayısı
+        duration (float): Ölçüm süresi (saniye)
+        max_requests (int): İsteğe bağlı toplam istek sınırı
+        warmup (float): Sonuçlara katılmayan ısınma süresi (saniye)
+
+    Returns:
+        dict: Genel ve uç nokta bazlı özet
+    """
+    parts = urlsplit(url)
+    host = parts.hostname or 'localhost'
+    port = parts.port or 80
+    prefix = parts.path.rstrip('/')
+
+    teams = await fetch_teams(host, port, prefix)
+    if len(teams) < 2:
+        raise HTTPError("Sunucu takım listesi döndürmedi")
+
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies = {name: [] for name in names}
+    errors = {name: Counter() for name in names}
+    stats = Counter()
+    issued = 0
+
+    loop = asyncio.get_running_loop()
+    measure_start = loop.time() + warmup
+    deadline = measure_start + duration
+
+    async def worker(worker_id):
+        nonlocal issued
+        rng = random.Random(seed + worker_id)
+        connection = Connection(host, port, stats)
+        try:
+            while loop.time() < deadline and (max_requests is None or issued < max_requests):
+                name = rng.choices(names, weights)[0]
+                method, path, body = ENDPOINTS[name](prefix, rng, teams)
+                if loop.time() >= measure_start:
+                    issued += 1
+
+                start = time.perf_counter()
+                try:
+                    status, _ = await asyncio.wait_for(connection.request(method, path, body), timeout)
+                    error = None if status < 400 else f"HTTP {status}"
+                except asyncio.TimeoutError:
+                    connection.close()
+                    error = 'timeout'
+                except (HTTPError, OSError, asyncio.IncompleteReadError, ValueError) as e:
+                    connection.close()
+                    error = type(e).__name__
+                elapsed = time.perf_counter() - start
+
+                if loop.time() - elapsed < measure_start:
+                    continue
+                latencies[name].append(elapsed)
+                if error:
+                    errors[name][error] += 1
+        finally:
+            connection.close()
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = min(loop.time(), deadline) - measure_start if max_requests is None else loop.time() - measure_start
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    all_errors = sum(errors.values(), Counter())
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'url': url,
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 3),
+        'mix': mix,
+        'connections_opened': stats['connections'],
+        'total': summarize(all_latencies, all_errors, elapsed),
+        'endpoints': {name: summarize(latencies[name], errors[name], elapsed) for name in names}
+    }
+
+
+def _ms(value):
+    return format_time(value) if value is not None else '-'
+
+
+def print_report(report):
+    """Sonuç tablosu"""
+    print(f"\n🚦 {report['url']} | {report['concurrency']} bağlantı | {report['duration_s']:.1f} sn | "
+          f"{report['connections_opened']} TCP bağlantısı açıldı")
+    print(f"{'Uç nokta':<14} {'İstek':>8} {'req/s':>9} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10} {'Hata':>8}")
+    print("-" * 84)
+    rows = list(report['endpoints'].items()) + [('TOPLAM', report['total'])]
+    for name, summary in rows:
+        latency = summary['latency_s']
+        print(f"{name:<14} {summary['requests']:>8} {summary['rps']:>9.1f} {_ms(latency['p50']):>10} "
+              f"{_ms(latency['p95']):>10} {_ms(latency['p99']):>10} {_ms(latency['max']):>10} "
+              f"{summary['error_rate'] * 100:>7.2f}%")
+
+    error_kinds = report['total']['error_kinds']
+    if error_kinds:
+        print("❌ Hatalar: " + ', '.join(f"{kind} x{count}" for kind, count in sorted(error_kinds.items())))
+
+
+def print_comparison(paths):
+    """Kaydedilmiş JSON raporlarını yan yana karşılaştır"""
+    print(f"{'Çalıştırma':<24} {'c':>4} {'req/s':>9} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10} {'Hata':>8}")
+    print("-" * 92)
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        total = report['total']
+        latency = total['latency_s']
+        label = report.get('label') or os.path.splitext(os.path.basename(path))[0]
+        print(f"{label:<24} {report['concurrency']:>4} {total['rps']:>9.1f} {_ms(latency['p50']):>10} "
+              f"{_ms(latency['p95']):>10} {_ms(latency['p99']):>10} {_ms(latency['max']):>10} "
+              f"{total['error_rate'] * 100:>7.2f}%")
+
+
+def main(argv=None, default_url='http://localhost:8000'):
+    """Ana fonksiyon - Yük testini çalıştır"""
+    parser = argparse.ArgumentParser(description="Football prediction API yük testi")
+    parser.add_argument('url', nargs='?', default=default_url, help="Sunucu adresi (yol öneki dahil)")
+    parser.add_argument('-c', '--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="Eşzamanlı bağlantı sayısı")
+    parser.add_argument('-d', '--duration', type=float, default=DEFAULT_DURATION, help="Ölçüm süresi (saniye)")
+    parser.add_argument('-n', '--requests', type=int, help="Toplam istek sınırı (süreden önce biterse durur)")
+    parser.add_argument('--warmup', type=float, default=0.0, help="Sonuçlara katılmayan ısınma süresi (saniye)")
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f"Uç nokta ağırlıkları ({', '.join(ENDPOINTS)}); varsayılan: {DEFAULT_MIX}")
+    parser.add_argument('--timeout', type=float, default=REQUEST_TIMEOUT, help="İstek zaman aşımı (saniye)")
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--label', help="JSON raporundaki çalıştırma adı")
+    parser.add_argument('--json', help="JSON raporunu bu dosyaya yaz ('-' = stdout)")
+    parser.add_argument('--compare', nargs='+', metavar='JSON', help="Kayıtlı raporları karşılaştır")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        print_comparison(args.compare)
+        return
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.json != '-':
+        print(f"🚦 {args.url} yükleniyor: {args.concurrency} bağlantı, {args.duration:.0f} sn, karışım {args.mix}")
+
+    try:
+        report = asyncio.run(run_load(args.url, mix, args.concurrency, args.duration,
+                                      max_requests=args.requests, warmup=args.warmup,
+                                      seed=args.seed, timeout=args.timeout))
+    except (HTTPError, OSError) as e:
+        print(f"❌ Sunucuya ulaşılamadı: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    report['label'] = args.label
+
+    if args.json == '-':
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+
+    print_report(report)
+    if args.json:
+        write_json(args.json, report)
+        print(f"💾 Rapor: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
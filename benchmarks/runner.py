@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏁 Benchmark Runner - Ölçüm, geçmiş ve gerileme kontrolü
+Author: Berke Özkul
+Description: Her senaryo ayrı bir Python sürecinde çalışır (tepe RSS
+senaryoya özgü olsun diye); süre, tepe RSS ve tracemalloc ayırma ölçümleri
+JSON geçmişine eklenir ve kayıtlı baseline ile karşılaştırılır
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+
+HISTORY_PATH = os.path.join(BENCH_DIR, 'history.json')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+# Medyan süre veya tepe RSS baseline'dan bu orandan fazla artarsa gerileme sayılır
+DEFAULT_THRESHOLD = 0.10
+# Çok kısa ölçümlerde gürültüyü gerileme saymamak için mutlak alt sınır (saniye)
+MIN_TIME_DELTA = 0.0005
+# Senaryo süreci için üst sınır (saniye)
+CASE_TIMEOUT = int(os.environ.get('BENCH_CASE_TIMEOUT', '1800'))
+
+
+def _peak_rss_mb():
+    """Sürecin tepe RSS değeri (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt döndürür
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure_case(name, options):
+    """
+    Senaryoyu bu süreçte ölç (alt süreç tarafında çalışır)
+
+    Returns:
+        dict: Süreler, bellek ve ayırma ölçümleri
+    """
+    from benchmarks.cases import CASES, SkipCase
+
+    case = CASES[name]
+    repeat = options.get('repeat') or case.repeat
+
+    try:
+        # Kodun print çıktıları ölçümü bozmasın
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            run = case.setup(options)
+            setup_rss = _peak_rss_mb()
+
+            if case.warmup:
+                run()
+
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for _ in range(case.number):
+                    run()
+                times.append((time.perf_counter() - start) / case.number)
+
+            peak_rss = _peak_rss_mb()
+
+            allocations = None
+            if options.get('allocations', True):
+                # Ayrı geçiş: tracemalloc süreyi yavaşlattığı için süre ölçümüne karışmaz
+                tracemalloc.start()
+                run()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                allocations = {
+                    'peak_mb': round(peak / (1024 * 1024), 3),
+                    'retained_mb': round(current / (1024 * 1024), 3)
+                }
+    except SkipCase as e:
+        return {'status': 'skipped', 'reason': str(e)}
+    except Exception as e:
+        return {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+
+    return {
+        'status': 'ok',
+        'repeat': repeat,
+        'number': case.number,
+        'wall_s': {
+            'min': min(times),
+            'median': statistics.median(times),
+            'mean': statistics.fmean(times),
+            'stdev': statistics.stdev(times) if len(times) > 1 else 0.0
+        },
+        'setup_rss_mb': round(setup_rss, 1),
+        'peak_rss_mb': round(peak_rss, 1),
+        'allocations': allocations
+    }
+
+
+def run_case_isolated(name, options):
+    """Senaryoyu yeni bir Python sürecinde çalıştır ve sonucunu oku"""
+    with tempfile.NamedTemporaryFile('r', suffix='.json', delete=False) as output:
+        output_path = output.name
+
+    command = [sys.executable, '-m', 'benchmarks.runner', '--child', name,
+               '--output', output_path, '--options', json.dumps(options)]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT_DIR, SRC_DIR, os.environ.get('PYTHONPATH')])))
+
+    try:
+        # Kod ../data/ gibi göreli yollar kullandığı için src/ içinden çalışır
+        completed = subprocess.run(command, cwd=SRC_DIR, env=env, capture_output=True,
+                                   text=True, timeout=CASE_TIMEOUT)
+        with open(output_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if not content:
+            stderr = completed.stderr.strip().splitlines()
+            return {'status': 'error', 'error': stderr[-1] if stderr else f"çıkış kodu {completed.returncode}"}
+        return json.loads(content)
+    except subprocess.TimeoutExpired:
+        return {'status': 'error', 'error': f"{CASE_TIMEOUT} sn zaman aşımı"}
+    finally:
+        os.unlink(output_path)
+
+
+def git_revision():
+    """Mevcut commit (git yoksa None)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def load_json(path, default):
+    """JSON dosyasını oku (yoksa varsayılan)"""
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    """JSON dosyasını atomik olarak yaz"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    os.replace(temp_path, path)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Sonuçları baseline ile karşılaştır
+
+    Returns:
+        dict: Senaryo -> {'verdict': regression/improvement/ok/new, 'time_change', 'rss_change'}
+    """
+    verdicts = {}
+    base_results = (baseline or {}).get('results', {})
+
+    for name, result in results.items():
+        base = base_results.get(name)
+        if result.get('status') != 'ok':
+            verdicts[name] = {'verdict': result.get('status')}
+            continue
+        if not base or base.get('status') != 'ok':
+            verdicts[name] = {'verdict': 'new'}
+            continue
+
+        current_time = result['wall_s']['median']
+        base_time = base['wall_s']['median']
+        time_change = (current_time - base_time) / base_time if base_time else 0.0
+        rss_change = (result['peak_rss_mb'] - base['peak_rss_mb']) / base['peak_rss_mb'] if base['peak_rss_mb'] else 0.0
+
+        slower = time_change > threshold and current_time - base_time > MIN_TIME_DELTA
+        if slower or rss_change > threshold:
+            verdict = 'regression'
+        elif time_change < -threshold:
+            verdict = 'improvement'
+        else:
+            verdict = 'ok'
+
+        verdicts[name] = {
+            'verdict': verdict,
+            'time_change': round(time_change, 4),
+            'rss_change': round(rss_change, 4)
+        }
+
+    return verdicts
+
+
+def format_time(seconds):
+    """Süreyi okunabilir birimle yaz"""
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def print_report(results, verdicts):
+    """Sonuç tablosu"""
+    icons = {'regression': '🔴', 'improvement': '🟢', 'ok': '✅', 'new': '🆕',
+             'skipped': '⏭️', 'error': '❌'}
+
+    print(f"\n{'Senaryo':<20} {'Medyan':>11} {'Min':>11} {'RSS':>9} {'Alloc':>9}  Karşılaştırma")
+    print("-" * 84)
+    for name, result in results.items():
+        verdict = verdicts.get(name, {})
+        icon = icons.get(verdict.get('verdict'), '')
+
+        if result.get('status') != 'ok':
+            detail = result.get('reason') or result.get('error')
+            print(f"{name:<20} {icon} {result.get('status')}: {detail}")
+            continue
+
+        wall = result['wall_s']
+        allocations = result.get('allocations')
+        alloc = f"{allocations['peak_mb']:.1f} MB" if allocations else '-'
+        change = ''
+        if 'time_change' in verdict:
+            change = f"süre {verdict['time_change'] * 100:+.1f}% | RSS {verdict['rss_change'] * 100:+.1f}%"
+        print(f"{name:<20} {format_time(wall['median']):>11} {format_time(wall['min']):>11} "
+              f"{result['peak_rss_mb']:>6.1f} MB {alloc:>9}  {icon} {change}")
+
+
+def main():
+    """Ana fonksiyon - Benchmark'ları çalıştır"""
+    from benchmarks.cases import CASES
+
+    parser = argparse.ArgumentParser(description="Football prediction benchmark'ları")
+    parser.add_argument('--case', action='append', default=[], help="Adında bu metin geçen senaryolar (tekrarlanabilir)")
+    parser.add_argument('--group', choices=sorted({case.group for case in CASES.values()}), help="Yalnızca bu grup")
+    parser.add_argument('--list', action='store_true', help="Senaryoları listele")
+    parser.add_argument('--repeat', type=int, help="Tüm senaryolar için tekrar sayısı")
+    parser.add_argument('--seasons', type=int, help="_process_data/train_models için son N sezon (varsayılan: tümü / 4)")
+    parser.add_argument('--model', default=os.environ.get('BENCH_MODEL', os.path.join(SRC_DIR, 'advanced_football_model.pkl')),
+                        help="Tahmin ve HTTP senaryoları için gelişmiş model dosyası")
+    parser.add_argument('--no-alloc', action='store_true', help="tracemalloc geçişini atla")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Gerileme eşiği (0.10 = %%10)")
+    parser.add_argument('--history', default=HISTORY_PATH)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Bu çalıştırmayı baseline olarak kaydet")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Gerileme varsa çıkış kodu 1")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--output', help=argparse.SUPPRESS)
+    parser.add_argument('--options', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = measure_case(args.child, json.loads(args.options))
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    selected = [case for case in CASES.values()
+                if (not args.group or case.group == args.group)
+                and (not args.case or any(pattern in case.name for pattern in args.case))]
+
+    if args.list:
+        for case in selected:
+            print(f"{case.name:<20} [{case.group}] {case.description}")
+        return
+
+    options = {
+        'repeat': args.repeat,
+        'seasons': args.seasons,
+        'model': os.path.abspath(args.model) if args.model else None,
+        'allocations': not args.no_alloc
+    }
+
+    print("⏱️ Football Prediction Benchmark")
+    print("=" * 84)
+    print(f"🐍 Python {platform.python_version()} | {platform.machine()} | {os.cpu_count()} CPU | commit {git_revision()}")
+
+    results = {}
+    for case in selected:
+        print(f"  ▶️ {case.name} ...", flush=True)
+        results[case.name] = run_case_isolated(case.name, options)
+
+    baseline = load_json(args.baseline, None)
+    verdicts = compare(results, baseline, args.threshold)
+    print_report(results, verdicts)
+
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'options': options,
+        'results': results,
+        'comparison': verdicts
+    }
+
+    history = load_json(args.history, [])
+    history.append(run)
+    write_json(args.history, history)
+    print(f"\n💾 Geçmiş: {args.history} ({len(history)} çalıştırma)")
+
+    if args.save_baseline:
+        write_json(args.baseline, run)
+        print(f"📌 Baseline kaydedildi: {args.baseline}")
+    elif baseline is None:
+        print("ℹ️ Baseline yok; --save-baseline ile kaydedin")
+
+    regressions = [name for name, verdict in verdicts.items() if verdict['verdict'] == 'regression']
+    if regressions:
+        print(f"🔴 Gerileme: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
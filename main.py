@@ -6,15 +6,36 @@ Author: Berke Özkul
 Description: Production-ready FastAPI server for Railway deployment
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 import uvicorn
+import asyncio
+import hashlib
+import io
 import os
+import sys
 import json
 import random
-from datetime import datetime
-from typing import Dict, Any
+import time
+from datetime import date, datetime
+from typing import Dict, Any, List, Tuple
+
+# src/ altındaki paylaşılan modüller
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from compression import CompressionMiddleware
+from team_registry import REGISTRY
+from serialization import dumps
+from http_cache import etag_for, etag_for_key, is_not_modified, cache_control, HEALTH_CACHE_CONTROL
+from metrics import METRICS, MetricsMiddleware, CONTENT_TYPE as METRICS_CONTENT_TYPE, stage
+from admission import AdmissionMiddleware
+from prefork import PreforkServer, worker_count, worker_status
+from inference_pool import InferencePool, PoolSaturated
+from micro_batching import MicroBatcher
+from audit_log import AUDIT_LOG
+from schemas import (FastJSONResponse, PredictRequest, BatchRequest, PredictResponse, BatchResponse,
+                     ErrorResponse, MAX_TEAM_NAME_LENGTH, validation_errors)
 
 # Create FastAPI instance
 app = FastAPI(
@@ -22,9 +43,13 @@ app = FastAPI(
     description="AI-powered football match score prediction service",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
 )
 
+# İstemci başına hız sınırı (429) ve yük atma (503); CORS'un içinde: reddedilen yanıtlar da CORS başlığı alır
+app.add_middleware(AdmissionMiddleware)
+
 # CORS middleware for Flutter app
 app.add_middleware(
     CORSMiddleware,
@@ -34,71 +59,175 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Premier League teams (2005-2018 historical data)
-TEAMS = [
-    "Arsenal", "Aston Villa", "Birmingham", "Blackburn", "Blackpool",
-    "Bolton", "Bournemouth", "Brentford", "Brighton", "Burnley",
-    "Cardiff", "Chelsea", "Crystal Palace", "Derby", "Everton",
-    "Fulham", "Hull", "Huddersfield", "Leicester", "Liverpool",
-    "Man City", "Man United", "Middlesbrough", "Newcastle",
-    "Norwich", "Portsmouth", "QPR", "Reading", "Sheffield United",
-    "Southampton", "Stoke", "Sunderland", "Swansea", "Tottenham",
-    "Watford", "West Brom", "West Ham", "Wigan", "Wolves"
-]
+# Accept-Encoding müzakereli gzip/brotli sıkıştırma (mobil ağlar için)
+app.add_middleware(CompressionMiddleware, cacheable_paths=("/", "/teams"))
+
+# İstek sayıları ve süreleri (en dışta: sıkıştırma dahil toplam süre ölçülür)
+ROUTES = ("/", "/health", "/teams", "/teams/search", "/predict", "/predict/batch", "/metrics")
+app.add_middleware(MetricsMiddleware, known_paths=ROUTES)
+
+# Tahmin aşamalarının gecikme histogramları ve cache istatistikleri
+VALIDATE_STAGE = stage("validate")
+INFERENCE_STAGE = stage("inference")
+ANALYSIS_STAGE = stage("analysis")
+ENCODE_STAGE = stage("encode")
+CONDITIONAL_CACHE_STATS = METRICS.cache("conditional_get")
+
+# Premier League teams (ortak takım kaydından, bir kez sıralanır)
+TEAMS = sorted(REGISTRY.names)
+
+RESULT_TEXTS = {
+    "H": "Ev Sahibi Galibiyeti",
+    "D": "Beraberlik",
+    "A": "Deplasman Galibiyeti"
+}
+
+# Toplu tahminde tek istekte kabul edilen en fazla maç sayısı
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", "50"))
+
+# Tahmin ve analiz olay döngüsü dışında, sınırlı bir thread havuzunda çalışır
+# (INFERENCE_WORKERS thread, INFERENCE_QUEUE bekleyen iş; dolunca 503 + Retry-After)
+INFERENCE_POOL = InferencePool("inference")
+
+# Mock model sürümü (ETag ve Cache-Control için; tahminler maça göre deterministik)
+MODEL_VERSION = "mock-1.0.0"
+
+# İsteğe bağlı gerçek model (gelişmiş model .pkl dosyası); verilmezse mock tahminler kullanılır
+MODEL_PATH = os.environ.get("MODEL_PATH", "")
+PREDICTOR = None
+
+def load_predictor(path):
+    """Gelişmiş modeli yükle; (predictor, sürüm) döndürür"""
+    # pandas/sklearn yalnızca gerçek model kullanılırken gerekir
+    from advanced_model import AdvancedFootballPredictor
+    
+    with open(path, "rb") as f:
+        data = f.read()
+    buffer = io.BytesIO(data)
+    buffer.name = path
+    predictor = AdvancedFootballPredictor()
+    if not predictor.load_model(buffer):
+        raise ValueError(f"Model yüklenemedi: {path}")
+    return predictor, "advanced-" + hashlib.sha256(data).hexdigest()[:12]
+
+# Model modül yüklenirken okunur: prefork modunda ana süreçte bir kez yüklenip işçilerle paylaşılır
+if MODEL_PATH:
+    PREDICTOR, MODEL_VERSION = load_predictor(MODEL_PATH)
+
+# Gerçek modelde eşzamanlı tekil tahminler tek predict_matches çağrısında toplanır
+# (MICRO_BATCH_WAIT_MS pencere, MICRO_BATCH_SIZE en fazla maç)
+BATCHER = MicroBatcher(PREDICTOR.predict_matches, "predict") if PREDICTOR is not None else None
+
+ROOT_INFO = {
+    "message": "⚽ Football Prediction API",
+    "version": "1.0.0",
+    "status": "running",
+    "docs": "/docs",
+    "endpoints": {
+        "health": "/health",
+        "teams": "/teams", 
+        "team_search": "/teams/search?q=",
+        "predict": "/predict",
+        "predict_batch": "/predict/batch",
+        "metrics": "/metrics"
+    }
+}
+
+# Statik yanıtlar bir kez kodlanır; ETag içerik özetidir
+ROOT_BODY = dumps(ROOT_INFO)
+ROOT_ETAG = etag_for(ROOT_BODY)
+TEAMS_BODY = dumps({"teams": TEAMS, "count": len(TEAMS)})
+TEAMS_ETAG = etag_for(TEAMS_BODY)
+
+METRICS.gauge_function("model_info", "Aktif model sürümü (değer her zaman 1)",
+                       lambda: [({"version": MODEL_VERSION, "type": "advanced" if PREDICTOR else "mock"}, 1)])
+
+def cached_json(request: Request, body: bytes, etag: str, policy: str) -> Response:
+    """ETag/Cache-Control ile JSON yanıt; If-None-Match eşleşirse gövdesiz 304"""
+    headers = {"ETag": etag, "Cache-Control": policy, "Vary": "Accept-Encoding"}
+    not_modified = is_not_modified(request.headers.get("if-none-match"), etag)
+    CONDITIONAL_CACHE_STATS.record(not_modified)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Kapanışta tampondaki denetim kayıtları yazılır (prefork işçileri atexit çalıştırmadan çıkar)
+app.router.add_event_handler("shutdown", AUDIT_LOG.close)
 
 @app.get("/")
-async def root():
+async def root(request: Request):
     """API ana sayfası"""
-    return {
-        "message": "⚽ Football Prediction API",
-        "version": "1.0.0",
-        "status": "running",
-        "docs": "/docs",
-        "endpoints": {
-            "health": "/health",
-            "teams": "/teams", 
-            "predict": "/predict"
-        }
-    }
+    return cached_json(request, ROOT_BODY, ROOT_ETAG, cache_control(MODEL_VERSION))
 
 @app.get("/health")
-async def health_check():
+async def health_check(response: Response):
     """Sağlık kontrolü"""
+    response.headers["Cache-Control"] = HEALTH_CACHE_CONTROL
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "service": "football-prediction-api",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "model_version": MODEL_VERSION,
+        "inference_pool": INFERENCE_POOL.status(),
+        "micro_batching": BATCHER.status() if BATCHER is not None else None,
+        "audit_log": AUDIT_LOG.status(),
+        "process": worker_status()
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrikleri (aşama gecikmeleri, istek/hata sayıları, cache oranları)"""
+    # media_type yerine başlık: Starlette text/ türlerine ikinci bir charset eklemesin
+    return Response(content=METRICS.render(),
+                    headers={"Content-Type": METRICS_CONTENT_TYPE, "Cache-Control": "no-store"})
+
 @app.get("/teams")
-async def get_teams():
+async def get_teams(request: Request):
     """Takım listesi"""
-    return {
-        "teams": sorted(TEAMS),
-        "count": len(TEAMS),
-        "timestamp": datetime.now().isoformat()
-    }
+    return cached_json(request, TEAMS_BODY, TEAMS_ETAG, cache_control(MODEL_VERSION))
 
-@app.post("/predict")
-async def predict_match(request: Dict[str, Any]):
-    """Maç tahmini"""
+@app.get("/teams/search")
+async def search_teams(request: Request, q: str = "", limit: int = 10):
+    """Takım ismi otomatik tamamlama (takma adlar dahil, harf duyarsız)"""
+    matches = REGISTRY.search(q, limit=max(1, min(limit, len(TEAMS)))) if q else []
+    body = dumps({
+        "query": q,
+        "count": len(matches),
+        "teams": matches
+    })
+    return cached_json(request, body, etag_for(body), cache_control(MODEL_VERSION))
+
+# Tahmin uçlarının olası hata yanıtları (OpenAPI)
+ERROR_RESPONSES = {400: {"model": ErrorResponse}, 503: {"model": ErrorResponse}}
+
+def resolve_fixture(home_team: str, away_team: str) -> Tuple[str, str]:
+    """Takma adları kanonik isme çevir ("Manchester City" -> "Man City"); geçersizse 400"""
+    with VALIDATE_STAGE.time():
+        home_team = REGISTRY.resolve(home_team)
+        away_team = REGISTRY.resolve(away_team)
+    
+    if home_team is None or away_team is None:
+        raise HTTPException(status_code=400, detail="Geçersiz takım adı")
+    
+    if home_team == away_team:
+        raise HTTPException(status_code=400, detail="Aynı takım seçilemez")
+    
+    return home_team, away_team
+
+async def prediction_body(home_team: str, away_team: str) -> bytes:
+    """Tek maç tahmini + detaylı analiz, kodlanmış JSON olarak"""
+    start = time.perf_counter()
     try:
-        home_team = request.get("home_team")
-        away_team = request.get("away_team")
-        
-        if not home_team or not away_team:
-            raise HTTPException(status_code=400, detail="home_team ve away_team gerekli")
-        
-        if home_team not in TEAMS or away_team not in TEAMS:
-            raise HTTPException(status_code=400, detail="Geçersiz takım adı")
-        
-        if home_team == away_team:
-            raise HTTPException(status_code=400, detail="Aynı takım seçilemez")
-        
-        # AI Prediction (Mock - production'da gerçek model kullanılacak)
-        prediction = generate_prediction(home_team, away_team)
-        detailed_analysis = generate_detailed_analysis(home_team, away_team)
+        # Tahmin ve analiz havuzda çalışır; olay döngüsü diğer isteklere devam eder
+        if BATCHER is not None:
+            # Model tahmini diğer eşzamanlı isteklerle aynı partide, analiz havuzda
+            prediction, detailed_analysis = await asyncio.gather(
+                BATCHER.predict((home_team, away_team)),
+                INFERENCE_POOL.run(timed_analysis, home_team, away_team)
+            )
+        else:
+            prediction, detailed_analysis = await INFERENCE_POOL.run(predict_with_analysis, home_team, away_team)
         
         response = {
             "success": True,
@@ -110,50 +239,212 @@ async def predict_match(request: Dict[str, Any]):
                 "home_goals": prediction["home_goals"],
                 "away_goals": prediction["away_goals"], 
                 "result": prediction["result"],
-                "result_text": {
-                    "H": "Ev Sahibi Galibiyeti",
-                    "D": "Beraberlik", 
-                    "A": "Deplasman Galibiyeti"
-                }[prediction["result"]],
+                "result_text": RESULT_TEXTS[prediction["result"]],
                 "probabilities": prediction["probabilities"],
                 "confidence": prediction["confidence"]
             },
-            "detailed_analysis": detailed_analysis,
+            "detailed_analysis": detailed_analysis
+        }
+        
+        with ENCODE_STAGE.time():
+            body = dumps(response)
+        
+        # Sunulan tahmin denetim günlüğüne (tampona bırakılır, disk beklenmez)
+        AUDIT_LOG.record("predict", MODEL_VERSION, home_team, away_team, prediction, time.perf_counter() - start)
+        return body
+        
+    except PoolSaturated:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
+
+@app.post("/predict", response_model=PredictResponse, responses=ERROR_RESPONSES)
+async def predict_match(request: PredictRequest):
+    """Maç tahmini"""
+    home_team, away_team = resolve_fixture(request.home_team, request.away_team)
+    return FastJSONResponse(await prediction_body(home_team, away_team))
+
+@app.get("/predict", response_model=PredictResponse, responses=ERROR_RESPONSES)
+async def predict_match_get(
+    request: Request,
+    home: str = Query(min_length=1, max_length=MAX_TEAM_NAME_LENGTH, examples=["Arsenal"]),
+    away: str = Query(min_length=1, max_length=MAX_TEAM_NAME_LENGTH, examples=["Chelsea"])
+):
+    """Maç tahmini (GET, Flutter istemcisi); If-None-Match eşleşirse tahmin yapılmadan 304"""
+    home_team, away_team = resolve_fixture(home.strip(), away.strip())
+    
+    # Tahmin model sürümü ve maça (gerçek modelde ay/hafta günü özellikleri için güne de) bağlı:
+    # ETag gövde üretilmeden hesaplanır; aynı ETag'li gövdeler aynıdır (zaman damgası yok)
+    key = (home_team, away_team) if PREDICTOR is None else (home_team, away_team, date.today().isoformat())
+    etag = etag_for_key(MODEL_VERSION, "predict", *key)
+    headers = {"ETag": etag, "Cache-Control": cache_control(MODEL_VERSION), "Vary": "Accept-Encoding"}
+    not_modified = is_not_modified(request.headers.get("if-none-match"), etag)
+    CONDITIONAL_CACHE_STATS.record(not_modified)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    
+    return FastJSONResponse(await prediction_body(home_team, away_team), headers=headers)
+
+@app.post("/predict/batch", response_model=BatchResponse, responses=ERROR_RESPONSES)
+async def predict_batch(request: BatchRequest):
+    """Toplu maç tahmini (bir haftanın tüm maçları tek istekte)"""
+    try:
+        matches = request.matches
+        
+        if len(matches) > MAX_BATCH_SIZE:
+            raise HTTPException(status_code=400, detail=f"En fazla {MAX_BATCH_SIZE} maç gönderilebilir")
+        
+        # Tüm maçları tek geçişte doğrula, hataları birlikte döndür
+        with VALIDATE_STAGE.time():
+            fixtures, errors = validate_fixtures(matches)
+        
+        if errors:
+            return FastJSONResponse(status_code=400, content={
+                "error": "Geçersiz maç listesi",
+                "errors": errors,
+                "max_batch_size": MAX_BATCH_SIZE
+            })
+        
+        start = time.perf_counter()
+        predictions = await INFERENCE_POOL.run(timed_predictions, fixtures)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        response = {
+            "success": True,
+            "count": len(predictions),
+            "predictions": [
+                {
+                    "match": {"home_team": home_team, "away_team": away_team},
+                    "prediction": dict(prediction, result_text=RESULT_TEXTS[prediction["result"]])
+                }
+                for (home_team, away_team), prediction in zip(fixtures, predictions)
+            ],
+            "timing": {
+                "total_ms": round(elapsed_ms, 3),
+                "per_fixture_ms": round(elapsed_ms / len(fixtures), 3)
+            },
             "timestamp": datetime.now().isoformat()
         }
         
-        return response
+        with ENCODE_STAGE.time():
+            body = dumps(response)
+        
+        latency = time.perf_counter() - start
+        for (home_team, away_team), prediction in zip(fixtures, predictions):
+            AUDIT_LOG.record("predict_batch", MODEL_VERSION, home_team, away_team, prediction, latency)
+        return FastJSONResponse(body)
         
-    except HTTPException:
+    except (HTTPException, PoolSaturated):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
 
+@app.exception_handler(PoolSaturated)
+async def pool_saturated(request: Request, exc: PoolSaturated):
+    """Çıkarım havuzu dolu: isteği kuyruğa almadan reddet"""
+    return FastJSONResponse(status_code=503, headers={"Retry-After": str(exc.retry_after)}, content={
+        "error": "Sunucu yoğun, lütfen tekrar deneyin",
+        "retry_after": exc.retry_after
+    })
+
+@app.exception_handler(RequestValidationError)
+async def invalid_request(request: Request, exc: RequestValidationError):
+    """Doğrulama hataları diğer sunucularla aynı şekilde 400 döner (FastAPI varsayılanı 422)"""
+    errors = exc.errors()
+    if any(error.get("type") == "json_invalid" for error in errors):
+        detail = "Geçersiz JSON"
+    elif any(error.get("loc", ())[-1:] in (("home_team",), ("away_team",), ("home",), ("away",)) for error in errors):
+        detail = "home_team ve away_team gerekli"
+    elif any(error.get("loc", ())[-1:] == ("matches",) for error in errors):
+        detail = "matches boş olmayan bir liste olmalı"
+    else:
+        detail = "Geçersiz istek"
+    return FastJSONResponse(status_code=400, content={"detail": detail, "errors": validation_errors(errors)})
+
+def predict_with_analysis(home_team: str, away_team: str):
+    """Havuz thread'inde: tahmin ve detaylı analiz"""
+    with INFERENCE_STAGE.time():
+        prediction = generate_prediction(home_team, away_team)
+    with ANALYSIS_STAGE.time():
+        detailed_analysis = generate_detailed_analysis(home_team, away_team)
+    return prediction, detailed_analysis
+
+def timed_analysis(home_team: str, away_team: str):
+    """Havuz thread'inde: detaylı analiz"""
+    with ANALYSIS_STAGE.time():
+        return generate_detailed_analysis(home_team, away_team)
+
+def timed_predictions(fixtures):
+    """Havuz thread'inde: toplu tahmin"""
+    with INFERENCE_STAGE.time():
+        return generate_predictions(fixtures)
+
+def validate_fixtures(matches):
+    """Toplu tahmin listesini doğrula; (maç çiftleri, hata listesi) döndürür"""
+    fixtures = []
+    errors = []
+    for index, match in enumerate(matches):
+        if not isinstance(match, dict):
+            errors.append({"index": index, "error": "Maç bir JSON nesnesi olmalı"})
+            continue
+        
+        home_team = match.get("home_team")
+        away_team = match.get("away_team")
+        
+        if not home_team or not away_team:
+            errors.append({"index": index, "error": "home_team ve away_team gerekli"})
+            continue
+        
+        # Takma adlar kanonik isme çevrilir ("Manchester City" -> "Man City")
+        home_team = REGISTRY.resolve(home_team)
+        away_team = REGISTRY.resolve(away_team)
+        
+        if home_team is None or away_team is None:
+            errors.append({"index": index, "error": "Geçersiz takım adı"})
+        elif home_team == away_team:
+            errors.append({"index": index, "error": "Aynı takım seçilemez"})
+        else:
+            fixtures.append((home_team, away_team))
+    
+    return fixtures, errors
+
+def generate_predictions(fixtures) -> List[Dict[str, Any]]:
+    """Birden çok maç için tahmin (gerçek modelde tek vektörel çağrı)"""
+    if PREDICTOR is not None:
+        return PREDICTOR.predict_matches(fixtures)
+    return [generate_prediction(home_team, away_team) for home_team, away_team in fixtures]
+
 def generate_prediction(home_team: str, away_team: str) -> Dict[str, Any]:
-    """AI tahmin oluştur (Mock implementation)"""
+    """AI tahmin oluştur (MODEL_PATH verilmemişse mock)"""
+    if PREDICTOR is not None:
+        return PREDICTOR.predict_matches([(home_team, away_team)])[0]
+    
+    # Aynı maç için her istekte aynı sonuç (ETag ve cache için deterministik)
+    rng = random.Random(f"{home_team}|{away_team}")
+    
     # Home advantage
-    home_advantage = random.uniform(0.1, 0.3)
+    home_advantage = rng.uniform(0.1, 0.3)
     
     # Team strengths (mock)
-    home_strength = random.uniform(0.6, 0.9)
-    away_strength = random.uniform(0.5, 0.8)
+    home_strength = rng.uniform(0.6, 0.9)
+    away_strength = rng.uniform(0.5, 0.8)
     
     # Goal prediction
-    home_goals = max(0, int(random.normalvariate(home_strength * 2 + home_advantage, 0.8)))
-    away_goals = max(0, int(random.normalvariate(away_strength * 1.8, 0.7)))
+    home_goals = max(0, int(rng.normalvariate(home_strength * 2 + home_advantage, 0.8)))
+    away_goals = max(0, int(rng.normalvariate(away_strength * 1.8, 0.7)))
     
     # Result
     if home_goals > away_goals:
         result = "H"
-        home_prob = random.uniform(0.4, 0.7)
+        home_prob = rng.uniform(0.4, 0.7)
     elif home_goals < away_goals:
         result = "A"
-        home_prob = random.uniform(0.1, 0.3)
+        home_prob = rng.uniform(0.1, 0.3)
     else:
         result = "D"
-        home_prob = random.uniform(0.25, 0.4)
+        home_prob = rng.uniform(0.25, 0.4)
     
-    draw_prob = random.uniform(0.15, 0.3)
+    draw_prob = rng.uniform(0.15, 0.3)
     away_prob = 1.0 - home_prob - draw_prob
     
     # Normalize probabilities
@@ -162,7 +453,7 @@ def generate_prediction(home_team: str, away_team: str) -> Dict[str, Any]:
     draw_prob /= total  
     away_prob /= total
     
-    confidence = random.uniform(0.75, 0.95)
+    confidence = rng.uniform(0.75, 0.95)
     
     return {
         "home_goals": home_goals,
@@ -178,10 +469,13 @@ def generate_prediction(home_team: str, away_team: str) -> Dict[str, Any]:
 
 def generate_detailed_analysis(home_team: str, away_team: str) -> Dict[str, Any]:
     """Detaylı analiz oluştur"""
+    # Aynı maç için her istekte aynı sonuç (ETag ve cache için deterministik)
+    rng = random.Random(f"{home_team}|{away_team}")
+    
     # Mock detailed analysis
-    total_matches = random.randint(15, 25)
-    home_wins = random.randint(4, total_matches // 2)
-    away_wins = random.randint(3, total_matches - home_wins - 2)
+    total_matches = rng.randint(15, 25)
+    home_wins = rng.randint(4, total_matches // 2)
+    away_wins = rng.randint(3, total_matches - home_wins - 2)
     draws = total_matches - home_wins - away_wins
     
     return {
@@ -190,50 +484,50 @@ def generate_detailed_analysis(home_team: str, away_team: str) -> Dict[str, Any]
             "home_wins": home_wins,
             "away_wins": away_wins,
             "draws": draws,
-            "last_5_results": random.choices(['H', 'D', 'A'], k=5),
-            "avg_goals_per_match": round(random.uniform(2.1, 3.2), 1)
+            "last_5_results": rng.choices(['H', 'D', 'A'], k=5),
+            "avg_goals_per_match": round(rng.uniform(2.1, 3.2), 1)
         },
         "team_form": {
             "home_team": {
-                "last_5_matches": random.choices(['W', 'L', 'D'], weights=[0.5, 0.2, 0.3], k=5),
-                "goals_scored_last_5": random.randint(6, 12),
-                "goals_conceded_last_5": random.randint(3, 8),
-                "clean_sheets_last_10": random.randint(3, 7),
-                "matches_with_both_teams_scoring": random.randint(6, 9),
-                "avg_goals_per_match": round(random.uniform(1.2, 2.4), 1)
+                "last_5_matches": rng.choices(['W', 'L', 'D'], weights=[0.5, 0.2, 0.3], k=5),
+                "goals_scored_last_5": rng.randint(6, 12),
+                "goals_conceded_last_5": rng.randint(3, 8),
+                "clean_sheets_last_10": rng.randint(3, 7),
+                "matches_with_both_teams_scoring": rng.randint(6, 9),
+                "avg_goals_per_match": round(rng.uniform(1.2, 2.4), 1)
             },
             "away_team": {
-                "last_5_matches": random.choices(['W', 'L', 'D'], weights=[0.4, 0.3, 0.3], k=5),
-                "goals_scored_last_5": random.randint(4, 10),
-                "goals_conceded_last_5": random.randint(4, 9),
-                "clean_sheets_last_10": random.randint(2, 6),
-                "matches_with_both_teams_scoring": random.randint(5, 8),
-                "avg_goals_per_match": round(random.uniform(0.8, 2.0), 1)
+                "last_5_matches": rng.choices(['W', 'L', 'D'], weights=[0.4, 0.3, 0.3], k=5),
+                "goals_scored_last_5": rng.randint(4, 10),
+                "goals_conceded_last_5": rng.randint(4, 9),
+                "clean_sheets_last_10": rng.randint(2, 6),
+                "matches_with_both_teams_scoring": rng.randint(5, 8),
+                "avg_goals_per_match": round(rng.uniform(0.8, 2.0), 1)
             }
         },
         "goal_stats": {
-            "matches_over_2_5_goals": random.randint(8, 15),
-            "matches_under_2_5_goals": random.randint(5, 12),
-            "both_teams_to_score_percentage": round(random.uniform(55, 85), 1),
-            "first_half_goals_avg": round(random.uniform(0.8, 1.5), 1),
-            "second_half_goals_avg": round(random.uniform(1.2, 2.0), 1)
+            "matches_over_2_5_goals": rng.randint(8, 15),
+            "matches_under_2_5_goals": rng.randint(5, 12),
+            "both_teams_to_score_percentage": round(rng.uniform(55, 85), 1),
+            "first_half_goals_avg": round(rng.uniform(0.8, 1.5), 1),
+            "second_half_goals_avg": round(rng.uniform(1.2, 2.0), 1)
         },
         "interesting_facts": [
-            f"{home_team} son 5 ev sahibi maçında {random.randint(8, 15)} gol attı",
-            f"{away_team} son {random.randint(6, 10)} deplasman maçında sadece {random.randint(1, 3)} mağlubiyet aldı",
-            f"Bu iki takım arasındaki son {random.randint(3, 7)} maçta karşılıklı gol oldu",
-            f"Bu maçın %{random.randint(65, 85)}'inde 2.5+ gol oluyor"
+            f"{home_team} son 5 ev sahibi maçında {rng.randint(8, 15)} gol attı",
+            f"{away_team} son {rng.randint(6, 10)} deplasman maçında sadece {rng.randint(1, 3)} mağlubiyet aldı",
+            f"Bu iki takım arasındaki son {rng.randint(3, 7)} maçta karşılıklı gol oldu",
+            f"Bu maçın %{rng.randint(65, 85)}'inde 2.5+ gol oluyor"
         ],
         "key_stats": {
-            "home_team_strength": round(random.uniform(65, 85), 1),
-            "away_team_strength": round(random.uniform(60, 80), 1),
-            "home_advantage": round(random.uniform(0.12, 0.25), 2),
-            "motivation_factor": random.choice([
+            "home_team_strength": round(rng.uniform(65, 85), 1),
+            "away_team_strength": round(rng.uniform(60, 80), 1),
+            "home_advantage": round(rng.uniform(0.12, 0.25), 2),
+            "motivation_factor": rng.choice([
                 "Lig sıralaması için kritik maç",
                 "Geçen sezondan rövanş alma hırsı", 
                 "Playoff yarışı için önemli"
             ]),
-            "weather_impact": random.choice([
+            "weather_impact": rng.choice([
                 "İyi hava koşulları",
                 "Sıcak hava - tempolu oyun",
                 "Serin hava - ideal koşullar"
@@ -241,7 +535,20 @@ def generate_detailed_analysis(home_team: str, away_team: str) -> Dict[str, Any]
         }
     }
 
+def serve_worker(sock):
+    """Prefork işçisi: ana süreçten devralınan soket üzerinde uvicorn"""
+    config = uvicorn.Config(app, host=HOST, port=PORT, reload=False)
+    uvicorn.Server(config).run(sockets=[sock])
+
 # Railway için port configuration
+HOST = "0.0.0.0"
+PORT = int(os.environ.get("PORT", 8000))
+
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT", 8000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=False)
+    # WEB_CONCURRENCY > 1: model yüklendikten sonra fork edilen işçiler (bellek copy-on-write paylaşılır)
+    workers = worker_count()
+    if workers > 1:
+        PreforkServer(serve_worker, host=HOST, port=PORT, workers=workers).run()
+    else:
+        # Uygulama nesnesi verilir: "main:app" modülü ikinci kez import edip modeli yeniden yüklerdi
+        uvicorn.run(app, host=HOST, port=PORT, reload=False)
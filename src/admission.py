@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🚦 Admission - İstemci başına hız sınırı ve yük atma
+Author: Berke Özkul
+Description: API anahtarı veya IP başına token bucket hız sınırı (429) ve
+aynı anda işlenen istek sayısına göre genel yük atma (503). İstemci durumu
+son erişim sırasına göre tutulan bellek içi bir tabloda saklanır; boşta
+kalan istemciler periyodik olarak silinir. http.server sunucuları için
+enter()/leave(), FastAPI için ASGI middleware (sadece built-in Python)
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import METRICS
+
+# İstemci başına saniyede istek (0 = hız sınırı kapalı, varsayılan) ve anlık patlama kapasitesi
+# Proxy arkasında TRUST_PROXY olmadan tüm istemciler proxy adresini paylaşır; sınır bilinçli açılmalı
+RATE_LIMIT = float(os.environ.get('RATE_LIMIT', '0'))
+RATE_BURST = float(os.environ.get('RATE_BURST', '40'))
+# Aynı anda işlenen en fazla istek (0 = yük atma kapalı)
+MAX_IN_FLIGHT = int(os.environ.get('MAX_IN_FLIGHT', '256'))
+# 1: istemci IP'si X-Forwarded-For'a güvenilen proxy'nin eklediği en sağdaki adresten alınır
+# (Railway/Vercel proxy arkasında; soldaki adresleri istemci kendisi yazabilir)
+TRUST_PROXY = os.environ.get('TRUST_PROXY', '0') == '1'
+# Kendi kovasını alan API anahtarları (virgülle ayrılmış); listede olmayan anahtarlar IP ile sınırlanır
+API_KEYS = frozenset(key.strip() for key in os.environ.get('API_KEYS', '').split(',') if key.strip())
+
+# İstemci tablosu sınırı ve boşta kalanların silinme aralığı (saniye)
+MAX_CLIENTS = int(os.environ.get('RATE_LIMIT_MAX_CLIENTS', '100000'))
+EVICT_INTERVAL = 10.0
+
+API_KEY_HEADER = 'X-API-Key'
+_API_KEY_NAME = API_KEY_HEADER.lower().encode('latin-1')
+# İzleme uçları hiç sınırlanmaz
+EXEMPT_PATHS = frozenset(('/health', '/metrics'))
+
+REJECTED_TOTAL = METRICS.counter(
+    'admission_rejected_total',
+    'Kabul kontrolünde reddedilen istekler',
+    ('reason',)
+)
+RATE_LIMITED = REJECTED_TOTAL.labels('rate_limit')
+OVERLOADED = REJECTED_TOTAL.labels('overload')
+
+
+class Rejection:
+    """Reddedilen isteğin yanıtı (429 hız sınırı, 503 aşırı yük)"""
+
+    __slots__ = ('status', 'reason', 'retry_after', 'limit', 'remaining')
+
+    def __init__(self, status, reason, retry_after, limit=None, remaining=None):
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+        self.limit = limit
+        self.remaining = remaining
+
+    def headers(self):
+        headers = [('Retry-After', str(self.retry_after))]
+        if self.limit is not None:
+            headers.append(('X-RateLimit-Limit', f"{self.limit:g}"))
+            headers.append(('X-RateLimit-Remaining', str(self.remaining)))
+        return headers
+
+    def body(self):
+        message = 'Çok fazla istek, lütfen yavaşlayın' if self.status == 429 else 'Sunucu yoğun, lütfen tekrar deneyin'
+        return json.dumps({'error': message, 'reason': self.reason, 'retry_after': self.retry_after},
+                          ensure_ascii=False).encode('utf-8')
+
+
+class RateLimiter:
+    """
+    İstemci başına token bucket
+    - Her istemcinin kovası saniyede `rate` token dolar, en fazla `burst`
+    - Tablo son erişim sırasında tutulur; dolmuş (boşta) kovalar silinir
+    """
+
+    def __init__(self, rate=RATE_LIMIT, burst=RATE_BURST, max_clients=MAX_CLIENTS, evict_interval=EVICT_INTERVAL):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_clients = max_clients
+        self.evict_interval = evict_interval
+        # Kova bu süre boşta kalırsa tamamen dolar: silmek yeni kovayla aynıdır
+        self.idle_ttl = self.burst / rate if rate > 0 else 0.0
+
+        # istemci -> [token, son güncelleme]
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_eviction = 0.0
+        self.evicted = 0
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def acquire(self, client, cost=1.0, now=None):
+        """
+        İstemciden `cost` token düş
+
+        Returns:
+            tuple: (izin verildi mi, tekrar deneme süresi (sn), kalan token)
+        """
+        if not self.enabled:
+            return True, 0, None
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            if now >= self._next_eviction:
+                self._evict(now)
+
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = [self.burst, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+                    self.evicted += 1
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                self._buckets.move_to_end(client)
+
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return True, 0, int(bucket[0])
+            return False, max(1, math.ceil((cost - bucket[0]) / self.rate)), 0
+
+    def _evict(self, now):
+        """Boşta kalan (dolmuş) kovaları ve sınırı aşan en eski istemcileri sil (kilit altında)"""
+        buckets = self._buckets
+        while buckets:
+            client, (_, updated) = next(iter(buckets.items()))
+            if now - updated < self.idle_ttl and len(buckets) <= self.max_clients:
+                break
+            del buckets[client]
+            self.evicted += 1
+        self._next_eviction = now + self.evict_interval
+
+
+class AdmissionController:
+    """
+    Kabul kontrolü
+    - enter(): önce genel yük (aynı anda işlenen istek), sonra istemci hız sınırı
+    - Kabul edilen her istek için leave() çağrılmalı
+    - EXEMPT_PATHS (/health, /metrics) hiç sayılmaz ve sınırlanmaz
+    """
+
+    def __init__(self, limiter=None, max_in_flight=MAX_IN_FLIGHT, exempt_paths=EXEMPT_PATHS, trust_proxy=TRUST_PROXY,
+                 api_keys=API_KEYS):
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.max_in_flight = max_in_flight
+        self.exempt_paths = frozenset(exempt_paths)
+        self.trust_proxy = trust_proxy
+        self.api_keys = frozenset(api_keys)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def client_key(self, remote_address, api_key=None, forwarded_for=None):
+        """
+        Hız sınırı anahtarı: tanımlı (API_KEYS) API anahtarı, yoksa istemci IP'si
+
+        Bilinmeyen anahtarlar kova açmaz (her istekte yeni anahtarla sınır aşılamaz).
+        Proxy arkasında X-Forwarded-For'un en sağdaki adresi, güvenilen proxy'nin
+        gördüğü istemcidir.
+        """
+        if api_key and api_key in self.api_keys:
+            return f"key:{api_key}"
+        if self.trust_proxy and forwarded_for:
+            client = forwarded_for.rsplit(',', 1)[-1].strip()
+            if client:
+                return f"ip:{client}"
+        return f"ip:{remote_address}"
+
+    def enter(self, path, client):
+        """
+        İsteği kabul et veya reddet
+
+        Returns:
+            Rejection: Reddedildiyse yanıt bilgisi; kabul edildiyse None
+        """
+        if path in self.exempt_paths:
+            return None
+
+        with self._lock:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                overloaded = True
+            else:
+                overloaded = False
+                self.in_flight += 1
+        if overloaded:
+            OVERLOADED.inc()
+            return Rejection(503, 'overload', 1)
+
+        allowed, retry_after, remaining = self.limiter.acquire(client)
+        if not allowed:
+            self.leave(path)
+            RATE_LIMITED.inc()
+            return Rejection(429, 'rate_limit', retry_after, limit=self.limiter.rate, remaining=remaining)
+        return None
+
+    def leave(self, path):
+        """Kabul edilmiş istek bitti"""
+        if path in self.exempt_paths:
+            return
+        with self._lock:
+            self.in_flight -= 1
+
+    def metric_values(self):
+        """admission gauge değerleri"""
+        return [
+            ({'value': 'in_flight'}, self.in_flight),
+            ({'value': 'max_in_flight'}, self.max_in_flight),
+            ({'value': 'rate_per_second'}, self.limiter.rate),
+            ({'value': 'burst'}, self.limiter.burst),
+            ({'value': 'clients'}, len(self.limiter)),
+            ({'value': 'evicted_clients'}, self.limiter.evicted)
+        ]
+
+
+class AdmissionMiddleware:
+    """
+    FastAPI/Starlette için ASGI kabul kontrolü middleware'i
+
+    Reddedilen istekler uygulamaya ulaşmadan 429/503 JSON yanıtı alır.
+    """
+
+    def __init__(self, app, controller=None):
+        self.app = app
+        self.controller = controller if controller is not None else ADMISSION
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        path = scope.get('path', '')
+        api_key = forwarded_for = None
+        for name, value in scope.get('headers', ()):
+            if name == _API_KEY_NAME:
+                api_key = value.decode('latin-1')
+            elif name == b'x-forwarded-for':
+                # Birden çok başlık sırayla birleştirilir (en sağdaki son proxy'nin eklediği)
+                value = value.decode('latin-1')
+                forwarded_for = value if forwarded_for is None else f"{forwarded_for},{value}"
+        remote_address = (scope.get('client') or ('unknown',))[0]
+
+        controller = self.controller
+        rejection = controller.enter(path, controller.client_key(remote_address, api_key, forwarded_for))
+        if rejection is not None:
+            body = rejection.body()
+            headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in rejection.headers()]
+            headers += [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+            await send({'type': 'http.response.start', 'status': rejection.status, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': body})
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.leave(path)
+
+
+# Süreç başına ortak kabul kontrolü
+ADMISSION = AdmissionController()
+METRICS.gauge_function('admission', 'Kabul kontrolü sınırları ve durumu', ADMISSION.metric_values)
@@ -6,76 +6,179 @@ Author: Berke Özkul
 Description: Gelişmiş tahmin modeli ile API
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
-import json
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import urllib.parse as urlparse
 from advanced_model import AdvancedFootballPredictor
+from model_manager import ModelManager
+from serialization import EncodedPayload
+from http_cache import etag_for_key, cache_control, HEALTH_CACHE_CONTROL
+from team_registry import REGISTRY
+from season_simulation import SeasonState, simulate_with_predictor, DEFAULT_SEED
+from data_catalog import DataCatalog
+from elo_ratings import EloTimeline
+from match_dates import to_ordinal
+from metrics import METRICS, stage
+from audit_log import AUDIT_LOG
+from api_handler import ApiHandlerMixin, PARSE_STAGE
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
 import os
+import re
+import threading
+import time
+from datetime import date
 
-class AdvancedFootballPredictionHandler(BaseHTTPRequestHandler):
+MODEL_PATH = os.environ.get('MODEL_PATH', 'advanced_football_model.pkl')
+MODEL_POLL_INTERVAL = float(os.environ.get('MODEL_POLL_INTERVAL', '2.0'))
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', '50'))
+DATA_PATH = os.environ.get('DATA_PATH', '../data/')
+DATA_CATALOG = DataCatalog(DATA_PATH)
+MAX_SIMULATIONS = int(os.environ.get('MAX_SIMULATIONS', '100000'))
+# Simülasyon işlem havuzunun boyutu (tüm istekler aynı havuzu paylaşır; 0: CPU sayısı)
+SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', '2')) or None
+
+# /metrics etiketleri için bilinen yollar (diğerleri 'other')
+ROUTES = frozenset(('/', '/health', '/teams', '/teams/search', '/teams/{team}/rating-history', '/predict',
+                    '/predict/batch', '/model-info', '/simulate', '/metrics', '/admin/profile'))
+RATING_HISTORY_PATH = re.compile(r'/teams/([^/]+)/rating-history')
+
+# İstek aşamalarının gecikme histogramları ve cache istatistikleri
+VALIDATE_STAGE = stage('validate')
+STATIC_CACHE_STATS = METRICS.cache('static_response')
+SIMULATION_CACHE_STATS = METRICS.cache('simulation')
+
+
+def load_advanced_predictor(model_file):
+    """Model dosyasından gelişmiş predictor oluştur"""
+    predictor = AdvancedFootballPredictor()
+    if not predictor.load_model(model_file):
+        raise ValueError("Gelişmiş model yüklenemedi")
+    return predictor
+
+
+def load_simple_predictor():
+    """Basit modele geri dön"""
+    try:
+        from simple_model import SimpleFootballPredictor
+        predictor = SimpleFootballPredictor()
+        if os.path.exists('simple_football_model.txt'):
+            predictor.load_model('simple_football_model.txt')
+            print("✅ Basit model fallback başarılı")
+            return predictor
+        print("❌ Hiçbir model bulunamadı!")
+    except Exception as e:
+        print(f"❌ Basit model fallback hatası: {e}")
+    return None
+
+
+class AdvancedFootballPredictionHandler(ApiHandlerMixin, BaseHTTPRequestHandler):
     """Gelişmiş futbol tahmin API handler"""
     
+    # Tüm istekler tarafından paylaşılan model yöneticisi
+    model_manager = None
+    
+    # Aktif model sürümüne bağlı yanıtlar (model değişince temizlenir)
+    response_cache = {}
+    STATIC_PAYLOADS = ('teams', 'model-info')
+    
+    # Sezon simülasyonu sonuçları (model sürümü + parametreler ile anahtarlanır)
+    # Kilit yalnızca sözlükler için tutulur; hesaplanan simülasyonlar anahtar başına bir Future ile beklenir
+    simulation_cache = OrderedDict()
+    simulation_pending = {}
+    simulation_lock = threading.Lock()
+    SIMULATION_CACHE_SIZE = 32
+    
+    # Takım listesi (ortak takım kaydından, alfabetik)
+    teams = sorted(REGISTRY.names)
+    team_set = frozenset(teams)
+    routes = ROUTES
+    
+    # Elo reyting zaman çizelgesi (başlangıçta tek geçişte oluşturulur)
+    elo = None
+    
     def __init__(self, *args, **kwargs):
-        # Model ve takım listesini yükle
-        self.load_model_and_data()
+        # Model yöneticisi yoksa başlat (her istekte yeniden yükleme yapılmaz)
+        if AdvancedFootballPredictionHandler.model_manager is None:
+            AdvancedFootballPredictionHandler.load_model_and_data()
         super().__init__(*args, **kwargs)
     
-    def load_model_and_data(self):
-        """Model ve verileri yükle"""
+    @classmethod
+    def load_model_and_data(cls):
+        """Model yöneticisini başlat"""
+        if os.path.exists(MODEL_PATH):
+            print("📊 Gelişmiş model yükleniyor...")
+        else:
+            print("⚠️ Gelişmiş model bulunamadı, basit model kullanılacak")
+        
+        cls.model_manager = ModelManager(
+            MODEL_PATH,
+            loader=load_advanced_predictor,
+            fallback_loader=load_simple_predictor,
+            poll_interval=MODEL_POLL_INTERVAL
+        )
+        cls.model_manager.add_swap_listener(cls.invalidate_caches)
+        cls.model_manager.start()
+        
         try:
-            # Gelişmiş modeli yükle
-            self.predictor = AdvancedFootballPredictor()
-            
-            if os.path.exists('advanced_football_model.pkl'):
-                print("📊 Gelişmiş model yükleniyor...")
-                if self.predictor.load_model('advanced_football_model.pkl'):
-                    print("✅ Gelişmiş model başarıyla yüklendi!")
-                else:
-                    print("⚠️ Gelişmiş model yüklenemedi, basit model kullanılacak")
-                    self._fallback_to_simple_model()
-            else:
-                print("⚠️ Gelişmiş model bulunamadı, basit model kullanılacak")
-                self._fallback_to_simple_model()
-            
-            # Takım listesi
-            self.teams = [
-                "Arsenal", "Chelsea", "Liverpool", "Man City", "Man United", "Tottenham",
-                "Newcastle", "Brighton", "Aston Villa", "West Ham", "Crystal Palace",
-                "Leicester", "Everton", "Southampton", "Burnley", "Norwich", "Watford",
-                "Wolves", "Leeds", "Blackburn", "Birmingham", "Fulham", "Brentford",
-                "Sheffield United", "Bournemouth", "Cardiff", "Huddersfield", "Stoke",
-                "Swansea", "Hull", "Middlesbrough", "Sunderland", "QPR", "Derby",
-                "Bolton", "Wigan", "Reading", "Blackpool"
-            ]
-            
-        except Exception as e:
-            print(f"❌ Model yükleme hatası: {e}")
-            self._fallback_to_simple_model()
+            start = time.perf_counter()
+            cls.elo = EloTimeline.from_catalog(DATA_CATALOG)
+            print(f"📈 Elo zaman çizelgesi: {len(cls.elo.matches):,} maç, {len(cls.elo.histories)} takım "
+                  f"({time.perf_counter() - start:.2f} sn)")
+        except FileNotFoundError as e:
+            print(f"⚠️ Elo zaman çizelgesi oluşturulamadı: {e}")
+            cls.elo = EloTimeline()
+        
+        METRICS.gauge_function('model_info', 'Aktif model sürümü (değer her zaman 1)', cls.model_info_metric)
+        METRICS.gauge_function('model_reloads', 'Başarılı ve başarısız model yeniden yüklemeleri', cls.model_reload_metric)
     
-    def _fallback_to_simple_model(self):
-        """Basit modele geri dön"""
-        try:
-            from simple_model import SimpleFootballPredictor
-            self.predictor = SimpleFootballPredictor()
-            if os.path.exists('simple_football_model.txt'):
-                self.predictor.load_model('simple_football_model.txt')
-                print("✅ Basit model fallback başarılı")
-            else:
-                print("❌ Hiçbir model bulunamadı!")
-        except Exception as e:
-            print(f"❌ Basit model fallback hatası: {e}")
-            self.predictor = None
+    @classmethod
+    def model_info_metric(cls):
+        """model_info gauge değeri: sürüm ve tür etiketlerde"""
+        with cls.model_manager.lease() as model_version:
+            if model_version is None:
+                return []
+            return [({
+                'version': model_version.version,
+                'type': 'advanced' if hasattr(model_version.predictor, 'home_model') else 'simple',
+                'source': model_version.source
+            }, 1)]
     
-    def do_GET(self):
-        """GET isteklerini işle"""
-        parsed_url = urlparse.urlparse(self.path)
-        path = parsed_url.path
-        query = urlparse.parse_qs(parsed_url.query)
-        
-        # CORS headers
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+    @classmethod
+    def model_reload_metric(cls):
+        """model_reloads gauge değerleri"""
+        return [({'result': 'success'}, cls.model_manager.reload_count),
+                ({'result': 'failure'}, cls.model_manager.failed_reloads)]
+    
+    @classmethod
+    def invalidate_caches(cls, new_version, old_version):
+        """Model değiştiğinde sürüme bağlı cache'leri temizle ve yeniden ısıt"""
+        cls.response_cache.clear()
+        with cls.simulation_lock:
+            cls.simulation_cache.clear()
+            cls.simulation_pending.clear()
+        cls.warm_caches(new_version)
+    
+    @classmethod
+    def warm_caches(cls, model_version):
+        """Statik yanıtları (/teams, /model-info) önceden kodla"""
+        for name in cls.STATIC_PAYLOADS:
+            cls.response_cache[(name, model_version.version)] = cls.build_static_payload(name, model_version)
+    
+    @contextmanager
+    def request_context(self):
+        """İstek süresince aynı model sürümü kullanılır (model kiralanır)"""
+        with self.model_manager.lease() as model_version:
+            self.model_version = model_version
+            self.predictor = model_version.predictor if model_version else None
+            yield
+    
+    def route_get(self):
+        """GET isteğini ilgili uç noktaya yönlendir"""
+        with PARSE_STAGE.time():
+            parsed_url = urlparse.urlparse(self.path)
+            path = parsed_url.path
+            query = urlparse.parse_qs(parsed_url.query)
         
         if path == '/':
             self.serve_home()
@@ -83,50 +186,184 @@ class AdvancedFootballPredictionHandler(BaseHTTPRequestHandler):
             self.serve_health()
         elif path == '/teams':
             self.serve_teams()
+        elif path == '/teams/search':
+            self.serve_team_search(query)
+        elif RATING_HISTORY_PATH.fullmatch(path):
+            self.serve_rating_history(urlparse.unquote(RATING_HISTORY_PATH.fullmatch(path).group(1)), query)
         elif path == '/predict':
             self.serve_prediction(query)
         elif path == '/model-info':
             self.serve_model_info()
+        elif path == '/simulate':
+            self.serve_simulation(query)
+        elif path == '/metrics':
+            self.serve_metrics()
+        elif path == '/admin/profile':
+            self.serve_profile(query)
         else:
             self.send_error(404, "Endpoint bulunamadı")
     
-    def do_POST(self):
-        """POST isteklerini işle"""
+    def route_post(self):
+        """POST isteğini ilgili uç noktaya yönlendir"""
         if self.path == '/predict':
             try:
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
+                data = self.read_json_body()
+                if data is None:
+                    return
+                
+                home_team = data.get('home_team')
+                away_team = data.get('away_team')
                 
-                if not post_data:
+                if not home_team or not away_team:
                     self.send_json_response({
-                        'error': 'Boş istek gövdesi'
+                        'error': 'home_team ve away_team gerekli'
                     }, status=400)
                     return
                 
+                home_team, away_team = self.resolve_teams(home_team, away_team)
+                if home_team is None:
+                    return
+                
+                valid, as_of = self.resolve_as_of(data.get('date'))
+                if not valid:
+                    return
+                
+                if not self.predictor:
+                    self.send_json_response({
+                        'error': 'Tahmin modeli yüklenemedi'
+                    }, status=500)
+                    return
+                
                 # Tahmin yap
-                prediction = self.predictor.predict_match(home_team, away_team)
+                prediction = self.predictor.predict_match(home_team, away_team, as_of=as_of) if as_of else \
+                    self.predictor.predict_match(home_team, away_team)
                 
                 self.send_json_response({
                     'success': True,
                     'match': f"{home_team} vs {away_team}",
+                    'as_of': as_of,
                     'prediction': prediction,
                     'model_info': {
                         'type': 'advanced' if hasattr(self.predictor, 'home_model') else 'simple',
                         'confidence_explanation': 'Gelişmiş makine öğrenmesi algoritmaları kullanılarak hesaplandı' if hasattr(self.predictor, 'home_model') else 'Basit istatistiksel model kullanıldı'
                     }
                 })
+                self.audit('predict', home_team, away_team, prediction)
                 
-            except json.JSONDecodeError:
-                self.send_json_response({
-                    'error': 'Geçersiz JSON'
-                }, status=400)
             except Exception as e:
                 self.send_json_response({
                     'error': str(e)
                 }, status=500)
+        elif self.path == '/predict/batch':
+            self.serve_batch_prediction()
+        elif self.path == '/admin/profile':
+            self.configure_profiler()
         else:
             self.send_error(404, "Endpoint bulunamadı")
     
+    def validate_fixtures(self, matches):
+        """
+        Toplu tahmin listesini tek geçişte doğrula
+        
+        Returns:
+            tuple: (maç çiftleri, hata listesi)
+        """
+        if not isinstance(matches, list) or not matches:
+            return [], [{'index': None, 'error': 'matches boş olmayan bir liste olmalı'}]
+        
+        if len(matches) > MAX_BATCH_SIZE:
+            return [], [{'index': None, 'error': f'En fazla {MAX_BATCH_SIZE} maç gönderilebilir'}]
+        
+        fixtures = []
+        errors = []
+        
+        for index, match in enumerate(matches):
+            if not isinstance(match, dict):
+                errors.append({'index': index, 'error': 'Maç bir JSON nesnesi olmalı'})
+                continue
+            
+            home_team = match.get('home_team')
+            away_team = match.get('away_team')
+            
+            if not home_team or not away_team:
+                errors.append({'index': index, 'error': 'home_team ve away_team gerekli'})
+                continue
+            
+            # Takma adlar kanonik isme çevrilir ("Manchester City" -> "Man City")
+            home_team = REGISTRY.resolve(home_team)
+            away_team = REGISTRY.resolve(away_team)
+            
+            if home_team is None or away_team is None:
+                errors.append({'index': index, 'error': 'Geçersiz takım adı'})
+            elif home_team == away_team:
+                errors.append({'index': index, 'error': 'Aynı takım seçilemez'})
+            else:
+                fixtures.append((home_team, away_team))
+        
+        return fixtures, errors
+    
+    def serve_batch_prediction(self):
+        """Birden çok maçı tek istekte ve tek model çağrısında tahmin et"""
+        try:
+            data = self.read_json_body()
+            if data is None:
+                return
+            
+            with VALIDATE_STAGE.time():
+                fixtures, errors = self.validate_fixtures(data.get('matches'))
+            if errors:
+                self.send_json_response({
+                    'error': 'Geçersiz maç listesi',
+                    'errors': errors,
+                    'max_batch_size': MAX_BATCH_SIZE
+                }, status=400)
+                return
+            
+            if not self.predictor:
+                self.send_json_response({
+                    'error': 'Tahmin modeli yüklenemedi'
+                }, status=500)
+                return
+            
+            valid, as_of = self.resolve_as_of(data.get('date'))
+            if not valid:
+                return
+            
+            start = time.perf_counter()
+            predictions = self.predictor.predict_matches(fixtures, as_of=as_of) if as_of else \
+                self.predictor.predict_matches(fixtures)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            self.send_json_response({
+                'success': True,
+                'count': len(predictions),
+                'as_of': as_of,
+                'predictions': [
+                    {
+                        'match': {'home_team': home_team, 'away_team': away_team},
+                        'prediction': prediction
+                    }
+                    for (home_team, away_team), prediction in zip(fixtures, predictions)
+                ],
+                'model_info': {
+                    'type': 'advanced' if hasattr(self.predictor, 'home_model') else 'simple',
+                    'version': self.get_model_version()
+                },
+                'timing': {
+                    'total_ms': round(elapsed_ms, 3),
+                    'per_fixture_ms': round(elapsed_ms / len(fixtures), 3)
+                },
+                'timestamp': self.get_timestamp()
+            })
+            for (home_team, away_team), prediction in zip(fixtures, predictions):
+                self.audit('predict_batch', home_team, away_team, prediction)
+            
+        except Exception as e:
+            print(f"❌ Toplu tahmin hatası: {e}")
+            self.send_json_response({
+                'error': f'Toplu tahmin hatası: {str(e)}'
+            }, status=500)
+    
     def serve_home(self):
         """Gelişmiş ana sayfa"""
         model_type = 'Advanced ML' if hasattr(self.predictor, 'home_model') else 'Simple Statistical'
@@ -191,17 +428,43 @@ class AdvancedFootballPredictionHandler(BaseHTTPRequestHandler):
                     <p>Desteklenen takımların listesini döndürür.</p>
                 </div>
                 
+                <div class="endpoint">
+                    <span class="method">GET</span> <code>/teams/search?q=man</code>
+                    <p>Takım ismi otomatik tamamlama (takma adlar dahil, harf duyarsız).</p>
+                </div>
+                
+                <div class="endpoint">
+                    <span class="method">GET</span> <code>/teams/Arsenal/rating-history?from=2017-08-01&to=2018-05-31</code>
+                    <p>Takımın maç maç Elo reyting geçmişi (as_of ile o tarihteki reyting).</p>
+                </div>
+                
                 <div class="endpoint">
                     <span class="method">GET</span> <code>/predict?home=Arsenal&away=Chelsea</code>
                     <p>İki takım arasındaki maçın gelişmiş AI tahminini döndürür.</p>
                 </div>
                 
+                <div class="endpoint">
+                    <span class="method">GET</span> <code>/predict?home=Arsenal&away=Chelsea&date=2016-10-01</code>
+                    <p>Tarih itibarıyla tahmin: modelin o gün yapacağı tahmin (yalnızca önceki maçlar kullanılır).</p>
+                </div>
+                
                 <div class="endpoint">
                     <span class="method post">POST</span> <code>/predict</code>
                     <p>JSON formatında detaylı maç tahmini yapar.</p>
                     <pre><code>{{"home_team": "Arsenal", "away_team": "Chelsea"}}</code></pre>
                 </div>
                 
+                <div class="endpoint">
+                    <span class="method post">POST</span> <code>/predict/batch</code>
+                    <p>Bir haftanın tüm maçlarını tek istekte tahmin eder (en fazla {MAX_BATCH_SIZE} maç).</p>
+                    <pre><code>{{"matches": [{{"home_team": "Arsenal", "away_team": "Chelsea"}}]}}</code></pre>
+                </div>
+                
+                <div class="endpoint">
+                    <span class="method">GET</span> <code>/simulate?season=2018-2019&played=190&league=E0</code>
+                    <p>Sezonun kalanını Monte Carlo ile simüle eder; şampiyonluk, ilk 4 ve küme düşme olasılıklarını döndürür.</p>
+                </div>
+                
                 <div class="endpoint">
                     <span class="method">GET</span> <code>/model-info</code>
                     <p>Kullanılan model hakkında detaylı bilgi döndürür.</p>
@@ -212,6 +475,16 @@ class AdvancedFootballPredictionHandler(BaseHTTPRequestHandler):
                     <p>API ve model durumunu kontrol eder.</p>
                 </div>
                 
+                <div class="endpoint">
+                    <span class="method">GET</span> <code>/admin/profile</code>
+                    <p>Örneklemeli profiler durumu ve sıcak noktalar (POST ile <code>{{"sample_rate": 0.1}}</code> açar, <code>{{"dump": true}}</code> dosyaya yazar). Yalnızca localhost veya X-Admin-Token.</p>
+                </div>
+                
+                <div class="endpoint">
+                    <span class="method">GET</span> <code>/metrics</code>
+                    <p>Prometheus metrikleri: aşama bazlı gecikme histogramları, istek/hata sayıları, cache isabet oranları ve model sürümü.</p>
+                </div>
+                
                 <h2>🧠 AI Özellikleri</h2>
                 <div style="text-align: center;">
                     <span class="feature">📊 Takım Performans Analizi</span>
@@ -279,39 +552,60 @@ class AdvancedFootballPredictionHandler(BaseHTTPRequestHandler):
             home_team = urlparse.unquote(home_team)
             away_team = urlparse.unquote(away_team)
             
+            home_team, away_team = self.resolve_teams(home_team, away_team)
+            if home_team is None:
+                return
+            
+            valid, as_of = self.resolve_as_of(query.get('date', [None])[0])
+            if not valid:
+                return
+            
+            # Tahmin model sürümü, maç ve güne (veya istenen tarihe) göre belirlenir; 304 için tahmin yapılmaz
+            etag = etag_for_key(self.get_model_version(), 'predict', home_team, away_team,
+                                as_of or date.today().isoformat())
+            policy = cache_control(self.get_model_version())
+            if self.send_not_modified(etag, policy):
+                return
+            
             if not self.predictor:
                 self.send_json_response({
                     'error': 'Tahmin modeli yüklenemedi'
                 }, status=500)
                 return
             
-            # Gelişmiş tahmin yap
-            prediction = self.predictor.predict_match(home_team, away_team)
+            # Gelişmiş tahmin yap (basit model as_of almaz; resolve_as_of bunu engeller)
+            prediction = self.predictor.predict_match(home_team, away_team, as_of=as_of) if as_of else \
+                self.predictor.predict_match(home_team, away_team)
             
             response = {
                 'success': True,
                 'match': {
                     'home_team': home_team,
-                    'away_team': away_team
+                    'away_team': away_team,
+                    'as_of': as_of
                 },
                 'prediction': {
                     'home_goals': prediction['home_goals'],
                     'away_goals': prediction['away_goals'],
                     'result': prediction['result'],
-                    'result_text': prediction['result_text'],
+                    'result_text': prediction.get('result_text', {
+                        'H': 'Ev Sahibi Galibiyeti',
+                        'D': 'Beraberlik',
+                        'A': 'Deplasman Galibiyeti'
+                    }[prediction['result']]),
                     'probabilities': prediction['probabilities'],
                     'confidence': prediction['confidence']
                 },
                 'model_info': {
                     'type': prediction.get('model_type', 'unknown'),
-                    'features_analyzed': 17 if hasattr(self.predictor, 'home_model') else 9,
+                    'features_analyzed': len(getattr(self.predictor, 'feature_cols', ())) or 9,
                     'algorithm': 'Gradient Boosting + Random Forest' if hasattr(self.predictor, 'home_model') else 'Statistical Analysis',
                     'confidence_explanation': self._get_confidence_explanation(prediction['confidence'])
-                },
-                'timestamp': self.get_timestamp()
+                }
             }
             
-            self.send_json_response(response)
+            self.send_json_response(response, etag=etag, cache_control=policy)
+            self.audit('predict', home_team, away_team, prediction)
             
         except Exception as e:
             print(f"❌ Tahmin hatası: {e}")
@@ -320,6 +614,192 @@ class AdvancedFootballPredictionHandler(BaseHTTPRequestHandler):
                 'available_teams_count': len(self.teams)
             }, status=500)
     
+    def resolve_as_of(self, value):
+        """
+        Tarih itibarıyla tahmin parametresini (date) doğrula
+        
+        Returns:
+            tuple: (geçerli mi, ISO tarih veya None); geçersizse 400 gönderilir
+        """
+        if not value:
+            return True, None
+        
+        day = to_ordinal(value)
+        if day is None:
+            self.send_json_response({
+                'error': f'Geçersiz tarih: {value}',
+                'example': '/predict?home=Arsenal&away=Chelsea&date=2016-10-01'
+            }, status=400)
+            return False, None
+        
+        # Basit model ve geçmişi kaydedilmemiş eski modeller tarih desteklemez
+        if self.predictor is not None and getattr(self.predictor, 'history', None) is None:
+            self.send_json_response({
+                'error': 'Aktif model tarih itibarıyla tahmin desteklemiyor'
+            }, status=400)
+            return False, None
+        
+        return True, date.fromordinal(day).isoformat()
+    
+    def resolve_teams(self, home_team, away_team):
+        """
+        Takım isimlerini kanonik isimlere çevir
+        
+        Returns:
+            tuple: (ev sahibi, deplasman); geçersizse 400 gönderilir ve (None, None) döner
+        """
+        if not isinstance(home_team, str) or not isinstance(away_team, str):
+            self.send_json_response({
+                'error': 'Takım adları metin olmalı'
+            }, status=400)
+            return None, None
+        
+        with VALIDATE_STAGE.time():
+            home_resolved = REGISTRY.resolve(home_team)
+            away_resolved = REGISTRY.resolve(away_team)
+        
+        if home_resolved is None or away_resolved is None:
+            self.send_json_response({
+                'error': 'Geçersiz takım adı',
+                'unknown_teams': [name for name, resolved in
+                                  ((home_team, home_resolved), (away_team, away_resolved))
+                                  if resolved is None],
+                'suggestions': REGISTRY.search(home_team if home_resolved is None else away_team, limit=5)
+            }, status=400)
+            return None, None
+        
+        if home_resolved == away_resolved:
+            self.send_json_response({
+                'error': 'Aynı takım seçilemez'
+            }, status=400)
+            return None, None
+        
+        return home_resolved, away_resolved
+    
+    def serve_simulation(self, query):
+        """Sezonun kalanını Monte Carlo ile simüle et (sonuçlar cache'lenir)"""
+        try:
+            season = query.get('season', ['2018-2019'])[0]
+            league = query.get('league', ['E0'])[0].upper()
+            if not re.fullmatch(r'\d{4}-\d{4}', season):
+                self.send_json_response({
+                    'error': 'Geçersiz sezon',
+                    'example': '/simulate?season=2018-2019&played=190'
+                }, status=400)
+                return
+            
+            season_file = DATA_CATALOG.path_for(league, season)
+            if season_file is None:
+                self.send_json_response({
+                    'error': f'Sezon bulunamadı: {league} {season}'
+                }, status=404)
+                return
+            
+            try:
+                played = int(query['played'][0]) if 'played' in query else None
+                simulations = int(query.get('simulations', [MAX_SIMULATIONS])[0])
+                seed = int(query.get('seed', [DEFAULT_SEED])[0])
+            except ValueError:
+                self.send_json_response({
+                    'error': 'played, simulations ve seed tam sayı olmalı'
+                }, status=400)
+                return
+            
+            if not 1 <= simulations <= MAX_SIMULATIONS or (played is not None and played < 0):
+                self.send_json_response({
+                    'error': f'simulations 1-{MAX_SIMULATIONS} aralığında, played negatif olmayan bir sayı olmalı'
+                }, status=400)
+                return
+            
+            if not self.predictor:
+                self.send_json_response({
+                    'error': 'Tahmin modeli yüklenemedi'
+                }, status=500)
+                return
+            
+            cache_key = (self.get_model_version(), league, season, played, simulations, seed)
+            
+            payload = self.cached_simulation(
+                cache_key, lambda: self.run_simulation(season_file, played, simulations, seed)
+            )
+            self.send_json_response(payload, cache_control=cache_control(self.get_model_version()))
+            
+        except Exception as e:
+            print(f"❌ Simülasyon hatası: {e}")
+            self.send_json_response({
+                'error': f'Simülasyon hatası: {str(e)}'
+            }, status=500)
+    
+    @classmethod
+    def cached_simulation(cls, cache_key, compute):
+        """
+        Simülasyon sonucunu cache'ten al veya hesapla (anahtar başına tek hesaplama)
+        
+        Aynı anahtarı isteyen eşzamanlı istekler ilk isteğin Future'ını bekler;
+        farklı parametreler ve model değişimi (invalidate_caches) hesaplamayı beklemez.
+        """
+        with cls.simulation_lock:
+            payload = cls.simulation_cache.get(cache_key)
+            if payload is not None:
+                cls.simulation_cache.move_to_end(cache_key)
+                future = None
+                owner = False
+            else:
+                future = cls.simulation_pending.get(cache_key)
+                owner = future is None
+                if owner:
+                    future = cls.simulation_pending[cache_key] = Future()
+        # Hesaplamayı başlatan istek dışındakiler cache isabeti sayılır
+        SIMULATION_CACHE_STATS.record(not owner)
+        
+        if future is None:
+            return payload
+        if not owner:
+            return future.result()
+        
+        try:
+            payload = compute()
+        except BaseException as e:
+            with cls.simulation_lock:
+                if cls.simulation_pending.get(cache_key) is future:
+                    del cls.simulation_pending[cache_key]
+            future.set_exception(e)
+            raise
+        
+        with cls.simulation_lock:
+            # Hesaplama sırasında cache temizlendiyse (model değişti) sonuç saklanmaz
+            if cls.simulation_pending.get(cache_key) is future:
+                del cls.simulation_pending[cache_key]
+                cls.simulation_cache[cache_key] = payload
+                if len(cls.simulation_cache) > cls.SIMULATION_CACHE_SIZE:
+                    cls.simulation_cache.popitem(last=False)
+        future.set_result(payload)
+        return payload
+    
+    def run_simulation(self, season_file, played, simulations, seed):
+        """Simülasyonu çalıştır ve yanıtı önceden kodla"""
+        state = SeasonState.from_csv(season_file, played=played)
+        
+        # Tamamlanmış sezonlarda varsayılan olarak ikinci yarı simüle edilir
+        if played is None and not state.remaining:
+            state = SeasonState.from_csv(season_file, played=state.played // 2)
+        
+        print(f"🏆 Sezon simülasyonu: {state.season} ({len(state.remaining)} maç, {simulations:,} sezon)")
+        result = simulate_with_predictor(
+            self.predictor, state,
+            n_simulations=simulations, seed=seed, workers=SIMULATION_WORKERS
+        )
+        
+        return EncodedPayload({
+            'success': True,
+            'simulation': result,
+            'current_table': state.table(),
+            'model_info': {
+                'type': 'advanced' if hasattr(self.predictor, 'home_model') else 'simple',
+                'version': self.get_model_version()
+            }
+        })
+    
     def _get_confidence_explanation(self, confidence):
         """Güven skoruna göre açıklama döndür"""
         if confidence >= 0.8:
@@ -333,7 +813,47 @@ class AdvancedFootballPredictionHandler(BaseHTTPRequestHandler):
     
     def serve_model_info(self):
         """Model bilgilerini döndür"""
-        if hasattr(self.predictor, 'home_model'):
+        self.send_json_response(self.get_static_payload('model-info'),
+                                cache_control=cache_control(self.get_model_version()))
+    
+    def get_static_payload(self, name):
+        """Bu isteğin model sürümü için önceden kodlanmış statik yanıt"""
+        cache_key = (name, self.get_model_version())
+        payload = self.response_cache.get(cache_key)
+        STATIC_CACHE_STATS.record(payload is not None)
+        if payload is None:
+            payload = self.build_static_payload(name, self.model_version)
+            self.response_cache[cache_key] = payload
+        return payload
+    
+    @classmethod
+    def build_static_payload(cls, name, model_version):
+        """Model sürümüne bağlı statik yanıtı oluşturup kodla"""
+        predictor = model_version.predictor if model_version else None
+        
+        if name == 'teams':
+            data = {
+                'success': True,
+                'count': len(cls.teams),
+                'teams': cls.teams,
+                'supported_leagues': ['Premier League (2005-2019)'],
+                'model_type': 'advanced' if hasattr(predictor, 'home_model') else 'simple'
+            }
+        else:
+            data = {
+                'success': True,
+                'model_info': cls.build_model_info(model_version)
+            }
+        
+        return EncodedPayload(data)
+    
+    @classmethod
+    def build_model_info(cls, model_version):
+        """Model sürümü için model bilgisi sözlüğünü oluştur"""
+        predictor = model_version.predictor if model_version else None
+        loaded_at = model_version.loaded_at if model_version else None
+        
+        if hasattr(predictor, 'home_model'):
             # Gelişmiş model bilgileri
             model_info = {
                 'model_type': 'advanced',
@@ -353,11 +873,11 @@ class AdvancedFootballPredictionHandler(BaseHTTPRequestHandler):
                     'overall_confidence': '~82%'
                 },
                 'training_data': 'Premier League 2015-2019 seasons',
-                'last_updated': self.get_timestamp()
+                'last_updated': loaded_at
             }
             
-            if hasattr(self.predictor, 'feature_importance'):
-                model_info['feature_importance'] = self.predictor.feature_importance
+            if hasattr(predictor, 'feature_importance'):
+                model_info['feature_importance'] = predictor.feature_importance
         else:
             # Basit model bilgileri
             model_info = {
@@ -374,23 +894,22 @@ class AdvancedFootballPredictionHandler(BaseHTTPRequestHandler):
                     'overall_confidence': '~63%'
                 },
                 'training_data': 'Premier League historical data',
-                'last_updated': self.get_timestamp()
+                'last_updated': loaded_at
             }
         
-        self.send_json_response({
-            'success': True,
-            'model_info': model_info
-        })
+        if model_version is not None:
+            model_info['version'] = {
+                'version': model_version.version,
+                'source': model_version.source,
+                'loaded_at': model_version.loaded_at
+            }
+        
+        return model_info
     
     def serve_teams(self):
         """Takım listesi"""
-        self.send_json_response({
-            'success': True,
-            'count': len(self.teams),
-            'teams': self.teams,
-            'supported_leagues': ['Premier League (2005-2019)'],
-            'model_type': 'advanced' if hasattr(self.predictor, 'home_model') else 'simple'
-        })
+        self.send_json_response(self.get_static_payload('teams'),
+                                cache_control=cache_control(self.get_model_version()))
     
     def serve_health(self):
         """Gelişmiş sağlık kontrolü"""
@@ -403,8 +922,10 @@ class AdvancedFootballPredictionHandler(BaseHTTPRequestHandler):
             'model_type': model_type,
             'model_loaded': self.predictor is not None,
             'teams_count': len(self.teams),
-            'features_count': 17 if hasattr(self.predictor, 'home_model') else 9,
+            'features_count': len(getattr(self.predictor, 'feature_cols', ())) or 9,
             'version': '2.0.0-advanced',
+            'model_version': self.get_model_version(),
+            'audit_log': AUDIT_LOG.status(),
             'capabilities': {
                 'goal_prediction': True,
                 'result_prediction': True,
@@ -415,28 +936,16 @@ class AdvancedFootballPredictionHandler(BaseHTTPRequestHandler):
             }
         }
         
-        self.send_json_response(health_data)
-    
-    def send_json_response(self, data, status=200):
-        """JSON yanıt gönder"""
-        self.send_response(status)
-        self.send_header('Content-Type', 'application/json; charset=utf-8')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-        
-        json_data = json.dumps(data, ensure_ascii=False, indent=2)
-        self.wfile.write(json_data.encode('utf-8'))
+        self.send_json_response(health_data, cache_control=HEALTH_CACHE_CONTROL)
     
     def get_timestamp(self):
         """Zaman damgası"""
         from datetime import datetime
         return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
-    def log_message(self, format, *args):
-        """Log mesajlarını özelleştir"""
-        print(f"🌐 {self.address_string()} - {format % args}")
+    def get_model_version(self):
+        """Bu isteğin kullandığı model sürümü"""
+        return self.model_version.version if self.model_version else None
 
 def main():
     """Ana fonksiyon"""
@@ -447,7 +956,8 @@ def main():
     PORT = 8000
     
     try:
-        server = HTTPServer((HOST, PORT), AdvancedFootballPredictionHandler)
+        AdvancedFootballPredictionHandler.load_model_and_data()
+        server = ThreadingHTTPServer((HOST, PORT), AdvancedFootballPredictionHandler)
         print(f"✅ Gelişmiş sunucu başlatıldı: http://{HOST}:{PORT}")
         print(f"🌐 Ana sayfa: http://{HOST}:{PORT}")
         print(f"📡 API dokümantasyonu: http://{HOST}:{PORT}")
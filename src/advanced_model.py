@@ -14,11 +14,36 @@ from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 import joblib
 import json
-from datetime import datetime, timedelta
+import zlib
+from datetime import date, datetime, timedelta
 from collections import defaultdict
+from team_registry import REGISTRY
+from elo_ratings import elo_features, INITIAL_RATING
+from match_dates import to_ordinal
+from data_catalog import DEFAULT_LEAGUES
+from feature_store import (MatchFeatureBuilder, MATCH_FEATURES, HISTORY_COLUMNS, ELO_COLUMNS,
+                           CALENDAR_COLUMNS)
+from odds_features import outcome_log_loss, MARKET_PREFIX, MARKET_PROBABILITY_COLUMNS
+from metrics import stage
 import warnings
 warnings.filterwarnings('ignore')
 
+# Tahmin aşamalarının gecikme histogramları (/metrics)
+FEATURES_STAGE = stage('features')
+HOME_MODEL_STAGE = stage('inference_home')
+AWAY_MODEL_STAGE = stage('inference_away')
+RESULT_MODEL_STAGE = stage('inference_result')
+POISSON_STAGE = stage('poisson')
+
+# Elo özelliklerinden önce eğitilmiş modellerin özellik sırası
+LEGACY_FEATURE_COLUMNS = (
+    'home_team_encoded', 'away_team_encoded',
+    'home_avg_goals_for', 'home_avg_goals_against', 'home_win_rate', 'home_recent_form', 'home_home_advantage',
+    'away_avg_goals_for', 'away_avg_goals_against', 'away_win_rate', 'away_recent_form', 'away_away_performance',
+    'h2h_home_wins', 'h2h_away_wins', 'h2h_draws', 'h2h_avg_total_goals',
+    'month', 'day_of_week'
+)
+
 class AdvancedFootballPredictor:
     """
     Gelişmiş futbol tahmin modeli
@@ -29,6 +54,15 @@ class AdvancedFootballPredictor:
     - Ensemble modeling
     """
     
+    RESULT_TEXTS = {
+        'H': 'Ev Sahibi Galibiyeti',
+        'D': 'Beraberlik',
+        'A': 'Deplasman Galibiyeti'
+    }
+    
+    # Bilinmeyen takımlar için beklenen gol (varsayılan 1-1 tahminiyle uyumlu)
+    DEFAULT_EXPECTED_GOALS = 1.0
+    
     def __init__(self):
         self.home_model = None
         self.away_model = None
@@ -54,6 +88,13 @@ class AdvancedFootballPredictor:
         
         self.is_trained = False
         self.feature_importance = {}
+        self.feature_cols = list(LEGACY_FEATURE_COLUMNS)
+        
+        # Maç öncesi Elo reytingleri (eğitim verisinden, tek geçişte)
+        self.elo = None
+        
+        # Tarih itibarıyla takım/ikili özellikleri (eski modellerde yok)
+        self.history = None
         
     def load_and_prepare_data(self, data_files):
         """Tüm sezon verilerini yükle ve birleştir"""
@@ -79,206 +120,72 @@ class AdvancedFootballPredictor:
         return self._process_data(combined_df)
     
     def _process_data(self, df):
-        """Veriyi işle ve özellik çıkarımı yap"""
+        """Veriyi işle ve özellik çıkarımı yap (tek kronolojik geçiş; FeatureStore ile ortak üretici)"""
         print("🔧 Veri işleme ve özellik çıkarımı...")
         
-        # Temel temizlik
-        df = df.dropna(subset=['HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'])
+        # Maç öncesi geçmiş, Elo ve piyasa özellikleri; durum (Elo, geçmiş) tahmin için saklanır
+        builder = MatchFeatureBuilder()
+        columns = builder.build(df)
+        self.elo = builder.elo
+        self.history = builder.history
         
-        # Tarih işleme
-        if 'Date' in df.columns:
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-            df = df.dropna(subset=['Date'])
-            df = df.sort_values('Date')
-            
-        # Takım encoding
-        all_teams = list(set(df['HomeTeam'].unique()) | set(df['AwayTeam'].unique()))
-        self.team_encoder.fit(all_teams)
-        
-        # Özellik çıkarımı
-        processed_data = []
-        
-        for idx, row in df.iterrows():
-            home_team = row['HomeTeam']
-            away_team = row['AwayTeam']
-            home_goals = int(row['FTHG'])
-            away_goals = int(row['FTAG'])
-            
-            # Maç sonucu
-            if home_goals > away_goals:
-                result = 'H'  # Home win
-            elif home_goals < away_goals:
-                result = 'A'  # Away win
-            else:
-                result = 'D'  # Draw
-            
-            # Takım istatistiklerini güncelle (maç öncesi duruma göre)
-            home_stats = self._get_team_stats_before_match(home_team, idx, df)
-            away_stats = self._get_team_stats_before_match(away_team, idx, df)
-            
-            # Head-to-head geçmişi
-            h2h_stats = self._get_head_to_head_stats(home_team, away_team, idx, df)
-            
-            # Özellik vektörü oluştur
-            features = {
-                'home_team_encoded': self.team_encoder.transform([home_team])[0],
-                'away_team_encoded': self.team_encoder.transform([away_team])[0],
-                
-                # Ev sahibi takım istatistikleri
-                'home_avg_goals_for': home_stats['avg_goals_for'],
-                'home_avg_goals_against': home_stats['avg_goals_against'],
-                'home_win_rate': home_stats['win_rate'],
-                'home_recent_form': home_stats['recent_form'],
-                'home_home_advantage': home_stats['home_advantage'],
-                
-                # Deplasman takımı istatistikleri
-                'away_avg_goals_for': away_stats['avg_goals_for'],
-                'away_avg_goals_against': away_stats['avg_goals_against'],
-                'away_win_rate': away_stats['win_rate'],
-                'away_recent_form': away_stats['recent_form'],
-                'away_away_performance': away_stats['away_performance'],
-                
-                # Head-to-head
-                'h2h_home_wins': h2h_stats['home_wins'],
-                'h2h_away_wins': h2h_stats['away_wins'],
-                'h2h_draws': h2h_stats['draws'],
-                'h2h_avg_total_goals': h2h_stats['avg_total_goals'],
-                
-                # Sezonsal faktörler
-                'month': row.get('Date').month if 'Date' in row and pd.notna(row['Date']) else 6,
-                'day_of_week': row.get('Date').weekday() if 'Date' in row and pd.notna(row['Date']) else 5,
-                
-                # Hedef değişkenler
-                'target_home_goals': home_goals,
-                'target_away_goals': away_goals,
-                'target_result': result
-            }
-            
-            processed_data.append(features)
-            
-            # Takım istatistiklerini güncelle (maç sonrası)
-            self._update_team_stats_after_match(home_team, away_team, home_goals, away_goals, result)
-            
-        print(f"✅ {len(processed_data)} maç işlendi ve {len(features)-3} özellik çıkarıldı")
+        frame = self._feature_frame(columns)
+        processed_data = frame.to_dict('records')
+        
+        feature_count = sum(not col.startswith(('target_', MARKET_PREFIX)) for col in frame.columns)
+        print(f"✅ {len(processed_data)} maç işlendi ve {feature_count} özellik çıkarıldı")
         return processed_data
     
-    def _get_team_stats_before_match(self, team, match_idx, df):
-        """Maç öncesi takım istatistiklerini hesapla"""
-        # Son N maçı al
-        recent_matches = []
-        
-        for i in range(match_idx):
-            row = df.iloc[i]
-            if row['HomeTeam'] == team or row['AwayTeam'] == team:
-                recent_matches.append(row)
-        
-        # Son 10 maçı kullan
-        recent_matches = recent_matches[-10:]
-        
-        if not recent_matches:
-            return {
-                'avg_goals_for': 1.5,
-                'avg_goals_against': 1.5,
-                'win_rate': 0.5,
-                'recent_form': 0.5,
-                'home_advantage': 0.0,
-                'away_performance': 0.0
-            }
-        
-        goals_for = []
-        goals_against = []
-        results = []
-        home_results = []
-        away_results = []
-        
-        for match in recent_matches:
-            if match['HomeTeam'] == team:
-                goals_for.append(match['FTHG'])
-                goals_against.append(match['FTAG'])
-                if match['FTHG'] > match['FTAG']:
-                    results.append(3)  # Win
-                    home_results.append(3)
-                elif match['FTHG'] < match['FTAG']:
-                    results.append(0)  # Loss
-                    home_results.append(0)
-                else:
-                    results.append(1)  # Draw
-                    home_results.append(1)
-            else:  # Away team
-                goals_for.append(match['FTAG'])
-                goals_against.append(match['FTHG'])
-                if match['FTAG'] > match['FTHG']:
-                    results.append(3)  # Win
-                    away_results.append(3)
-                elif match['FTAG'] < match['FTHG']:
-                    results.append(0)  # Loss
-                    away_results.append(0)
-                else:
-                    results.append(1)  # Draw
-                    away_results.append(1)
-        
-        return {
-            'avg_goals_for': np.mean(goals_for) if goals_for else 1.5,
-            'avg_goals_against': np.mean(goals_against) if goals_against else 1.5,
-            'win_rate': len([r for r in results if r == 3]) / len(results) if results else 0.5,
-            'recent_form': np.mean(results) / 3 if results else 0.5,  # 0-1 scale
-            'home_advantage': np.mean(home_results) / 3 if home_results else 0.5,
-            'away_performance': np.mean(away_results) / 3 if away_results else 0.5
-        }
+    def load_features(self, store, leagues=DEFAULT_LEAGUES, seasons=None):
+        """
+        Eğitim özelliklerini FeatureStore'dan oku (_process_data yerine)
+        
+        Değişmeyen sezonlar yeniden hesaplanmaz; Elo ve maç geçmişi deponun
+        kaydettiği üretici durumundan alınır.
+        
+        Returns:
+            pd.DataFrame: train_models girdisi (_process_data ile aynı sütunlar)
+        """
+        print("🧮 Özellikler FeatureStore'dan okunuyor...")
+        
+        columns = store.load(MATCH_FEATURES, leagues, seasons)
+        report = store.last_report
+        builder = store.state(MATCH_FEATURES, leagues, seasons)
+        self.elo = builder.elo
+        self.history = builder.history
+        
+        frame = self._feature_frame(columns)
+        print(f"✅ {len(frame)} maç okundu ({report['reused']} sezon hazır, {report['computed']} sezon hesaplandı)")
+        return frame
     
-    def _get_head_to_head_stats(self, home_team, away_team, match_idx, df):
-        """İki takım arasındaki geçmiş karşılaşmaları analiz et"""
-        h2h_matches = []
-        
-        for i in range(match_idx):
-            row = df.iloc[i]
-            if ((row['HomeTeam'] == home_team and row['AwayTeam'] == away_team) or
-                (row['HomeTeam'] == away_team and row['AwayTeam'] == home_team)):
-                h2h_matches.append(row)
-        
-        if not h2h_matches:
-            return {
-                'home_wins': 0,
-                'away_wins': 0,
-                'draws': 0,
-                'avg_total_goals': 2.5
-            }
-        
-        home_wins = 0
-        away_wins = 0
-        draws = 0
-        total_goals = []
-        
-        for match in h2h_matches:
-            total_goals.append(match['FTHG'] + match['FTAG'])
-            
-            if match['HomeTeam'] == home_team:
-                if match['FTHG'] > match['FTAG']:
-                    home_wins += 1
-                elif match['FTHG'] < match['FTAG']:
-                    away_wins += 1
-                else:
-                    draws += 1
-            else:  # home_team was away
-                if match['FTAG'] > match['FTHG']:
-                    home_wins += 1
-                elif match['FTAG'] < match['FTHG']:
-                    away_wins += 1
-                else:
-                    draws += 1
-        
-        total_matches = len(h2h_matches)
-        return {
-            'home_wins': home_wins / total_matches,
-            'away_wins': away_wins / total_matches,
-            'draws': draws / total_matches,
-            'avg_total_goals': np.mean(total_goals) if total_goals else 2.5
+    def _feature_frame(self, columns):
+        """
+        Özellik sütunlarından eğitim tablosu
+        
+        Takım kodları okunan maçlardaki takımlara göre burada verilir
+        (depoda takımlar isim olarak saklanır).
+        """
+        teams = np.union1d(columns['home_team'], columns['away_team'])
+        self.team_encoder.fit(teams)
+        classes = self.team_encoder.classes_
+        
+        frame = {
+            'home_team_encoded': np.searchsorted(classes, columns['home_team']),
+            'away_team_encoded': np.searchsorted(classes, columns['away_team'])
         }
-    
-    def _update_team_stats_after_match(self, home_team, away_team, home_goals, away_goals, result):
-        """Maç sonrası takım istatistiklerini güncelle"""
-        # Bu fonksiyon gelecekte kullanılabilir
-        pass
+        for col in HISTORY_COLUMNS + ELO_COLUMNS + CALENDAR_COLUMNS:
+            frame[col] = columns[col]
+        
+        # Piyasa özellikleri (değerlendirme referansı)
+        for col, values in columns.items():
+            if col.startswith(MARKET_PREFIX):
+                frame[col] = values
+        
+        # Hedef değişkenler
+        frame['target_home_goals'] = columns['home_goals'].astype(int)
+        frame['target_away_goals'] = columns['away_goals'].astype(int)
+        frame['target_result'] = columns['result'].astype(object)
+        return pd.DataFrame(frame)
     
     def train_models(self, processed_data):
         """Ensemble modelleri eğit"""
@@ -288,7 +195,9 @@ class AdvancedFootballPredictor:
         df = pd.DataFrame(processed_data)
         
         # Özellik ve hedef değişkenleri ayır
-        feature_cols = [col for col in df.columns if not col.startswith('target_')]
+        # Piyasa sütunları girdi değildir: tahmin anında gelecekteki maçların oranları yoktur
+        feature_cols = [col for col in df.columns if not col.startswith(('target_', MARKET_PREFIX))]
+        self.feature_cols = feature_cols
         X = df[feature_cols]
         
         y_home = df['target_home_goals']
@@ -343,8 +252,13 @@ class AdvancedFootballPredictor:
         )
         self.result_model.fit(X_train_scaled, y_result_train)
         
-        # Model performansını değerlendir
-        self._evaluate_models(X_test_scaled, y_home_test, y_away_test, y_result_test)
+        # Model performansını değerlendir (aynı test maçlarında piyasa referansıyla)
+        _, test_index = train_test_split(df.index, test_size=0.2, random_state=42)
+        market_test = None
+        if set(MARKET_PROBABILITY_COLUMNS) <= set(df.columns):
+            market_test = df.loc[test_index, list(MARKET_PROBABILITY_COLUMNS)].to_numpy(dtype=float)
+        self._evaluate_models(X_test_scaled, y_home_test, y_away_test, y_result_test,
+                              results_test=df.loc[test_index, 'target_result'].to_numpy(), market_test=market_test)
         
         # Feature importance
         self._calculate_feature_importance(feature_cols)
@@ -352,8 +266,14 @@ class AdvancedFootballPredictor:
         self.is_trained = True
         print("✅ Tüm modeller başarıyla eğitildi!")
     
-    def _evaluate_models(self, X_test, y_home_test, y_away_test, y_result_test):
-        """Model performansını değerlendir"""
+    def _evaluate_models(self, X_test, y_home_test, y_away_test, y_result_test, results_test=None, market_test=None):
+        """
+        Model performansını değerlendir
+        
+        Args:
+            results_test: Test maçlarının 'H'/'D'/'A' sonuçları (log-loss için)
+            market_test (np.ndarray): Aynı maçların piyasa olasılıkları (referans log-loss)
+        """
         print("\n📊 Model Performans Değerlendirmesi:")
         print("=" * 50)
         
@@ -382,6 +302,19 @@ class AdvancedFootballPredictor:
         print(f"🎯 Sonuç Tahmini:")
         print(f"   Doğruluk: {result_accuracy:.3f}")
         
+        # Olasılık kalitesi: model ve (oranı olan maçlarda) piyasa log-loss'u
+        log_loss = market_loss = None
+        if results_test is not None:
+            probabilities = self._calculate_outcome_probabilities(np.maximum(0, home_pred), np.maximum(0, away_pred))
+            log_loss, _ = outcome_log_loss(probabilities, results_test)
+            print(f"📉 Log-loss: {log_loss:.4f}")
+            if market_test is not None:
+                market_loss, matches = outcome_log_loss(market_test, results_test)
+                if matches:
+                    with_odds = ~np.isnan(market_test).any(axis=1)
+                    model_loss, _ = outcome_log_loss(probabilities[with_odds], np.asarray(results_test)[with_odds])
+                    print(f"💰 Piyasa referansı: {market_loss:.4f} (model aynı {matches} maçta {model_loss:.4f})")
+        
         # Overall confidence score
         overall_confidence = (1 - (home_mae + away_mae) / 4) * result_accuracy
         print(f"\n🎖️ Genel Güven Skoru: {overall_confidence:.3f}")
@@ -390,6 +323,8 @@ class AdvancedFootballPredictor:
             'home_mae': home_mae,
             'away_mae': away_mae,
             'result_accuracy': result_accuracy,
+            'log_loss': log_loss,
+            'market_log_loss': market_loss,
             'confidence': overall_confidence
         }
     
@@ -410,95 +345,291 @@ class AdvancedFootballPredictor:
             for feature, importance in sorted_features:
                 print(f"   {feature}: {importance:.3f}")
     
-    def predict_match(self, home_team, away_team):
-        """Gelişmiş maç tahmini"""
+    def predict_match(self, home_team, away_team, as_of=None):
+        """Gelişmiş maç tahmini (as_of: bu tarihte yapılacak tahmin)"""
         if not self.is_trained:
             raise ValueError("Model henüz eğitilmedi!")
         
-        print(f"🔮 Gelişmiş tahmin: {home_team} vs {away_team}")
+        print(f"🔮 Gelişmiş tahmin: {home_team} vs {away_team}" + (f" ({as_of} itibarıyla)" if as_of else ""))
         
-        # Takım encoding
-        try:
-            home_encoded = self.team_encoder.transform([home_team])[0]
-            away_encoded = self.team_encoder.transform([away_team])[0]
-        except ValueError:
-            print(f"⚠️ Bilinmeyen takım: {home_team} veya {away_team}")
-            return self._generate_default_prediction(home_team, away_team)
-        
-        # Son performans istatistiklerini al (sahte veri - gerçek implementasyonda historical data kullanılacak)
-        features = self._generate_prediction_features(home_team, away_team, home_encoded, away_encoded)
-        
-        # Tahmin yap
-        X_pred = np.array([list(features.values())])
-        X_pred_scaled = self.scaler.transform(X_pred)
-        
-        home_goals_pred = max(0, self.home_model.predict(X_pred_scaled)[0])
-        away_goals_pred = max(0, self.away_model.predict(X_pred_scaled)[0])
-        result_pred = self.result_model.predict(X_pred_scaled)[0]
-        
-        # Sonuç kategorisini belirle
-        if result_pred < 0.5:
-            result = 'A'  # Away win
-            result_text = 'Deplasman Galibiyeti'
-        elif result_pred > 1.5:
-            result = 'H'  # Home win
-            result_text = 'Ev Sahibi Galibiyeti'
-        else:
-            result = 'D'  # Draw
-            result_text = 'Beraberlik'
+        return self.predict_matches([(home_team, away_team)], as_of=as_of)[0]
+    
+    def predict_matches(self, fixtures, as_of=None):
+        """
+        Birden çok maçı tek seferde (vektörel) tahmin et
         
-        # Olasılık hesaplama (Poisson distribution based)
-        home_prob = self._calculate_win_probability(home_goals_pred, away_goals_pred, 'home')
-        draw_prob = self._calculate_win_probability(home_goals_pred, away_goals_pred, 'draw')
-        away_prob = self._calculate_win_probability(home_goals_pred, away_goals_pred, 'away')
+        Args:
+            fixtures (list): (ev sahibi, deplasman) çiftleri
+            as_of: Tahmin tarihi; yalnızca bu tarihten önceki maçlar kullanılır (None = güncel)
+            
+        Returns:
+            list: Her maç için predict_match ile aynı formatta tahmin (aynı sırada)
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmedi!")
+        
+        predictions = [None] * len(fixtures)
+        with FEATURES_STAGE.time():
+            known_indices, X_pred_scaled = self._build_feature_matrix(fixtures, as_of)
+        
+        known = set(known_indices)
+        for i, (home_team, away_team) in enumerate(fixtures):
+            if i not in known:
+                predictions[i] = self._generate_default_prediction(home_team, away_team)
+        
+        if not known_indices:
+            return predictions
+        
+        # Tahmin yap - her model tüm maçlar için bir kez çağrılır
+        with HOME_MODEL_STAGE.time():
+            home_goals_pred = np.maximum(0, self.home_model.predict(X_pred_scaled))
+        with AWAY_MODEL_STAGE.time():
+            away_goals_pred = np.maximum(0, self.away_model.predict(X_pred_scaled))
+        with RESULT_MODEL_STAGE.time():
+            result_pred = self.result_model.predict(X_pred_scaled)
+        
+        # Olasılık hesaplama (Poisson distribution based), normalize edilmiş
+        with POISSON_STAGE.time():
+            probabilities = self._calculate_outcome_probabilities(home_goals_pred, away_goals_pred)
+        
+        for row, i in enumerate(known_indices):
+            # Sonuç kategorisini belirle
+            if result_pred[row] < 0.5:
+                result = 'A'  # Away win
+            elif result_pred[row] > 1.5:
+                result = 'H'  # Home win
+            else:
+                result = 'D'  # Draw
+            
+            home_prob, draw_prob, away_prob = (float(p) for p in probabilities[row])
+            
+            # Güven skorunu hesapla
+            confidence = max(home_prob, draw_prob, away_prob)
+            
+            predictions[i] = {
+                'home_goals': int(round(float(home_goals_pred[row]))),
+                'away_goals': int(round(float(away_goals_pred[row]))),
+                'result': result,
+                'result_text': self.RESULT_TEXTS[result],
+                'probabilities': {
+                    'home': round(home_prob, 3),
+                    'draw': round(draw_prob, 3),
+                    'away': round(away_prob, 3)
+                },
+                'confidence': round(confidence, 3),
+                'model_type': 'advanced'
+            }
+        
+        return predictions
+    
+    def expected_goals(self, fixtures):
+        """
+        Maçlar için beklenen gol sayıları (Poisson ortalamaları)
+        
+        Args:
+            fixtures (list): (ev sahibi, deplasman) çiftleri
+            
+        Returns:
+            tuple: (ev sahibi beklenen golleri, deplasman beklenen golleri) dizileri
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmedi!")
+        
+        home_xg = np.full(len(fixtures), self.DEFAULT_EXPECTED_GOALS)
+        away_xg = np.full(len(fixtures), self.DEFAULT_EXPECTED_GOALS)
+        
+        known_indices, X_pred_scaled = self._build_feature_matrix(fixtures)
+        if known_indices:
+            home_xg[known_indices] = np.maximum(0, self.home_model.predict(X_pred_scaled))
+            away_xg[known_indices] = np.maximum(0, self.away_model.predict(X_pred_scaled))
+        
+        return home_xg, away_xg
+    
+    def backtest(self, start=None, end=None, features=None):
+        """
+        Geçmiş maçları oynandıkları günkü durumla yeniden tahmin et
+        
+        Özellikler FeatureStore sütunlarından (features) veya
+        MatchHistory/EloTimeline'dan konuma göre okunur;
+        _process_data yeniden çalıştırılmaz.
+        
+        Args:
+            start, end: Tarih aralığı (dahil, None = tümü)
+            features (dict): FeatureStore.load() sütunları (None = modelin kaydettiği geçmiş)
+            
+        Returns:
+            dict: Maç sayısı, sonuç doğruluğu, log-loss ve gol MAE
+        """
+        if features is not None:
+            if not self.is_trained:
+                raise ValueError("Model henüz eğitilmedi!")
+            feature_rows, outcomes, goals = self._stored_backtest_rows(features, start, end)
+        else:
+            feature_rows, outcomes, goals = self._history_backtest_rows(start, end)
         
-        # Normalize probabilities
-        total_prob = home_prob + draw_prob + away_prob
-        home_prob /= total_prob
-        draw_prob /= total_prob
-        away_prob /= total_prob
+        if not len(feature_rows):
+            return {'matches': 0}
         
-        # Güven skorunu hesapla
-        confidence = max(home_prob, draw_prob, away_prob)
+        X = self.scaler.transform(np.asarray(feature_rows))
+        home_pred = np.maximum(0, self.home_model.predict(X))
+        away_pred = np.maximum(0, self.away_model.predict(X))
+        probabilities = self._calculate_outcome_probabilities(home_pred, away_pred)
         
+        outcomes = np.array(outcomes)
+        goals = np.array(goals)
+        actual = probabilities[np.arange(len(outcomes)), outcomes]
         return {
-            'home_goals': round(home_goals_pred),
-            'away_goals': round(away_goals_pred),
-            'result': result,
-            'result_text': result_text,
-            'probabilities': {
-                'home': round(home_prob, 3),
-                'draw': round(draw_prob, 3),
-                'away': round(away_prob, 3)
-            },
-            'confidence': round(confidence, 3),
-            'model_type': 'advanced'
+            'matches': len(outcomes),
+            'accuracy': float(np.mean(probabilities.argmax(axis=1) == outcomes)),
+            'log_loss': float(-np.mean(np.log(np.clip(actual, 1e-15, 1.0)))),
+            'home_goals_mae': float(np.mean(np.abs(home_pred - goals[:, 0]))),
+            'away_goals_mae': float(np.mean(np.abs(away_pred - goals[:, 1])))
         }
     
-    def _generate_prediction_features(self, home_team, away_team, home_encoded, away_encoded):
-        """Tahmin için özellik vektörü oluştur"""
-        # Gerçek implementasyonda bu veriler veritabanından gelecek
-        # Şimdilik realistic değerler üretelim
+    def _history_backtest_rows(self, start, end):
+        """Backtest satırları: özellikler modelin geçmişinden konuma göre hesaplanır"""
+        if not self.is_trained or self.history is None:
+            raise ValueError("Backtest için geçmişi kaydedilmiş eğitilmiş model gerekli")
+        
+        matches = self.history.between(start, end)
+        home_codes, home_known = self._encode_teams([match[2] for match in matches])
+        away_codes, away_known = self._encode_teams([match[3] for match in matches])
+        
+        feature_rows = []
+        outcomes = []
+        goals = []
+        for i, (position, when, home_team, away_team, home_goals, away_goals) in enumerate(matches):
+            if not (home_known[i] and away_known[i]):
+                continue
+            features = self._generate_prediction_features(home_team, away_team, home_codes[i], away_codes[i],
+                                                          position, when)
+            feature_rows.append([features[col] for col in self.feature_cols])
+            outcomes.append(0 if home_goals > away_goals else 1 if home_goals == away_goals else 2)
+            goals.append((home_goals, away_goals))
+        return feature_rows, outcomes, goals
+    
+    def _stored_backtest_rows(self, features, start, end):
+        """Backtest satırları: özellikler FeatureStore'daki maç öncesi satırlardan okunur"""
+        selected = np.ones(len(features['day']), dtype=bool)
+        for bound, compare in ((start, np.greater_equal), (end, np.less_equal)):
+            if bound is not None:
+                day = to_ordinal(bound)
+                if day is None:
+                    raise ValueError(f"Geçersiz tarih: {bound}")
+                selected &= compare(features['day'], day)
+        
+        home_codes, home_known = self._encode_teams(features['home_team'][selected])
+        away_codes, away_known = self._encode_teams(features['away_team'][selected])
+        known = home_known & away_known
+        
+        columns = {'home_team_encoded': home_codes[known], 'away_team_encoded': away_codes[known]}
+        missing = [col for col in self.feature_cols if col not in columns and col not in features]
+        if missing:
+            raise ValueError(f"Depoda modelin özellikleri yok: {', '.join(missing)}")
+        feature_rows = np.column_stack([columns[col] if col in columns else features[col][selected][known]
+                                        for col in self.feature_cols])
+        
+        home_goals = features['home_goals'][selected][known].astype(int)
+        away_goals = features['away_goals'][selected][known].astype(int)
+        outcomes = np.where(home_goals > away_goals, 0, np.where(home_goals == away_goals, 1, 2))
+        return feature_rows, outcomes, list(zip(home_goals, away_goals))
+    
+    def _build_feature_matrix(self, fixtures, as_of=None):
+        """
+        Bilinen takımların maçları için ölçeklenmiş özellik matrisi
+        
+        Raises:
+            ValueError: as_of okunamazsa veya model tarih itibarıyla tahmin desteklemiyorsa
+        
+        Returns:
+            tuple: (bilinen maçların indeksleri, ölçeklenmiş özellik matrisi)
+        """
+        known_indices = []
+        feature_rows = []
+        
+        # Tahmin tarihi bir kez çözülür; tüm maçlar aynı konumdan okunur
+        when = None
+        if as_of is not None:
+            if self.history is None:
+                raise ValueError("Bu model tarih itibarıyla tahmin desteklemiyor (yeniden eğitin)")
+            day = to_ordinal(as_of)
+            if day is None:
+                raise ValueError(f"Geçersiz tarih: {as_of}")
+            when = date.fromordinal(day)
+        position = self.history.position(when) if self.history is not None else None
+        
+        # Takım encoding (tüm maçlar için tek seferde)
+        home_codes, home_known = self._encode_teams([home for home, _ in fixtures])
+        away_codes, away_known = self._encode_teams([away for _, away in fixtures])
+        
+        for i, (home_team, away_team) in enumerate(fixtures):
+            if not (home_known[i] and away_known[i]):
+                print(f"⚠️ Bilinmeyen takım: {home_team} veya {away_team}")
+                continue
+            
+            features = self._generate_prediction_features(home_team, away_team, home_codes[i], away_codes[i],
+                                                          position, when)
+            feature_rows.append([features[col] for col in self.feature_cols])
+            known_indices.append(i)
+        
+        if not known_indices:
+            return known_indices, None
+        
+        return known_indices, self.scaler.transform(np.array(feature_rows))
+    
+    def _encode_teams(self, teams):
+        """Takım isimlerini encoder sınıflarına göre kodla; bilinmeyenleri işaretle"""
+        classes = self.team_encoder.classes_
+        # Takma adlar ("Manchester City" gibi) kanonik isme çevrilir
+        teams = np.asarray([REGISTRY.canonical(team) for team in teams], dtype=object)
+        codes = np.searchsorted(classes, teams)
+        codes = np.minimum(codes, len(classes) - 1)
+        known = classes[codes] == teams
+        return codes, known
+    
+    def _generate_prediction_features(self, home_team, away_team, home_encoded, away_encoded,
+                                      position=None, when=None):
+        """
+        Tahmin için özellik vektörü oluştur
+        
+        Args:
+            position (int): Geçmişteki konum (when tarihinden önce oynanan maç sayısı)
+            when (date): Tahmin tarihi (None = bugün, en güncel durum)
+        """
+        elo = self.elo.features(home_team, away_team, when) if self.elo is not None else \
+            elo_features(INITIAL_RATING, INITIAL_RATING)
+        when = when or datetime.now()
+        
+        if self.history is not None:
+            team_features = self.history.features_at(position, home_team, away_team)
+        else:
+            # Geçmişi kaydedilmemiş eski modeller: maça göre tohumlanmış tahmini değerler
+            # (aynı maç için tahmin her istekte aynıdır; ETag/cache)
+            rng = np.random.default_rng(zlib.crc32(f"{home_team}|{away_team}".encode('utf-8')))
+            team_features = {
+                'home_avg_goals_for': rng.normal(1.5, 0.3),
+                'home_avg_goals_against': rng.normal(1.2, 0.3),
+                'home_win_rate': rng.uniform(0.3, 0.7),
+                'home_recent_form': rng.uniform(0.4, 0.8),
+                'home_home_advantage': rng.uniform(0.5, 0.8),
+                'away_avg_goals_for': rng.normal(1.3, 0.3),
+                'away_avg_goals_against': rng.normal(1.4, 0.3),
+                'away_win_rate': rng.uniform(0.3, 0.7),
+                'away_recent_form': rng.uniform(0.4, 0.8),
+                'away_away_performance': rng.uniform(0.3, 0.6),
+                'h2h_home_wins': rng.uniform(0.2, 0.6),
+                'h2h_away_wins': rng.uniform(0.2, 0.6),
+                'h2h_draws': rng.uniform(0.2, 0.4),
+                'h2h_avg_total_goals': rng.normal(2.5, 0.5)
+            }
         
         return {
             'home_team_encoded': home_encoded,
             'away_team_encoded': away_encoded,
-            'home_avg_goals_for': np.random.normal(1.5, 0.3),
-            'home_avg_goals_against': np.random.normal(1.2, 0.3),
-            'home_win_rate': np.random.uniform(0.3, 0.7),
-            'home_recent_form': np.random.uniform(0.4, 0.8),
-            'home_home_advantage': np.random.uniform(0.5, 0.8),
-            'away_avg_goals_for': np.random.normal(1.3, 0.3),
-            'away_avg_goals_against': np.random.normal(1.4, 0.3),
-            'away_win_rate': np.random.uniform(0.3, 0.7),
-            'away_recent_form': np.random.uniform(0.4, 0.8),
-            'away_away_performance': np.random.uniform(0.3, 0.6),
-            'h2h_home_wins': np.random.uniform(0.2, 0.6),
-            'h2h_away_wins': np.random.uniform(0.2, 0.6),
-            'h2h_draws': np.random.uniform(0.2, 0.4),
-            'h2h_avg_total_goals': np.random.normal(2.5, 0.5),
-            'month': datetime.now().month,
-            'day_of_week': datetime.now().weekday()
+            **team_features,
+            **elo,
+            'month': when.month,
+            'day_of_week': when.weekday()
         }
     
     def _calculate_win_probability(self, home_goals, away_goals, outcome):
@@ -523,6 +654,39 @@ class AdvancedFootballPredictor:
         
         return total_prob
     
+    def _calculate_outcome_probabilities(self, home_goals, away_goals, max_goals=5):
+        """
+        Poisson dağılımı ile ev/beraberlik/deplasman olasılıkları (vektörel)
+        
+        Args:
+            home_goals (np.ndarray): Beklenen ev sahibi golleri
+            away_goals (np.ndarray): Beklenen deplasman golleri
+            max_goals (int): Hesaba katılan en yüksek gol sayısı
+            
+        Returns:
+            np.ndarray: (N, 3) normalize edilmiş [ev, beraberlik, deplasman]
+        """
+        goals = np.arange(max_goals + 1)
+        log_factorials = np.cumsum(np.log(np.maximum(goals, 1)))
+        
+        def poisson_pmf(lam):
+            lam = np.asarray(lam, dtype=float)[:, None]
+            with np.errstate(divide='ignore'):
+                log_pmf = goals * np.log(lam) - lam - log_factorials
+            pmf = np.exp(log_pmf)
+            pmf[:, 0] = np.exp(-lam[:, 0])
+            return pmf
+        
+        # (N, ev golü, deplasman golü) ortak olasılık matrisi
+        joint = poisson_pmf(home_goals)[:, :, None] * poisson_pmf(away_goals)[:, None, :]
+        
+        home_prob = np.tril(joint, k=-1).sum(axis=(1, 2))
+        away_prob = np.triu(joint, k=1).sum(axis=(1, 2))
+        draw_prob = np.trace(joint, axis1=1, axis2=2)
+        
+        probabilities = np.stack([home_prob, draw_prob, away_prob], axis=1)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+    
     def _generate_default_prediction(self, home_team, away_team):
         """Bilinmeyen takımlar için varsayılan tahmin"""
         return {
@@ -551,6 +715,9 @@ class AdvancedFootballPredictor:
             'scaler': self.scaler,
             'team_encoder': self.team_encoder,
             'feature_importance': self.feature_importance,
+            'feature_cols': self.feature_cols,
+            'elo': self.elo,
+            'history': self.history,
             'is_trained': True
         }
         
@@ -558,7 +725,7 @@ class AdvancedFootballPredictor:
         print(f"✅ Gelişmiş model kaydedildi: {path}")
     
     def load_model(self, path):
-        """Modeli yükle"""
+        """Modeli yükle (dosya yolu veya açık dosya nesnesi)"""
         try:
             model_data = joblib.load(path)
             
@@ -568,9 +735,13 @@ class AdvancedFootballPredictor:
             self.scaler = model_data['scaler']
             self.team_encoder = model_data['team_encoder']
             self.feature_importance = model_data.get('feature_importance', {})
+            # Eski model dosyalarında Elo özellikleri yoktur
+            self.feature_cols = list(model_data.get('feature_cols', LEGACY_FEATURE_COLUMNS))
+            self.elo = model_data.get('elo')
+            self.history = model_data.get('history')
             self.is_trained = model_data['is_trained']
             
-            print(f"✅ Gelişmiş model yüklendi: {path}")
+            print(f"✅ Gelişmiş model yüklendi: {getattr(path, 'name', path)}")
             return True
         except Exception as e:
             print(f"❌ Model yükleme hatası: {e}")
@@ -596,7 +767,15 @@ def main():
         # Veriyi yükle ve işle
         processed_data = predictor.load_and_prepare_data(data_files)
         
-        # Modeli eğit
+        # Son sezonun backtest'i: model önce son sezon hariç eğitilir (örneklem dışı ölçüm);
+        # maçlar oynandıkları günkü durumla (kaydedilmiş geçmişten) yeniden tahmin edilir
+        holdout_start = "2018-08-01"
+        predictor.train_models(processed_data[:predictor.history.position(holdout_start)])
+        report = predictor.backtest(start=holdout_start)
+        print(f"📉 Backtest 2018-2019 (örneklem dışı): {report['matches']} maç, "
+              f"doğruluk %{report['accuracy']*100:.1f}, log-loss {report['log_loss']:.3f}")
+        
+        # Modeli tüm veriyle eğit
         predictor.train_models(processed_data)
         
         # Test tahminleri
@@ -619,6 +798,11 @@ def main():
                   f"Beraberlik %{prediction['probabilities']['draw']*100:.1f} | "
                   f"Deplasman %{prediction['probabilities']['away']*100:.1f}")
         
+        # Tarih itibarıyla tahmin: yalnızca o güne kadar oynanan maçlar kullanılır
+        prediction = predictor.predict_match("Arsenal", "Chelsea", as_of="2016-10-01")
+        print(f"\n⏪ Arsenal vs Chelsea (2016-10-01 itibarıyla): "
+              f"{prediction['home_goals']}-{prediction['away_goals']} ({prediction['result_text']})")
+        
         # Modeli kaydet
         predictor.save_model('advanced_football_model.pkl')
         
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧩 API Handler - http.server API'lerinin ortak istek işleyicisi
+Author: Berke Özkul
+Description: simple_api.py ve advanced_api.py handler'larının paylaştığı
+davranış: istek yaşam döngüsü (hız sınırı, profiler, metrikler), JSON/304
+yanıtları, istek gövdesi okuma, denetim günlüğü, /metrics, /admin/profile,
+takım arama ve Elo reyting geçmişi (sadece built-in Python)
+"""
+
+import json
+import time
+import urllib.parse as urlparse
+from contextlib import nullcontext
+
+from admission import ADMISSION, API_KEY_HEADER
+from audit_log import AUDIT_LOG
+from compression import compress_response
+from http_cache import etag_for, is_not_modified, cache_control
+from metrics import METRICS, CONTENT_TYPE as METRICS_CONTENT_TYPE, stage, record_request, endpoint_label
+from profiling import PROFILER, PROFILE_TOP_N, apply_command, admin_allowed
+from serialization import EncodedPayload, encode_response, wants_pretty
+from team_registry import REGISTRY
+
+# İstek aşamalarının gecikme histogramları ve koşullu GET istatistikleri
+PARSE_STAGE = stage('parse')
+ENCODE_STAGE = stage('encode')
+CONDITIONAL_CACHE_STATS = METRICS.cache('conditional_get')
+
+# Takım aramasında varsayılan sonuç sayısı
+DEFAULT_SEARCH_LIMIT = 10
+
+
+class ApiHandlerMixin:
+    """
+    BaseHTTPRequestHandler alt sınıfları için ortak davranış
+
+    Alt sınıf sağlar:
+    - routes: /metrics etiketleri için bilinen yollar
+    - route_get() / route_post(): uç nokta yönlendirmesi
+    - teams, team_set, elo (EloTimeline) ve get_model_version()
+    - request_context(): istek süresince tutulan bağlam (ör. model kiralama)
+    """
+
+    routes = frozenset()
+
+    def do_GET(self):
+        """GET istekleri"""
+        self.handle_request('GET', self.route_get)
+
+    def do_POST(self):
+        """POST istekleri"""
+        self.handle_request('POST', self.route_post)
+
+    def handle_request(self, method, route):
+        """İsteği işle; süre ve durum kodunu metriklere yaz"""
+        start = self.request_start = time.perf_counter()
+        self.status_code = None
+        path = self.path.partition('?')[0]
+        endpoint = endpoint_label(path, self.routes)
+        # Hız sınırı ve yük atma (istek bağlamına girilmeden önce)
+        rejection = ADMISSION.enter(path, self.admission_key())
+        try:
+            if rejection is not None:
+                self.send_rejection(rejection)
+                return
+            with self.request_context():
+                # Profiler kapalıyken boş bağlam döner
+                with PROFILER.profile(f"{method} {endpoint}"):
+                    route()
+        finally:
+            if rejection is None:
+                ADMISSION.leave(path)
+            record_request(method, endpoint, self.status_code or 500, time.perf_counter() - start)
+
+    def request_context(self):
+        """İstek süresince tutulan bağlam (varsayılan: boş)"""
+        return nullcontext()
+
+    def get_model_version(self):
+        """Bu isteğin kullandığı model sürümü (ETag, Cache-Control ve denetim günlüğü için)"""
+        raise NotImplementedError
+
+    def admission_key(self):
+        """Hız sınırı anahtarı: API anahtarı, yoksa istemci IP'si"""
+        # Birden çok X-Forwarded-For başlığı sırayla birleştirilir
+        forwarded_for = ','.join(self.headers.get_all('X-Forwarded-For') or ()) or None
+        return ADMISSION.client_key(self.client_address[0], self.headers.get(API_KEY_HEADER), forwarded_for)
+
+    def send_rejection(self, rejection):
+        """Hız sınırı (429) veya aşırı yük (503) yanıtı"""
+        body = rejection.body()
+        self.send_response(rejection.status)
+        for name, value in rejection.headers():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_response(self, code, message=None):
+        """Durum kodunu metrikler için sakla"""
+        self.status_code = code
+        super().send_response(code, message)
+
+    def send_error(self, code, message=None, explain=None):
+        """
+        Hata yanıtını JSON olarak gönder
+
+        BaseHTTPRequestHandler mesajı durum satırına latin-1 olarak yazar;
+        Türkçe mesajlar ("Endpoint bulunamadı") bağlantıyı yanıtsız düşürürdü.
+        """
+        self.send_json_response({'error': message or self.responses.get(code, ('Hata',))[0]}, status=code)
+
+    def read_json_body(self):
+        """
+        İstek gövdesini JSON olarak oku
+
+        Returns:
+            dict: Çözümlenmiş gövde (hata durumunda 400 gönderilir ve None döner)
+        """
+        content_length = int(self.headers.get('Content-Length', 0))
+        post_data = self.rfile.read(content_length)
+
+        if not post_data:
+            self.send_json_response({
+                'error': 'Boş istek gövdesi'
+            }, status=400)
+            return None
+
+        try:
+            with PARSE_STAGE.time():
+                data = json.loads(post_data.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self.send_json_response({
+                'error': 'Geçersiz JSON'
+            }, status=400)
+            return None
+
+        if not isinstance(data, dict):
+            self.send_json_response({
+                'error': 'İstek gövdesi bir JSON nesnesi olmalı'
+            }, status=400)
+            return None
+
+        return data
+
+    def audit(self, endpoint, home_team, away_team, prediction):
+        """Sunulan tahmini denetim günlüğüne bırak (tampona eklenir, disk beklenmez)"""
+        AUDIT_LOG.record(endpoint, self.get_model_version(), home_team, away_team, prediction,
+                         time.perf_counter() - self.request_start)
+
+    def serve_team_search(self, query):
+        """Takım ismi otomatik tamamlama (/teams/search?q=man&limit=10)"""
+        prefix = query.get('q', [''])[0]
+        try:
+            limit = max(1, min(int(query.get('limit', [DEFAULT_SEARCH_LIMIT])[0]), len(self.teams)))
+        except ValueError:
+            limit = DEFAULT_SEARCH_LIMIT
+
+        matches = []
+        if prefix:
+            # Yalnızca sunucunun bildiği takımlar önerilir
+            candidates = REGISTRY.search(prefix, limit=len(REGISTRY))
+            matches = [team for team in candidates if team in self.team_set][:limit]
+        self.send_json_response({
+            'success': True,
+            'query': prefix,
+            'count': len(matches),
+            'teams': matches
+        }, cache_control=cache_control(self.get_model_version()))
+
+    def serve_rating_history(self, team, query):
+        """Takımın Elo reyting geçmişi (/teams/Arsenal/rating-history?from=...&to=...&as_of=...)"""
+        resolved = REGISTRY.resolve(team)
+        if resolved not in self.elo.histories:
+            self.send_json_response({
+                'error': f'Geçersiz takım adı: {team}',
+                'suggestions': [name for name in REGISTRY.search(team) if name in self.elo.histories][:5]
+            }, status=404)
+            return
+
+        try:
+            payload = self.elo.history_payload(
+                resolved,
+                start=query.get('from', [None])[0],
+                end=query.get('to', [None])[0],
+                as_of=query.get('as_of', [None])[0]
+            )
+        except ValueError as e:
+            self.send_json_response({
+                'error': str(e),
+                'example': '/teams/Arsenal/rating-history?from=2017-08-01&to=2018-05-31'
+            }, status=400)
+            return
+
+        self.send_json_response(payload, cache_control=cache_control(self.get_model_version()))
+
+    def serve_metrics(self):
+        """Prometheus metinleri (gecikme histogramları, sayaçlar, cache oranları)"""
+        self.send_text(METRICS.render(), METRICS_CONTENT_TYPE)
+
+    def require_admin(self):
+        """Admin uç noktaları için yetki kontrolü (yetkisizse 403 gönderilir)"""
+        if admin_allowed(self.client_address[0], self.headers.get('X-Admin-Token')):
+            return True
+        self.send_json_response({'error': 'Yetkisiz'}, status=403)
+        return False
+
+    def serve_profile(self, query):
+        """Profiler durumu ve sıcak noktalar (?format=collapsed ile flamegraph girdisi)"""
+        if not self.require_admin():
+            return
+
+        if query.get('format', [''])[0] == 'collapsed':
+            self.send_text(PROFILER.collapsed().encode('utf-8'), 'text/plain; charset=utf-8')
+            return
+
+        try:
+            top_n = int(query.get('top', [PROFILE_TOP_N])[0])
+        except ValueError:
+            top_n = PROFILE_TOP_N
+
+        self.send_json_response({
+            'success': True,
+            'profiler': PROFILER.status(),
+            'hotspots': PROFILER.hotspots(top_n)
+        })
+
+    def configure_profiler(self):
+        """Profiler'ı çalışma anında aç/kapat, sıfırla veya diske yaz"""
+        if not self.require_admin():
+            return
+
+        data = self.read_json_body()
+        if data is None:
+            return
+
+        try:
+            self.send_json_response(apply_command(data))
+        except ValueError as e:
+            self.send_json_response({'error': str(e)}, status=400)
+
+    def send_text(self, body, content_type):
+        """Önbelleklenmeyen düz metin yanıt (bayt gövde)"""
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json_response(self, data, status=200, etag=None, cache_control=None):
+        """
+        JSON yanıt gönder (varsayılan kompakt, ?pretty=1 ile girintili)
+
+        cache_control verilen yanıtlara ETag eklenir; If-None-Match
+        eşleşirse gövdesiz 304 gönderilir.
+        """
+        if cache_control and etag is None and isinstance(data, EncodedPayload):
+            etag = data.etag
+        if etag is not None and self.send_not_modified(etag, cache_control):
+            return
+
+        with ENCODE_STAGE.time():
+            query = urlparse.parse_qs(urlparse.urlparse(self.path).query)
+            body = encode_response(data, pretty=wants_pretty(query))
+
+        if cache_control and etag is None:
+            etag = etag_for(body)
+            if self.send_not_modified(etag, cache_control):
+                return
+
+        if cache_control:
+            CONDITIONAL_CACHE_STATS.record(False)
+
+        # Önceden kodlanmış (statik) yanıtların sıkıştırılmış hali cache'lenir
+        body, content_encoding = compress_response(
+            body,
+            self.headers.get('Accept-Encoding'),
+            cacheable=isinstance(data, EncodedPayload)
+        )
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if content_encoding:
+            self.send_header('Content-Encoding', content_encoding)
+        if content_encoding or cache_control:
+            self.send_header('Vary', 'Accept-Encoding')
+        if cache_control:
+            self.send_header('Cache-Control', cache_control)
+            self.send_header('ETag', etag)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+        self.wfile.write(body)
+
+    def send_not_modified(self, etag, cache_control=None):
+        """If-None-Match mevcut ETag ile eşleşirse gövdesiz 304 gönder"""
+        if not is_not_modified(self.headers.get('If-None-Match'), etag):
+            return False
+
+        CONDITIONAL_CACHE_STATS.record(True)
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        if cache_control:
+            self.send_header('Cache-Control', cache_control)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        return True
+
+    def log_message(self, format, *args):
+        """Log mesajlarını özelleştir"""
+        print(f"🌐 {self.address_string()} - {format % args}")
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📝 Audit Log - Sunulan tahminlerin bloklamayan denetim günlüğü
+Author: Berke Özkul
+Description: İstek işleyicileri her tahmini (maç, model sürümü, olasılıklar,
+gecikme) sınırlı bir bellek içi halka tampona bırakır; arka plan thread'i
+kayıtları partiler halinde, boyuta göre döndürülen (rotate) ve yalnızca
+sona eklenen TSV dosyalarına yazar. Disk yavaşsa tampon dolar ve yeni
+kayıtlar beklemeden atılıp sayılır; istek yolu asla diske dokunmaz
+(sadece built-in Python)
+"""
+
+import atexit
+import glob
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+from metrics import METRICS
+
+# AUDIT_LOG=0 günlüğü kapatır; dosyalar varsayılan olarak depo kökündeki logs/audit altına yazılır
+AUDIT_LOG_ENABLED = os.environ.get('AUDIT_LOG', '1') != '0'
+AUDIT_LOG_DIR = os.environ.get('AUDIT_LOG_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs', 'audit')
+# Tampon kapasitesi (kayıt) ve yazıcının uyanma aralığı
+AUDIT_BUFFER = int(os.environ.get('AUDIT_BUFFER', '65536'))
+AUDIT_FLUSH_INTERVAL = float(os.environ.get('AUDIT_FLUSH_MS', '250')) / 1000
+# Dosya bu boyutu geçince yenisine geçilir; en fazla dosya sayısı (0 = hepsi saklanır)
+AUDIT_MAX_BYTES = int(float(os.environ.get('AUDIT_MAX_MB', '64')) * 1024 * 1024)
+AUDIT_MAX_FILES = int(os.environ.get('AUDIT_MAX_FILES', '0'))
+
+# Tek write() çağrısındaki en fazla kayıt
+WRITE_BATCH = 4096
+
+FIELDS = ('timestamp', 'endpoint', 'model_version', 'home_team', 'away_team', 'result',
+          'home_goals', 'away_goals', 'p_home', 'p_draw', 'p_away', 'confidence', 'latency_ms')
+HEADER = ('#' + '\t'.join(FIELDS) + '\n').encode('utf-8')
+FILE_PATTERN = 'predictions-*.tsv'
+
+RECORDS_TOTAL = METRICS.counter(
+    'audit_records_total',
+    'Denetim günlüğü kayıtları (yazılan, tampon dolu/yazma hatası nedeniyle atılan)',
+    ('outcome',)
+)
+FLUSH_SECONDS = METRICS.histogram(
+    'audit_flush_seconds',
+    'Denetim günlüğü parti yazma süresi (saniye)'
+).labels()
+
+
+def format_record(record):
+    """Kaydı tek TSV satırına çevir (yazıcı thread'inde çalışır)"""
+    (timestamp, endpoint, model_version, home_team, away_team, result,
+     home_goals, away_goals, p_home, p_draw, p_away, confidence, latency) = record
+    return (f"{timestamp:.3f}\t{endpoint}\t{model_version or '-'}\t{home_team}\t{away_team}\t{result}\t"
+            f"{home_goals}\t{away_goals}\t{p_home:.6g}\t{p_draw:.6g}\t{p_away:.6g}\t"
+            f"{'-' if confidence is None else format(confidence, '.6g')}\t{latency * 1000:.3f}\n")
+
+
+class AuditLog:
+    """
+    Bloklamayan tahmin günlüğü
+    - record(): kaydı tampona ekler (~1 µs, kilit yok); tampon doluysa kayıt atılır
+    - Yazıcı thread'i ilk kayıtta başlar, her flush_interval'da tamponu boşaltır
+    - Dosyalar süreç başına ayrıdır (prefork işçileri aynı dosyaya yazmaz)
+    """
+
+    def __init__(self, directory=AUDIT_LOG_DIR, capacity=AUDIT_BUFFER, flush_interval=AUDIT_FLUSH_INTERVAL,
+                 max_bytes=AUDIT_MAX_BYTES, max_files=AUDIT_MAX_FILES, enabled=AUDIT_LOG_ENABLED):
+        """
+        Args:
+            directory (str): Günlük klasörü
+            capacity (int): Tamponda bekleyebilecek en fazla kayıt
+            flush_interval (float): Yazıcının tamponu boşaltma aralığı (saniye)
+            max_bytes (int): Dosya döndürme boyutu
+            max_files (int): Saklanacak en fazla dosya (0 = sınırsız)
+            enabled (bool): False ise record() hiçbir şey yapmaz
+        """
+        if capacity < 1 or flush_interval <= 0:
+            raise ValueError("capacity en az 1, flush_interval pozitif olmalı")
+
+        self.directory = directory
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.enabled = enabled
+
+        # deque.append/popleft GIL altında atomik: üretici ve yazıcı kilitsiz çalışır
+        self._buffer = deque()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._file = None
+        self._file_size = 0
+        self._sequence = 0
+        self.path = None
+        self.last_error = None
+
+        self._written = RECORDS_TOTAL.labels('written')
+        self._dropped_full = RECORDS_TOTAL.labels('dropped_buffer_full')
+        self._dropped_error = RECORDS_TOTAL.labels('dropped_write_error')
+
+        # Fork edilen işçi ana sürecin tamponunu ve dosyasını devralmaz
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def record(self, endpoint, model_version, home_team, away_team, prediction, latency):
+        """
+        Sunulan tahmini günlüğe bırak (asla bloklamaz)
+
+        Args:
+            endpoint (str): Uç nokta etiketi (predict, predict_batch, ...)
+            prediction (dict): result, home_goals, away_goals, probabilities, confidence
+            latency (float): İstek başından yanıta kadar geçen süre (saniye)
+        """
+        if not self.enabled:
+            return
+        buffer = self._buffer
+        if len(buffer) >= self.capacity:
+            self._dropped_full.inc()
+            return
+        probabilities = prediction['probabilities']
+        buffer.append((time.time(), endpoint, model_version, home_team, away_team, prediction['result'],
+                       prediction['home_goals'], prediction['away_goals'], probabilities['home'],
+                       probabilities['draw'], probabilities['away'], prediction.get('confidence'), latency))
+        if self._thread is None:
+            self._start()
+
+    @property
+    def buffered(self):
+        return len(self._buffer)
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='audit-writer', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _reset_after_fork(self):
+        self._buffer = deque()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._file = None
+        self._file_size = 0
+        self._sequence = 0
+        self.path = None
+
+    def _loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        """Tampondaki kayıtları partiler halinde dosyaya yaz (yazıcı thread'i veya close)"""
+        buffer = self._buffer
+        while buffer:
+            batch = []
+            while buffer and len(batch) < WRITE_BATCH:
+                batch.append(buffer.popleft())
+            data = ''.join([format_record(record) for record in batch]).encode('utf-8')
+
+            started = time.perf_counter()
+            try:
+                self._write(data)
+            except OSError as e:
+                self._dropped_error.inc(len(batch))
+                if str(e) != self.last_error:
+                    print(f"⚠️ Denetim günlüğü yazılamadı ({len(batch)} kayıt atıldı): {e}", file=sys.stderr)
+                self.last_error = str(e)
+                self._close_file()
+                continue
+            FLUSH_SECONDS.observe(time.perf_counter() - started)
+            self._written.inc(len(batch))
+            self.last_error = None
+
+    def _write(self, data):
+        if self._file is not None and self._file_size + len(data) > self.max_bytes and self._file_size > len(HEADER):
+            self._close_file()
+        if self._file is None:
+            self._open_file()
+            self._prune()
+        self._file.write(data)
+        self._file_size += len(data)
+
+    def _open_file(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        stamp = time.strftime('%Y%m%dT%H%M%S')
+        self.path = os.path.join(self.directory, f"predictions-{stamp}-{os.getpid()}-{self._sequence:04d}.tsv")
+        # Tamponsuz: her parti tek write() çağrısı
+        self._file = open(self.path, 'ab', buffering=0)
+        self._file_size = self._file.tell()
+        if self._file_size == 0:
+            self._file.write(HEADER)
+            self._file_size = len(HEADER)
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        self._file = None
+
+    def _prune(self):
+        """max_files aşılırsa en eski dosyaları sil"""
+        if not self.max_files:
+            return
+        for path in log_files(self.directory)[:-self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def status(self):
+        """/health için günlük durumu"""
+        return {
+            'enabled': self.enabled,
+            'file': self.path,
+            'buffered': self.buffered,
+            'capacity': self.capacity,
+            'written': self._written.value,
+            'dropped': self._dropped_full.value + self._dropped_error.value,
+            'last_error': self.last_error
+        }
+
+    def metric_values(self):
+        """audit_buffer gauge değerleri"""
+        return [({'value': 'buffered'}, self.buffered), ({'value': 'capacity'}, self.capacity)]
+
+    def close(self):
+        """Yazıcıyı durdur, kalan kayıtları yaz ve dosyayı kapat"""
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+            self._thread = None
+        self.flush()
+        self._close_file()
+
+
+def log_files(directory=AUDIT_LOG_DIR):
+    """Klasördeki günlük dosyaları (eskiden yeniye)"""
+    return sorted(glob.glob(os.path.join(directory, FILE_PATTERN)))
+
+
+def read_records(directory=AUDIT_LOG_DIR):
+    """
+    Günlük kayıtlarını oku (tahminleri gerçek sonuçlarla puanlamak için)
+
+    Yarım kalmış (çökme sırasında yazılan) satırlar atlanır.
+
+    Yields:
+        dict: FIELDS alanları; sayısal alanlar sayıya çevrilmiş
+    """
+    for path in log_files(directory):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if line.startswith('#') or not line.endswith('\n'):
+                    continue
+                values = line.rstrip('\n').split('\t')
+                if len(values) != len(FIELDS):
+                    continue
+                record = dict(zip(FIELDS, values))
+                try:
+                    for field in ('timestamp', 'p_home', 'p_draw', 'p_away', 'latency_ms'):
+                        record[field] = float(record[field])
+                    record['home_goals'] = int(record['home_goals'])
+                    record['away_goals'] = int(record['away_goals'])
+                except ValueError:
+                    continue
+                record['confidence'] = None if record['confidence'] == '-' else float(record['confidence'])
+                yield record
+
+
+# Süreç başına ortak günlük
+AUDIT_LOG = AuditLog()
+METRICS.gauge_function('audit_buffer', 'Denetim günlüğü tamponu', AUDIT_LOG.metric_values)
+
+
+def benchmark(count=200000):
+    """record() maliyeti (µs/kayıt) ve yazılan dosya boyutu"""
+    import tempfile
+
+    directory = tempfile.mkdtemp(prefix='audit-')
+    audit = AuditLog(directory=directory, capacity=count + 1)
+    prediction = {'home_goals': 2, 'away_goals': 1, 'result': 'H',
+                  'probabilities': {'home': 0.512, 'draw': 0.251, 'away': 0.237}, 'confidence': 0.512}
+
+    started = time.perf_counter()
+    for _ in range(count):
+        audit.record('predict', 'advanced-0123456789ab', 'Arsenal', 'Chelsea', prediction, 0.0123)
+    elapsed = time.perf_counter() - started
+    audit.close()
+
+    size = sum(os.path.getsize(path) for path in log_files(directory))
+    return {
+        'directory': directory,
+        'us_per_record': elapsed / count * 1e6,
+        'written': sum(1 for _ in read_records(directory)),
+        'bytes_per_record': size / count
+    }
+
+
+def main():
+    """Ana fonksiyon - record() maliyeti"""
+    print("📝 Denetim günlüğü benchmark'ı")
+    print("=" * 60)
+    result = benchmark()
+    print(f"  record(): {result['us_per_record']:.2f} µs/kayıt")
+    print(f"  Yazılan: {result['written']:,} kayıt, {result['bytes_per_record']:.0f} bayt/kayıt ({result['directory']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗜️ Response Compression - Mobil istemciler için sıkıştırma
+Author: Berke Özkul
+Description: Accept-Encoding müzakeresi, boyut eşiği, gzip/brotli sıkıştırma
+ve statik/cache'lenebilir yanıtlar için sıkıştırılmış sürüm cache'i
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from metrics import METRICS
+
+try:
+    import brotli
+except ImportError:  # brotli opsiyonel
+    brotli = None
+
+# Bu boyutun altındaki yanıtlar sıkıştırılmaz (başlık maliyeti kazancı geçer)
+MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', '5'))
+
+# Sunucunun desteklediği kodlamalar (tercih sırasına göre)
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/')
+
+
+def parse_accept_encoding(header):
+    """
+    Accept-Encoding başlığını {kodlama: q} sözlüğüne çevirir
+
+    Args:
+        header (str): Örn. "gzip, deflate, br;q=0.9"
+
+    Returns:
+        dict: Kodlama -> kalite değeri
+    """
+    encodings = {}
+    if not header:
+        return encodings
+
+    for part in header.split(','):
+        pieces = part.strip().split(';')
+        coding = pieces[0].strip().lower()
+        if not coding:
+            continue
+
+        quality = 1.0
+        for param in pieces[1:]:
+            name, _, value = param.strip().partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        encodings[coding] = quality
+
+    return encodings
+
+
+def negotiate(header):
+    """İstemcinin kabul ettiği en iyi kodlamayı seç (yoksa None)"""
+    accepted = parse_accept_encoding(header)
+    if not accepted:
+        return None
+
+    wildcard = accepted.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+
+    return best
+
+
+def compress(body, encoding):
+    """Gövdeyi verilen kodlama ile sıkıştır"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        # mtime=0: aynı gövde her zaman aynı çıktıyı üretir (cache ve ETag için)
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Desteklenmeyen kodlama: {encoding}")
+
+
+class CompressionCache:
+    """Sıkıştırılmış yanıt sürümleri için boyutu sınırlı LRU cache"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compress(self, body, encoding):
+        """Aynı gövde daha önce sıkıştırıldıysa cache'ten döndür"""
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compressed
+
+        compressed = compress(body, encoding)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = compressed
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return compressed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Tüm sunucuların paylaştığı varsayılan cache
+DEFAULT_CACHE = CompressionCache()
+METRICS.register_cache('compression', DEFAULT_CACHE)
+
+
+def compress_response(body, accept_encoding, cacheable=False, cache=DEFAULT_CACHE):
+    """
+    Yanıt gövdesini istemciye göre sıkıştırır
+
+    Args:
+        body (bytes): Kodlanmış yanıt gövdesi
+        accept_encoding (str): İstemcinin Accept-Encoding başlığı
+        cacheable (bool): Statik/cache'lenebilir yanıt mı
+        cache (CompressionCache): Sıkıştırılmış sürümlerin tutulduğu cache
+
+    Returns:
+        tuple: (gövde, content-encoding veya None)
+    """
+    if len(body) < MIN_SIZE:
+        return body, None
+
+    encoding = negotiate(accept_encoding)
+    if encoding is None:
+        return body, None
+
+    if cacheable:
+        return cache.get_or_compress(body, encoding), encoding
+    return compress(body, encoding), encoding
+
+
+def with_vary_accept_encoding(headers):
+    """Mevcut Vary başlığına Accept-Encoding ekle (zaten varsa dokunma)"""
+    for index, (name, value) in enumerate(headers):
+        if name != b'vary':
+            continue
+        tokens = [token.strip().lower() for token in value.split(b',')]
+        if b'accept-encoding' in tokens or b'*' in tokens:
+            return headers
+        return headers[:index] + [(name, value + b', Accept-Encoding')] + headers[index + 1:]
+    return headers + [(b'vary', b'Accept-Encoding')]
+
+
+class CompressionMiddleware:
+    """
+    FastAPI/Starlette için ASGI sıkıştırma middleware'i
+
+    JSON ve metin yanıtlarını tamponlayıp müzakere edilen kodlamayla
+    sıkıştırır; cacheable_paths içindeki yanıtların sıkıştırılmış
+    sürümleri cache'ten verilir.
+    """
+
+    def __init__(self, app, cacheable_paths=(), cache=DEFAULT_CACHE):
+        self.app = app
+        self.cacheable_paths = frozenset(cacheable_paths)
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for name, value in scope.get('headers', ()):
+            if name == b'accept-encoding':
+                accept_encoding = value.decode('latin-1')
+                break
+
+        if negotiate(accept_encoding) is None:
+            await self.app(scope, receive, send)
+            return
+
+        cacheable = scope.get('path') in self.cacheable_paths
+        start_message = None
+        chunks = []
+
+        async def send_wrapper(message):
+            nonlocal start_message
+
+            if message['type'] == 'http.response.start':
+                # Gövdesiz yanıtlar (304 Not Modified vb.) olduğu gibi geçer
+                if message['status'] in (204, 304):
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if message['type'] != 'http.response.body' or start_message is None:
+                await send(message)
+                return
+
+            chunks.append(message.get('body', b''))
+            if message.get('more_body', False):
+                return
+
+            await send_compressed(b''.join(chunks))
+
+        async def send_compressed(body):
+            headers = [(k, v) for k, v in start_message['headers'] if k != b'content-length']
+            content_type = dict(headers).get(b'content-type', b'').decode('latin-1')
+            already_encoded = any(k == b'content-encoding' for k, _ in headers)
+
+            encoding = None
+            if not already_encoded and content_type.startswith(COMPRESSIBLE_TYPES):
+                body, encoding = compress_response(body, accept_encoding, cacheable, self.cache)
+
+            if encoding is not None:
+                headers.append((b'content-encoding', encoding.encode('latin-1')))
+                headers = with_vary_accept_encoding(headers)
+            headers.append((b'content-length', str(len(body)).encode('latin-1')))
+
+            await send(dict(start_message, headers=headers))
+            await send({'type': 'http.response.body', 'body': body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def benchmark(number=2000):
+    """Örnek yanıtlar için boyut kazancı ve istek başına CPU maliyeti"""
+    from serialization import dumps, _sample_prediction_response
+
+    payloads = {
+        '/predict': dumps(_sample_prediction_response()),
+        '/predict (pretty)': dumps(_sample_prediction_response(), pretty=True),
+    }
+
+    results = []
+    for name, body in payloads.items():
+        for encoding in SUPPORTED_ENCODINGS:
+            compressed = compress(body, encoding)
+
+            start = time.perf_counter()
+            for _ in range(number):
+                compress(body, encoding)
+            cold_us = (time.perf_counter() - start) / number * 1e6
+
+            cache = CompressionCache()
+            cache.get_or_compress(body, encoding)
+            start = time.perf_counter()
+            for _ in range(number):
+                cache.get_or_compress(body, encoding)
+            cached_us = (time.perf_counter() - start) / number * 1e6
+
+            results.append({
+                'payload': name,
+                'encoding': encoding,
+                'raw_bytes': len(body),
+                'compressed_bytes': len(compressed),
+                'reduction_pct': (1 - len(compressed) / len(body)) * 100,
+                'compress_us': cold_us,
+                'cached_us': cached_us
+            })
+
+    return results
+
+
+def main():
+    """Ana fonksiyon - Sıkıştırma ölçümleri"""
+    print("🗜️ Yanıt sıkıştırma benchmark'ı")
+    print(f"⚙️  Desteklenen kodlamalar: {', '.join(SUPPORTED_ENCODINGS)} | eşik: {MIN_SIZE} bayt")
+    print("=" * 78)
+
+    for row in benchmark():
+        print(f"  {row['payload']:<18} {row['encoding']:<5} "
+              f"{row['raw_bytes']:>6} → {row['compressed_bytes']:>5} bayt "
+              f"(-%{row['reduction_pct']:.1f})  "
+              f"sıkıştırma {row['compress_us']:>7.1f} µs | cache {row['cached_us']:>5.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗂️ Data Catalog - Lig/sezon bölümlü veri kataloğu
+Author: Berke Özkul
+Description: football-data.co.uk biçimindeki CSV'leri (E0-E3, SP1, D1, I1, ...)
+lig ve sezon bölümleri halinde bulur, lig/sezon aralığına göre filtreler ve
+sezon dosyalarını paralel süreçlerle okur
+
+Desteklenen yerleşimler:
+    data/<LİG>/<sezon>.csv      # bölümlü: data/SP1/2010-2011.csv
+    data/<LİG> <sezon>.csv      # düz (eski): data/E0 2005-2006.csv
+"""
+
+import csv
+import os
+import re
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# football-data.co.uk lig kodları
+LEAGUES = {
+    'E0': 'Premier League', 'E1': 'Championship', 'E2': 'League One',
+    'E3': 'League Two', 'EC': 'National League',
+    'SC0': 'Scottish Premiership', 'SC1': 'Scottish Championship',
+    'SC2': 'Scottish League One', 'SC3': 'Scottish League Two',
+    'D1': 'Bundesliga', 'D2': '2. Bundesliga',
+    'I1': 'Serie A', 'I2': 'Serie B',
+    'SP1': 'La Liga', 'SP2': 'Segunda División',
+    'F1': 'Ligue 1', 'F2': 'Ligue 2',
+    'N1': 'Eredivisie', 'B1': 'Jupiler League', 'P1': 'Primeira Liga',
+    'T1': 'Süper Lig', 'G1': 'Super League Greece'
+}
+
+# Tüm liglerde bulunan maç sonucu, şut ve ana bahis oranı sütunları
+CORE_COLUMNS = (
+    'Div', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR',
+    'HTHG', 'HTAG', 'HTR', 'HS', 'AS', 'HST', 'AST', 'HF', 'AF',
+    'HC', 'AC', 'HY', 'AY', 'HR', 'AR', 'B365H', 'B365D', 'B365A'
+)
+
+# Modeller varsayılan olarak Premier League ile eğitilir
+DEFAULT_LEAGUES = ('E0',)
+# Paralel okuma için işçi süreç sayısı (1 = aynı süreçte oku)
+DATA_WORKERS = int(os.environ.get('DATA_WORKERS', str(os.cpu_count() or 1)))
+# Bu sayıdan az dosya için süreç havuzu açmaya değmez
+PARALLEL_MIN_FILES = 4
+
+_LEAGUE_PATTERN = re.compile(r'^[A-Z]{1,3}[0-9]?$')
+_SEASON_PATTERN = re.compile(r'^(\d{4})(?:-(\d{2}|\d{4}))?$')
+
+SeasonFile = namedtuple('SeasonFile', ['league', 'season', 'start_year', 'path'])
+
+
+def parse_season(text):
+    """
+    Sezon metnini (2005-2006, 2005-06, 2005) kanonik biçime çevir
+
+    Returns:
+        tuple: ('2005-2006', 2005) veya geçersizse None
+    """
+    match = _SEASON_PATTERN.match(text.strip())
+    if not match:
+        return None
+    start_year = int(match.group(1))
+    return f"{start_year}-{start_year + 1}", start_year
+
+
+def parse_season_range(text):
+    """
+    Komut satırı sezon aralığı: '2010:2018', '2010:', ':2015', '2012-2013'
+
+    Returns:
+        tuple: (ilk, son) başlangıç yılları (açık uçlar None)
+
+    Raises:
+        ValueError: Geçersiz aralık
+    """
+    if not text:
+        return None
+    if ':' not in text:
+        season = parse_season(text)
+        if season is None:
+            raise ValueError(f"Geçersiz sezon: {text}")
+        return season[1], season[1]
+
+    first, _, last = text.partition(':')
+    try:
+        return (int(first) if first else None, int(last) if last else None)
+    except ValueError:
+        raise ValueError(f"Geçersiz sezon aralığı: {text}")
+
+
+def _in_range(start_year, seasons):
+    if seasons is None:
+        return True
+    first, last = seasons
+    return (first is None or start_year >= first) and (last is None or start_year <= last)
+
+
+class DataCatalog:
+    """
+    Veri klasöründeki lig/sezon dosyalarının kataloğu
+    - Dosyalar bir kez taranır (refresh() ile yenilenir)
+    - files() lig ve sezon aralığına göre filtreler
+    - load_frame()/load_rows() dosyaları paralel süreçlerle okur
+    """
+
+    def __init__(self, data_path="../data/"):
+        self.data_path = data_path
+        self._files = None
+
+    def refresh(self):
+        """Veri klasörünü yeniden tara"""
+        found = {}
+        try:
+            entries = list(os.scandir(self.data_path))
+        except FileNotFoundError:
+            entries = []
+
+        for entry in entries:
+            if entry.is_dir() and _LEAGUE_PATTERN.match(entry.name):
+                # Bölümlü yerleşim: <LİG>/<sezon>.csv
+                for child in os.scandir(entry.path):
+                    stem, ext = os.path.splitext(child.name)
+                    season = parse_season(stem) if ext.lower() == '.csv' else None
+                    if season and child.is_file():
+                        found[(entry.name, season[0])] = SeasonFile(entry.name, season[0], season[1], child.path)
+            elif entry.is_file() and entry.name.lower().endswith('.csv'):
+                # Düz yerleşim: "<LİG> <sezon>.csv" (bölümlü kopya varsa o kullanılır)
+                league, _, rest = entry.name[:-4].partition(' ')
+                season = parse_season(rest) if _LEAGUE_PATTERN.match(league) else None
+                if season:
+                    found.setdefault((league, season[0]), SeasonFile(league, season[0], season[1], entry.path))
+
+        self._files = sorted(found.values(), key=lambda f: (f.league, f.start_year))
+        return self._files
+
+    @property
+    def leagues(self):
+        """Katalogdaki lig kodları"""
+        return sorted({f.league for f in self.files()})
+
+    def seasons(self, league):
+        """Ligin mevcut sezonları (eskiden yeniye)"""
+        return [f.season for f in self.files(leagues=[league])]
+
+    def files(self, leagues=None, seasons=None):
+        """
+        Filtrelenmiş sezon dosyaları
+
+        Args:
+            leagues (list): Lig kodları (None = hepsi)
+            seasons (tuple): (ilk, son) başlangıç yılı aralığı (None = hepsi)
+
+        Returns:
+            list: SeasonFile listesi (lig, sezon sırasıyla)
+        """
+        files = self._files if self._files is not None else self.refresh()
+        if leagues is not None:
+            wanted = set(leagues)
+            files = [f for f in files if f.league in wanted]
+        return [f for f in files if _in_range(f.start_year, seasons)]
+
+    def path_for(self, league, season):
+        """Tek sezon dosyasının yolu (yoksa None)"""
+        parsed = parse_season(season)
+        if parsed is None:
+            return None
+        for f in self.files(leagues=[league]):
+            if f.season == parsed[0]:
+                return f.path
+        return None
+
+    def load_frame(self, leagues=None, seasons=None, columns=None, workers=None, compact=False):
+        """
+        Sezonları pandas DataFrame olarak yükle
+
+        Args:
+            leagues (list): Lig kodları (None = hepsi)
+            seasons (tuple): (ilk, son) başlangıç yılı aralığı
+            columns (list): Okunacak sütunlar (None = hepsi; eksik olanlar atlanır)
+            workers (int): İşçi süreç sayısı (varsayılan DATA_WORKERS)
+            compact (bool): float32 ve kategorik sütunlarla bellek tasarrufu
+
+        Returns:
+            pd.DataFrame: League ve Season sütunları eklenmiş birleşik veri
+        """
+        import numpy as np
+        import pandas as pd
+
+        files = self.files(leagues, seasons)
+        if not files:
+            raise FileNotFoundError(f"❌ {self.data_path} klasöründe eşleşen sezon dosyası bulunamadı!")
+
+        loaded = [(f, frame) for f, frame in zip(files, _map(_read_frame, files, columns, workers))
+                  if frame is not None]
+        if not loaded:
+            raise ValueError("❌ Hiçbir sezon verisi yüklenemedi!")
+
+        df = pd.concat([frame for _, frame in loaded], ignore_index=True)
+
+        # Lig/sezon sütunları dosya başına değil, birleştirmeden sonra tek seferde kurulur
+        lengths = [len(frame) for _, frame in loaded]
+        for column, values in (('League', [f.league for f, _ in loaded]), ('Season', [f.season for f, _ in loaded])):
+            categories = sorted(set(values))
+            codes = np.repeat([categories.index(value) for value in values], lengths)
+            labels = pd.Categorical.from_codes(codes, categories=categories)
+            df[column] = labels if compact else labels.astype(str)
+
+        return compact_frame(df) if compact else df
+
+    def load_rows(self, leagues=None, seasons=None, workers=None):
+        """
+        Sezonları csv.DictReader satırları olarak yükle (pandas gerektirmez)
+
+        Returns:
+            list: League ve Season alanları eklenmiş satır sözlükleri
+        """
+        files = self.files(leagues, seasons)
+        if not files:
+            raise FileNotFoundError(f"❌ {self.data_path} klasöründe eşleşen sezon dosyası bulunamadı!")
+
+        rows = []
+        for season_rows in _map(_read_rows, files, None, workers):
+            rows.extend(season_rows or ())
+        return rows
+
+
+def compact_frame(df):
+    """Bellek tasarrufu: float64 sütunlar float32, tekrar eden metinler kategorik"""
+    float_columns = df.select_dtypes('float64').columns
+    df[float_columns] = df[float_columns].astype('float32')
+    for column in ('League', 'Season', 'Div', 'HomeTeam', 'AwayTeam', 'FTR', 'HTR', 'Referee'):
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
+
+
+def _map(reader, files, columns, workers):
+    """Dosyaları sırayı koruyarak (paralel) oku"""
+    workers = DATA_WORKERS if workers is None else workers
+    workers = min(workers, len(files))
+    args = [(f, columns) for f in files]
+
+    if workers <= 1 or len(files) < PARALLEL_MIN_FILES:
+        return [reader(*arg) for arg in args]
+
+    # Büyük dosya listelerinde süreçlere parça parça dağıt (IPC maliyeti azalır)
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(reader, *zip(*args), chunksize=chunksize))
+
+
+def _read_frame(season_file, columns):
+    """Tek sezon dosyasını DataFrame olarak oku (işçi süreçte çalışır)"""
+    import pandas as pd
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda column: column in wanted
+
+    try:
+        # Eski sezonlarda satır sonu virgülleri ve latin-1 karakterler bulunabilir
+        df = pd.read_csv(season_file.path, usecols=usecols, encoding='utf-8-sig',
+                         encoding_errors='replace', on_bad_lines='skip')
+    except (OSError, ValueError, pd.errors.ParserError) as e:
+        print(f"  ❌ {season_file.league} {season_file.season}: Hata - {e}", file=sys.stderr)
+        return None
+
+    # Dosya sonundaki boş satırlar ve satır sonu virgüllerinden gelen isimsiz sütunlar
+    if 'HomeTeam' in df.columns and df['HomeTeam'].hasnans:
+        df = df[df['HomeTeam'].notna()]
+    unnamed = [column for column in df.columns if column.startswith('Unnamed')]
+    return df.drop(columns=unnamed) if unnamed else df
+
+
+def _read_rows(season_file, columns):
+    """Tek sezon dosyasını sözlük satırları olarak oku (işçi süreçte çalışır)"""
+    try:
+        with open(season_file.path, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+            rows = []
+            for row in csv.DictReader(f):
+                if not row.get('HomeTeam'):
+                    continue
+                row.pop(None, None)
+                row['League'] = season_file.league
+                row['Season'] = season_file.season
+                rows.append(row)
+            return rows
+    except OSError as e:
+        print(f"  ❌ {season_file.league} {season_file.season}: Hata - {e}", file=sys.stderr)
+        return None
+
+
+def main():
+    """Ana fonksiyon - Katalog özeti ve yükleme süresi"""
+    import time
+
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "../data/"
+    catalog = DataCatalog(data_path)
+
+    print(f"🗂️ {data_path}")
+    for league in catalog.leagues:
+        seasons = catalog.seasons(league)
+        print(f"  {league:<4} {LEAGUES.get(league, '?'):<24} {len(seasons):>3} sezon ({seasons[0]} → {seasons[-1]})")
+
+    start = time.perf_counter()
+    df = catalog.load_frame(columns=CORE_COLUMNS, compact=True)
+    elapsed = time.perf_counter() - start
+    memory = df.memory_usage(deep=True).sum() / (1024 * 1024)
+    print(f"\n⏱️ {len(catalog.files())} dosya, {len(df):,} maç: {elapsed:.2f} sn, {memory:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
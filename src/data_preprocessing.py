@@ -8,10 +8,11 @@ Description: Premier League verilerini yükleme, temizleme ve ön işleme modül
 
 import pandas as pd
 import numpy as np
-import os
-import glob
 from datetime import datetime
 from typing import Tuple, List, Optional
+from data_catalog import DataCatalog, DEFAULT_LEAGUES
+from match_dates import to_datetime
+from team_registry import REGISTRY
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -20,57 +21,42 @@ class FootballDataPreprocessor:
     İngiliz Premier Ligi verilerini ön işleme sınıfı
     """
     
-    def __init__(self, data_path: str = "../data/"):
+    def __init__(self, data_path: str = "../data/", leagues: Optional[List[str]] = DEFAULT_LEAGUES,
+                 seasons: Optional[Tuple[int, int]] = None, workers: Optional[int] = None, store=None):
         """
         Args:
             data_path (str): CSV dosyalarının bulunduğu klasör yolu
+            leagues (list): Yüklenecek lig kodları (None = hepsi)
+            seasons (tuple): (ilk, son) sezon başlangıç yılı aralığı (None = hepsi)
+            workers (int): Paralel okuma için işçi süreç sayısı
+            store (MatchStore): Verilirse maçlar CSV yerine SQLite deposundan okunur
         """
         self.data_path = data_path
+        self.catalog = DataCatalog(data_path)
+        self.source = store if store is not None else self.catalog
+        self.leagues = leagues
+        self.seasons = seasons
+        self.workers = workers
         self.raw_data = None
         self.processed_data = None
         self.team_mapping = {}
         
     def load_all_seasons(self) -> pd.DataFrame:
         """
-        Tüm sezonların CSV dosyalarını yükler ve birleştirir
+        Seçili lig ve sezonların CSV dosyalarını paralel yükler ve birleştirir
         
         Returns:
             pd.DataFrame: Birleştirilmiş veri
         """
         print("🔄 Tüm sezonları yüklüyor ve birleştiriyor...")
         
-        # CSV dosyalarını bul
-        csv_files = glob.glob(os.path.join(self.data_path, "E0*.csv"))
-        if not csv_files:
-            raise FileNotFoundError(f"❌ {self.data_path} klasöründe CSV dosyası bulunamadı!")
+        self.raw_data = self.source.load_frame(leagues=self.leagues, seasons=self.seasons, workers=self.workers)
         
-        all_seasons = []
+        counts = self.raw_data.groupby(['League', 'Season'], sort=False).size()
+        for (league, season), count in counts.items():
+            print(f"  ✅ {league} {season}: {count} maç yüklendi")
         
-        for file_path in sorted(csv_files):
-            # Sezon adını dosya adından çıkar
-            season_name = os.path.basename(file_path).replace('.csv', '').replace('E0 ', '')
-            
-            try:
-                # CSV'yi oku
-                df = pd.read_csv(file_path)
-                
-                # Sezon sütunu ekle
-                df['Season'] = season_name
-                
-                all_seasons.append(df)
-                print(f"  ✅ {season_name}: {len(df)} maç yüklendi")
-                
-            except Exception as e:
-                print(f"  ❌ {season_name}: Hata - {str(e)}")
-                continue
-        
-        if not all_seasons:
-            raise ValueError("❌ Hiçbir sezon verisi yüklenemedi!")
-        
-        # Tüm sezonları birleştir
-        self.raw_data = pd.concat(all_seasons, ignore_index=True)
-        
-        print(f"\n🎯 Toplam {len(all_seasons)} sezon birleştirildi")
+        print(f"\n🎯 Toplam {len(counts)} sezon birleştirildi")
         print(f"📊 Toplam veri boyutu: {self.raw_data.shape[0]:,} satır × {self.raw_data.shape[1]} sütun")
         
         return self.raw_data
@@ -90,7 +76,8 @@ class FootballDataPreprocessor:
         
         # 1. Tarih sütununu düzelt
         print("  📅 Tarih sütununu düzeltiliyor...")
-        df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y', errors='coerce')
+        # Sezonların bir kısmı gg/aa/yy, bir kısmı gg/aa/yyyy: ikisi de ortak ayrıştırıcıyla okunur
+        df['Date'] = to_datetime(df['Date'])
         
         invalid_dates = df['Date'].isnull().sum()
         if invalid_dates > 0:
@@ -157,33 +144,16 @@ class FootballDataPreprocessor:
         Returns:
             pd.DataFrame: Standardize edilmiş veri
         """
-        # Takım isimleri için mapping sözlüğü
-        team_name_mapping = {
-            # Ortak hatalar ve alternatif isimler
-            'Man United': 'Manchester United',
-            'Man Utd': 'Manchester United',
-            'Man City': 'Manchester City',
-            'Man Utd': 'Manchester United',
-            'Tottenham': 'Tottenham Hotspur',
-            'Spurs': 'Tottenham Hotspur',
-            'Leicester': 'Leicester City',
-            'Wolves': 'Wolverhampton Wanderers',
-            'Brighton': 'Brighton & Hove Albion',
-            'West Ham': 'West Ham United',
-            'Newcastle': 'Newcastle United',
-            'Norwich': 'Norwich City',
-            'Crystal Palace': 'Crystal Palace',
-            'Sheffield United': 'Sheffield United',
-            'Sheffield Utd': 'Sheffield United'
-        }
+        # Takma adları ortak kayıttaki kanonik isimlere çevir (CSV ve API'lerle aynı)
+        raw_names = pd.unique(pd.concat([df['HomeTeam'], df['AwayTeam']]))
+        team_name_mapping = {name: REGISTRY.canonical(name) for name in raw_names}
         
-        # Home ve Away takım isimlerini standardize et
-        df['HomeTeam'] = df['HomeTeam'].replace(team_name_mapping)
-        df['AwayTeam'] = df['AwayTeam'].replace(team_name_mapping)
+        df['HomeTeam'] = df['HomeTeam'].map(team_name_mapping)
+        df['AwayTeam'] = df['AwayTeam'].map(team_name_mapping)
         
-        # Takım mapping'ini sakla
-        unique_teams = sorted(list(set(df['HomeTeam'].unique()) | set(df['AwayTeam'].unique())))
-        self.team_mapping = {team: idx for idx, team in enumerate(unique_teams)}
+        # Takım kimlikleri ortak kayıttan gelir (tüm modüllerde aynı tam sayılar)
+        unique_teams = sorted(set(team_name_mapping.values()))
+        self.team_mapping = {team: REGISTRY.intern(team) for team in unique_teams}
         
         print(f"    📝 {len(unique_teams)} benzersiz takım bulundu ve standardize edildi")
         
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📈 Elo Ratings - Tek geçişte Elo reyting zaman çizelgesi
+Author: Berke Özkul
+Description: Maçları kronolojik sırayla bir kez dolaşarak her takımın her
+maçtan sonraki reytingini takım başına sıralı (tarih, reyting) dizilerinde
+saklar; "X takımının D tarihindeki reytingi" sorgusu ikili arama ile
+cevaplanır (sadece built-in Python)
+"""
+
+from array import array
+from bisect import bisect_left
+from datetime import date
+
+from match_dates import to_ordinal
+from team_registry import REGISTRY
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 20.0
+# Ev sahibi avantajı (Elo puanı)
+HOME_ADVANTAGE = 60.0
+
+
+def margin_multiplier(goal_difference):
+    """Gol farkı çarpanı (eloratings.net): 0-1 fark 1, 2 fark 1.5, 3+ (11 + N) / 8"""
+    goal_difference = abs(goal_difference)
+    if goal_difference <= 1:
+        return 1.0
+    if goal_difference == 2:
+        return 1.5
+    return (11 + goal_difference) / 8
+
+
+class TeamHistory:
+    """Bir takımın maç sonrası reytingleri (tarihe göre sıralı)"""
+
+    __slots__ = ('days', 'ratings', 'matches')
+
+    def __init__(self):
+        self.days = array('l')
+        self.ratings = array('d')
+        # Zaman çizelgesindeki maç sırası (rakip/skor bilgisi için)
+        self.matches = array('l')
+
+
+class EloTimeline:
+    """
+    Elo reyting zaman çizelgesi
+    - build(): maçlar tarihe göre sıralanır ve tek geçişte işlenir
+    - extend(): yeni maçlar mevcut reytinglerin üzerine işlenir (yeni sezonlar)
+    - rating()/features(): tarih itibarıyla reyting (ikili arama, maç taraması yok)
+    - history(): takımın maç maç reyting geçmişi
+    """
+
+    def __init__(self, k_factor=K_FACTOR, home_advantage=HOME_ADVANTAGE, initial_rating=INITIAL_RATING):
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.initial_rating = initial_rating
+        self.histories = {}
+        # Sıralı maçlar: (gün, ev, deplasman, ev golü, dep golü)
+        self.matches = []
+        self.pre_match = []
+
+    @classmethod
+    def from_rows(cls, rows, **kwargs):
+        """Date/HomeTeam/AwayTeam/FTHG/FTAG alanlı satırlardan oluştur"""
+        timeline = cls(**kwargs)
+        timeline.build((row.get('Date'), row['HomeTeam'], row['AwayTeam'], row['FTHG'], row['FTAG'])
+                       for row in rows)
+        return timeline
+
+    @classmethod
+    def from_frame(cls, df, **kwargs):
+        """Date/HomeTeam/AwayTeam/FTHG/FTAG sütunlu DataFrame'den oluştur"""
+        timeline = cls(**kwargs)
+        timeline.build(zip(df['Date'], df['HomeTeam'], df['AwayTeam'], df['FTHG'], df['FTAG']))
+        return timeline
+
+    @classmethod
+    def from_catalog(cls, catalog, leagues=None, seasons=None, **kwargs):
+        """DataCatalog'daki lig/sezon dosyalarından oluştur (None = tüm ligler)"""
+        rows = catalog.load_rows(leagues=leagues, seasons=seasons)
+        return cls.from_rows(rows, **kwargs)
+
+    def build(self, matches):
+        """
+        Reytingleri tek kronolojik geçişte hesapla
+
+        Args:
+            matches: (tarih, ev sahibi, deplasman, ev golü, deplasman golü) demetleri
+
+        Returns:
+            list: Girdi sırasıyla maç öncesi (ev reytingi, deplasman reytingi);
+            tarihi veya skoru okunamayan maçlarda (None, None)
+        """
+        self.histories = {}
+        self.matches = []
+        self.pre_match = []
+        return self.extend(matches)
+
+    def extend(self, matches):
+        """
+        Yeni maçları mevcut reytinglerin üzerine işle (ör. yeni sezon; baştan hesaplamadan)
+
+        Raises:
+            ValueError: Yeni maçlar son işlenen maçtan önceyse
+
+        Returns:
+            list: build() gibi, girdi sırasıyla maç öncesi reytingler
+        """
+        parsed = []
+        for position, (when, home_team, away_team, home_goals, away_goals) in enumerate(matches):
+            # Tarih metinleri match_dates önbelleğinden okunur (her metin bir kez ayrıştırılır)
+            day = to_ordinal(when)
+            if day is None:
+                parsed.append(None)
+                continue
+            try:
+                home_goals, away_goals = int(home_goals), int(away_goals)
+            except (TypeError, ValueError):
+                # Oynanmamış maç (boş skor veya NaN)
+                parsed.append(None)
+                continue
+            parsed.append((day, position, REGISTRY.canonical(home_team), REGISTRY.canonical(away_team),
+                           home_goals, away_goals))
+
+        pre_match = [(None, None)] * len(parsed)
+        ratings = {team: history.ratings[-1] for team, history in self.histories.items()}
+        initial = self.initial_rating
+
+        # Aynı gündeki maçlar girdi sırasını korur
+        ordered = sorted(m for m in parsed if m)
+        if ordered and self.matches and ordered[0][0] < self.matches[-1][0]:
+            raise ValueError("Maçlar kronolojik sırayla eklenmeli")
+        for day, position, home_team, away_team, home_goals, away_goals in ordered:
+            home_rating = ratings.get(home_team, initial)
+            away_rating = ratings.get(away_team, initial)
+            pre_match[position] = (home_rating, away_rating)
+
+            expected_home = 1.0 / (1.0 + 10 ** ((away_rating - home_rating - self.home_advantage) / 400.0))
+            actual_home = 1.0 if home_goals > away_goals else 0.5 if home_goals == away_goals else 0.0
+            change = self.k_factor * margin_multiplier(home_goals - away_goals) * (actual_home - expected_home)
+
+            ratings[home_team] = home_rating + change
+            ratings[away_team] = away_rating - change
+
+            match_index = len(self.matches)
+            self.matches.append((day, home_team, away_team, home_goals, away_goals))
+            for team in (home_team, away_team):
+                history = self.histories.get(team)
+                if history is None:
+                    history = self.histories[team] = TeamHistory()
+                history.days.append(day)
+                history.ratings.append(ratings[team])
+                history.matches.append(match_index)
+
+        self.pre_match.extend(pre_match)
+        return pre_match
+
+    @property
+    def teams(self):
+        """Zaman çizelgesindeki takımlar"""
+        return sorted(self.histories)
+
+    def _history(self, team):
+        return self.histories.get(REGISTRY.canonical(team))
+
+    def rating(self, team, as_of=None):
+        """
+        Takımın reytingi
+
+        Args:
+            team (str): Takım ismi veya takma adı
+            as_of: Bu tarihten önce oynanan maçlar dikkate alınır (None = en güncel)
+
+        Returns:
+            float: Reyting (hiç maçı yoksa başlangıç reytingi)
+        """
+        history = self._history(team)
+        if history is None or not history.ratings:
+            return self.initial_rating
+        if as_of is None:
+            return history.ratings[-1]
+
+        day = to_ordinal(as_of)
+        if day is None:
+            raise ValueError(f"Geçersiz tarih: {as_of}")
+        position = bisect_left(history.days, day) - 1
+        return history.ratings[position] if position >= 0 else self.initial_rating
+
+    def expected_score(self, home_team, away_team, as_of=None):
+        """Ev sahibinin beklenen puanı (galibiyet 1, beraberlik 0.5)"""
+        difference = self.rating(home_team, as_of) + self.home_advantage - self.rating(away_team, as_of)
+        return 1.0 / (1.0 + 10 ** (-difference / 400.0))
+
+    def features(self, home_team, away_team, as_of=None):
+        """Tahmin modelleri için maç öncesi Elo özellikleri"""
+        home_rating = self.rating(home_team, as_of)
+        away_rating = self.rating(away_team, as_of)
+        return elo_features(home_rating, away_rating, self.home_advantage)
+
+    def history(self, team, start=None, end=None):
+        """
+        Takımın maç maç reyting geçmişi
+
+        Args:
+            start, end: İsteğe bağlı tarih aralığı (dahil)
+
+        Returns:
+            list: {'date', 'rating', 'change', 'opponent', 'venue', 'score'} sözlükleri
+        """
+        history = self._history(team)
+        if history is None:
+            return []
+
+        first = bisect_left(history.days, to_ordinal(start)) if start is not None else 0
+        last = bisect_left(history.days, to_ordinal(end) + 1) if end is not None else len(history.days)
+
+        canonical = REGISTRY.canonical(team)
+        entries = []
+        for i in range(first, last):
+            day, home_team, away_team, home_goals, away_goals = self.matches[history.matches[i]]
+            previous = history.ratings[i - 1] if i > 0 else self.initial_rating
+            at_home = home_team == canonical
+            entries.append({
+                'date': date.fromordinal(day).isoformat(),
+                'rating': round(history.ratings[i], 1),
+                'change': round(history.ratings[i] - previous, 1),
+                'opponent': away_team if at_home else home_team,
+                'venue': 'H' if at_home else 'A',
+                'score': f"{home_goals}-{away_goals}"
+            })
+        return entries
+
+    def history_payload(self, team, start=None, end=None, as_of=None):
+        """
+        /teams/{team}/rating-history yanıtı
+
+        Raises:
+            ValueError: Tarih okunamazsa
+        """
+        for value in (start, end, as_of):
+            if value is not None and to_ordinal(value) is None:
+                raise ValueError(f"Geçersiz tarih: {value}")
+
+        team = REGISTRY.canonical(team)
+        history = self.history(team, start, end)
+        return {
+            'success': True,
+            'team': team,
+            'as_of': as_of,
+            'rating': round(self.rating(team, as_of), 1),
+            'from': start,
+            'to': end,
+            'count': len(history),
+            'history': history
+        }
+
+    def table(self, as_of=None, limit=None):
+        """Reyting sıralaması"""
+        rows = sorted(((team, self.rating(team, as_of)) for team in self.histories), key=lambda row: -row[1])
+        return [{'team': team, 'rating': round(rating, 1)} for team, rating in rows[:limit]]
+
+
+def elo_features(home_rating, away_rating, home_advantage=HOME_ADVANTAGE):
+    """Maç öncesi reytinglerden özellik sözlüğü"""
+    difference = home_rating + home_advantage - away_rating
+    return {
+        'home_elo': home_rating,
+        'away_elo': away_rating,
+        'elo_diff': home_rating - away_rating,
+        'elo_home_expectation': 1.0 / (1.0 + 10 ** (-difference / 400.0))
+    }
+
+
+def main():
+    """Ana fonksiyon - Zaman çizelgesini oluştur ve sorgu süresini ölç"""
+    import sys
+    import time
+    from data_catalog import DataCatalog
+
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "../data/"
+    rows = DataCatalog(data_path).load_rows()
+
+    start = time.perf_counter()
+    timeline = EloTimeline.from_rows(rows)
+    elapsed = time.perf_counter() - start
+    print(f"📈 {len(timeline.matches):,} maç, {len(timeline.histories)} takım: {elapsed * 1000:.1f} ms (tek geçiş)")
+
+    queries = 100_000
+    teams = timeline.teams
+    start = time.perf_counter()
+    for i in range(queries):
+        timeline.rating(teams[i % len(teams)], date(2010 + i % 9, 1 + i % 12, 1))
+    elapsed = time.perf_counter() - start
+    print(f"🔎 {queries:,} tarih itibarıyla sorgu: {elapsed / queries * 1e6:.2f} µs/sorgu")
+
+    print("\n🏆 Güncel sıralama:")
+    for row in timeline.table(limit=10):
+        print(f"  {row['team']:<20} {row['rating']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
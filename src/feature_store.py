@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧮 Feature Store - Sürümlü, sütunsal özellik deposu
+Author: Berke Özkul
+Description: İsimli özellik kümelerini lig kapsamı ve sezon başına tipli
+sütunsal .npz dosyalarına yazar; satırlar match_id ile anahtarlanır. Her
+sezon parçası kaynak CSV'lerin boyut/değişiklik zamanını ve onu üreten
+kodun sürümünü kaydeder: değişmeyen sezonlar yeniden hesaplanmaz, yeni
+sezonlar üreticinin kaydedilmiş durumundan (Elo, maç geçmişi) devam
+edilerek eklenir. Eğitim, backtest ve basit API özellikleri buradan okur
+
+Yerleşim:
+    <kök>/<küme>/v<sürüm>/<kapsam>/<sezon>.npz     # ör. features/match_features/v1/E0/2005-2006.npz
+    <kök>/<küme>/v<sürüm>/<kapsam>/manifest.json   # parçalar, kaynak dosyalar, kod sürümü
+    <kök>/<küme>/v<sürüm>/<kapsam>/state.pkl       # son parçadan sonraki üretici durumu
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+from data_catalog import DataCatalog
+from elo_ratings import elo_features, EloTimeline, INITIAL_RATING
+from match_dates import EPOCH_DAY, to_datetime
+from match_history import MatchHistory
+from odds_features import odds_features
+from team_registry import REGISTRY
+
+# Veri klasöründeki varsayılan kök (FEATURE_STORE ile ezilir)
+STORE_DIRNAME = 'features'
+# Dosya yerleşimi değişince eski manifestler yok sayılır ve kümeler baştan yazılır
+FORMAT_VERSION = 1
+MANIFEST_FILENAME = 'manifest.json'
+STATE_FILENAME = 'state.pkl'
+
+MATCH_FEATURES = 'match_features'
+# Basit modelin form penceresi (SimpleFootballDataProcessor.add_form_features ile aynı)
+SIMPLE_FORM_WINDOW = 5
+
+# Her satırın anahtarı ve sonucu (durum bu sütunlardan yeniden kurulabilir)
+KEY_COLUMNS = ('match_id', 'league', 'season', 'day', 'home_team', 'away_team', 'home_goals', 'away_goals', 'result')
+# Gelişmiş modelin girdileri (_process_data sırasıyla; takım kodları okuyan modelde verilir)
+HISTORY_COLUMNS = (
+    'home_avg_goals_for', 'home_avg_goals_against', 'home_win_rate', 'home_recent_form', 'home_home_advantage',
+    'away_avg_goals_for', 'away_avg_goals_against', 'away_win_rate', 'away_recent_form', 'away_away_performance',
+    'h2h_home_wins', 'h2h_away_wins', 'h2h_draws', 'h2h_avg_total_goals'
+)
+ELO_COLUMNS = tuple(elo_features(INITIAL_RATING, INITIAL_RATING))
+CALENDAR_COLUMNS = ('month', 'day_of_week')
+# Basit modelin son 5 maç formu
+FORM_COLUMNS = tuple(f"{side}_form_{name}" for side in ('home', 'away')
+                     for name in ('matches', 'points', 'goals_for', 'goals_against', 'avg'))
+_FORM_COUNT_COLUMNS = frozenset(name for name in FORM_COLUMNS if not name.endswith('_avg'))
+
+FeatureSet = namedtuple('FeatureSet', ['name', 'version', 'builder', 'modules', 'description'])
+
+# İsim -> FeatureSet
+FEATURE_SETS = {}
+_code_versions = {}
+
+
+def register(name, version, builder, modules=(), description=''):
+    """
+    Özellik kümesi tanımla
+
+    Args:
+        version (int): Sütunlar veya anlamları değişince elle artırılır (yeni klasör)
+        builder: build(frame) ve replay(columns) sunan, pickle'lanabilir üretici sınıfı
+        modules (tuple): Kod sürümüne dahil edilen bağımlı modüller
+    """
+    FEATURE_SETS[name] = FeatureSet(name, version, builder, tuple(modules), description)
+    return FEATURE_SETS[name]
+
+
+def code_version(feature_set):
+    """
+    Kümeyi üreten kodun sürümü: "<sürüm>.<üretici ve bağımlı modüllerin kaynak özeti>"
+
+    Kaynaklardan biri değişirse kayıtlı parçalar geçersiz olur ve yeniden hesaplanır.
+    """
+    cached = _code_versions.get(feature_set.name)
+    if cached is None:
+        digest = hashlib.sha256()
+        for module_name in (feature_set.builder.__module__,) + feature_set.modules:
+            module = sys.modules.get(module_name) or importlib.import_module(module_name)
+            with open(module.__file__, 'rb') as f:
+                digest.update(f.read())
+        cached = _code_versions[feature_set.name] = f"{feature_set.version}.{digest.hexdigest()[:12]}"
+    return cached
+
+
+def match_id(league, day, home_team, away_team):
+    """Maç anahtarı: lig, gün ve kanonik takım isimlerinden kararlı 64 bit özet"""
+    key = f"{league}|{day}|{home_team}|{away_team}".encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little', signed=True)
+
+
+def default_root(data_path="../data/"):
+    """Depo kökü: FEATURE_STORE, yoksa <veri klasörü>/features"""
+    return os.environ.get('FEATURE_STORE') or os.path.join(data_path, STORE_DIRNAME)
+
+
+def _strings(values):
+    """Metin listesi -> sabit genişlikli unicode dizi (npz'de pickle gerektirmez)"""
+    return np.array(values, dtype=str)
+
+
+class MatchFeatureBuilder:
+    """
+    match_features üreticisi (AdvancedFootballPredictor._process_data ile ortak)
+    - Maçlar kronolojik tek geçişte işlenir; her satır yalnızca önceki maçları görür
+    - Durum (Elo zaman çizelgesi, maç geçmişi) korunur: build() sonraki sezonlarla devam eder
+    - Takımlar isim olarak saklanır; kodlamayı okuyan model yapar (yeni takım kodları kaydırmaz)
+    """
+
+    def __init__(self):
+        self.elo = EloTimeline()
+        self.history = MatchHistory()
+
+    @classmethod
+    def replay(cls, columns):
+        """Kayıtlı anahtar sütunlarından durumu kur (özellik hesaplanmaz)"""
+        builder = cls()
+        matches = list(zip(columns['day'].tolist(), columns['home_team'].tolist(), columns['away_team'].tolist(),
+                           columns['home_goals'].tolist(), columns['away_goals'].tolist()))
+        builder.elo.build(matches)
+        for match in matches:
+            builder.history.append(*match)
+        return builder
+
+    def build(self, frame):
+        """
+        Ham maçların maç öncesi özellikleri
+
+        Args:
+            frame (pd.DataFrame): HomeTeam/AwayTeam/FTHG/FTAG (+ Date, League, Season, oran) sütunları
+
+        Returns:
+            dict: Sütun adı -> np.ndarray (temizlenmiş maçlar, kronolojik sırayla)
+        """
+        import pandas as pd
+
+        # Temel temizlik; tarihler gg/aa/yy ve gg/aa/yyyy (her benzersiz tarih bir kez ayrıştırılır)
+        df = frame.dropna(subset=['HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'])
+        has_dates = 'Date' in df.columns
+        if has_dates:
+            df = df.assign(Date=to_datetime(df['Date']))
+            df = df.dropna(subset=['Date'])
+            df = df.sort_values('Date', kind='stable')
+        df = df.reset_index(drop=True)
+        count = len(df)
+
+        # Takım isimleri ortak kayıttaki kanonik isimlere çevrilir
+        raw_names = pd.unique(pd.concat([df['HomeTeam'], df['AwayTeam']]))
+        team_names = {name: REGISTRY.canonical(name) for name in raw_names}
+        home = df['HomeTeam'].map(team_names).tolist()
+        away = df['AwayTeam'].map(team_names).tolist()
+        home_goals = df['FTHG'].astype(int).to_numpy()
+        away_goals = df['FTAG'].astype(int).to_numpy()
+
+        if has_dates:
+            dates = df['Date'].to_numpy().astype('datetime64[D]')
+            epoch_days = dates.astype(np.int64)
+            days = epoch_days + EPOCH_DAY
+            # 1970-01-01 perşembe (weekday 3)
+            day_of_week = (epoch_days + 3) % 7
+            month = dates.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        else:
+            days = np.zeros(count, dtype=np.int64)
+            day_of_week = np.full(count, 5)
+            month = np.full(count, 6)
+        day_list = days.tolist()
+
+        # Maç öncesi Elo reytingleri (mevcut reytinglerin üzerine)
+        pre_match = self.elo.extend(zip(day_list if has_dates else [None] * count, home,
+                                        away, home_goals.tolist(), away_goals.tolist()))
+        initial = self.elo.initial_rating
+
+        # Tarih itibarıyla özellikler: her maçtan önce sorgulanır, sonra geçmişe eklenir
+        history = self.history
+        values = {name: [] for name in HISTORY_COLUMNS + ELO_COLUMNS + FORM_COLUMNS}
+        for home_team, away_team, day, goals_for, goals_against, (home_elo, away_elo) in zip(
+                home, away, day_list, home_goals.tolist(), away_goals.tolist(), pre_match):
+            position = len(history)
+            for name, value in history.features_at(position, home_team, away_team).items():
+                values[name].append(value)
+            for name, value in elo_features(initial if home_elo is None else home_elo,
+                                            initial if away_elo is None else away_elo,
+                                            self.elo.home_advantage).items():
+                values[name].append(value)
+            for side, team in (('home', home_team), ('away', away_team)):
+                matches, points, scored, conceded = history.form_at(team, position, SIMPLE_FORM_WINDOW)
+                values[f"{side}_form_matches"].append(matches)
+                values[f"{side}_form_points"].append(points)
+                values[f"{side}_form_goals_for"].append(scored)
+                values[f"{side}_form_goals_against"].append(conceded)
+                values[f"{side}_form_avg"].append(points / max(1, matches))
+            history.append(day, home_team, away_team, goals_for, goals_against)
+
+        leagues = df['League'].astype(str).tolist() if 'League' in df.columns else [''] * count
+        columns = {
+            'match_id': np.array([match_id(*key) for key in zip(leagues, day_list, home, away)], dtype=np.int64),
+            'league': _strings(leagues),
+            'season': _strings(df['Season'].astype(str).tolist() if 'Season' in df.columns else [''] * count),
+            'day': days.astype(np.int32),
+            'home_team': _strings(home),
+            'away_team': _strings(away),
+            'home_goals': home_goals.astype(np.int16),
+            'away_goals': away_goals.astype(np.int16),
+            'result': _strings(np.where(home_goals > away_goals, 'H', np.where(home_goals < away_goals, 'A', 'D'))),
+            'month': month.astype(np.int8),
+            'day_of_week': day_of_week.astype(np.int8)
+        }
+        for name, column in values.items():
+            columns[name] = np.array(column, dtype=np.int16 if name in _FORM_COUNT_COLUMNS else np.float64)
+
+        # Bahis piyasası olasılıkları (değerlendirme referansı; model girdisi değil)
+        market = odds_features(df)
+        for name in market.columns:
+            columns[name] = market[name].to_numpy(dtype=np.float64)
+        return columns
+
+
+register(
+    MATCH_FEATURES, 1, MatchFeatureBuilder,
+    modules=('match_history', 'elo_ratings', 'odds_features', 'match_dates', 'team_registry'),
+    description="Maç öncesi takım/ikili geçmişi, Elo, son 5 maç formu ve piyasa olasılıkları"
+)
+
+
+class FeatureStore:
+    """
+    Sürümlü özellik deposu
+    - materialize(): eksik veya değişen sezonları hesaplar (değişmeyenler atlanır)
+    - load(): sütunlar (np.ndarray sözlüğü), kronolojik ve match_id anahtarlı
+    - state(): üreticinin istenen son sezondan sonraki durumu (Elo, maç geçmişi)
+
+    Özellikler yalnızca önceki maçlara bağlı olduğu için bir kapsamın parçaları
+    katalogdaki ilk sezondan başlar; sezon aralığının ilk yılı yalnızca okumayı
+    filtreler. Değişen bir sezondan sonraki parçalar da yeniden hesaplanır.
+    """
+
+    def __init__(self, root=None, data_path="../data/", catalog=None, workers=None):
+        """
+        Args:
+            root (str): Depo kökü (None = default_root(data_path))
+            data_path (str): CSV'lerin bulunduğu veri klasörü
+            catalog (DataCatalog): Kaynak (None = DataCatalog(data_path))
+            workers (int): CSV okuma işçi süreç sayısı (varsayılan DATA_WORKERS)
+        """
+        self.root = root or default_root(data_path)
+        self.catalog = catalog if catalog is not None else DataCatalog(data_path)
+        self.workers = workers
+        self.last_report = None
+
+    # ------------------------------------------------------------------
+    # Yazma
+    # ------------------------------------------------------------------
+    def materialize(self, name, leagues=None, seasons=None):
+        """
+        Kümenin eksik veya değişen sezonlarını hesapla ve yaz
+
+        Args:
+            name (str): Küme adı (FEATURE_SETS)
+            leagues (list): Birlikte işlenen lig kodları (None = katalogdaki hepsi)
+            seasons (tuple): (ilk, son) başlangıç yılı aralığı; parçalar son yıla kadar yazılır
+
+        Returns:
+            dict: Küme, kapsam, kod sürümü, kullanılan/hesaplanan sezon ve satır sayıları, süre
+        """
+        start = time.perf_counter()
+        feature_set = self._feature_set(name)
+        version = code_version(feature_set)
+        leagues = self._leagues(leagues)
+        directory = self._directory(feature_set, leagues)
+        wanted = self._season_sources(leagues, seasons)
+        parts = self._read_manifest(directory, version)['parts']
+
+        reused = 0
+        for part, season in zip(parts, wanted):
+            if (part['season'] != season['season'] or part['sources'] != season['sources']
+                    or part['code_version'] != version
+                    or not os.path.exists(os.path.join(directory, part['file']))):
+                break
+            reused += 1
+
+        missing = wanted[reused:]
+        computed_rows = 0
+        if missing:
+            builder = self._builder_at(directory, feature_set, parts[:reused])
+            frame = self.catalog.load_frame(leagues=leagues, workers=self.workers,
+                                            seasons=(missing[0]['start_year'], missing[-1]['start_year']))
+            columns = builder.build(frame)
+            computed_rows = len(columns['match_id'])
+
+            os.makedirs(directory, exist_ok=True)
+            created = datetime.now().isoformat(timespec='seconds')
+            new_parts = []
+            for season in missing:
+                selected = columns['season'] == season['season']
+                filename = f"{season['season']}.npz"
+                _write_part(os.path.join(directory, filename), {key: values[selected] for key, values in columns.items()})
+                new_parts.append({
+                    'season': season['season'],
+                    'start_year': season['start_year'],
+                    'file': filename,
+                    'rows': int(selected.sum()),
+                    'sources': season['sources'],
+                    'code_version': version,
+                    'created': created
+                })
+
+            # Değişen sezondan sonraki eski parçalar geçersizdir (özellikler önceki maçlara bağlı)
+            kept_files = {part['file'] for part in new_parts}
+            for stale in parts[reused:]:
+                if stale['file'] not in kept_files:
+                    path = os.path.join(directory, stale['file'])
+                    if os.path.exists(path):
+                        os.remove(path)
+
+            parts = parts[:reused] + new_parts
+            self._write_state(directory, parts, builder)
+            self._write_manifest(directory, feature_set, version, leagues, parts, columns)
+
+        report = {
+            'name': name,
+            'scope': _scope(leagues),
+            'code_version': version,
+            'seasons': len(wanted),
+            'reused': reused,
+            'computed': len(missing),
+            'rows': sum(part['rows'] for part in parts[:len(wanted)]),
+            'computed_rows': computed_rows,
+            'seconds': time.perf_counter() - start
+        }
+        self.last_report = report
+        return report
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+    def load(self, name, leagues=None, seasons=None, columns=None):
+        """
+        Kümenin sütunları (eksik/değişen sezonlar önce hesaplanır)
+
+        Args:
+            seasons (tuple): (ilk, son) başlangıç yılı aralığı (önceki sezonlar özelliklerin geçmişidir)
+            columns (list): Okunacak sütunlar (None = hepsi)
+
+        Returns:
+            dict: Sütun adı -> np.ndarray (kronolojik sırayla)
+        """
+        self.materialize(name, leagues, seasons)
+        directory, parts = self._parts(name, leagues, seasons)
+        first = seasons[0] if seasons is not None else None
+        if first is not None:
+            parts = [part for part in parts if part['start_year'] >= first]
+        return _read_parts(directory, parts, columns)
+
+    def state(self, name, leagues=None, seasons=None):
+        """
+        Üreticinin istenen son sezondan sonraki durumu (ör. MatchFeatureBuilder.elo/.history)
+
+        Kaydedilmiş durum aynı parçalara aitse okunur; değilse anahtar sütunlardan yeniden kurulur.
+        """
+        self.materialize(name, leagues, seasons)
+        directory, parts = self._parts(name, leagues, seasons)
+        return self._builder_at(directory, self._feature_set(name), parts)
+
+    def manifest(self, name, leagues=None):
+        """Kapsamın manifestosu (henüz yazılmadıysa boş parça listesi)"""
+        feature_set = self._feature_set(name)
+        return self._read_manifest(self._directory(feature_set, self._leagues(leagues)), code_version(feature_set))
+
+    # ------------------------------------------------------------------
+    # Yardımcılar
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _feature_set(name):
+        feature_set = FEATURE_SETS.get(name)
+        if feature_set is None:
+            raise ValueError(f"Bilinmeyen özellik kümesi: {name} (mevcut: {', '.join(sorted(FEATURE_SETS))})")
+        return feature_set
+
+    def _leagues(self, leagues):
+        return sorted(leagues) if leagues is not None else self.catalog.leagues
+
+    def _directory(self, feature_set, leagues):
+        return os.path.join(self.root, feature_set.name, f"v{feature_set.version}", _scope(leagues))
+
+    def _parts(self, name, leagues, seasons):
+        """Kapsamın son sezon yılına kadar olan parçaları"""
+        feature_set = self._feature_set(name)
+        directory = self._directory(feature_set, self._leagues(leagues))
+        parts = self._read_manifest(directory, code_version(feature_set))['parts']
+        last = seasons[1] if seasons is not None else None
+        if last is not None:
+            parts = [part for part in parts if part['start_year'] <= last]
+        return directory, parts
+
+    def _season_sources(self, leagues, seasons):
+        """
+        Katalogdaki sezonlar ve kaynak dosya imzaları (ilk sezondan son yıla kadar)
+
+        Returns:
+            list: {'season', 'start_year', 'sources': [[lig, boyut, mtime_ns], ...]} (eskiden yeniye)
+        """
+        last = seasons[1] if seasons is not None else None
+        files = self.catalog.files(leagues, (None, last))
+        if not files:
+            raise FileNotFoundError(f"❌ {self.catalog.data_path} klasöründe eşleşen sezon dosyası bulunamadı!")
+
+        grouped = {}
+        for season_file in files:
+            stat = os.stat(season_file.path)
+            season = grouped.setdefault(season_file.start_year, {
+                'season': season_file.season, 'start_year': season_file.start_year, 'sources': []
+            })
+            season['sources'].append([season_file.league, stat.st_size, stat.st_mtime_ns])
+        return [grouped[start_year] for start_year in sorted(grouped)]
+
+    def _builder_at(self, directory, feature_set, parts):
+        """Verilen parçalardan sonraki üretici: kaydedilmiş durum veya anahtar sütunlarından yeniden kurulum"""
+        if not parts:
+            return feature_set.builder()
+        signature = _signature(parts)
+        try:
+            with open(os.path.join(directory, STATE_FILENAME), 'rb') as f:
+                saved = pickle.load(f)
+            if saved.get('parts') == signature:
+                return saved['builder']
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            pass
+        return feature_set.builder.replay(_read_parts(directory, parts, KEY_COLUMNS))
+
+    @staticmethod
+    def _read_manifest(directory, version):
+        """Manifesto; yoksa veya yerleşim sürümü farklıysa boş"""
+        try:
+            with open(os.path.join(directory, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = None
+        if not manifest or manifest.get('format') != FORMAT_VERSION:
+            return {'format': FORMAT_VERSION, 'code_version': version, 'parts': []}
+        return manifest
+
+    @staticmethod
+    def _write_manifest(directory, feature_set, version, leagues, parts, columns):
+        manifest = {
+            'format': FORMAT_VERSION,
+            'name': feature_set.name,
+            'version': feature_set.version,
+            'code_version': version,
+            'description': feature_set.description,
+            'leagues': leagues,
+            'updated': datetime.now().isoformat(timespec='seconds'),
+            'columns': {name: values.dtype.str for name, values in columns.items()},
+            'parts': parts
+        }
+        _atomic_write(os.path.join(directory, MANIFEST_FILENAME),
+                      json.dumps(manifest, ensure_ascii=False, indent=1).encode('utf-8'))
+
+    @staticmethod
+    def _write_state(directory, parts, builder):
+        state = {'parts': _signature(parts), 'builder': builder}
+        _atomic_write(os.path.join(directory, STATE_FILENAME), pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _scope(leagues):
+    """Birlikte işlenen liglerin klasör adı: E0, E0+E1, ..."""
+    return '+'.join(leagues)
+
+
+def _signature(parts):
+    return [[part['season'], part['sources'], part['code_version']] for part in parts]
+
+
+def _atomic_write(path, data):
+    """Geçici dosyaya yazıp yerine taşı (okuyucular yarım dosya görmez)"""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+def _write_part(path, columns):
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        np.savez(f, **columns)
+    os.replace(temporary, path)
+
+
+def _read_parts(directory, parts, columns=None):
+    """Parçaları sütun sütun birleştir; bir parçada olmayan (ör. oran) sütunlar NaN"""
+    loaded = []
+    for part in parts:
+        with np.load(os.path.join(directory, part['file']), allow_pickle=False) as data:
+            names = data.files if columns is None else [name for name in columns if name in data.files]
+            loaded.append((part['rows'], {name: data[name] for name in names}))
+
+    names = list(dict.fromkeys(name for _, arrays in loaded for name in arrays))
+    return {
+        name: np.concatenate([arrays[name] if name in arrays else np.full(rows, np.nan) for rows, arrays in loaded])
+        for name in names
+    }
+
+
+def main():
+    """Ana fonksiyon - Kümeleri oluştur ve ikinci okumanın süresini ölç"""
+    import argparse
+
+    from data_catalog import DEFAULT_LEAGUES, parse_season_range
+
+    # Betik olarak çalışınca üretici __main__ yerine modül adıyla pickle'lansın
+    import feature_store
+
+    parser = argparse.ArgumentParser(description="Özellik deposunu oluştur/güncelle")
+    parser.add_argument('--data', default="../data/", help="Veri klasörü")
+    parser.add_argument('--root', help="Depo kökü (varsayılan: FEATURE_STORE veya <veri>/features)")
+    parser.add_argument('--league', action='append', help="Lig kodu (tekrarlanabilir; varsayılan: E0)")
+    parser.add_argument('--seasons', help="Sezon aralığı (ör. 2010:2018)")
+    parser.add_argument('--set', default=MATCH_FEATURES, choices=sorted(feature_store.FEATURE_SETS))
+    args = parser.parse_args()
+
+    try:
+        seasons = parse_season_range(args.seasons)
+    except ValueError as e:
+        parser.error(str(e))
+
+    store = feature_store.FeatureStore(args.root, data_path=args.data)
+    leagues = args.league or list(DEFAULT_LEAGUES)
+    print(f"🧮 {args.set} → {store.root}")
+
+    for attempt in ('ilk', 'ikinci'):
+        report = store.materialize(args.set, leagues, seasons)
+        print(f"  {attempt:<7} {report['scope']:<8} {report['reused']:>3} sezon hazır, {report['computed']:>3} hesaplandı, "
+              f"{report['rows']:,} satır ({report['seconds'] * 1000:.1f} ms, kod {report['code_version']})")
+
+    start = time.perf_counter()
+    columns = store.load(args.set, leagues, seasons)
+    print(f"  📖 load: {len(columns)} sütun × {len(columns['match_id']):,} satır "
+          f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
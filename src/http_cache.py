@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧊 HTTP Cache - ETag ve Cache-Control yardımcıları
+Author: Berke Özkul
+Description: İçerik özetinden ETag, If-None-Match ile 304 yanıtları, model
+sürümünden türetilen Cache-Control başlıkları ve kayıtlı trafiği tekrar
+oynatarak origin isteklerindeki düşüşü ölçen araç
+"""
+
+import hashlib
+import os
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+
+# Model sürümüne bağlı yanıtlar (teams, model-info, predict) için önbellek süresi
+MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', '300'))
+# Sürümü bilinmeyen/yedek modelin yanıtları daha kısa süre tutulur
+FALLBACK_MAX_AGE = int(os.environ.get('HTTP_CACHE_FALLBACK_MAX_AGE', '30'))
+# /health sık sorgulanır; kısa süreli cache yeterli
+HEALTH_MAX_AGE = int(os.environ.get('HTTP_CACHE_HEALTH_MAX_AGE', '5'))
+
+
+def etag_for(body):
+    """Yanıt gövdesinden zayıf ETag (sıkıştırılmış sürümler de eşleşir)"""
+    return 'W/"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_for_key(*parts):
+    """
+    Yanıtı belirleyen girdilerden ETag (gövde üretilmeden hesaplanır)
+
+    Args:
+        *parts: Yanıtı tek başına belirleyen değerler (sürüm, yol, parametreler)
+    """
+    key = '\x1f'.join(str(part) for part in parts).encode('utf-8')
+    return 'W/"' + hashlib.blake2b(key, digest_size=12).hexdigest() + '"'
+
+
+def _opaque_tag(etag):
+    """Zayıf karşılaştırma için W/ önekini at"""
+    etag = etag.strip()
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def is_not_modified(if_none_match, etag):
+    """
+    If-None-Match başlığı mevcut ETag ile eşleşiyor mu
+
+    Args:
+        if_none_match (str): İstemcinin gönderdiği başlık (virgülle ayrılmış liste veya *)
+        etag (str): Yanıtın güncel ETag'i
+    """
+    if not if_none_match or not etag:
+        return False
+
+    if if_none_match.strip() == '*':
+        return True
+
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == current for candidate in if_none_match.split(','))
+
+
+def cache_control(model_version=None, max_age=None):
+    """
+    Model sürümüne göre Cache-Control başlığı
+
+    Sürüm değişince ETag'ler de değiştiği için istemciler süre dolunca
+    ucuz bir 304 ile yeniden doğrular; yedek model kısa süre tutulur.
+    """
+    if max_age is None:
+        max_age = FALLBACK_MAX_AGE if model_version in (None, 'fallback') else MAX_AGE
+    return f"public, max-age={max_age}, stale-while-revalidate={max_age}"
+
+
+HEALTH_CACHE_CONTROL = f"public, max-age={HEALTH_MAX_AGE}"
+
+
+class CachingClient:
+    """
+    Tekrar oynatma için basit HTTP cache'li istemci (mobil uygulama/CDN gibi)
+    - Cache-Control max-age süresince yanıtı origin'e gitmeden sunar
+    - Süre dolunca If-None-Match ile yeniden doğrular
+    """
+
+    def __init__(self, fetch, clock):
+        """
+        Args:
+            fetch (callable): (yol, başlıklar) -> (durum, başlıklar, gövde)
+            clock (callable): Saniye cinsinden (sanal) zaman
+        """
+        self.fetch = fetch
+        self.clock = clock
+        self.entries = {}
+        self.stats = {'requests': 0, 'cache_hits': 0, 'revalidated': 0,
+                      'full_responses': 0, 'origin_requests': 0, 'bytes_received': 0}
+
+    def get(self, path):
+        self.stats['requests'] += 1
+        now = self.clock()
+        entry = self.entries.get(path)
+
+        if entry is not None and now < entry['expires']:
+            self.stats['cache_hits'] += 1
+            return entry['body']
+
+        headers = {'Accept-Encoding': 'gzip'}
+        if entry is not None and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+
+        status, response_headers, body = self.fetch(path, headers)
+        self.stats['origin_requests'] += 1
+        self.stats['bytes_received'] += len(body)
+
+        max_age = _parse_max_age(response_headers.get('Cache-Control'))
+        if status == 304 and entry is not None:
+            self.stats['revalidated'] += 1
+            entry['expires'] = now + max_age
+            return entry['body']
+
+        self.stats['full_responses'] += 1
+        self.entries[path] = {
+            'etag': response_headers.get('ETag'),
+            'expires': now + max_age,
+            'body': body
+        }
+        return body
+
+
+def _parse_max_age(value):
+    """Cache-Control başlığından max-age (yoksa 0)"""
+    for directive in (value or '').split(','):
+        name, _, number = directive.strip().partition('=')
+        if name == 'max-age':
+            try:
+                return int(number)
+            except ValueError:
+                return 0
+    return 0
+
+
+def build_trace(n_requests=2000, duration=1800, n_users=50, seed=42):
+    """
+    Flutter uygulamasına benzeyen istek dizisi: açılışta /health ve /teams,
+    ardından popülerliği Zipf dağılımına uyan maç tahminleri
+
+    Returns:
+        list: (zaman, kullanıcı, yol) üçlüleri (zamana göre sıralı)
+    """
+    from team_registry import REGISTRY
+
+    rng = random.Random(seed)
+    teams = sorted(REGISTRY.names)
+    fixtures = [(h, a) for h in teams for a in teams if h != a]
+    rng.shuffle(fixtures)
+    weights = [1.0 / (rank + 1) for rank in range(len(fixtures))]
+
+    trace = []
+    for _ in range(n_requests):
+        at = rng.uniform(0, duration)
+        user = rng.randrange(n_users)
+        roll = rng.random()
+        if roll < 0.25:
+            path = '/health'
+        elif roll < 0.45:
+            path = '/teams'
+        else:
+            home, away = rng.choices(fixtures, weights=weights)[0]
+            path = '/predict?home=' + urllib.request.quote(home) + '&away=' + urllib.request.quote(away)
+        trace.append((at, user, path))
+
+    trace.sort()
+    return trace
+
+
+def replay(fetch, trace, shared_cache=False):
+    """
+    İstek dizisini cache'li istemcilerle tekrar oynat
+
+    Args:
+        fetch (callable): (yol, başlıklar) -> (durum, başlıklar, gövde)
+        trace (list): build_trace çıktısı
+        shared_cache (bool): True ise tüm kullanıcılar tek cache'i paylaşır (CDN)
+
+    Returns:
+        dict: Toplam istek, origin isteği ve aktarılan bayt sayıları
+    """
+    clock_value = [0.0]
+    clients = {}
+
+    def clock():
+        return clock_value[0]
+
+    for at, user, path in trace:
+        clock_value[0] = at
+        key = 'cdn' if shared_cache else user
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = CachingClient(fetch, clock)
+        client.get(path)
+
+    totals = {}
+    for client in clients.values():
+        for name, value in client.stats.items():
+            totals[name] = totals.get(name, 0) + value
+    return totals
+
+
+def urllib_fetch(base_url):
+    """Çalışan bir sunucuya istek atan fetch fonksiyonu"""
+    def fetch(path, headers):
+        request = urllib.request.Request(base_url + path, headers=headers)
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, dict(e.headers), e.read()
+    return fetch
+
+
+def main():
+    """Ana fonksiyon - Çalışan bir API'ye kayıtlı trafiği tekrar oynat"""
+    base_url = sys.argv[1] if len(sys.argv) > 1 else 'http://localhost:8000'
+    trace = build_trace()
+    fetch = urllib_fetch(base_url)
+
+    print(f"🧊 HTTP cache tekrar oynatma: {base_url}")
+    print(f"📼 {len(trace)} istek, {len({u for _, u, _ in trace})} kullanıcı")
+    print("=" * 60)
+
+    for label, shared in (('Uygulama cache\'i (kullanıcı başına)', False), ('CDN (paylaşılan)', True)):
+        start = time.perf_counter()
+        stats = replay(fetch, trace, shared_cache=shared)
+        elapsed = time.perf_counter() - start
+
+        saved = 1 - stats['origin_requests'] / stats['requests']
+        print(f"\n{label}:")
+        print(f"  İstek: {stats['requests']} | origin: {stats['origin_requests']} "
+              f"(-%{saved * 100:.1f}) | 304: {stats['revalidated']} | tam yanıt: {stats['full_responses']}")
+        print(f"  Aktarılan: {stats['bytes_received'] / 1024:.1f} KB | süre: {elapsed:.2f} sn")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧵 Inference Pool - Olay döngüsü dışında sınırlı eşzamanlı çıkarım
+Author: Berke Özkul
+Description: CPU ağırlıklı tahmin ve analiz çağrılarını ayrı bir thread
+havuzunda çalıştırır; çalışan + kuyruktaki iş sayısı sınırlıdır ve havuz
+dolduğunda istek hemen reddedilir (503 + Retry-After). Kuyrukta bekleme ve
+çalışma süreleri ayrı histogramlarda tutulur
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import METRICS
+
+# Havuz başına çıkarım thread'i ve en fazla bekleyen iş sayısı
+INFERENCE_WORKERS = int(os.environ.get('INFERENCE_WORKERS', '2'))
+INFERENCE_QUEUE = int(os.environ.get('INFERENCE_QUEUE', '16'))
+
+# Çalışma süresi ortalaması için üstel ağırlık (Retry-After tahmini)
+RUN_TIME_WEIGHT = 0.2
+
+QUEUE_WAIT_SECONDS = METRICS.histogram(
+    'executor_queue_wait_seconds',
+    'İşin havuz kuyruğunda beklediği süre (saniye)',
+    ('pool',)
+)
+RUN_SECONDS = METRICS.histogram(
+    'executor_run_seconds',
+    'İşin havuz thread\'inde çalıştığı süre (saniye)',
+    ('pool',)
+)
+REJECTED_TOTAL = METRICS.counter(
+    'executor_rejected_total',
+    'Havuz dolu olduğu için reddedilen işler',
+    ('pool',)
+)
+
+# /metrics gauge'ları için kayıtlı havuzlar
+POOLS = {}
+
+
+class PoolSaturated(Exception):
+    """Havuz dolu: istek 503 ile reddedilmeli"""
+
+    def __init__(self, pool, retry_after):
+        super().__init__(f"{pool} havuzu dolu")
+        self.pool = pool
+        self.retry_after = retry_after
+
+
+class InferencePool:
+    """
+    Sınırlı çıkarım havuzu
+    - run(): işi thread havuzuna verir ve olay döngüsünü bloklamadan bekler
+    - Çalışan + kuyruktaki iş sayısı workers + max_queue'yu aşarsa PoolSaturated
+    """
+
+    def __init__(self, name='inference', workers=INFERENCE_WORKERS, max_queue=INFERENCE_QUEUE):
+        """
+        Args:
+            name (str): Metrik etiketi
+            workers (int): Eşzamanlı çalışan iş sayısı (thread)
+            max_queue (int): Thread bekleyen en fazla iş sayısı (0 = kuyruk yok)
+        """
+        if workers < 1 or max_queue < 0:
+            raise ValueError("workers en az 1, max_queue en az 0 olmalı")
+
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.limit = workers + max_queue
+
+        self.in_flight = 0
+        self.running = 0
+        self.mean_run = 0.0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-pool")
+
+        self._queue_wait = QUEUE_WAIT_SECONDS.labels(name)
+        self._run = RUN_SECONDS.labels(name)
+        self._rejected = REJECTED_TOTAL.labels(name)
+        POOLS[name] = self
+
+    @property
+    def queued(self):
+        return self.in_flight - self.running
+
+    def retry_after(self):
+        """Kuyruğun boşalması için tahmini süre (tam saniye, en az 1)"""
+        backlog = self.in_flight / self.workers
+        return max(1, math.ceil(backlog * self.mean_run))
+
+    def _acquire(self):
+        with self._lock:
+            if self.in_flight >= self.limit:
+                saturated = True
+            else:
+                saturated = False
+                self.in_flight += 1
+        if saturated:
+            self._rejected.inc()
+            raise PoolSaturated(self.name, self.retry_after())
+
+    def _release(self, future):
+        # Bitti veya thread'e ulaşmadan iptal edildi
+        with self._lock:
+            self.in_flight -= 1
+
+    async def run(self, function, *args):
+        """
+        function(*args) çağrısını havuzda çalıştır
+
+        Raises:
+            PoolSaturated: Havuz dolu (iş kuyruğa alınmaz)
+        """
+        self._acquire()
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            self._queue_wait.observe(started - submitted)
+            with self._lock:
+                self.running += 1
+            try:
+                return function(*args)
+            finally:
+                elapsed = time.perf_counter() - started
+                self._run.observe(elapsed)
+                with self._lock:
+                    self.running -= 1
+                    self.mean_run += RUN_TIME_WEIGHT * (elapsed - self.mean_run)
+
+        try:
+            future = self._executor.submit(task)
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def status(self):
+        """/health için havuz durumu"""
+        return {
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'running': self.running,
+            'queued': self.queued,
+            'rejected': self._rejected.value
+        }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def pool_metric():
+    """executor_in_flight gauge değerleri (havuz ve durum etiketli)"""
+    values = []
+    for name, pool in sorted(POOLS.items()):
+        values.append(({'pool': name, 'state': 'running'}, pool.running))
+        values.append(({'pool': name, 'state': 'queued'}, pool.queued))
+        values.append(({'pool': name, 'state': 'limit'}, pool.limit))
+    return values
+
+
+METRICS.gauge_function('executor_in_flight', 'Havuzda çalışan/bekleyen işler ve sınır', pool_metric)
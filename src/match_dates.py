@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📅 Match Dates - Ortak, önbellekli maç tarihi ayrıştırıcı
+Author: Berke Özkul
+Description: football-data tarihlerini (gg/aa/yy, gg/aa/yyyy, yyyy-aa-gg)
+tam sayı gün numarasına (date.toordinal()) çevirir. Her benzersiz metin bir
+kez ayrıştırılır (~5.300 maçta ~1.500 farklı tarih); tüm veri hatları ve
+modeller aynı kuralları kullanır. Tekil çağrılar sadece built-in Python,
+dizi fonksiyonları numpy/pandas ister
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+
+# İki haneli yıllar strptime('%y') kuralıyla: 69-99 -> 1900'ler, 00-68 -> 2000'ler
+CENTURY_PIVOT = 69
+# Geçersiz tarih için gün numarası (date.toordinal() en az 1'dir)
+MISSING_DAY = 0
+# 1970-01-01'in gün numarası (datetime64 dönüşümü için)
+EPOCH_DAY = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=65536)
+def parse_day(text):
+    """
+    Tarih metnini gün numarasına çevir (sonuç metin başına önbelleklenir)
+
+    Returns:
+        int: date.toordinal() değeri; okunamazsa None
+    """
+    text = text.strip()
+    if '/' in text:
+        parts = text.split('/')
+        if len(parts) != 3:
+            return None
+        day, month, year = parts
+    elif len(text) >= 10 and text[4] == '-' and text[7] == '-':
+        # ISO tarih (saat kısmı varsa atılır: "2019-05-12 00:00:00")
+        year, month, day = text[:4], text[5:7], text[8:10]
+    else:
+        return None
+
+    if not (day.isdigit() and month.isdigit() and year.isdigit()):
+        return None
+    year_number = int(year)
+    if len(year) == 2:
+        year_number += 1900 if year_number >= CENTURY_PIVOT else 2000
+    elif len(year) != 4:
+        return None
+    try:
+        return date(year_number, int(month), int(day)).toordinal()
+    except ValueError:
+        return None
+
+
+def to_ordinal(value):
+    """
+    Tarihi gün sayısına çevir (gün numarası, date, datetime, pandas Timestamp veya metin)
+
+    Returns:
+        int: date.toordinal() değeri; okunamazsa None
+    """
+    if value is None:
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if value > MISSING_DAY else None
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    if hasattr(value, 'to_pydatetime'):
+        try:
+            return value.to_pydatetime().date().toordinal()
+        except ValueError:
+            # NaT
+            return None
+    return parse_day(value if isinstance(value, str) else str(value))
+
+
+def day_numbers(values):
+    """
+    Tarih dizisini gün numaralarına çevir (benzersiz metinler bir kez ayrıştırılır)
+
+    Returns:
+        np.ndarray: int32 gün numaraları; geçersizler MISSING_DAY
+    """
+    import numpy as np
+
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        days = values.astype('datetime64[D]')
+        numbers = days.astype(np.int64) + EPOCH_DAY
+        return np.where(np.isnat(days), MISSING_DAY, numbers).astype(np.int32)
+
+    unique, inverse = np.unique(values.astype(str), return_inverse=True)
+    return _parse_unique(unique)[inverse.reshape(-1)]
+
+
+def _parse_unique(values):
+    """Benzersiz değerlerin gün numaraları (int32, geçersizler MISSING_DAY)"""
+    import numpy as np
+
+    return np.fromiter(((to_ordinal(value) or MISSING_DAY) for value in values), dtype=np.int32, count=len(values))
+
+
+def _to_datetime64(numbers):
+    import numpy as np
+
+    dates = (numbers.astype(np.int64) - EPOCH_DAY).astype('datetime64[D]')
+    dates[numbers == MISSING_DAY] = np.datetime64('NaT')
+    return dates
+
+
+def parse_dates(values):
+    """Tarih dizisini datetime64[D] dizisine çevir; geçersizler NaT"""
+    return _to_datetime64(day_numbers(values))
+
+
+def to_datetime(series):
+    """
+    pandas Date sütunu -> datetime64[ns] Series (pd.to_datetime yerine; geçersizler NaT)
+
+    Benzersiz değerler pd.factorize ile (sıralamadan, hash ile) bulunur.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.astype('datetime64[ns]')
+    codes, uniques = pd.factorize(series)
+    numbers = np.where(codes >= 0, _parse_unique(uniques)[codes], MISSING_DAY)
+    return pd.Series(_to_datetime64(numbers).astype('datetime64[ns]'), index=series.index, name=series.name)
+
+
+def main():
+    """Ana fonksiyon - Ayrıştırma yollarının karşılaştırması"""
+    import sys
+    import time
+
+    import pandas as pd
+
+    from data_catalog import DataCatalog
+
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "../data/"
+    dates = DataCatalog(data_path).load_frame(columns=['Date'])['Date']
+    print(f"📅 {len(dates):,} maç, {dates.nunique():,} benzersiz tarih")
+
+    candidates = [
+        ("pd.to_datetime(format='%d/%m/%Y')", lambda: pd.to_datetime(dates, format='%d/%m/%Y', errors='coerce')),
+        ("pd.to_datetime(format='mixed')",
+         lambda: pd.to_datetime(dates, dayfirst=True, format='mixed', errors='coerce')),
+        ("match_dates.to_datetime (soğuk)", lambda: (parse_day.cache_clear(), to_datetime(dates))[1]),
+        ("match_dates.to_datetime (önbellekli)", lambda: to_datetime(dates))
+    ]
+    for name, function in candidates:
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        print(f"  {name:<40} {elapsed * 1000:8.2f} ms  geçersiz: {int(result.isna().sum()):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🕰️ Match History - Tarih itibarıyla ("as-of") özellik motoru
+Author: Berke Özkul
+Description: Maçları kronolojik bir değişiklik (delta) günlüğü olarak saklar.
+Takım başına maç konumları, ikili karşılaşmalar için her maçtan sonra
+birikimli anlık görüntüler tutulur; herhangi bir tarihteki özellikler ikili
+arama ile konuma gidip en fazla son 10 maçın yeniden oynatılmasıyla elde
+edilir (sadece built-in Python)
+"""
+
+from array import array
+from bisect import bisect_left
+from datetime import date
+
+from match_dates import to_ordinal
+from team_registry import REGISTRY
+
+# Takım formu için son maç penceresi
+FORM_WINDOW = 10
+
+# Geçmişi olmayan takım ve ikililer için varsayılanlar
+DEFAULT_TEAM_STATS = {
+    'avg_goals_for': 1.5,
+    'avg_goals_against': 1.5,
+    'win_rate': 0.5,
+    'recent_form': 0.5,
+    'home_advantage': 0.0,
+    'away_performance': 0.0
+}
+DEFAULT_H2H_STATS = {
+    'home_wins': 0,
+    'away_wins': 0,
+    'draws': 0,
+    'avg_total_goals': 2.5
+}
+
+
+class PairHistory:
+    """İki takımın karşılaşmalarından sonraki birikimli anlık görüntüler"""
+
+    __slots__ = ('positions', 'snapshots')
+
+    def __init__(self):
+        self.positions = array('l')
+        # (maç, ilk takım galibiyeti, ikinci takım galibiyeti, beraberlik, toplam gol)
+        self.snapshots = []
+
+
+class MatchHistory:
+    """
+    Tarih itibarıyla maç öncesi özellikler
+    - append(): maçlar kronolojik sırayla eklenir (delta günlüğü)
+    - position(): tarihten önce oynanan maç sayısı (ikili arama)
+    - features_at()/features(): konum veya tarih itibarıyla takım ve ikili özellikleri
+    """
+
+    def __init__(self):
+        # Maç sırası: (gün, ev, deplasman, ev golü, dep golü)
+        self.matches = []
+        self.days = array('l')
+        self.team_positions = {}
+        self.pairs = {}
+
+    @classmethod
+    def from_matches(cls, matches):
+        """
+        (tarih, ev sahibi, deplasman, ev golü, dep golü) demetlerinden oluştur
+
+        Tarihe göre kararlı sıralanır; aynı gündeki maçlar girdi sırasını korur.
+        """
+        history = cls()
+        parsed = []
+        for when, home_team, away_team, home_goals, away_goals in matches:
+            try:
+                home_goals, away_goals = int(home_goals), int(away_goals)
+            except (TypeError, ValueError):
+                continue
+            day = to_ordinal(when)
+            parsed.append((0 if day is None else day, home_team, away_team, home_goals, away_goals))
+
+        parsed.sort(key=lambda match: match[0])
+        for match in parsed:
+            history.append(*match)
+        return history
+
+    @classmethod
+    def from_frame(cls, df):
+        """Date/HomeTeam/AwayTeam/FTHG/FTAG sütunlu DataFrame'den oluştur"""
+        dates = df['Date'] if 'Date' in df.columns else [None] * len(df)
+        return cls.from_matches(zip(dates, df['HomeTeam'], df['AwayTeam'], df['FTHG'], df['FTAG']))
+
+    def __len__(self):
+        return len(self.matches)
+
+    def append(self, day, home_team, away_team, home_goals, away_goals):
+        """Maçı günlüğün sonuna ekle (day: date.toordinal() değeri)"""
+        if self.days and day < self.days[-1]:
+            raise ValueError("Maçlar kronolojik sırayla eklenmeli")
+
+        home_team = REGISTRY.canonical(home_team)
+        away_team = REGISTRY.canonical(away_team)
+        position = len(self.matches)
+        self.matches.append((day, home_team, away_team, home_goals, away_goals))
+        self.days.append(day)
+
+        for team in (home_team, away_team):
+            positions = self.team_positions.get(team)
+            if positions is None:
+                positions = self.team_positions[team] = array('l')
+            positions.append(position)
+
+        # İkili anlık görüntü: alfabetik ilk takımın bakış açısından
+        first, second = sorted((home_team, away_team))
+        pair = self.pairs.get((first, second))
+        if pair is None:
+            pair = self.pairs[(first, second)] = PairHistory()
+        count, first_wins, second_wins, draws, goals = pair.snapshots[-1] if pair.snapshots else (0, 0, 0, 0, 0)
+        first_goals, second_goals = (home_goals, away_goals) if home_team == first else (away_goals, home_goals)
+        pair.positions.append(position)
+        pair.snapshots.append((
+            count + 1,
+            first_wins + (first_goals > second_goals),
+            second_wins + (second_goals > first_goals),
+            draws + (first_goals == second_goals),
+            goals + home_goals + away_goals
+        ))
+
+    def position(self, as_of=None, inclusive=False):
+        """as_of tarihinden önce (inclusive ise o gün dahil) oynanan maç sayısı (None = tümü)"""
+        if as_of is None:
+            return len(self.matches)
+        day = to_ordinal(as_of)
+        if day is None:
+            raise ValueError(f"Geçersiz tarih: {as_of}")
+        return bisect_left(self.days, day + inclusive)
+
+    @property
+    def first_date(self):
+        return date.fromordinal(self.days[0]).isoformat() if self.days and self.days[0] else None
+
+    @property
+    def last_date(self):
+        return date.fromordinal(self.days[-1]).isoformat() if self.days and self.days[-1] else None
+
+    def team_stats(self, team, position):
+        """Takımın ilk `position` maç itibarıyla son FORM_WINDOW maç istatistikleri"""
+        positions = self.team_positions.get(REGISTRY.canonical(team))
+        end = bisect_left(positions, position) if positions else 0
+        if not end:
+            return dict(DEFAULT_TEAM_STATS)
+
+        team = REGISTRY.canonical(team)
+        goals_for = goals_against = wins = points = 0
+        home_points = []
+        away_points = []
+        window = positions[max(0, end - FORM_WINDOW):end]
+
+        # Pencere kadar deltanın yeniden oynatılması
+        for match_position in window:
+            _, home_team, _, home_goals, away_goals = self.matches[match_position]
+            if home_team == team:
+                scored, conceded, venue_points = home_goals, away_goals, home_points
+            else:
+                scored, conceded, venue_points = away_goals, home_goals, away_points
+            result_points = 3 if scored > conceded else 1 if scored == conceded else 0
+            goals_for += scored
+            goals_against += conceded
+            wins += result_points == 3
+            points += result_points
+            venue_points.append(result_points)
+
+        matches = len(window)
+        return {
+            'avg_goals_for': goals_for / matches,
+            'avg_goals_against': goals_against / matches,
+            'win_rate': wins / matches,
+            'recent_form': points / matches / 3,
+            'home_advantage': sum(home_points) / len(home_points) / 3 if home_points else 0.5,
+            'away_performance': sum(away_points) / len(away_points) / 3 if away_points else 0.5
+        }
+
+    def form_at(self, team, position, window=FORM_WINDOW):
+        """
+        Takımın ilk `position` maç itibarıyla son `window` maçı (basit modelin form özellikleri)
+
+        Returns:
+            tuple: (maç sayısı, puan, attığı gol, yediği gol)
+        """
+        team = REGISTRY.canonical(team)
+        positions = self.team_positions.get(team)
+        end = bisect_left(positions, position) if positions else 0
+
+        points = goals_for = goals_against = 0
+        window = positions[max(0, end - window):end] if end else ()
+        for match_position in window:
+            _, home_team, _, home_goals, away_goals = self.matches[match_position]
+            scored, conceded = (home_goals, away_goals) if home_team == team else (away_goals, home_goals)
+            points += 3 if scored > conceded else 1 if scored == conceded else 0
+            goals_for += scored
+            goals_against += conceded
+        return len(window), points, goals_for, goals_against
+
+    def h2h_stats(self, home_team, away_team, position):
+        """İki takımın ilk `position` maç itibarıyla karşılaşma istatistikleri (ev sahibi bakışıyla)"""
+        home_team = REGISTRY.canonical(home_team)
+        away_team = REGISTRY.canonical(away_team)
+        first, second = sorted((home_team, away_team))
+        pair = self.pairs.get((first, second))
+        index = bisect_left(pair.positions, position) if pair else 0
+        if not index:
+            return dict(DEFAULT_H2H_STATS)
+
+        count, first_wins, second_wins, draws, goals = pair.snapshots[index - 1]
+        home_wins, away_wins = (first_wins, second_wins) if home_team == first else (second_wins, first_wins)
+        return {
+            'home_wins': home_wins / count,
+            'away_wins': away_wins / count,
+            'draws': draws / count,
+            'avg_total_goals': goals / count
+        }
+
+    def features_at(self, position, home_team, away_team):
+        """İlk `position` maç oynanmışken maç öncesi özellikler (_process_data ile aynı isimler)"""
+        home_stats = self.team_stats(home_team, position)
+        away_stats = self.team_stats(away_team, position)
+        h2h_stats = self.h2h_stats(home_team, away_team, position)
+        return {
+            'home_avg_goals_for': home_stats['avg_goals_for'],
+            'home_avg_goals_against': home_stats['avg_goals_against'],
+            'home_win_rate': home_stats['win_rate'],
+            'home_recent_form': home_stats['recent_form'],
+            'home_home_advantage': home_stats['home_advantage'],
+            'away_avg_goals_for': away_stats['avg_goals_for'],
+            'away_avg_goals_against': away_stats['avg_goals_against'],
+            'away_win_rate': away_stats['win_rate'],
+            'away_recent_form': away_stats['recent_form'],
+            'away_away_performance': away_stats['away_performance'],
+            'h2h_home_wins': h2h_stats['home_wins'],
+            'h2h_away_wins': h2h_stats['away_wins'],
+            'h2h_draws': h2h_stats['draws'],
+            'h2h_avg_total_goals': h2h_stats['avg_total_goals']
+        }
+
+    def features(self, home_team, away_team, as_of=None):
+        """as_of tarihinden önce oynanan maçlara göre özellikler (None = en güncel)"""
+        return self.features_at(self.position(as_of), home_team, away_team)
+
+    def between(self, start=None, end=None):
+        """
+        Tarih aralığındaki (dahil) maçlar
+
+        Returns:
+            list: (konum, tarih, ev sahibi, deplasman, ev golü, dep golü) demetleri
+        """
+        first = self.position(start) if start is not None else 0
+        last = self.position(end, inclusive=True)
+        return [(position, date.fromordinal(day) if day else None, home_team, away_team, home_goals, away_goals)
+                for position, (day, home_team, away_team, home_goals, away_goals)
+                in enumerate(self.matches[first:last], start=first)]
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗄️ Match Store - İndeksli SQLite maç deposu
+Author: Berke Özkul
+Description: Katalogdaki sezon CSV'lerini gömülü bir SQLite veritabanına
+toplu olarak yükler (değişmeyen dosyalar atlanır) ve ikili karşılaşma, son N
+maç formu ve sezon özetlerini indeks aramasıyla yanıtlar. DataCatalog ile
+aynı load_rows()/load_frame() arayüzünü sunduğu için veri işleyicilerin
+kaynağı olarak kullanılabilir (sadece built-in Python; load_frame pandas ister)
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import date
+
+from data_catalog import DataCatalog, compact_frame
+from match_dates import to_ordinal
+from team_registry import REGISTRY
+
+# Veri klasöründeki varsayılan veritabanı dosyası (MATCH_STORE ile ezilir)
+STORE_FILENAME = 'matches.sqlite'
+# Şema değişince veritabanı baştan kurulur (PRAGMA user_version)
+SCHEMA_VERSION = 1
+# executemany çağrısı başına satır (tüm dosya tek işlemde yazılır)
+INSERT_BATCH = 1000
+
+# Tarih sınırı verilmeyen sorgular için "sonsuz" gün
+_NO_LIMIT_DAY = date.max.toordinal() + 1
+_RESULT_POINTS = {'W': 3, 'D': 1, 'L': 0}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    league TEXT NOT NULL,
+    season TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    PRIMARY KEY (league, season)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    league TEXT NOT NULL,
+    season TEXT NOT NULL,
+    start_year INTEGER NOT NULL,
+    day INTEGER,
+    home TEXT NOT NULL,
+    away TEXT NOT NULL,
+    home_goals INTEGER,
+    away_goals INTEGER,
+    result TEXT,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matches_pair ON matches (home, away, day);
+CREATE INDEX IF NOT EXISTS matches_season ON matches (league, season);
+CREATE TABLE IF NOT EXISTS team_matches (
+    team TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    match_id INTEGER NOT NULL,
+    league TEXT NOT NULL,
+    season TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    goals_for INTEGER NOT NULL,
+    goals_against INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (team, day, match_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS team_matches_season ON team_matches (league, season, team);
+"""
+
+# Sorgu metinleri sabit: sqlite3 her bağlantıda derlenmiş ifadeleri metne göre önbellekler
+INSERT_MATCH_SQL = """
+INSERT INTO matches (id, league, season, start_year, day, home, away, home_goals, away_goals, result, raw)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSERT_TEAM_MATCH_SQL = """
+INSERT OR REPLACE INTO team_matches
+    (team, day, match_id, league, season, venue, opponent, goals_for, goals_against, result, points)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+H2H_SQL = """
+SELECT day, home, away, home_goals, away_goals, result FROM matches
+WHERE home = ? AND away = ? AND day < ? AND result IS NOT NULL
+UNION ALL
+SELECT day, home, away, home_goals, away_goals, result FROM matches
+WHERE home = ? AND away = ? AND day < ? AND result IS NOT NULL
+ORDER BY day DESC
+LIMIT ?
+"""
+FORM_SQL = """
+SELECT day, venue, opponent, goals_for, goals_against, result, points FROM team_matches
+WHERE team = ? AND day < ?
+ORDER BY day DESC, match_id DESC
+LIMIT ?
+"""
+SEASON_SQL = """
+SELECT team, COUNT(*), SUM(result = 'W'), SUM(result = 'D'), SUM(result = 'L'),
+       SUM(goals_for), SUM(goals_against), SUM(points)
+FROM team_matches
+WHERE league = ? AND season = ?
+GROUP BY team
+"""
+
+# Sunucu isteklerinde çalışan sorgular (explain() ile indeks araması olduğu doğrulanır)
+LOOKUP_QUERIES = {
+    'h2h': (H2H_SQL, ('Arsenal', 'Chelsea', _NO_LIMIT_DAY, 'Chelsea', 'Arsenal', _NO_LIMIT_DAY, 10)),
+    'form': (FORM_SQL, ('Arsenal', _NO_LIMIT_DAY, 5)),
+    'season': (SEASON_SQL, ('E0', '2017-2018'))
+}
+
+
+def default_path(data_path="../data/"):
+    """Veritabanı yolu: MATCH_STORE, yoksa <veri klasörü>/matches.sqlite"""
+    return os.environ.get('MATCH_STORE') or os.path.join(data_path, STORE_FILENAME)
+
+
+def _goals(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class MatchStore:
+    """
+    SQLite maç deposu
+    - sync(): katalogdaki yeni/değişen sezon dosyalarını toplu yükler
+    - h2h()/form()/season_table(): indeks aramasıyla geçmiş sorguları
+    - load_rows()/load_frame(): DataCatalog yerine veri işleyici kaynağı
+    - Bağlantılar thread (ve fork sonrası süreç) başına açılır
+    """
+
+    def __init__(self, path=None, data_path="../data/", catalog=None):
+        """
+        Args:
+            path (str): Veritabanı dosyası (None = default_path(data_path))
+            data_path (str): CSV'lerin bulunduğu veri klasörü
+            catalog (DataCatalog): Yükleme kaynağı (None = DataCatalog(data_path))
+        """
+        self.path = path or default_path(data_path)
+        self.catalog = catalog if catalog is not None else DataCatalog(data_path)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._prepare()
+
+    def _connection(self):
+        """Bu thread'in bağlantısı (fork sonrası yeniden açılır)"""
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.connection = sqlite3.connect(self.path)
+            local.pid = os.getpid()
+        return local.connection
+
+    def _prepare(self):
+        """Şemayı kur; sürüm farklıysa tabloları baştan oluştur"""
+        connection = self._connection()
+        with self._write_lock, connection:
+            version = connection.execute('PRAGMA user_version').fetchone()[0]
+            if version != SCHEMA_VERSION:
+                for table in ('sources', 'matches', 'team_matches'):
+                    connection.execute(f'DROP TABLE IF EXISTS {table}')
+                connection.executescript(SCHEMA)
+                connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM matches').fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Yükleme
+    # ------------------------------------------------------------------
+    def sync(self, leagues=None, seasons=None):
+        """
+        Katalogdaki sezon dosyalarını depoya yükle
+
+        Boyutu ve değişiklik zamanı kayıtlı olanla aynı dosyalar atlanır;
+        değişen sezonun satırları silinip yeniden yazılır.
+
+        Returns:
+            int: Yüklenen (yeni veya değişen) sezon dosyası sayısı
+        """
+        connection = self._connection()
+        known = {
+            (league, season): (path, size, mtime_ns)
+            for league, season, path, size, mtime_ns in
+            connection.execute('SELECT league, season, path, size, mtime_ns FROM sources')
+        }
+
+        loaded = 0
+        for season_file in self.catalog.files(leagues, seasons):
+            try:
+                stat = os.stat(season_file.path)
+            except OSError:
+                continue
+            signature = (season_file.path, stat.st_size, stat.st_mtime_ns)
+            if known.get((season_file.league, season_file.season)) == signature:
+                continue
+
+            rows = self.catalog.load_rows(leagues=[season_file.league],
+                                          seasons=(season_file.start_year, season_file.start_year), workers=1)
+            self._load_season(season_file, rows, signature)
+            loaded += 1
+        return loaded
+
+    def _load_season(self, season_file, rows, signature):
+        """Tek sezonu tek işlemde (toplu executemany ile) yeniden yaz"""
+        league, season = season_file.league, season_file.season
+        connection = self._connection()
+        with self._write_lock, connection:
+            connection.execute('DELETE FROM team_matches WHERE league = ? AND season = ?', (league, season))
+            connection.execute('DELETE FROM matches WHERE league = ? AND season = ?', (league, season))
+            next_id = connection.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM matches').fetchone()[0]
+
+            matches, team_matches = [], []
+            for match_id, row in enumerate(rows, next_id):
+                home = REGISTRY.canonical(row['HomeTeam'].strip())
+                away = REGISTRY.canonical((row.get('AwayTeam') or '').strip())
+                home_goals, away_goals = _goals(row.get('FTHG')), _goals(row.get('FTAG'))
+                result = row.get('FTR') if row.get('FTR') in ('H', 'D', 'A') else None
+                if home_goals is None or away_goals is None:
+                    result = None
+                day = to_ordinal(row.get('Date'))
+
+                matches.append((match_id, league, season, season_file.start_year, day, home, away,
+                                home_goals, away_goals, result,
+                                json.dumps(row, ensure_ascii=False, separators=(',', ':'))))
+                if day is not None and result is not None:
+                    home_result = 'W' if result == 'H' else 'D' if result == 'D' else 'L'
+                    away_result = 'W' if result == 'A' else 'D' if result == 'D' else 'L'
+                    team_matches.append((home, day, match_id, league, season, 'H', away,
+                                         home_goals, away_goals, home_result, _RESULT_POINTS[home_result]))
+                    team_matches.append((away, day, match_id, league, season, 'A', home,
+                                         away_goals, home_goals, away_result, _RESULT_POINTS[away_result]))
+
+                if len(matches) >= INSERT_BATCH:
+                    connection.executemany(INSERT_MATCH_SQL, matches)
+                    connection.executemany(INSERT_TEAM_MATCH_SQL, team_matches)
+                    matches, team_matches = [], []
+
+            connection.executemany(INSERT_MATCH_SQL, matches)
+            connection.executemany(INSERT_TEAM_MATCH_SQL, team_matches)
+            connection.execute('INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?)',
+                               (league, season) + signature + (len(rows),))
+
+    # ------------------------------------------------------------------
+    # Veri işleyici kaynağı (DataCatalog ile aynı arayüz)
+    # ------------------------------------------------------------------
+    def load_rows(self, leagues=None, seasons=None, workers=None):
+        """
+        Depodaki ham CSV satırları (önce sync() yapılır)
+
+        Returns:
+            list: League ve Season alanları eklenmiş satır sözlükleri (DataCatalog.load_rows ile aynı)
+        """
+        self.sync(leagues, seasons)
+
+        sql = 'SELECT raw FROM matches'
+        conditions, params = [], []
+        if leagues is not None:
+            leagues = list(leagues)
+            conditions.append(f"league IN ({', '.join('?' * len(leagues))})")
+            params.extend(leagues)
+        if seasons is not None:
+            first, last = seasons
+            if first is not None:
+                conditions.append('start_year >= ?')
+                params.append(first)
+            if last is not None:
+                conditions.append('start_year <= ?')
+                params.append(last)
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY league, start_year, id'
+
+        rows = [json.loads(raw) for raw, in self._connection().execute(sql, params)]
+        if not rows:
+            raise FileNotFoundError(f"❌ {self.path} deposunda eşleşen maç bulunamadı!")
+        return rows
+
+    def load_frame(self, leagues=None, seasons=None, columns=None, workers=None, compact=False):
+        """
+        Depodaki maçları pandas DataFrame olarak yükle
+
+        Sayısal görünen sütunlar read_csv'deki gibi sayıya, boş hücreler NaN'a çevrilir.
+
+        Returns:
+            pd.DataFrame: League ve Season sütunları eklenmiş birleşik veri
+        """
+        import numpy as np
+        import pandas as pd
+
+        df = pd.DataFrame.from_records(self.load_rows(leagues, seasons))
+        if columns is not None:
+            wanted = set(columns) | {'League', 'Season'}
+            df = df[[column for column in df.columns if column in wanted]]
+        # DataCatalog.load_frame'deki gibi lig/sezon en sonda
+        df = df[[column for column in df.columns if column not in ('League', 'Season')] + ['League', 'Season']]
+        df = df.replace('', np.nan)
+        for column in df.columns:
+            if column in ('League', 'Season', 'Date', 'Time'):
+                continue
+            try:
+                df[column] = pd.to_numeric(df[column])
+            except (ValueError, TypeError):
+                pass
+        return compact_frame(df) if compact else df
+
+    # ------------------------------------------------------------------
+    # İstek başına geçmiş sorguları (indeks araması)
+    # ------------------------------------------------------------------
+    def h2h(self, home_team, away_team, before=None, limit=None):
+        """
+        İki takımın karşılaşmaları (iki yönde de, yeniden eskiye)
+
+        Args:
+            before: Bu tarihten önceki maçlar (None = hepsi)
+            limit (int): En fazla maç (None = hepsi)
+
+        Returns:
+            list: {date, home_team, away_team, home_goals, away_goals, result} sözlükleri
+        """
+        home_team, away_team = REGISTRY.canonical(home_team), REGISTRY.canonical(away_team)
+        day = _NO_LIMIT_DAY if before is None else to_ordinal(before)
+        rows = self._connection().execute(
+            H2H_SQL, (home_team, away_team, day, away_team, home_team, day, -1 if limit is None else limit))
+        return [
+            {
+                'date': date.fromordinal(day).isoformat(),
+                'home_team': home,
+                'away_team': away,
+                'home_goals': home_goals,
+                'away_goals': away_goals,
+                'result': result
+            }
+            for day, home, away, home_goals, away_goals, result in rows
+        ]
+
+    def h2h_stats(self, home_team, away_team, before=None, limit=None):
+        """İkili özet: ev sahibi açısından galibiyet/beraberlik/mağlubiyet ve maç başı gol"""
+        matches = self.h2h(home_team, away_team, before, limit)
+        home_team = REGISTRY.canonical(home_team)
+
+        home_wins = away_wins = draws = goals = 0
+        for match in matches:
+            goals += match['home_goals'] + match['away_goals']
+            if match['result'] == 'D':
+                draws += 1
+            elif (match['result'] == 'H') == (match['home_team'] == home_team):
+                home_wins += 1
+            else:
+                away_wins += 1
+        return {
+            'matches': len(matches),
+            'home_wins': home_wins,
+            'away_wins': away_wins,
+            'draws': draws,
+            'avg_total_goals': goals / len(matches) if matches else 0.0
+        }
+
+    def form(self, team, last_n=5, before=None):
+        """
+        Takımın son N maçı (yeniden eskiye)
+
+        Returns:
+            list: {date, venue, opponent, goals_for, goals_against, result, points} sözlükleri
+        """
+        day = _NO_LIMIT_DAY if before is None else to_ordinal(before)
+        rows = self._connection().execute(FORM_SQL, (REGISTRY.canonical(team), day, last_n))
+        return [
+            {
+                'date': date.fromordinal(day).isoformat(),
+                'venue': venue,
+                'opponent': opponent,
+                'goals_for': goals_for,
+                'goals_against': goals_against,
+                'result': result,
+                'points': points
+            }
+            for day, venue, opponent, goals_for, goals_against, result, points in rows
+        ]
+
+    def season_table(self, league, season):
+        """
+        Sezon puan tablosu (puan, averaj, atılan gol sırasıyla)
+
+        Returns:
+            list: {team, played, wins, draws, losses, goals_for, goals_against, points} sözlükleri
+        """
+        rows = self._connection().execute(SEASON_SQL, (league, season))
+        table = [
+            {
+                'team': team,
+                'played': played,
+                'wins': wins,
+                'draws': draws,
+                'losses': losses,
+                'goals_for': goals_for,
+                'goals_against': goals_against,
+                'points': points
+            }
+            for team, played, wins, draws, losses, goals_for, goals_against, points in rows
+        ]
+        table.sort(key=lambda row: (-row['points'], row['goals_against'] - row['goals_for'], -row['goals_for']))
+        return table
+
+    def explain(self):
+        """
+        İstek başına sorguların SQLite planları
+
+        Returns:
+            dict: sorgu adı -> plan satırları (tam tablo taraması 'SCAN <tablo>' olarak görünür)
+        """
+        connection = self._connection()
+        return {
+            name: [row[3] for row in connection.execute('EXPLAIN QUERY PLAN ' + sql, params)]
+            for name, (sql, params) in LOOKUP_QUERIES.items()
+        }
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            connection.close()
+        self._local = threading.local()
+
+
+def main():
+    """Ana fonksiyon - Depoyu kur, sorgu planlarını ve CSV taramasıyla farkı göster"""
+    import time
+
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "../data/"
+    store = MatchStore(data_path=data_path)
+
+    print(f"🗄️ Maç deposu: {store.path}")
+    started = time.perf_counter()
+    loaded = store.sync()
+    print(f"  ✅ {loaded} sezon dosyası yüklendi, {len(store):,} maç ({time.perf_counter() - started:.3f} sn)")
+
+    print("\n🔍 Sorgu planları:")
+    for name, plan in store.explain().items():
+        for line in plan:
+            marker = '⚠️ ' if line.startswith('SCAN') else '  '
+            print(f"  {marker}{name:<7} {line}")
+
+    home_team, away_team = 'Arsenal', 'Chelsea'
+    count = 1000
+    started = time.perf_counter()
+    for _ in range(count):
+        store.h2h(home_team, away_team, limit=10)
+        store.form(home_team, 5)
+    seek = (time.perf_counter() - started) / count
+
+    started = time.perf_counter()
+    rows = store.catalog.load_rows()
+    h2h = [row for row in rows if {row['HomeTeam'], row['AwayTeam']} == {home_team, away_team}]
+    scan = time.perf_counter() - started
+
+    print(f"\n⚡ {home_team} - {away_team} ikili + form: {seek * 1e6:.0f} µs/istek (indeks), "
+          f"CSV okuyup tarama {scan * 1000:.1f} ms ({len(h2h)} maç)")
+    print(f"📈 Son 5 maç ({home_team}): {[match['result'] for match in store.form(home_team, 5)]}")
+
+
+if __name__ == "__main__":
+    main()
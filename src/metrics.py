@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📈 Metrics - Prometheus formatında gecikme ve istek metrikleri
+Author: Berke Özkul
+Description: Sayaçlar, aşama bazlı gecikme histogramları, cache isabet
+oranları ve model sürümü; /metrics uç noktası için metin formatı
+(sadece built-in Python, ölçüm başına birkaç mikrosaniye)
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+# 10 µs - 10 sn arası gecikme kovaları (saniye)
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_perf_counter = time.perf_counter
+
+
+def _escape(value):
+    """Etiket değerini Prometheus metin formatına uygun kaçışla"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=''):
+    """{a="x",b="y"} biçiminde etiket bloğu"""
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value):
+    """Sayıyı Prometheus formatında yaz (tam sayılar ondalıksız)"""
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Artan sayaç (tek seri)"""
+
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """Sabit kovalı histogram (tek seri)"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        # Son eleman +Inf kovası
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        """with bloğunun süresini ölçen zamanlayıcı"""
+        return _Timer(self)
+
+
+class _Timer:
+    """Histogram.time() için bağlam yöneticisi"""
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = _perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(_perf_counter() - self.start)
+        return False
+
+
+class CacheStats:
+    """Uygulama içi cache'ler için isabet/ıskalama sayacı"""
+
+    __slots__ = ('hits', 'misses', '_lock')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+class MetricFamily:
+    """Aynı isim ve etiket adlarını paylaşan seriler"""
+
+    def __init__(self, kind, name, documentation, labelnames, factory):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children = {}
+        # Ham etiket değerleri -> seri (str dönüşümü her çağrıda yapılmaz)
+        self._lookup = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """
+        Etiket değerlerine ait seri (ilk kullanımda oluşturulur)
+
+        Sık kullanılan seriler modül seviyesinde bir kez alınıp saklanmalı;
+        sıcak yolda sözlük erişimi bile gerekmez.
+        """
+        child = self._lookup.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: {len(self.labelnames)} etiket bekleniyordu")
+            with self._lock:
+                child = self._children.setdefault(tuple(str(value) for value in values), self._factory())
+                self._lookup[values] = child
+        return child
+
+    def render(self, lines):
+        """Ailenin tüm serilerini metin formatında ekle"""
+        lines.append(f'# HELP {self.name} {self.documentation}')
+        lines.append(f'# TYPE {self.name} {self.kind}')
+
+        for values, child in sorted(self._children.items()):
+            if self.kind == 'counter':
+                lines.append(f'{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}')
+                continue
+
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+                count = child.count
+
+            cumulative = 0
+            for bound, bucket_count in zip(child.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                labels = _format_labels(self.labelnames, values, f'le="{le}"')
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f'{self.name}_sum{labels} {repr(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+
+
+class MetricsRegistry:
+    """
+    Sunucu metrikleri
+    - counter/histogram: etiketli aileler
+    - register_cache: hits/misses özniteliği olan her nesne (isabet oranı hesaplanır)
+    - gauge_function: render sırasında okunan değerler (model sürümü gibi)
+    """
+
+    def __init__(self):
+        self._families = {}
+        self._caches = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def _family(self, kind, name, documentation, labelnames, factory):
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = MetricFamily(kind, name, documentation, labelnames, factory)
+                self._families[name] = family
+            elif family.kind != kind or family.labelnames != tuple(labelnames):
+                raise ValueError(f"Metrik farklı tanımla kayıtlı: {name}")
+        return family
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._family('counter', name, documentation, labelnames, Counter)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._family('histogram', name, documentation, labelnames,
+                            lambda: Histogram(buckets))
+
+    def register_cache(self, name, source):
+        """
+        Cache isabet istatistiklerini kaydet
+
+        Args:
+            name (str): Cache adı (cache etiketi)
+            source: hits ve misses öznitelikleri olan nesne
+        """
+        self._caches[name] = source
+        return source
+
+    def cache(self, name):
+        """Yeni bir CacheStats oluşturup kaydet (aynı isim tekrar istenirse aynısı döner)"""
+        source = self._caches.get(name)
+        if source is None:
+            source = self.register_cache(name, CacheStats())
+        return source
+
+    def gauge_function(self, name, documentation, function):
+        """
+        Render sırasında çağrılan gauge
+
+        Args:
+            function (callable): [(etiket sözlüğü, değer), ...] döndürür
+        """
+        self._gauges[name] = (documentation, function)
+
+    def render(self):
+        """Tüm metrikler (Prometheus metin formatı 0.0.4)"""
+        lines = []
+        for family in list(self._families.values()):
+            family.render(lines)
+
+        if self._caches:
+            caches = sorted(self._caches.items())
+            for suffix, documentation in (('hits_total', 'Cache isabetleri'),
+                                          ('misses_total', 'Cache ıskalamaları')):
+                lines.append(f'# HELP cache_{suffix} {documentation}')
+                lines.append(f'# TYPE cache_{suffix} counter')
+                for name, source in caches:
+                    value = source.hits if suffix == 'hits_total' else source.misses
+                    lines.append(f'cache_{suffix}{{cache="{_escape(name)}"}} {value}')
+
+            lines.append('# HELP cache_hit_ratio Cache isabet oranı (başlangıçtan beri)')
+            lines.append('# TYPE cache_hit_ratio gauge')
+            for name, source in caches:
+                hits, misses = source.hits, source.misses
+                ratio = hits / (hits + misses) if hits + misses else 0.0
+                lines.append(f'cache_hit_ratio{{cache="{_escape(name)}"}} {_format_value(ratio)}')
+
+        for name, (documentation, function) in sorted(self._gauges.items()):
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} gauge')
+            for labels, value in function():
+                label_text = _format_labels(labels.keys(), labels.values())
+                lines.append(f'{name}{label_text} {_format_value(value)}')
+
+        lines.append('')
+        return '\n'.join(lines).encode('utf-8')
+
+
+# Tüm modüllerin paylaştığı kayıt
+METRICS = MetricsRegistry()
+
+# Tahmin hattının aşamaları (parse, validate, features, inference_*, poisson, analysis, encode)
+STAGE_SECONDS = METRICS.histogram(
+    'prediction_stage_seconds',
+    'Tahmin hattı aşamalarının süresi (saniye)',
+    ('stage',)
+)
+
+REQUESTS_TOTAL = METRICS.counter(
+    'http_requests_total',
+    'İşlenen HTTP istekleri',
+    ('method', 'endpoint', 'status')
+)
+
+REQUEST_ERRORS_TOTAL = METRICS.counter(
+    'http_request_errors_total',
+    'Hata ile sonuçlanan HTTP istekleri (4xx/5xx)',
+    ('method', 'endpoint', 'status')
+)
+
+REQUEST_SECONDS = METRICS.histogram(
+    'http_request_duration_seconds',
+    'HTTP isteklerinin toplam süresi (saniye)',
+    ('endpoint',)
+)
+
+
+def stage(name):
+    """Aşama histogramı (modül seviyesinde bir kez alınır)"""
+    return STAGE_SECONDS.labels(name)
+
+
+def record_request(method, endpoint, status, seconds):
+    """Tamamlanan isteği sayaç ve histogramlara işle"""
+    REQUESTS_TOTAL.labels(method, endpoint, status).inc()
+    if status >= 400:
+        REQUEST_ERRORS_TOTAL.labels(method, endpoint, status).inc()
+    REQUEST_SECONDS.labels(endpoint).observe(seconds)
+
+
+def endpoint_label(path, known_paths):
+    """
+    Yolu sınırlı sayıda etikete indir (bilinmeyen yollar 'other')
+
+    '/teams/{team}/rating-history' gibi şablonlar parçası parçası eşleşir
+    ve şablonun kendisi etiket olur.
+    """
+    if path in known_paths:
+        return path
+    segments = path.split('/')
+    for template in known_paths:
+        if '{' not in template:
+            continue
+        parts = template.split('/')
+        if len(parts) == len(segments) and all(
+                part == segment or (part.startswith('{') and segment)
+                for part, segment in zip(parts, segments)):
+            return template
+    return 'other'
+
+
+class MetricsMiddleware:
+    """
+    FastAPI/Starlette için ASGI metrik middleware'i
+
+    Her isteğin süresini ve durum kodunu http_requests_total ve
+    http_request_duration_seconds serilerine yazar.
+    """
+
+    def __init__(self, app, known_paths=()):
+        self.app = app
+        self.known_paths = frozenset(known_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = _perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint = endpoint_label(scope.get('path', ''), self.known_paths)
+            record_request(scope.get('method', 'GET'), endpoint, status, _perf_counter() - start)
+
+
+def benchmark(number=200000):
+    """Ölçüm maliyeti (mikrosaniye/işlem)"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram('bench_seconds', 'bench', ('stage',)).labels('bench')
+    counter = registry.counter('bench_total', 'bench', ('endpoint',))
+    results = {}
+
+    start = _perf_counter()
+    for _ in range(number):
+        histogram.observe(0.0004)
+    results['observe'] = (_perf_counter() - start) / number * 1e6
+
+    start = _perf_counter()
+    for _ in range(number):
+        with histogram.time():
+            pass
+    results['timer'] = (_perf_counter() - start) / number * 1e6
+
+    start = _perf_counter()
+    for _ in range(number):
+        counter.labels('/predict').inc()
+    results['labeled_counter'] = (_perf_counter() - start) / number * 1e6
+
+    start = _perf_counter()
+    for _ in range(number // 100):
+        registry.render()
+    results['render'] = (_perf_counter() - start) / (number // 100) * 1e6
+
+    return results
+
+
+def main():
+    """Ana fonksiyon - Ölçüm maliyetini yazdır"""
+    print("📈 Metrik ölçüm maliyeti")
+    print("=" * 60)
+    for name, micros in benchmark().items():
+        print(f"  {name:<16} {micros:>7.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📦 Micro Batching - Eşzamanlı tahmin isteklerini tek çağrıda toplama
+Author: Berke Özkul
+Description: Aynı anda gelen tekil tahmin isteklerini kısa bir pencere
+(veya parti dolana kadar) biriktirip tek vektörel predict_matches çağrısı
+yapar ve sonuçları bekleyen isteklere dağıtır. Hem thread'li sunuculardan
+(submit().result()) hem asyncio'dan (await predict()) kullanılabilir
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from inference_pool import PoolSaturated
+from metrics import METRICS
+
+# İlk istekten sonra en fazla bekleme (sn), parti boyutu ve bekleyen istek sınırı
+MICRO_BATCH_WAIT = float(os.environ.get('MICRO_BATCH_WAIT_MS', '2')) / 1000
+MICRO_BATCH_SIZE = int(os.environ.get('MICRO_BATCH_SIZE', '64'))
+MICRO_BATCH_PENDING = int(os.environ.get('MICRO_BATCH_PENDING', '512'))
+
+# Çalışma süresi ortalaması için üstel ağırlık (Retry-After tahmini)
+RUN_TIME_WEIGHT = 0.2
+
+BATCH_SIZE = METRICS.histogram(
+    'micro_batch_size',
+    'Tek çağrıda işlenen istek sayısı',
+    ('batcher',),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+BATCH_WAIT_SECONDS = METRICS.histogram(
+    'micro_batch_wait_seconds',
+    'İsteğin parti başlayana kadar beklediği süre (saniye)',
+    ('batcher',)
+)
+BATCH_RUN_SECONDS = METRICS.histogram(
+    'micro_batch_run_seconds',
+    'Parti başına vektörel çağrı süresi (saniye)',
+    ('batcher',)
+)
+BATCH_REJECTED_TOTAL = METRICS.counter(
+    'micro_batch_rejected_total',
+    'Bekleyen istek sınırı aşıldığı için reddedilen istekler',
+    ('batcher',)
+)
+
+
+class MicroBatcher:
+    """
+    Dinamik mikro parti zamanlayıcı
+    - submit(): isteği kuyruğa ekler, Future döndürür
+    - Parti ilk istekten max_wait sonra veya max_batch dolunca çalışır
+    - Yoğunlukta parti çalışırken gelenler bir sonraki partide birikir
+    """
+
+    def __init__(self, function, name='predict', max_batch=MICRO_BATCH_SIZE, max_wait=MICRO_BATCH_WAIT,
+                 max_pending=MICRO_BATCH_PENDING):
+        """
+        Args:
+            function (callable): Öğe listesi alıp aynı sırada sonuç listesi döndürür
+            name (str): Metrik etiketi
+            max_batch (int): Tek çağrıdaki en fazla öğe
+            max_wait (float): İlk öğeden sonra parti için en fazla bekleme (saniye)
+            max_pending (int): Bekleyen en fazla öğe (aşılırsa PoolSaturated)
+        """
+        if max_batch < 1 or max_wait < 0 or max_pending < 1:
+            raise ValueError("max_batch ve max_pending en az 1, max_wait negatif olmamalı")
+
+        self.function = function
+        self.name = name
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+
+        self.mean_run = 0.0
+        self.batches = 0
+        # (öğe, Future, kuyruğa girdiği an)
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+        self._size = BATCH_SIZE.labels(name)
+        self._wait = BATCH_WAIT_SECONDS.labels(name)
+        self._run = BATCH_RUN_SECONDS.labels(name)
+        self._rejected = BATCH_REJECTED_TOTAL.labels(name)
+
+    def submit(self, item):
+        """
+        Öğeyi sıraya al
+
+        Raises:
+            PoolSaturated: Bekleyen öğe sınırı dolu
+        """
+        future = Future()
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                saturated = True
+            else:
+                saturated = False
+                # Thread ilk istekte başlar (prefork öncesi thread açılmaz)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._loop, name=f"{self.name}-batcher", daemon=True)
+                    self._thread.start()
+                self._pending.append((item, future, time.perf_counter()))
+                if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                    self._condition.notify()
+        if saturated:
+            self._rejected.inc()
+            raise PoolSaturated(self.name, self.retry_after())
+        return future
+
+    async def predict(self, item):
+        """asyncio içinden: sonucu olay döngüsünü bloklamadan bekle"""
+        return await asyncio.wrap_future(self.submit(item))
+
+    def retry_after(self):
+        """Kuyruğun boşalması için tahmini süre (tam saniye, en az 1)"""
+        return max(1, math.ceil(len(self._pending) / self.max_batch * self.mean_run))
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def _next_batch(self):
+        """Parti hazır olana kadar bekle (durdurulduysa None)"""
+        with self._condition:
+            while not self._pending and not self._stopped:
+                self._condition.wait()
+            if not self._pending:
+                return None
+
+            deadline = self._pending[0][2] + self.max_wait
+            while len(self._pending) < self.max_batch and not self._stopped:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            count = min(len(self._pending), self.max_batch)
+            return [self._pending.popleft() for _ in range(count)]
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            started = time.perf_counter()
+            # İstemcisi vazgeçen (iptal edilen) istekler partiden çıkarılır
+            batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            for _, _, queued_at in batch:
+                self._wait.observe(started - queued_at)
+            self._size.observe(len(batch))
+
+            try:
+                results = self.function([item for item, _, _ in batch])
+            except BaseException as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+
+            elapsed = time.perf_counter() - started
+            self._run.observe(elapsed)
+            self.mean_run += RUN_TIME_WEIGHT * (elapsed - self.mean_run)
+            self.batches += 1
+
+    def status(self):
+        """/health için zamanlayıcı durumu"""
+        return {
+            'max_batch': self.max_batch,
+            'max_wait_ms': round(self.max_wait * 1000, 3),
+            'pending': self.pending,
+            'batches': self.batches,
+            'rejected': self._rejected.value
+        }
+
+    def stop(self):
+        """Bekleyenleri bitir ve thread'i durdur"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
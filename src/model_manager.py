@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔄 Model Manager - Arka plan model yenileme
+Author: Berke Özkul
+Description: Model dosyasını izler, yeni sürümleri arka planda yükler, duman
+testinden geçirir ve aktif tahmin modelini istekleri düşürmeden değiştirir
+"""
+
+import hashlib
+import io
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+
+def default_smoke_test(predictor):
+    """Yeni model için örnek bir tahmin yap ve çıktıyı doğrula"""
+    prediction = predictor.predict_match('Arsenal', 'Chelsea')
+    probabilities = prediction['probabilities']
+    total = probabilities['home'] + probabilities['draw'] + probabilities['away']
+
+    if prediction['result'] not in ('H', 'D', 'A'):
+        raise ValueError(f"Geçersiz sonuç: {prediction['result']}")
+    if abs(total - 1.0) > 0.01:
+        raise ValueError(f"Olasılıklar toplamı 1 değil: {total:.3f}")
+
+
+class ModelVersion:
+    """Yüklenmiş bir model sürümü ve onu kullanan aktif istek sayısı"""
+
+    def __init__(self, predictor, version, source):
+        self.predictor = predictor
+        self.version = version
+        self.source = source
+        self.loaded_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.in_flight = 0
+        self.retired = False
+
+    def to_dict(self):
+        return {
+            'version': self.version,
+            'source': self.source,
+            'loaded_at': self.loaded_at,
+            'in_flight': self.in_flight
+        }
+
+
+class ModelManager:
+    """
+    Aktif tahmin modelini yöneten alt sistem
+    - Model dosyasını arka plan thread'inde izler
+    - Dosya yazımı bitene kadar bekler (yarım dosya okunmaz)
+    - Yeni sürümü duman testinden geçirip atomik olarak devreye alır
+    - Eski sürümü, üzerindeki istekler bitince emekliye ayırır
+    """
+
+    def __init__(self, model_path, loader, fallback_loader=None,
+                 smoke_test=default_smoke_test, poll_interval=2.0):
+        """
+        Args:
+            model_path (str): İzlenecek model dosyası
+            loader (callable): Dosya nesnesinden predictor üreten fonksiyon
+            fallback_loader (callable): Model yüklenemezse kullanılacak predictor
+            smoke_test (callable): Devreye almadan önce predictor'ı doğrular
+            poll_interval (float): Dosya kontrol aralığı (saniye)
+        """
+        self.model_path = model_path
+        self.loader = loader
+        self.fallback_loader = fallback_loader
+        self.smoke_test = smoke_test
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._active = None
+        self._retiring = []
+        self._swap_listeners = []
+        self._stop_event = threading.Event()
+        self._watcher = None
+
+        # Dosya imzası: (mtime_ns, size)
+        self._loaded_signature = None
+        self._pending_signature = None
+
+        self.reload_count = 0
+        self.failed_reloads = 0
+        self.last_error = None
+
+    # ------------------------------------------------------------------
+    # Yaşam döngüsü
+    # ------------------------------------------------------------------
+    def start(self):
+        """İlk modeli senkron yükle ve izleyici thread'i başlat"""
+        signature = self._file_signature()
+        if signature is None or not self._load_and_swap(signature):
+            self._activate_fallback()
+
+        self._watcher = threading.Thread(
+            target=self._watch_loop, name='model-watcher', daemon=True
+        )
+        self._watcher.start()
+        return self
+
+    def stop(self):
+        """İzleyici thread'i durdur"""
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=self.poll_interval * 2)
+
+    def add_swap_listener(self, callback):
+        """Model değiştiğinde çağrılacak fonksiyonu kaydet (cache temizliği vb.)"""
+        self._swap_listeners.append(callback)
+
+    # ------------------------------------------------------------------
+    # İstek tarafı
+    # ------------------------------------------------------------------
+    @contextmanager
+    def lease(self):
+        """
+        Aktif model sürümünü istek süresince kirala
+
+        Yields:
+            ModelVersion: Aktif sürüm (model yoksa None)
+        """
+        with self._lock:
+            current = self._active
+            if current is not None:
+                current.in_flight += 1
+
+        try:
+            yield current
+        finally:
+            if current is not None:
+                with self._lock:
+                    current.in_flight -= 1
+                    finished = current.retired and current.in_flight == 0
+                if finished:
+                    self._finalize(current)
+
+    @property
+    def active_version(self):
+        """Aktif model sürümü"""
+        current = self._active
+        return current.version if current is not None else None
+
+    def status(self):
+        """Sağlık ve model-info uç noktaları için durum özeti"""
+        with self._lock:
+            current = self._active
+            return {
+                'active': current.to_dict() if current is not None else None,
+                'retiring': [v.to_dict() for v in self._retiring],
+                'model_path': self.model_path,
+                'reload_count': self.reload_count,
+                'failed_reloads': self.failed_reloads,
+                'last_error': self.last_error
+            }
+
+    # ------------------------------------------------------------------
+    # Yükleme ve değiştirme
+    # ------------------------------------------------------------------
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.model_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _watch_loop(self):
+        """Dosya değişikliklerini izle; imza iki kontrol boyunca sabitse yükle"""
+        while not self._stop_event.wait(self.poll_interval):
+            signature = self._file_signature()
+
+            if signature is None or signature == self._loaded_signature:
+                self._pending_signature = None
+                continue
+
+            # Dosya hâlâ yazılıyor olabilir - bir tur daha bekle
+            if signature != self._pending_signature:
+                self._pending_signature = signature
+                continue
+
+            self._pending_signature = None
+            self._load_and_swap(signature)
+
+    def _load_and_swap(self, signature):
+        """Modeli yükle, doğrula ve aktif sürümle değiştir"""
+        try:
+            with open(self.model_path, 'rb') as f:
+                data = f.read()
+
+            # Okuma sırasında dosya değiştiyse bir sonraki tura bırak
+            if self._file_signature() != signature:
+                return False
+
+            version = hashlib.sha256(data).hexdigest()[:12]
+            self._loaded_signature = signature
+
+            current = self._active
+            if current is not None and current.version == version:
+                return True
+
+            print(f"🔄 Yeni model sürümü yükleniyor: {version}")
+            buffer = io.BytesIO(data)
+            buffer.name = self.model_path
+            predictor = self.loader(buffer)
+
+            if self.smoke_test is not None:
+                self.smoke_test(predictor)
+
+        except Exception as e:
+            self.failed_reloads += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"❌ Model sürümü devreye alınamadı: {self.last_error}")
+            return False
+
+        self._swap(ModelVersion(predictor, version, self.model_path))
+        return True
+
+    def _activate_fallback(self):
+        """Model dosyası kullanılamıyorsa yedek predictor'ı devreye al"""
+        if self.fallback_loader is None:
+            return
+
+        predictor = self.fallback_loader()
+        if predictor is not None:
+            self._swap(ModelVersion(predictor, 'fallback', 'fallback'))
+
+    def _swap(self, new_version):
+        """Aktif referansı atomik olarak değiştir"""
+        with self._lock:
+            old_version = self._active
+            self._active = new_version
+            self.reload_count += 1
+
+            finished = False
+            if old_version is not None:
+                old_version.retired = True
+                if old_version.in_flight == 0:
+                    finished = True
+                else:
+                    self._retiring.append(old_version)
+
+        print(f"✅ Aktif model sürümü: {new_version.version}")
+
+        if finished:
+            self._finalize(old_version)
+
+        for callback in self._swap_listeners:
+            try:
+                callback(new_version, old_version)
+            except Exception as e:
+                print(f"⚠️ Model değişim dinleyicisi hatası: {e}")
+
+    def _finalize(self, version):
+        """Emekliye ayrılan sürümün referanslarını bırak"""
+        with self._lock:
+            if version in self._retiring:
+                self._retiring.remove(version)
+        version.predictor = None
+        print(f"🗑️ Eski model sürümü kaldırıldı: {version.version}")
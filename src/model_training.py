@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏭 Model Training - Lig bazlı paralel model eğitimi
+Author: Berke Özkul
+Description: Katalogdaki her lig için ayrı model eğitir; ligler ayrı işçi
+süreçlerde yan yana eğitilir ve modeller models/<LİG>/ altına kaydedilir
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from data_catalog import DataCatalog, LEAGUES, DATA_WORKERS, parse_season_range
+
+MODEL_DIR = "../models/"
+MODEL_FILES = {
+    'simple': 'simple_football_model.txt',
+    'advanced': 'advanced_football_model.pkl'
+}
+
+
+def model_path(league, kind='simple', model_dir=MODEL_DIR):
+    """Ligin model dosyası: models/<LİG>/<dosya>"""
+    return os.path.join(model_dir, league, MODEL_FILES[kind])
+
+
+def _train_simple(data_path, league, seasons, features=None):
+    from simple_data_processing import SimpleFootballDataProcessor
+    from simple_model import SimpleFootballPredictor
+
+    # Ligler zaten paralel eğitildiği için her işçi dosyaları kendi sürecinde okur
+    processor = SimpleFootballDataProcessor(data_path=data_path, leagues=[league], seasons=seasons, workers=1)
+    if features:
+        data = processor.load_features(_feature_store(features, processor.catalog))
+    else:
+        processor.load_all_seasons()
+        processor.clean_data()
+        processor.add_basic_features()
+        processor.add_elo_features()
+        data = processor.add_form_features(last_n_matches=5)
+
+    predictor = SimpleFootballPredictor()
+    predictor.train(data, elo=processor.elo)
+    return predictor, len(data), len(predictor.team_strength)
+
+
+def _train_advanced(data_path, league, seasons, features=None):
+    from advanced_model import AdvancedFootballPredictor
+
+    catalog = DataCatalog(data_path)
+    predictor = AdvancedFootballPredictor()
+    if features:
+        processed = predictor.load_features(_feature_store(features, catalog), leagues=[league], seasons=seasons)
+    else:
+        frame = catalog.load_frame(leagues=[league], seasons=seasons, workers=1)
+        processed = predictor._process_data(frame)
+    predictor.train_models(processed)
+    return predictor, len(processed), len(predictor.team_encoder.classes_)
+
+
+def _feature_store(root, catalog):
+    from feature_store import FeatureStore
+
+    return FeatureStore(root, catalog=catalog, workers=1)
+
+
+def train_league(league, data_path="../data/", seasons=None, kind='simple', model_dir=MODEL_DIR, features=None):
+    """
+    Tek ligin modelini eğit ve kaydet (işçi süreçte çalışır)
+
+    features: FeatureStore kökü; verilirse özellikler depodan okunur (None = CSV'lerden hesaplanır)
+
+    Returns:
+        dict: Lig, durum, maç/takım sayısı, süre ve model yolu
+    """
+    trainer = _train_simple if kind == 'simple' else _train_advanced
+    path = model_path(league, kind, model_dir)
+    start = time.perf_counter()
+
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            predictor, matches, teams = trainer(data_path, league, seasons, features)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            predictor.save_model(path)
+    except Exception as e:
+        return {'league': league, 'status': 'error', 'error': f"{type(e).__name__}: {e}",
+                'seconds': round(time.perf_counter() - start, 2)}
+
+    return {
+        'league': league,
+        'status': 'ok',
+        'matches': matches,
+        'teams': teams,
+        'seconds': round(time.perf_counter() - start, 2),
+        'path': path
+    }
+
+
+def train_leagues(data_path="../data/", leagues=None, seasons=None, kind='simple', workers=None, model_dir=MODEL_DIR,
+                  features=None):
+    """
+    Ligleri paralel eğit
+
+    Args:
+        leagues (list): Lig kodları (None = katalogdaki hepsi)
+        seasons (tuple): (ilk, son) sezon başlangıç yılı aralığı
+        kind (str): 'simple' veya 'advanced'
+        workers (int): Aynı anda eğitilecek lig sayısı
+        features (str): FeatureStore kökü (None = özellikler CSV'lerden hesaplanır)
+
+    Returns:
+        list: Lig başına train_league sonuçları
+    """
+    catalog = DataCatalog(data_path)
+    leagues = [league for league in (leagues or catalog.leagues) if catalog.files([league], seasons)]
+    workers = min(DATA_WORKERS if workers is None else workers, len(leagues)) or 1
+
+    if workers == 1:
+        return [train_league(league, data_path, seasons, kind, model_dir, features) for league in leagues]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(train_league, league, data_path, seasons, kind, model_dir, features)
+                   for league in leagues]
+        return [future.result() for future in futures]
+
+
+def main():
+    """Ana fonksiyon - Lig bazlı model eğitimi"""
+    parser = argparse.ArgumentParser(description="Lig bazlı model eğitimi")
+    parser.add_argument('--data', default="../data/", help="Veri klasörü")
+    parser.add_argument('--league', action='append', help="Lig kodu (tekrarlanabilir; varsayılan: hepsi)")
+    parser.add_argument('--seasons', help="Sezon aralığı (ör. 2010:2018)")
+    parser.add_argument('--kind', choices=sorted(MODEL_FILES), default='simple')
+    parser.add_argument('--workers', type=int, help="Paralel eğitilecek lig sayısı")
+    parser.add_argument('--models', default=MODEL_DIR, help="Model klasörü")
+    parser.add_argument('--features', help="FeatureStore kökü (varsayılan: FEATURE_STORE veya <veri>/features)")
+    parser.add_argument('--no-features', action='store_true', help="Özellikleri depodan okumadan CSV'lerden hesapla")
+    args = parser.parse_args()
+
+    try:
+        seasons = parse_season_range(args.seasons)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("🏭 Lig bazlı model eğitimi")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    features = None
+    if not args.no_features:
+        from feature_store import default_root
+        features = args.features or default_root(args.data)
+    results = train_leagues(args.data, args.league, seasons, args.kind, args.workers, args.models, features)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        name = LEAGUES.get(result['league'], result['league'])
+        if result['status'] == 'ok':
+            print(f"  ✅ {result['league']:<4} {name:<24} {result['matches']:>6} maç, {result['teams']:>3} takım "
+                  f"({result['seconds']:.1f} sn) → {result['path']}")
+        else:
+            print(f"  ❌ {result['league']:<4} {name:<24} {result['error']}")
+
+    failed = sum(result['status'] != 'ok' for result in results)
+    print(f"\n⏱️ {len(results)} lig {elapsed:.1f} sn'de eğitildi ({failed} hata)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
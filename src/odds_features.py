@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+💰 Odds Features - Bahis oranlarından piyasa olasılıkları
+Author: Berke Özkul
+Description: Sezon dosyalarındaki tüm bahis şirketlerinin 1X2 ve 2.5 alt/üst
+oranlarını tek sütunsal geçişte marjdan arındırılmış olasılıklara çevirir;
+şirketler arası uzlaşı (ortalama) ve dağılım (standart sapma) özellikleri ile
+piyasa log-loss referansı üretir
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+# 1X2 sonuçları (model olasılıklarıyla aynı sıra: ev, beraberlik, deplasman)
+OUTCOMES = ('H', 'D', 'A')
+RESULT_INDEX = {outcome: i for i, outcome in enumerate(OUTCOMES)}
+
+# Özellik sütunlarının öneki (modeller bu sütunları girdi olarak kullanmaz)
+MARKET_PREFIX = 'market_'
+MARKET_PROBABILITY_COLUMNS = tuple(f"{MARKET_PREFIX}{name}_prob" for name in ('home', 'draw', 'away'))
+
+# Şirketler arası en yüksek/ortalama oran sütunları (tek bir şirket değildir)
+AGGREGATE_PREFIXES = ('BbMx', 'BbAv', 'Max', 'Avg')
+MAX_PREFIXES = ('BbMx', 'Max')
+
+# Oran sütunu: <şirket><H|D|A> veya <şirket><>|<>2.5
+_RESULT_COLUMN = re.compile(r'^([A-Z][A-Za-z0-9]*?)([HDA])$')
+_TOTAL_COLUMN = re.compile(r'^([A-Z][A-Za-z0-9]*?)([<>])2\.5$')
+
+# Bu önekler oran değil maç istatistiğidir (HTHG/HTAG gibi)
+_NON_ODDS_PREFIXES = frozenset(('FT', 'HT'))
+
+
+def find_bookmakers(columns):
+    """
+    H/D/A sütunlarının üçü de bulunan bahis şirketleri
+
+    Şirketler arası özetler (BbMx, BbAv, Max, Avg) ve kapanış oranları
+    (PSCH gibi, şirket kodu + 'C') maç öncesi piyasayı temsil etmediği için dahil edilmez.
+
+    Returns:
+        list: Şirket önekleri (sütun sırasıyla)
+    """
+    columns = set(columns)
+    prefixes = []
+    for column in sorted(columns):
+        match = _RESULT_COLUMN.match(column)
+        if not match or match.group(2) != 'H':
+            continue
+        prefix = match.group(1)
+        if prefix in _NON_ODDS_PREFIXES or prefix in AGGREGATE_PREFIXES:
+            continue
+        if all(f"{prefix}{outcome}" in columns for outcome in OUTCOMES):
+            prefixes.append(prefix)
+
+    # Kapanış oranları: önek = başka bir şirket/özet + 'C'
+    known = set(prefixes) | set(AGGREGATE_PREFIXES)
+    return [prefix for prefix in prefixes if not (prefix.endswith('C') and prefix[:-1] in known)]
+
+
+def find_total_markets(columns):
+    """
+    2.5 alt/üst oranı bulunan kaynaklar (en yüksek oran özetleri hariç)
+
+    Returns:
+        list: Önekler ('B365', 'BbAv', 'P' ...)
+    """
+    columns = set(columns)
+    prefixes = []
+    for column in sorted(columns):
+        match = _TOTAL_COLUMN.match(column)
+        if not match or match.group(2) != '>':
+            continue
+        prefix = match.group(1)
+        if prefix not in MAX_PREFIXES and f"{prefix}<2.5" in columns:
+            prefixes.append(prefix)
+    return prefixes
+
+
+def odds_matrix(df, prefixes, suffixes):
+    """
+    Oranları (maç, kaynak, sonuç) dizisine çevir; geçersiz oranlar NaN
+
+    Bir kaynağın oranlarından biri eksik veya 1'den küçükse o kaynağın o maçtaki
+    tüm oranları NaN olur (eksik sütunlar sezon bazında değiştiği için).
+    """
+    columns = [f"{prefix}{suffix}" for prefix in prefixes for suffix in suffixes]
+    frame = df[columns]
+    # Bozuk metin içeren sütunlar (eski sezonlar) sayıya çevrilir; diğerleri doğrudan kopyalanır
+    text_columns = [column for column in columns if not pd.api.types.is_numeric_dtype(frame[column])]
+    if text_columns:
+        frame = frame.assign(**{column: pd.to_numeric(frame[column], errors='coerce') for column in text_columns})
+    odds = frame.to_numpy(dtype=float, copy=True).reshape(len(df), len(prefixes), len(suffixes))
+
+    invalid = ~(odds > 1.0).all(axis=2)
+    odds[invalid] = np.nan
+    return odds
+
+
+def margin_free_probabilities(odds):
+    """
+    Oranları marjdan (overround) arındırılmış olasılıklara çevir (orantılı yöntem)
+
+    Args:
+        odds (np.ndarray): (..., sonuç) oran dizisi
+
+    Returns:
+        tuple: (olasılıklar, marj) - olasılıklar her kaynakta toplamı 1
+    """
+    implied = 1.0 / odds
+    booksum = implied.sum(axis=-1, keepdims=True)
+    return implied / booksum, booksum[..., 0] - 1.0
+
+
+def _consensus(probabilities):
+    """Kaynaklar arası ortalama (yeniden normalize) ve standart sapma; kaynak yoksa NaN"""
+    available = ~np.isnan(probabilities[:, :, 0])
+    counts = available.sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        filled = np.where(available[:, :, None], probabilities, 0.0)
+        mean = filled.sum(axis=1) / counts[:, None]
+        mean = mean / mean.sum(axis=1, keepdims=True)
+        squares = np.where(available[:, :, None], (probabilities - mean[:, None, :]) ** 2, 0.0)
+        std = np.sqrt(squares.sum(axis=1) / counts[:, None])
+    return mean, std, counts
+
+
+def odds_features(df, prefix=MARKET_PREFIX):
+    """
+    Maç başına piyasa özellikleri (vektörel, tek geçiş)
+
+    Args:
+        df (pd.DataFrame): Sezon verisi (farklı sezonların sütun kümeleri karışık olabilir)
+        prefix (str): Özellik sütunu öneki
+
+    Returns:
+        pd.DataFrame: df ile aynı indeksli; oran bulunmayan maçlarda NaN
+            - {prefix}home/draw/away_prob: şirketler arası uzlaşı (marjsız)
+            - {prefix}home/draw/away_std: şirketler arası dağılım
+            - {prefix}overround: ortalama marj, {prefix}books: şirket sayısı
+            - {prefix}over25_prob/{prefix}over25_std: 2.5 üst olasılığı
+    """
+    features = pd.DataFrame(index=df.index)
+    nan = np.full(len(df), np.nan)
+
+    books = find_bookmakers(df.columns)
+    if books:
+        odds = odds_matrix(df, books, OUTCOMES)
+        probabilities, overround = margin_free_probabilities(odds)
+        mean, std, counts = _consensus(probabilities)
+        for i, name in enumerate(('home', 'draw', 'away')):
+            features[f"{prefix}{name}_prob"] = mean[:, i]
+            features[f"{prefix}{name}_std"] = std[:, i]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            features[f"{prefix}overround"] = np.where(np.isnan(overround), 0.0, overround).sum(axis=1) / counts
+        features[f"{prefix}books"] = counts
+    else:
+        for name in ('home', 'draw', 'away'):
+            features[f"{prefix}{name}_prob"] = nan
+            features[f"{prefix}{name}_std"] = nan
+        features[f"{prefix}overround"] = nan
+        features[f"{prefix}books"] = 0
+
+    totals = find_total_markets(df.columns)
+    if totals:
+        odds = odds_matrix(df, totals, ('>2.5', '<2.5'))
+        probabilities, _ = margin_free_probabilities(odds)
+        mean, std, _ = _consensus(probabilities)
+        features[f"{prefix}over25_prob"] = mean[:, 0]
+        features[f"{prefix}over25_std"] = std[:, 0]
+    else:
+        features[f"{prefix}over25_prob"] = nan
+        features[f"{prefix}over25_std"] = nan
+
+    return features
+
+
+def outcome_log_loss(probabilities, results):
+    """
+    1X2 olasılıklarının log-loss'u (model veya piyasa)
+
+    Args:
+        probabilities (np.ndarray): (N, 3) ev/beraberlik/deplasman olasılıkları (NaN satırlar atlanır)
+        results: 'H'/'D'/'A' sonuçları
+
+    Returns:
+        tuple: (log-loss, kullanılan maç sayısı)
+    """
+    probabilities = np.asarray(probabilities, dtype=float)
+    outcomes = np.array([RESULT_INDEX.get(result, -1) for result in results])
+    valid = ~np.isnan(probabilities).any(axis=1) & (outcomes >= 0)
+    if not valid.any():
+        return float('nan'), 0
+
+    actual = probabilities[valid, outcomes[valid]]
+    return float(-np.mean(np.log(np.clip(actual, 1e-15, 1.0)))), int(valid.sum())
+
+
+def market_log_loss(df):
+    """
+    Piyasa referans log-loss'u (modellerin yenmesi gereken çıta)
+
+    Returns:
+        tuple: (log-loss, oranı bulunan maç sayısı)
+    """
+    features = odds_features(df)
+    return outcome_log_loss(features[list(MARKET_PROBABILITY_COLUMNS)].to_numpy(), df['FTR'])
+
+
+def main():
+    """Ana fonksiyon - Tüm sezonlar için piyasa özellikleri ve log-loss referansı"""
+    import sys
+    import time
+    from data_catalog import DataCatalog
+
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "../data/"
+    df = DataCatalog(data_path).load_frame()
+    print(f"📊 {len(df):,} maç, {len(df.columns)} sütun")
+    print(f"🏦 1X2 şirketleri: {', '.join(find_bookmakers(df.columns))}")
+    print(f"⚖️ 2.5 alt/üst kaynakları: {', '.join(find_total_markets(df.columns))}")
+
+    start = time.perf_counter()
+    features = odds_features(df)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️ Özellik çıkarımı: {elapsed * 1000:.1f} ms")
+
+    probabilities = features[list(MARKET_PROBABILITY_COLUMNS)].to_numpy()
+    loss, matches = outcome_log_loss(probabilities, df['FTR'])
+    print(f"\n📉 Piyasa log-loss: {loss:.4f} ({matches:,} maç)")
+    print(f"💸 Ortalama marj: %{features['market_overround'].mean() * 100:.2f}")
+    print(f"📐 Ortalama şirket sayısı: {features['market_books'].mean():.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🍴 Prefork - Model yüklendikten sonra çatallanan çok işçili sunucu
+Author: Berke Özkul
+Description: Ana süreç modeli bir kez yükler, nesneleri GC'den dondurur
+(gc.freeze) ve dinleme soketini açtıktan sonra işçileri fork eder; işçiler
+model dizilerini copy-on-write ile paylaşır. İşçi PID'leri paylaşımlı bir
+bellek tablosunda tutulur, böylece her işçi /health üzerinden tüm işçilerin
+RSS/PSS/paylaşılan bellek değerlerini raporlayabilir (sadece built-in Python)
+"""
+
+import gc
+import mmap
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+import traceback
+
+# WEB_CONCURRENCY: işçi sayısı ('auto' = kullanılabilir çekirdek sayısı)
+WORKERS_ENV = 'WEB_CONCURRENCY'
+# Başlar başlamaz ölen işçi yeniden başlatılmadan önce beklenir (çökme döngüsü)
+RESPAWN_DELAY = 1.0
+
+# /proc okuması süreç başına ~1 ms: /health yanıtındaki bellek bilgisi bu süre boyunca tekrar kullanılır
+MEMORY_CACHE_SECONDS = 1.0
+
+# İşçi tablosu satırı: (pid, başlangıç zamanı)
+_SLOT = struct.Struct('<qd')
+
+# Çalışan süreçteki prefork sunucu (tek süreçli çalışmada None)
+SERVER = None
+
+# (zaman, worker_status yanıtı)
+_status_cache = (0.0, None)
+
+
+def worker_count(value=None):
+    """
+    İşçi sayısı: argüman, yoksa WEB_CONCURRENCY, yoksa 1
+
+    Raises:
+        ValueError: Sayı veya 'auto' değilse
+    """
+    value = value if value is not None else os.environ.get(WORKERS_ENV, '1')
+    if str(value).strip().lower() == 'auto':
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:
+            return os.cpu_count() or 1
+    count = int(value)
+    if count < 1:
+        raise ValueError(f"İşçi sayısı en az 1 olmalı: {value}")
+    return count
+
+
+def process_memory(pid='self'):
+    """
+    Sürecin bellek kullanımı (bayt, /proc/<pid>/smaps_rollup)
+
+    Returns:
+        dict: rss, pss (paylaşılan sayfalar süreç sayısına bölünmüş), shared,
+        private; okunamazsa None
+    """
+    values = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                key, _, rest = line.partition(':')
+                parts = rest.split()
+                if len(parts) == 2 and parts[1] == 'kB':
+                    values[key] = int(parts[0]) * 1024
+    except OSError:
+        return _statm_memory(pid)
+
+    return {
+        'rss': values.get('Rss', 0),
+        'pss': values.get('Pss', 0),
+        'shared': values.get('Shared_Clean', 0) + values.get('Shared_Dirty', 0),
+        'private': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    }
+
+
+def _statm_memory(pid):
+    """smaps_rollup olmayan çekirdekler için /proc/<pid>/statm (PSS yok)"""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            _, resident, shared = (int(value) for value in f.read().split()[:3])
+    except (OSError, ValueError):
+        return None
+    page = mmap.PAGESIZE
+    return {'rss': resident * page, 'pss': None, 'shared': shared * page, 'private': (resident - shared) * page}
+
+
+def freeze_heap():
+    """
+    Yüklenmiş nesneleri GC'nin dışına al (fork öncesi)
+
+    Döngüsel GC taradığı nesnelerin başlıklarına yazar; bu da paylaşılan
+    sayfaları işçilerde kopyalatır. Dondurulan nesneler hiç taranmaz.
+
+    Returns:
+        int: Dondurulan nesne sayısı
+    """
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def bind_socket(host, port, backlog=2048):
+    """İşçilerin ortak kullanacağı dinleme soketi"""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class WorkerBoard:
+    """
+    İşçi tablosu (fork öncesi açılan anonim paylaşımlı bellek)
+
+    Yalnızca ana süreç yazar; işçiler okuyarak kardeşlerini bulur.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        # Anonim mmap varsayılan olarak MAP_SHARED: fork sonrası tüm süreçler aynı sayfaları görür
+        self._buffer = mmap.mmap(-1, _SLOT.size * size)
+
+    def register(self, slot, pid):
+        _SLOT.pack_into(self._buffer, slot * _SLOT.size, pid, time.time())
+
+    def clear(self, slot):
+        _SLOT.pack_into(self._buffer, slot * _SLOT.size, 0, 0.0)
+
+    def workers(self):
+        """(slot, pid, başlangıç zamanı) listesi (boş satırlar hariç)"""
+        rows = []
+        for slot in range(self.size):
+            pid, started = _SLOT.unpack_from(self._buffer, slot * _SLOT.size)
+            if pid:
+                rows.append((slot, pid, started))
+        return rows
+
+
+class PreforkServer:
+    """
+    Çatallanan çok işçili sunucu
+    - preload(): model ve uygulama ana süreçte bir kez yüklenir
+    - Nesneler dondurulur, soket açılır, işçiler fork edilir
+    - Ölen işçi aynı satırda yeniden başlatılır; SIGTERM/SIGINT tüm işçilere iletilir
+    """
+
+    def __init__(self, serve, host='0.0.0.0', port=8000, workers=None, preload=None):
+        """
+        Args:
+            serve (callable): İşçide soketi alıp sunucuyu çalıştıran fonksiyon
+            workers (int): İşçi sayısı (None = WEB_CONCURRENCY)
+            preload (callable): Fork öncesi çalışacak yükleme fonksiyonu
+        """
+        self.serve = serve
+        self.host = host
+        self.port = port
+        self.workers = worker_count(workers)
+        self.preload = preload
+
+        self.board = WorkerBoard(self.workers)
+        self.parent_pid = os.getpid()
+        self.slot = None
+        self.frozen = 0
+        self.children = {}
+        self.stopping = False
+
+    def run(self):
+        """Yükle, dondur, fork et ve işçileri denetle (tüm işçiler bitene kadar döner)"""
+        global SERVER
+        SERVER = self
+
+        if self.preload is not None:
+            self.preload()
+        self.frozen = freeze_heap()
+        sock = bind_socket(self.host, self.port)
+        print(f"🍴 {self.workers} işçi başlatılıyor (ana süreç {self.parent_pid}, {self.frozen:,} nesne donduruldu)")
+
+        for slot in range(self.workers):
+            self._spawn(slot, sock)
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        try:
+            self._supervise(sock)
+        finally:
+            sock.close()
+
+    def _spawn(self, slot, sock):
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(slot, sock)
+        self.children[pid] = slot
+        self.board.register(slot, pid)
+
+    def _run_worker(self, slot, sock):
+        """İşçi süreci: sunucuyu çalıştır ve hiç geri dönmeden çık"""
+        self.slot = slot
+        self.children = {}
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        code = 0
+        try:
+            self.serve(sock)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    def _supervise(self, sock):
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            slot = self.children.pop(pid, None)
+            if slot is None:
+                continue
+            started = dict((row[1], row[2]) for row in self.board.workers()).get(pid, 0.0)
+            self.board.clear(slot)
+            if self.stopping:
+                continue
+
+            print(f"⚠️ İşçi {pid} durdu (durum {os.waitstatus_to_exitcode(status)}), yeniden başlatılıyor")
+            if time.time() - started < RESPAWN_DELAY:
+                time.sleep(RESPAWN_DELAY)
+            self._spawn(slot, sock)
+
+    def _stop(self, signum, frame):
+        """Kapanış sinyali: işçilere ilet, yeniden başlatma yapma"""
+        if not self.stopping:
+            print(f"\n🛑 {signal.Signals(signum).name} alındı, {len(self.children)} işçi durduruluyor...")
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def worker_status():
+    """
+    /health için süreç ve bellek bilgisi
+
+    Prefork modunda tüm işçilerin (ve ana sürecin) belleği raporlanır;
+    rss_total - pss_total işçiler arasında paylaşılarak kazanılan bellektir.
+    Yanıt MEMORY_CACHE_SECONDS boyunca tekrar kullanılır.
+    """
+    global _status_cache
+    cached_at, status = _status_cache
+    now = time.monotonic()
+    if status is None or now - cached_at >= MEMORY_CACHE_SECONDS:
+        status = _read_status()
+        _status_cache = (now, status)
+    return status
+
+
+def _read_status():
+    server = SERVER
+    if server is None or server.slot is None:
+        memory = process_memory() or {}
+        return {
+            'mode': 'single',
+            'workers': 1,
+            'pid': os.getpid(),
+            'memory': memory
+        }
+
+    processes = []
+    for slot, pid, started in server.board.workers():
+        memory = process_memory(pid)
+        if memory is None:
+            continue
+        processes.append(dict(memory, slot=slot, pid=pid, uptime=round(time.time() - started, 1)))
+
+    def total(key):
+        values = [process[key] for process in processes]
+        return sum(values) if values and None not in values else None
+
+    rss_total = total('rss')
+    pss_total = total('pss')
+    return {
+        'mode': 'prefork',
+        'workers': server.workers,
+        'alive': len(processes),
+        'pid': os.getpid(),
+        'slot': server.slot,
+        'parent': dict(process_memory(server.parent_pid) or {}, pid=server.parent_pid),
+        'frozen_objects': server.frozen,
+        'processes': processes,
+        'rss_total': rss_total,
+        'pss_total': pss_total,
+        'shared_total': total('shared'),
+        'shared_savings': rss_total - pss_total if rss_total is not None and pss_total is not None else None
+    }
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔥 Profiling - Canlı istekler için örneklemeli profiler
+Author: Berke Özkul
+Description: İsteklerin ayarlanabilir bir kısmını arka plan iş parçacığıyla
+örnekler, yığınları toplar; flamegraph'a hazır collapsed-stack dosyaları ve
+en sıcak fonksiyonların özetini üretir (kapalıyken ek maliyet yok)
+"""
+
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime
+
+# 0 = kapalı; 0.1 = isteklerin %10'u örneklenir
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+# Yığın örnekleme aralığı (saniye)
+PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL', '0.002'))
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_TOP_N = int(os.environ.get('PROFILE_TOP_N', '20'))
+# Admin uç noktaları: token ayarlıysa X-Admin-Token başlığı, değilse yalnızca localhost
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+LOOPBACK_HOSTS = ('127.0.0.1', '::1', 'localhost')
+
+_DISABLED = nullcontext()
+
+
+class _ProfiledRequest:
+    """Örneklenen isteğin iş parçacığını profiler'a kaydeden bağlam"""
+
+    __slots__ = ('profiler', 'label', 'thread_id')
+
+    def __init__(self, profiler, label):
+        self.profiler = profiler
+        self.label = label
+
+    def __enter__(self):
+        self.thread_id = threading.get_ident()
+        # Yığınlar bu çerçeveden (isteği başlatan fonksiyon) itibaren kaydedilir
+        self.profiler._register(self.thread_id, self.label, sys._getframe(1))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._unregister(self.thread_id)
+        return False
+
+
+class SamplingProfiler:
+    """
+    İstek bazlı örneklemeli profiler
+    - profile(label): isteğin örneklenip örneklenmeyeceğine karar verir
+    - Arka plan iş parçacığı yalnızca örneklenen isteklerin yığınlarını okur
+    - Yığınlar 'etiket;modül:fonksiyon;...' anahtarıyla sayılır
+    """
+
+    def __init__(self, sample_rate=PROFILE_SAMPLE_RATE, interval=PROFILE_INTERVAL, output_dir=PROFILE_DIR):
+        self.sample_rate = 0.0
+        self.interval = interval
+        self.output_dir = output_dir
+        self.enabled = False
+
+        self.stacks = Counter()
+        self.samples = 0
+        self.profiled_requests = 0
+        self.started_at = None
+
+        self._active = {}
+        self._frame_labels = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._sampler = None
+
+        self.configure(sample_rate=sample_rate)
+
+    def configure(self, sample_rate=None, interval=None):
+        """
+        Çalışma anında profiler'ı aç/kapat
+
+        Args:
+            sample_rate (float): Örneklenecek istek oranı (0 kapatır, 1 hepsi)
+            interval (float): Yığın örnekleme aralığı (saniye)
+        """
+        if interval is not None:
+            if interval <= 0:
+                raise ValueError("interval pozitif olmalı")
+            self.interval = interval
+
+        if sample_rate is not None:
+            if not 0 <= sample_rate <= 1:
+                raise ValueError("sample_rate 0-1 aralığında olmalı")
+            self.sample_rate = sample_rate
+            self.enabled = sample_rate > 0
+
+        if self.enabled and self.started_at is None:
+            self.started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def profile(self, label):
+        """
+        İsteği saran bağlam yöneticisi
+
+        Kapalıyken paylaşılan boş bağlam döner (tek öznitelik kontrolü).
+        """
+        if not self.enabled:
+            return _DISABLED
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return _DISABLED
+        return _ProfiledRequest(self, label)
+
+    def _register(self, thread_id, label, root_frame):
+        with self._lock:
+            self._active[thread_id] = (label, root_frame)
+            self.profiled_requests += 1
+            if self._sampler is None or not self._sampler.is_alive():
+                self._sampler = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+                self._sampler.start()
+        self._wake.set()
+
+    def _unregister(self, thread_id):
+        with self._lock:
+            self._active.pop(thread_id, None)
+
+    def _run(self):
+        """Örnekleme döngüsü: aktif istek yoksa uyur"""
+        while True:
+            if not self._active:
+                self._wake.clear()
+                if not self._active:
+                    self._wake.wait()
+                continue
+
+            self._sample()
+            time.sleep(self.interval)
+
+    def _sample(self):
+        """Örneklenen isteklerin güncel yığınlarını say"""
+        frames = sys._current_frames()
+
+        with self._lock:
+            active = list(self._active.items())
+
+        for thread_id, (label, root_frame) in active:
+            frame = frames.get(thread_id)
+            if frame is None:
+                continue
+
+            names = []
+            while frame is not None:
+                names.append(self._label_for(frame.f_code))
+                if frame is root_frame:
+                    break
+                frame = frame.f_back
+            names.append(label)
+            names.reverse()
+
+            key = ';'.join(names)
+            with self._lock:
+                self.stacks[key] += 1
+                self.samples += 1
+
+    def _label_for(self, code):
+        """Kod nesnesi için 'modül:fonksiyon' etiketi (cache'lenir)"""
+        name = self._frame_labels.get(code)
+        if name is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            name = f"{module}:{code.co_name}"
+            self._frame_labels[code] = name
+        return name
+
+    def reset(self):
+        """Toplanan örnekleri temizle"""
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+            self.profiled_requests = 0
+            self.started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S') if self.enabled else None
+
+    def collapsed(self):
+        """Flamegraph araçlarının okuduğu 'yığın sayı' satırları"""
+        with self._lock:
+            items = sorted(self.stacks.items())
+        return ''.join(f"{stack} {count}\n" for stack, count in items)
+
+    def hotspots(self, top_n=PROFILE_TOP_N):
+        """
+        En çok zaman harcanan fonksiyonlar
+
+        Returns:
+            dict: self (yığının en üstünde) ve total (yığında herhangi bir yerde)
+            örnek sayılarına göre ilk top_n fonksiyon
+        """
+        with self._lock:
+            items = list(self.stacks.items())
+            samples = self.samples
+
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in items:
+            frames = stack.split(';')[1:]
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for name in set(frames):
+                total_counts[name] += count
+
+        def summarize(counts):
+            return [
+                {'function': name, 'samples': count,
+                 'percent': round(100.0 * count / samples, 1) if samples else 0.0}
+                for name, count in counts.most_common(top_n)
+            ]
+
+        return {
+            'samples': samples,
+            'self': summarize(self_counts),
+            'total': summarize(total_counts)
+        }
+
+    def status(self):
+        """Admin uç noktası için durum özeti"""
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'interval_ms': round(self.interval * 1000, 3),
+            'profiled_requests': self.profiled_requests,
+            'samples': self.samples,
+            'active_requests': len(self._active),
+            'started_at': self.started_at,
+            'output_dir': self.output_dir
+        }
+
+    def dump(self, top_n=PROFILE_TOP_N):
+        """
+        Collapsed-stack dosyasını ve sıcak nokta özetini diske yaz
+
+        Returns:
+            dict: Yazılan dosya yolları ve özet
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        collapsed_path = os.path.join(self.output_dir, f"profile-{stamp}.collapsed")
+        summary_path = os.path.join(self.output_dir, f"profile-{stamp}.txt")
+
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed())
+
+        summary = self.hotspots(top_n)
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(format_hotspots(summary))
+
+        return {
+            'collapsed': collapsed_path,
+            'summary': summary_path,
+            'hotspots': summary
+        }
+
+
+def apply_command(data, profiler=None):
+    """
+    Admin isteğindeki komutları uygula (POST /admin/profile)
+
+    Args:
+        data (dict): sample_rate, interval_ms, reset, dump alanları (hepsi isteğe bağlı)
+
+    Returns:
+        dict: Güncel durum (dump istendiyse dosya yolları ve özet)
+
+    Raises:
+        ValueError: Geçersiz değer
+    """
+    profiler = profiler or PROFILER
+
+    try:
+        sample_rate = float(data['sample_rate']) if 'sample_rate' in data else None
+        interval = float(data['interval_ms']) / 1000 if 'interval_ms' in data else None
+    except (TypeError, ValueError):
+        raise ValueError("sample_rate ve interval_ms sayı olmalı")
+
+    profiler.configure(sample_rate=sample_rate, interval=interval)
+
+    response = {'success': True}
+    if data.get('dump'):
+        response['dump'] = profiler.dump()
+    if data.get('reset'):
+        profiler.reset()
+    response['profiler'] = profiler.status()
+    return response
+
+
+def admin_allowed(client_host, token):
+    """
+    Admin isteğine izin verilir mi
+
+    Args:
+        client_host (str): İstemci adresi
+        token (str): X-Admin-Token başlığı
+    """
+    if ADMIN_TOKEN:
+        return token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+    return client_host in LOOPBACK_HOSTS
+
+
+def format_hotspots(summary):
+    """Sıcak nokta özetini okunabilir tabloya çevir"""
+    lines = [f"🔥 Toplam örnek: {summary['samples']}", ""]
+    for title, key in (("Self (yığının tepesi)", 'self'), ("Total (kapsayıcı)", 'total')):
+        lines.append(title)
+        lines.append("-" * 60)
+        for row in summary[key]:
+            lines.append(f"{row['percent']:>6.1f}%  {row['samples']:>7}  {row['function']}")
+        lines.append("")
+    return '\n'.join(lines)
+
+
+# Tüm sunucuların paylaştığı profiler (PROFILE_SAMPLE_RATE ile açılır)
+PROFILER = SamplingProfiler()
+
+
+def main():
+    """Ana fonksiyon - Gelişmiş modelin tahmin yolunu profille"""
+    model_path = sys.argv[1] if len(sys.argv) > 1 else 'advanced_football_model.pkl'
+    n_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    from advanced_model import AdvancedFootballPredictor
+    from team_registry import REGISTRY
+
+    predictor = AdvancedFootballPredictor()
+    if not predictor.load_model(model_path):
+        print(f"❌ Model yüklenemedi: {model_path}")
+        return
+
+    teams = [team for team in REGISTRY.names if team in set(predictor.team_encoder.classes_)]
+    rng = random.Random(42)
+    PROFILER.configure(sample_rate=1.0)
+
+    print(f"🔥 {n_requests} tahmin profilleniyor...")
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        home_team, away_team = rng.sample(teams, 2)
+        with PROFILER.profile('predict'):
+            predictor.predict_match(home_team, away_team)
+    elapsed = time.perf_counter() - start
+
+    result = PROFILER.dump()
+    print(f"⏱️ {elapsed:.2f} sn ({elapsed / n_requests * 1000:.2f} ms/tahmin)")
+    print(format_hotspots(result['hotspots']))
+    print(f"💾 {result['collapsed']}")
+    print(f"💾 {result['summary']}")
+
+
+if __name__ == "__main__":
+    main()
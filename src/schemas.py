@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧾 Schemas - FastAPI istek/yanıt modelleri
+Author: Berke Özkul
+Description: main.py için pydantic v2 istek ve yanıt modelleri ile yanıt
+sözlüklerini jsonable_encoder'a uğramadan doğrudan bayta kodlayan
+(orjson veya kompakt json) yanıt sınıfı. Yanıt modelleri OpenAPI şeması
+içindir; tahmin yanıtları çalışma anında yeniden doğrulanmaz
+"""
+
+import timeit
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+from starlette.responses import Response
+
+from serialization import dumps, _sample_prediction_response
+
+# Takım adı en fazla bu kadar karakter olabilir (takma adlar dahil)
+MAX_TEAM_NAME_LENGTH = 64
+
+
+class FastJSONResponse(Response):
+    """Sözlükleri doğrudan JSON baytlarına çeviren yanıt (bytes olduğu gibi gönderilir)"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+# ----------------------------------------------------------------------
+# İstekler
+# ----------------------------------------------------------------------
+class PredictRequest(BaseModel):
+    """POST /predict gövdesi"""
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    home_team: str = Field(min_length=1, max_length=MAX_TEAM_NAME_LENGTH, examples=["Arsenal"])
+    away_team: str = Field(min_length=1, max_length=MAX_TEAM_NAME_LENGTH, examples=["Chelsea"])
+
+
+class BatchRequest(BaseModel):
+    """POST /predict/batch gövdesi (maçlar tek tek doğrulanıp hatalar indeksle döner)"""
+
+    matches: List[Any] = Field(min_length=1, examples=[[{"home_team": "Arsenal", "away_team": "Chelsea"}]])
+
+
+# ----------------------------------------------------------------------
+# Yanıtlar
+# ----------------------------------------------------------------------
+class Probabilities(BaseModel):
+    home: float
+    draw: float
+    away: float
+
+
+class Prediction(BaseModel):
+    # model_type alanı pydantic'in model_ önekiyle çakışmasın
+    model_config = ConfigDict(protected_namespaces=())
+
+    home_goals: int
+    away_goals: int
+    result: Literal["H", "D", "A"]
+    result_text: str
+    probabilities: Probabilities
+    confidence: float
+    model_type: Optional[str] = None
+
+
+class MatchTeams(BaseModel):
+    home_team: str
+    away_team: str
+
+
+class PredictResponse(BaseModel):
+    success: bool
+    match: MatchTeams
+    prediction: Prediction
+    detailed_analysis: Dict[str, Any]
+
+
+class BatchPrediction(BaseModel):
+    match: MatchTeams
+    prediction: Prediction
+
+
+class BatchTiming(BaseModel):
+    total_ms: float
+    per_fixture_ms: float
+
+
+class BatchResponse(BaseModel):
+    success: bool
+    count: int
+    predictions: List[BatchPrediction]
+    timing: BatchTiming
+    timestamp: str
+
+
+class ErrorResponse(BaseModel):
+    detail: str
+    errors: Optional[List[Dict[str, Any]]] = None
+
+
+def validation_errors(errors):
+    """RequestValidationError.errors() listesini kısa {alan, hata} listesine çevir"""
+    return [
+        {
+            "field": ".".join(str(part) for part in error.get("loc", ()) if part not in ("body", "query")),
+            "error": error.get("msg", "")
+        }
+        for error in errors
+    ]
+
+
+def benchmark(number=20000):
+    """
+    /predict yanıtı kodlama yolları (istek başına µs)
+
+    - FastAPI varsayılanı: jsonable_encoder + JSONResponse
+    - response_model: pydantic doğrulama + serileştirme + JSONResponse
+    - FastJSONResponse: sözlükten doğrudan bayt
+    """
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    payload = _sample_prediction_response()
+
+    candidates = [
+        ("jsonable_encoder + JSONResponse", lambda: JSONResponse(jsonable_encoder(payload)).body),
+        ("response_model + JSONResponse",
+         lambda: JSONResponse(PredictResponse.model_validate(payload).model_dump(mode="json")).body),
+        ("model_dump_json", lambda: PredictResponse.model_validate(payload).model_dump_json().encode("utf-8")),
+        ("FastJSONResponse", lambda: FastJSONResponse(payload).body)
+    ]
+
+    results = []
+    for name, function in candidates:
+        size = len(function())
+        seconds = timeit.timeit(function, number=number)
+        results.append({"name": name, "bytes": size, "us_per_response": seconds / number * 1e6})
+    return results
+
+
+def main():
+    """Ana fonksiyon - Yanıt kodlama benchmark'ı"""
+    print("🧾 /predict yanıt kodlama benchmark'ı")
+    print("=" * 60)
+    for row in benchmark():
+        print(f"  {row['name']:<34} {row['bytes']:>6} bayt  {row['us_per_response']:>8.2f} µs/yanıt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏆 Season Simulation - Monte Carlo lig tablosu projeksiyonu
+Author: Berke Özkul
+Description: Kalan fikstürü tahmin modellerinin Poisson beklenen golleriyle
+binlerce kez simüle eder; şampiyonluk, ilk 4 ve küme düşme olasılıklarını
+hesaplar (vektörel NumPy örnekleme, tohumlu ve paralel parçalar)
+"""
+
+import csv
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_SIMULATIONS = 100_000
+DEFAULT_SEED = 2019
+
+# Simülasyonların bölündüğü tohumlu parça sayısı; sonuçlar yalnızca tohuma
+# ve parça sayısına bağlıdır, işlem sayısına bağlı değildir
+DEFAULT_CHUNKS = 8
+
+# Bir işlemin tek seferde örneklediği sezon sayısı (bellek sınırı)
+BATCH_SIZE = 5_000
+
+# Paralel parçaları çalıştıran işlem havuzu; çağrılar arasında paylaşılır
+# (sunucuda her simülasyon için yeni işlemler başlatılmaz)
+_EXECUTOR = None
+_EXECUTOR_WORKERS = 0
+_EXECUTOR_LOCK = threading.Lock()
+
+TOP_N = 4
+RELEGATION_SPOTS = 3
+
+
+class SeasonState:
+    """Bir sezonun oynanmış sonuçları ve kalan fikstürü"""
+
+    def __init__(self, teams, results, remaining, season=None):
+        """
+        Args:
+            teams (list): Sezondaki takımlar
+            results (list): Oynanmış maçlar (ev, deplasman, ev golü, deplasman golü)
+            remaining (list): Kalan maçlar (ev, deplasman)
+            season (str): Sezon adı (örn. "2018-2019")
+        """
+        self.season = season
+        self.teams = sorted(teams)
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.remaining = list(remaining)
+        self.played = len(results)
+
+        n_teams = len(self.teams)
+        self.points = np.zeros(n_teams, dtype=np.int32)
+        self.goals_for = np.zeros(n_teams, dtype=np.int32)
+        self.goals_against = np.zeros(n_teams, dtype=np.int32)
+
+        for home_team, away_team, home_goals, away_goals in results:
+            h = self.team_index[home_team]
+            a = self.team_index[away_team]
+            self.goals_for[h] += home_goals
+            self.goals_against[h] += away_goals
+            self.goals_for[a] += away_goals
+            self.goals_against[a] += home_goals
+
+            if home_goals > away_goals:
+                self.points[h] += 3
+            elif home_goals < away_goals:
+                self.points[a] += 3
+            else:
+                self.points[h] += 1
+                self.points[a] += 1
+
+        self.home_idx = np.array([self.team_index[h] for h, _ in self.remaining], dtype=np.intp)
+        self.away_idx = np.array([self.team_index[a] for _, a in self.remaining], dtype=np.intp)
+
+    @classmethod
+    def from_csv(cls, file_path, played=None):
+        """
+        football-data.co.uk formatındaki sezon dosyasından durum oluştur
+
+        Args:
+            file_path (str): Sezon CSV dosyası
+            played (int): Oynanmış sayılacak maç sayısı (dosya sırasıyla);
+                None ise skoru olan tüm maçlar oynanmış sayılır
+
+        Returns:
+            SeasonState: Sezon durumu
+        """
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            rows = [row for row in csv.DictReader(f) if row.get('HomeTeam') and row.get('AwayTeam')]
+
+        teams = set()
+        results = []
+        remaining = []
+
+        for i, row in enumerate(rows):
+            home_team, away_team = row['HomeTeam'], row['AwayTeam']
+            teams.update((home_team, away_team))
+
+            has_score = row.get('FTHG', '') != '' and row.get('FTAG', '') != ''
+            if has_score and (played is None or i < played):
+                results.append((home_team, away_team, int(row['FTHG']), int(row['FTAG'])))
+            else:
+                remaining.append((home_team, away_team))
+
+        # "E0 2018-2019.csv" (düz) veya "E0/2018-2019.csv" (bölümlü)
+        season = os.path.splitext(os.path.basename(file_path))[0].split(' ')[-1]
+        return cls(teams, results, remaining, season=season)
+
+    def table(self):
+        """Oynanmış maçlara göre mevcut puan tablosu"""
+        rows = [
+            {
+                'team': team,
+                'points': int(self.points[i]),
+                'goal_difference': int(self.goals_for[i] - self.goals_against[i]),
+                'goals_for': int(self.goals_for[i])
+            }
+            for i, team in enumerate(self.teams)
+        ]
+        rows.sort(key=lambda r: (-r['points'], -r['goal_difference'], -r['goals_for'], r['team']))
+        return rows
+
+
+def _ranking_keys(points, goal_difference, goals_for, tiebreak):
+    """Puan > averaj > atılan gol > kura sıralaması için tek sayısal anahtar"""
+    # Averaj [-500, 500], atılan gol [0, 1000) aralığında varsayılır
+    return (points.astype(np.int64) * 1_000_000_000
+            + (goal_difference.astype(np.int64) + 500) * 1_000_000
+            + goals_for.astype(np.int64) * 1_000
+            + tiebreak)
+
+
+def poisson_cdf_table(expected_goals, tail=1e-7):
+    """
+    Maç başına Poisson kümülatif dağılım tablosu
+
+    Args:
+        expected_goals (np.ndarray): Maçların beklenen golleri
+        tail (float): Tablonun dışında kalan en büyük kuyruk olasılığı
+
+    Returns:
+        np.ndarray: (gol, maç) boyutlu float32 tablo; satır k = P(X <= k)
+    """
+    lam = np.asarray(expected_goals, dtype=np.float64)
+    if lam.size == 0:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    pmf = np.exp(-lam)
+    rows = [pmf]
+    k = 0
+    while (1.0 - rows[-1]).max() > tail:
+        k += 1
+        pmf = pmf * lam / k
+        rows.append(rows[-1] + pmf)
+    # Son satır kuyruk eşiğini geçen satırdır; tüm beklenen goller 0 olsa da k=0 satırı kalır
+    return np.array(rows[:max(len(rows) - 1, 1)], dtype=np.float32)
+
+
+def sample_goals(rng, cdf_table, size):
+    """
+    Ters CDF ile Poisson gol örneklemesi (rng.poisson'dan ~4x hızlı)
+
+    Her maç için tek bir düzgün sayı çekilir; gol sayısı, sayının
+    geçtiği kümülatif eşik sayısıdır.
+    """
+    uniform = rng.random((size, cdf_table.shape[1]), dtype=np.float32)
+    goals = np.zeros((size, cdf_table.shape[1]), dtype=np.int8)
+    for threshold in cdf_table:
+        goals += uniform > threshold
+    return goals
+
+
+def simulate_chunk(home_idx, away_idx, home_xg, away_xg, base_points, base_goals_for,
+                   base_goals_against, n_simulations, seed_sequence, batch_size=BATCH_SIZE):
+    """
+    Bir parça sezonu simüle et ve sayaçları döndür (işlemler arasında paylaşılır)
+
+    Returns:
+        dict: Sıra dağılımı, puan ve averaj toplamları
+    """
+    rng = np.random.default_rng(seed_sequence)
+    n_teams = len(base_points)
+    n_matches = len(home_idx)
+
+    home_cdf = poisson_cdf_table(home_xg)
+    away_cdf = poisson_cdf_table(away_xg)
+
+    # Maç -> takım birliktelik matrisleri (one-hot); toplamlar matris çarpımıyla alınır
+    home_incidence = np.zeros((n_matches, n_teams), dtype=np.float32)
+    away_incidence = np.zeros((n_matches, n_teams), dtype=np.float32)
+    home_incidence[np.arange(n_matches), home_idx] = 1.0
+    away_incidence[np.arange(n_matches), away_idx] = 1.0
+
+    # Gol farkının işaretine göre puan: [deplasman kazandı, beraberlik, ev kazandı]
+    home_point_table = np.array([0.0, 1.0, 3.0], dtype=np.float32)
+    away_point_table = np.array([3.0, 1.0, 0.0], dtype=np.float32)
+
+    position_counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    points_sum = np.zeros(n_teams, dtype=np.float64)
+    goal_difference_sum = np.zeros(n_teams, dtype=np.float64)
+
+    done = 0
+    while done < n_simulations:
+        size = min(batch_size, n_simulations - done)
+
+        home_goals = sample_goals(rng, home_cdf, size)
+        away_goals = sample_goals(rng, away_cdf, size)
+
+        goal_margin = home_goals.astype(np.float32) - away_goals
+        outcome = np.sign(goal_margin).astype(np.intp) + 1
+
+        points = (base_points + home_point_table[outcome] @ home_incidence
+                  + away_point_table[outcome] @ away_incidence)
+        goal_difference = ((base_goals_for - base_goals_against)
+                           + goal_margin @ home_incidence - goal_margin @ away_incidence)
+        goals_for = (base_goals_for + home_goals.astype(np.float32) @ home_incidence
+                     + away_goals.astype(np.float32) @ away_incidence)
+
+        tiebreak = rng.integers(0, 1_000, size=(size, n_teams))
+        keys = _ranking_keys(np.rint(points), np.rint(goal_difference), np.rint(goals_for), tiebreak)
+
+        # order[s, k] = simülasyon s'de k. sıradaki takım
+        order = np.argsort(-keys, axis=1)
+        positions = np.broadcast_to(np.arange(n_teams), order.shape)
+        position_counts += np.bincount(
+            (order * n_teams + positions).ravel(), minlength=n_teams * n_teams
+        ).reshape(n_teams, n_teams)
+
+        points_sum += points.sum(axis=0)
+        goal_difference_sum += goal_difference.sum(axis=0)
+        done += size
+
+    return {
+        'position_counts': position_counts,
+        'points_sum': points_sum,
+        'goal_difference_sum': goal_difference_sum,
+        'n_simulations': n_simulations
+    }
+
+
+def _merge_chunks(chunks):
+    """Parça sonuçlarını topla"""
+    merged = dict(chunks[0])
+    for chunk in chunks[1:]:
+        for key in ('position_counts', 'points_sum', 'goal_difference_sum', 'n_simulations'):
+            merged[key] = merged[key] + chunk[key]
+    return merged
+
+
+def shared_executor(workers):
+    """
+    Paylaşılan işlem havuzu (ilk çağrıda workers işlemle oluşturulur)
+
+    Sonraki çağrılar aynı havuzu kullanır; sonuçlar işlem sayısına bağlı
+    olmadığından havuz boyutu ilk istekte sabitlenir.
+    """
+    global _EXECUTOR, _EXECUTOR_WORKERS
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ProcessPoolExecutor(max_workers=workers)
+            _EXECUTOR_WORKERS = workers
+        return _EXECUTOR, _EXECUTOR_WORKERS
+
+
+def simulate_season(state, home_xg, away_xg, n_simulations=DEFAULT_SIMULATIONS,
+                    seed=DEFAULT_SEED, workers=None, chunks=DEFAULT_CHUNKS):
+    """
+    Kalan fikstürü Monte Carlo ile simüle et
+
+    Args:
+        state (SeasonState): Sezon durumu
+        home_xg, away_xg: Kalan maçlar için beklenen goller (fikstür sırasıyla)
+        n_simulations (int): Simüle edilecek sezon sayısı
+        seed (int): Tekrarlanabilirlik için ana tohum
+        workers (int): İşlem sayısı (None: CPU sayısı, 1: tek işlem)
+        chunks (int): Tohumlu parça sayısı
+
+    Returns:
+        dict: Takım bazında olasılıklar ve özet
+    """
+    start = time.perf_counter()
+
+    home_xg = np.maximum(np.asarray(home_xg, dtype=np.float64), 0.0)
+    away_xg = np.maximum(np.asarray(away_xg, dtype=np.float64), 0.0)
+    if len(home_xg) != len(state.remaining) or len(away_xg) != len(state.remaining):
+        raise ValueError("Beklenen gol sayısı kalan maç sayısıyla uyuşmuyor")
+
+    chunks = max(1, min(chunks, n_simulations))
+    workers = min(workers or os.cpu_count() or 1, chunks)
+
+    # Her parça bağımsız bir alt tohum alır
+    seed_sequences = np.random.SeedSequence(seed).spawn(chunks)
+    sizes = [n_simulations // chunks + (1 if i < n_simulations % chunks else 0) for i in range(chunks)]
+
+    base = (state.home_idx, state.away_idx, home_xg, away_xg,
+            state.points.astype(np.float64), state.goals_for.astype(np.float64),
+            state.goals_against.astype(np.float64))
+
+    if workers > 1 and chunks > 1:
+        executor, pool_size = shared_executor(workers)
+        workers = min(pool_size, chunks)
+        futures = [executor.submit(simulate_chunk, *base, size, seed_sequence)
+                   for size, seed_sequence in zip(sizes, seed_sequences)]
+        results = [future.result() for future in futures]
+    else:
+        results = [simulate_chunk(*base, size, seed_sequence)
+                   for size, seed_sequence in zip(sizes, seed_sequences)]
+
+    merged = _merge_chunks(results)
+    elapsed = time.perf_counter() - start
+
+    return _summarize(state, merged, n_simulations, seed, elapsed, workers, chunks)
+
+
+def _summarize(state, merged, n_simulations, seed, elapsed, workers, chunks):
+    """Sayaçları takım bazında olasılıklara çevir"""
+    n_teams = len(state.teams)
+    position_probs = merged['position_counts'] / n_simulations
+    relegation_from = max(0, n_teams - RELEGATION_SPOTS)
+
+    teams = []
+    for i, team in enumerate(state.teams):
+        probs = position_probs[i]
+        teams.append({
+            'team': team,
+            'current_points': int(state.points[i]),
+            'expected_points': round(float(merged['points_sum'][i] / n_simulations), 2),
+            'expected_goal_difference': round(float(merged['goal_difference_sum'][i] / n_simulations), 2),
+            'expected_position': round(float((probs * np.arange(1, n_teams + 1)).sum()), 2),
+            'title_probability': round(float(probs[0]), 4),
+            'top4_probability': round(float(probs[:TOP_N].sum()), 4),
+            'relegation_probability': round(float(probs[relegation_from:].sum()), 4),
+            'position_probabilities': [round(float(p), 4) for p in probs]
+        })
+
+    teams.sort(key=lambda t: (t['expected_position'], t['team']))
+
+    return {
+        'season': state.season,
+        'played_matches': state.played,
+        'remaining_matches': len(state.remaining),
+        'simulations': n_simulations,
+        'seed': seed,
+        'teams': teams,
+        'timing': {
+            'total_seconds': round(elapsed, 3),
+            'workers': workers,
+            'chunks': chunks
+        }
+    }
+
+
+def simulate_with_predictor(predictor, state, **kwargs):
+    """Tahmin modelinin beklenen golleriyle sezonu simüle et"""
+    home_xg, away_xg = predictor.expected_goals(state.remaining)
+    return simulate_season(state, home_xg, away_xg, **kwargs)
+
+
+def main():
+    """Ana fonksiyon - 2018-2019 sezonunun ikinci yarısını simüle et"""
+    from simple_data_processing import SimpleFootballDataProcessor
+    from simple_model import SimpleFootballPredictor
+
+    print("🏆 Sezon simülasyonu başlıyor...")
+    print("=" * 60)
+
+    # Önceki sezonlarla eğitilmiş basit model
+    processor = SimpleFootballDataProcessor(data_path="../data/")
+    processor.load_all_seasons()
+    processed_data = processor.clean_data()
+    season_file = "../data/E0 2018-2019.csv"
+    training_data = [row for row in processed_data if row.get('Season') != '2018-2019']
+
+    predictor = SimpleFootballPredictor()
+    predictor.train(training_data)
+
+    state = SeasonState.from_csv(season_file, played=190)
+    print(f"\n📅 {state.season}: {state.played} maç oynandı, {len(state.remaining)} maç kaldı")
+
+    result = simulate_with_predictor(predictor, state)
+    print(f"⏱️  {result['simulations']:,} sezon {result['timing']['total_seconds']:.2f} sn "
+          f"({result['timing']['workers']} işlem)")
+
+    print(f"\n{'Takım':<18} {'Puan':>5} {'Bek.':>6} {'Şamp.':>7} {'İlk 4':>7} {'Düşme':>7}")
+    print("-" * 56)
+    for team in result['teams']:
+        print(f"{team['team']:<18} {team['current_points']:>5} {team['expected_points']:>6.1f} "
+              f"{team['title_probability']:>7.1%} {team['top4_probability']:>7.1%} "
+              f"{team['relegation_probability']:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📦 JSON Serialization - Hızlı yanıt kodlama
+Author: Berke Özkul
+Description: API yanıtları için kompakt JSON kodlama, önceden kodlanmış
+statik yanıtlar ve (kuruluysa) orjson desteği
+"""
+
+import hashlib
+import json
+import os
+import timeit
+
+try:
+    import orjson
+except ImportError:  # orjson opsiyonel
+    orjson = None
+
+# JSON_BACKEND=json ile orjson devre dışı bırakılabilir
+BACKEND = 'orjson' if orjson is not None and os.environ.get('JSON_BACKEND', 'auto') != 'json' else 'json'
+
+_compact_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+_pretty_encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data, pretty=False):
+    """
+    Veriyi UTF-8 JSON byte dizisine çevirir
+
+    Args:
+        data: JSON'a çevrilecek veri
+        pretty (bool): Girintili (okunabilir) çıktı
+
+    Returns:
+        bytes: Kodlanmış JSON
+    """
+    if pretty:
+        return _pretty_encoder.encode(data).encode('utf-8')
+
+    if BACKEND == 'orjson':
+        try:
+            return orjson.dumps(data, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # orjson'un desteklemediği tipler için standart kodlayıcıya dön
+            pass
+
+    return _compact_encoder.encode(data).encode('utf-8')
+
+
+class EncodedPayload:
+    """
+    Bir kez kodlanıp tekrar tekrar gönderilen statik yanıt
+    (/teams, /model-info gibi)
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.compact = dumps(data)
+        self._pretty = None
+        self._etag = None
+    
+    @property
+    def etag(self):
+        """İçerik özetinden zayıf ETag (ilk istekte hesaplanır)"""
+        if self._etag is None:
+            self._etag = 'W/"' + hashlib.blake2b(self.compact, digest_size=12).hexdigest() + '"'
+        return self._etag
+
+    def encode(self, pretty=False):
+        """Kodlanmış yanıtı döndür (girintili sürüm ilk istekte üretilir)"""
+        if not pretty:
+            return self.compact
+        if self._pretty is None:
+            self._pretty = dumps(self.data, pretty=True)
+        return self._pretty
+
+
+def encode_response(data, pretty=False):
+    """Yanıt gövdesini kodla; önceden kodlanmış yanıtları olduğu gibi kullan"""
+    if isinstance(data, EncodedPayload):
+        return data.encode(pretty)
+    return dumps(data, pretty)
+
+
+def wants_pretty(query):
+    """?pretty=1 parametresi ile girintili çıktı istenip istenmediği"""
+    value = query.get('pretty', ['0'])[0].lower()
+    return value in ('1', 'true', 'yes')
+
+
+def _sample_prediction_response():
+    """Benchmark için /predict yanıtına benzeyen örnek veri"""
+    return {
+        'success': True,
+        'match': {'home_team': 'Arsenal', 'away_team': 'Chelsea'},
+        'prediction': {
+            'home_goals': 2, 'away_goals': 1, 'result': 'H',
+            'result_text': 'Ev Sahibi Galibiyeti',
+            'probabilities': {'home': 0.512, 'draw': 0.241, 'away': 0.247},
+            'confidence': 0.512
+        },
+        'detailed_analysis': {
+            'head_to_head': {
+                'total_matches': 21, 'home_wins': 8, 'away_wins': 7, 'draws': 6,
+                'last_5_results': ['H', 'D', 'A', 'H', 'H'],
+                'avg_goals_per_match': 2.7
+            },
+            'team_form': {
+                side: {
+                    'last_5_matches': ['W', 'D', 'W', 'L', 'W'],
+                    'goals_scored_last_5': 9, 'goals_conceded_last_5': 5,
+                    'clean_sheets_last_10': 4,
+                    'matches_with_both_teams_scoring': 7,
+                    'avg_goals_per_match': 1.8
+                } for side in ('home_team', 'away_team')
+            },
+            'goal_stats': {
+                'matches_over_2_5_goals': 12, 'matches_under_2_5_goals': 9,
+                'both_teams_to_score_percentage': 68.4,
+                'first_half_goals_avg': 1.1, 'second_half_goals_avg': 1.6
+            },
+            'interesting_facts': [
+                'Arsenal son 5 ev sahibi maçında 12 gol attı',
+                'Chelsea son 8 deplasman maçında sadece 2 mağlubiyet aldı',
+                'Bu iki takım arasındaki son 5 maçta karşılıklı gol oldu',
+                "Bu maçın %74'inde 2.5+ gol oluyor"
+            ],
+            'key_stats': {
+                'home_team_strength': 78.2, 'away_team_strength': 74.9,
+                'home_advantage': 0.18,
+                'motivation_factor': 'Lig sıralaması için kritik maç',
+                'weather_impact': 'Serin hava - ideal koşullar'
+            }
+        },
+        'timestamp': '2019-05-12 15:00:00'
+    }
+
+
+def benchmark(number=20000):
+    """Eski (indent=2) ve yeni kodlama yollarını bayt ve µs bazında karşılaştır"""
+    payload = _sample_prediction_response()
+    static_payload = EncodedPayload(payload)
+
+    candidates = [
+        ('json indent=2 (eski)', lambda: json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8')),
+        ('json compact', lambda: _compact_encoder.encode(payload).encode('utf-8')),
+    ]
+    if orjson is not None:
+        candidates.append(('orjson compact', lambda: orjson.dumps(payload, option=_ORJSON_OPTIONS)))
+    candidates.append(('pre-encoded', lambda: static_payload.encode()))
+
+    results = []
+    for name, func in candidates:
+        size = len(func())
+        seconds = timeit.timeit(func, number=number)
+        results.append({'name': name, 'bytes': size, 'us_per_response': seconds / number * 1e6})
+    return results
+
+
+def main():
+    """Ana fonksiyon - Serileştirme mikro benchmark'ı"""
+    print("📦 JSON serileştirme benchmark'ı")
+    print(f"⚙️  Aktif backend: {BACKEND}")
+    print("=" * 60)
+
+    for row in benchmark():
+        print(f"  {row['name']:<22} {row['bytes']:>6} bayt  {row['us_per_response']:>8.2f} µs/yanıt")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,18 +6,41 @@ Author: Berke Özkul
 Description: Basit web API (sadece built-in Python HTTP server)
 """
 
-import json
 import urllib.parse as urlparse
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from simple_model import SimpleFootballPredictor
 from simple_data_processing import SimpleFootballDataProcessor
+from data_catalog import DataCatalog, DEFAULT_LEAGUES
+from elo_ratings import EloTimeline
+from team_registry import REGISTRY
+from serialization import EncodedPayload
+from http_cache import etag_for_key, cache_control, HEALTH_CACHE_CONTROL
+from metrics import METRICS, stage
+from audit_log import AUDIT_LOG
+from api_handler import ApiHandlerMixin, PARSE_STAGE
+import hashlib
 import os
+import re
 
-class FootballPredictionHandler(BaseHTTPRequestHandler):
+# Ayarlıysa tahminler Dixon-Coles reytinglerinden yapılır (team_ratings.py, numpy gerekir)
+RATINGS_PATH = os.environ.get('RATINGS_PATH')
+
+# /metrics etiketleri için bilinen yollar (diğerleri 'other')
+ROUTES = frozenset(('/', '/predict', '/teams', '/teams/search', '/teams/{team}/rating-history',
+                    '/health', '/metrics', '/admin/profile'))
+RATING_HISTORY_PATH = re.compile(r'/teams/([^/]+)/rating-history')
+
+# İstek aşamalarının gecikme histogramları
+VALIDATE_STAGE = stage('validate')
+ANALYSIS_STAGE = stage('analysis')
+
+class FootballPredictionHandler(ApiHandlerMixin, BaseHTTPRequestHandler):
     """
     HTTP request handler for football predictions
     """
     
+    routes = ROUTES
+    
     def __init__(self, *args, **kwargs):
         # Model ve takım listesi yükle
         if not hasattr(FootballPredictionHandler, 'model'):
@@ -29,28 +52,74 @@ class FootballPredictionHandler(BaseHTTPRequestHandler):
         """Model ve veriyi yükle"""
         print("🤖 Model yükleniyor...")
         
-        # Veri işleyiciyi başlat
+        if RATINGS_PATH:
+            # Reytingler hazır: özellik hattı ve basit model eğitimi atlanır
+            from team_ratings import TeamRatings
+            cls.model = TeamRatings.load(RATINGS_PATH)
+            cls.model_type = 'ratings'
+            cls.teams = sorted(cls.model.teams)
+            cls.elo = EloTimeline.from_catalog(DataCatalog("../data/"), leagues=DEFAULT_LEAGUES)
+            fingerprint = repr((cls.model.teams, cls.model.parameters.tolist()))
+            print(f"📐 Dixon-Coles reytingleri kullanılıyor: {RATINGS_PATH}")
+        else:
+            cls.train_model()
+            fingerprint = repr((cls.model.home_advantage, sorted(cls.model.team_strength.items()),
+                                sorted(cls.model.team_attack.items()), sorted(cls.model.team_defense.items()),
+                                cls.model.elo_weight, sorted(cls.model.team_elo.items())))
+        
+        cls.team_set = frozenset(cls.teams)
+        
+        # Model sürümü: parametrelerin özeti (ETag ve Cache-Control için)
+        cls.model_version = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:12]
+        
+        # Statik yanıtları başlangıçta bir kez kodla
+        cls.teams_payload = EncodedPayload({
+            'success': True,
+            'count': len(cls.teams),
+            'teams': cls.teams
+        })
+        
+        METRICS.gauge_function('model_info', 'Aktif model sürümü (değer her zaman 1)',
+                               lambda: [({'version': cls.model_version, 'type': cls.model_type}, 1)])
+        
+        print(f"✅ Model yüklendi! {len(cls.teams)} takım mevcut.")
+    
+    @classmethod
+    def train_model(cls):
+        """Basit modeli özelliklerden eğit (takım listesi ve Elo zaman çizelgesi dahil)"""
         processor = SimpleFootballDataProcessor(data_path="../data/")
-        processor.load_all_seasons()
-        processor.clean_data()
-        processor.add_basic_features()
-        form_data = processor.add_form_features(last_n_matches=5)
-        processor.processed_data = form_data
+        try:
+            # Özellikler FeatureStore'dan (değişmeyen sezonlar yeniden hesaplanmaz)
+            processor.load_features()
+        except (ImportError, OSError):
+            # numpy olmayan ortamlar (requirements-production) veya salt okunur disk:
+            # özellikler CSV'lerden hesaplanır
+            processor.load_all_seasons()
+            processor.clean_data()
+            processor.add_basic_features()
+            processor.add_elo_features()
+            form_data = processor.add_form_features(last_n_matches=5)
+            processor.processed_data = form_data
         
-        # Modeli eğit
         cls.model = SimpleFootballPredictor()
-        cls.model.train(processor.processed_data)
+        cls.model.train(processor.processed_data, elo=processor.elo)
+        cls.model_type = 'simple'
         
-        # Takım listesi
         cls.teams = sorted(processor.team_mapping.keys())
         
-        print(f"✅ Model yüklendi! {len(cls.teams)} takım mevcut.")
+        # Elo reyting zaman çizelgesi (/teams/{team}/rating-history)
+        cls.elo = processor.elo
     
-    def do_GET(self):
-        """GET istekleri"""
-        parsed_path = urlparse.urlparse(self.path)
-        path = parsed_path.path
-        query = urlparse.parse_qs(parsed_path.query)
+    def get_model_version(self):
+        """Model sürümü (parametrelerin özeti; ETag ve Cache-Control için)"""
+        return self.model_version
+    
+    def route_get(self):
+        """GET isteğini ilgili uç noktaya yönlendir"""
+        with PARSE_STAGE.time():
+            parsed_path = urlparse.urlparse(self.path)
+            path = parsed_path.path
+            query = urlparse.parse_qs(parsed_path.query)
         
         if path == '/':
             self.serve_home()
@@ -58,18 +127,26 @@ class FootballPredictionHandler(BaseHTTPRequestHandler):
             self.serve_prediction(query)
         elif path == '/teams':
             self.serve_teams()
+        elif path == '/teams/search':
+            self.serve_team_search(query)
+        elif RATING_HISTORY_PATH.fullmatch(path):
+            self.serve_rating_history(urlparse.unquote(RATING_HISTORY_PATH.fullmatch(path).group(1)), query)
         elif path == '/health':
             self.serve_health()
+        elif path == '/metrics':
+            self.serve_metrics()
+        elif path == '/admin/profile':
+            self.serve_profile(query)
         else:
             self.send_error(404, "Endpoint bulunamadı")
     
-    def do_POST(self):
-        """POST istekleri"""
+    def route_post(self):
+        """POST isteğini ilgili uç noktaya yönlendir"""
         if self.path == '/predict':
             try:
-                content_length = int(self.headers.get('Content-Length', 0))
-                post_data = self.rfile.read(content_length)
-                data = json.loads(post_data.decode('utf-8'))
+                data = self.read_json_body()
+                if data is None:
+                    return
                 
                 home_team = data.get('home_team')
                 away_team = data.get('away_team')
@@ -80,6 +157,10 @@ class FootballPredictionHandler(BaseHTTPRequestHandler):
                     }, status=400)
                     return
                 
+                home_team, away_team = self.resolve_teams(home_team, away_team)
+                if home_team is None:
+                    return
+                
                 # Tahmin yap
                 prediction = self.model.predict_match(home_team, away_team)
                 
@@ -88,15 +169,14 @@ class FootballPredictionHandler(BaseHTTPRequestHandler):
                     'match': f"{home_team} vs {away_team}",
                     'prediction': prediction
                 })
+                self.audit('predict', home_team, away_team, prediction)
                 
-            except json.JSONDecodeError:
-                self.send_json_response({
-                    'error': 'Geçersiz JSON'
-                }, status=400)
             except Exception as e:
                 self.send_json_response({
                     'error': str(e)
                 }, status=500)
+        elif self.path == '/admin/profile':
+            self.configure_profiler()
         else:
             self.send_error(404, "Endpoint bulunamadı")
     
@@ -133,6 +213,16 @@ class FootballPredictionHandler(BaseHTTPRequestHandler):
                     <p>Mevcut takımların listesini döndürür.</p>
                 </div>
                 
+                <div class="endpoint">
+                    <span class="method">GET</span> <code>/teams/search?q=man</code>
+                    <p>Takım ismi otomatik tamamlama (takma adlar dahil).</p>
+                </div>
+                
+                <div class="endpoint">
+                    <span class="method">GET</span> <code>/teams/Arsenal/rating-history?from=2017-08-01&to=2018-05-31</code>
+                    <p>Takımın maç maç Elo reyting geçmişi (as_of ile o tarihteki reyting).</p>
+                </div>
+                
                 <div class="endpoint">
                     <span class="method">GET</span> <code>/predict?home=Arsenal&away=Chelsea</code>
                     <p>İki takım arasındaki maçın tahminini döndürür.</p>
@@ -149,6 +239,16 @@ class FootballPredictionHandler(BaseHTTPRequestHandler):
                     <p>API durumunu kontrol eder.</p>
                 </div>
                 
+                <div class="endpoint">
+                    <span class="method">GET</span> <code>/admin/profile</code>
+                    <p>Örneklemeli profiler durumu ve sıcak noktalar (POST ile {"sample_rate": 0.1} açar). Yalnızca localhost veya X-Admin-Token.</p>
+                </div>
+                
+                <div class="endpoint">
+                    <span class="method">GET</span> <code>/metrics</code>
+                    <p>Prometheus metrikleri (aşama bazlı gecikme, istek/hata sayıları, cache oranları).</p>
+                </div>
+                
                 <h2>🔮 Örnek Tahmin</h2>
                 <div class="example">
                     <strong>Örnek:</strong> <a href="/predict?home=Arsenal&away=Chelsea" style="color: white;">Arsenal vs Chelsea</a>
@@ -191,11 +291,22 @@ class FootballPredictionHandler(BaseHTTPRequestHandler):
             home_team = urlparse.unquote(home_team)
             away_team = urlparse.unquote(away_team)
             
+            home_team, away_team = self.resolve_teams(home_team, away_team)
+            if home_team is None:
+                return
+            
+            # Aynı model ve maç için yanıt hep aynıdır; tahmin yapmadan 304 dönülebilir
+            etag = etag_for_key(self.model_version, 'predict', home_team, away_team)
+            policy = cache_control(self.model_version)
+            if self.send_not_modified(etag, policy):
+                return
+            
             # Tahmin yap
             prediction = self.model.predict_match(home_team, away_team)
             
             # Detaylı analiz verisi oluştur
-            detailed_analysis = self.generate_detailed_analysis(home_team, away_team)
+            with ANALYSIS_STAGE.time():
+                detailed_analysis = self.generate_detailed_analysis(home_team, away_team)
             
             response = {
                 'success': True,
@@ -215,11 +326,11 @@ class FootballPredictionHandler(BaseHTTPRequestHandler):
                     'probabilities': prediction['probabilities'],
                     'confidence': prediction['confidence']
                 },
-                'detailed_analysis': detailed_analysis,
-                'timestamp': self.get_timestamp()
+                'detailed_analysis': detailed_analysis
             }
             
-            self.send_json_response(response)
+            self.send_json_response(response, etag=etag, cache_control=policy)
+            self.audit('predict', home_team, away_team, prediction)
             
         except Exception as e:
             self.send_json_response({
@@ -227,13 +338,36 @@ class FootballPredictionHandler(BaseHTTPRequestHandler):
                 'available_teams_count': len(self.teams)
             }, status=500)
     
+    def resolve_teams(self, home_team, away_team):
+        """
+        Takım isimlerini kanonik isimlere çevir ("Manchester City" -> "Man City")
+        
+        Returns:
+            tuple: (ev sahibi, deplasman); geçersizse 400 gönderilir ve (None, None) döner
+        """
+        if not isinstance(home_team, str) or not isinstance(away_team, str):
+            self.send_json_response({
+                'error': 'Takım adları metin olmalı'
+            }, status=400)
+            return None, None
+        
+        with VALIDATE_STAGE.time():
+            home_resolved = REGISTRY.resolve(home_team)
+            away_resolved = REGISTRY.resolve(away_team)
+        
+        if home_resolved not in self.team_set or away_resolved not in self.team_set:
+            unknown = home_team if home_resolved not in self.team_set else away_team
+            self.send_json_response({
+                'error': f'Geçersiz takım adı: {unknown}',
+                'suggestions': [team for team in REGISTRY.search(unknown) if team in self.team_set][:5]
+            }, status=400)
+            return None, None
+        
+        return home_resolved, away_resolved
+    
     def serve_teams(self):
         """Takım listesi"""
-        self.send_json_response({
-            'success': True,
-            'count': len(self.teams),
-            'teams': self.teams
-        })
+        self.send_json_response(self.teams_payload, cache_control=cache_control(self.model_version))
     
     def serve_health(self):
         """Sağlık kontrolü"""
@@ -241,29 +375,16 @@ class FootballPredictionHandler(BaseHTTPRequestHandler):
             'status': 'healthy',
             'model_loaded': hasattr(self, 'model'),
             'teams_count': len(self.teams) if hasattr(self, 'teams') else 0,
-            'version': '1.0.0'
-        })
-    
-    def send_json_response(self, data, status=200):
-        """JSON yanıt gönder"""
-        self.send_response(status)
-        self.send_header('Content-Type', 'application/json; charset=utf-8')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-        
-        json_data = json.dumps(data, ensure_ascii=False, indent=2)
-        self.wfile.write(json_data.encode('utf-8'))
-    
-    def get_timestamp(self):
-        """Zaman damgası"""
-        from datetime import datetime
-        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'version': '1.0.0',
+            'audit_log': AUDIT_LOG.status()
+        }, cache_control=HEALTH_CACHE_CONTROL)
     
     def generate_detailed_analysis(self, home_team, away_team):
         """Detaylı maç analizi verisi oluştur"""
-        import random
+        import random as random_module
+        
+        # Aynı maç için her istekte aynı analiz (ETag ve cache için deterministik)
+        random = random_module.Random(f"{home_team}|{away_team}")
         
         # Head-to-head stats
         total_matches = random.randint(15, 25)
@@ -370,10 +491,6 @@ class FootballPredictionHandler(BaseHTTPRequestHandler):
             }
         }
 
-    def log_message(self, format, *args):
-        """Log mesajlarını özelleştir"""
-        print(f"🌐 {self.address_string()} - {format % args}")
-
 def main():
     """Ana fonksiyon"""
     print("🚀 Football Prediction API başlıyor...")
@@ -7,61 +7,87 @@ Description: Sadece built-in Python kütüphaneleriyle veri işleme
 """
 
 import csv
-import os
-import glob
-from datetime import datetime
+from datetime import date
 from collections import defaultdict, Counter
+from data_catalog import DataCatalog, DEFAULT_LEAGUES
+from elo_ratings import EloTimeline
+from match_dates import parse_day
+from team_registry import REGISTRY
 
 class SimpleFootballDataProcessor:
     """
     Basit veri işleme sınıfı (sadece built-in Python)
     """
     
-    def __init__(self, data_path="../data/"):
+    def __init__(self, data_path="../data/", leagues=DEFAULT_LEAGUES, seasons=None, workers=None, store=None):
         self.data_path = data_path
+        self.catalog = DataCatalog(data_path)
+        # Maçlar MatchStore'dan (SQLite) okunabilir; yoksa doğrudan CSV'lerden
+        self.source = store if store is not None else self.catalog
+        self.leagues = leagues
+        self.seasons = seasons
+        self.workers = workers
         self.raw_data = []
         self.processed_data = []
         self.team_mapping = {}
+        self.elo = None
         
     def load_all_seasons(self):
-        """Tüm sezonları yükler"""
+        """Seçili lig ve sezonları (paralel) yükler"""
         print("🔄 Tüm sezonları yüklüyor...")
         
-        # CSV dosyalarını bul
-        csv_files = glob.glob(os.path.join(self.data_path, "E0*.csv"))
-        if not csv_files:
-            raise FileNotFoundError(f"❌ {self.data_path} klasöründe CSV dosyası bulunamadı!")
+        all_data = self.source.load_rows(leagues=self.leagues, seasons=self.seasons, workers=self.workers)
         
-        all_data = []
-        
-        for file_path in sorted(csv_files):
-            season_name = os.path.basename(file_path).replace('.csv', '').replace('E0 ', '')
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    season_data = []
-                    
-                    for row in reader:
-                        row['Season'] = season_name
-                        season_data.append(row)
-                    
-                    all_data.extend(season_data)
-                    print(f"  ✅ {season_name}: {len(season_data)} maç yüklendi")
-                    
-            except Exception as e:
-                print(f"  ❌ {season_name}: Hata - {str(e)}")
-                continue
+        counts = Counter((row['League'], row['Season']) for row in all_data)
+        for (league, season), count in counts.items():
+            print(f"  ✅ {league} {season}: {count} maç yüklendi")
         
         self.raw_data = all_data
         print(f"\n🎯 Toplam {len(all_data)} maç yüklendi")
         return all_data
     
+    def load_features(self, store=None):
+        """
+        Temizlenmiş maçları, Elo ve form özelliklerini FeatureStore'dan yükler
+        (load_all_seasons + clean_data + add_elo_features + add_form_features yerine;
+        değişmeyen sezonlar yeniden hesaplanmaz, numpy gerektirir)
+        """
+        from feature_store import FeatureStore, MATCH_FEATURES, FORM_COLUMNS
+        
+        print("🧮 Özellikler FeatureStore'dan yükleniyor...")
+        
+        store = store if store is not None else FeatureStore(data_path=self.data_path, catalog=self.catalog)
+        columns = store.load(MATCH_FEATURES, leagues=self.leagues, seasons=self.seasons)
+        report = store.last_report
+        self.elo = store.state(MATCH_FEATURES, leagues=self.leagues, seasons=self.seasons).elo
+        
+        names = ('League', 'Season', 'Day', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR', 'Month',
+                 'home_elo', 'away_elo', 'elo_diff') + FORM_COLUMNS
+        stored = ('league', 'season', 'day', 'home_team', 'away_team', 'home_goals', 'away_goals', 'result', 'month',
+                  'home_elo', 'away_elo', 'elo_diff') + FORM_COLUMNS
+        
+        rows = []
+        for values in zip(*(columns[name].tolist() for name in stored)):
+            row = dict(zip(names, values))
+            match_date = date.fromordinal(row['Day']) if row['Day'] else None
+            row['Date_Parsed'] = match_date.isoformat() if match_date else ''
+            row['Year'] = match_date.year if match_date else 0
+            rows.append(row)
+        
+        self.raw_data = rows
+        self.processed_data = rows
+        print(f"  ✅ {len(rows)} maç yüklendi ({report['reused']} sezon hazır, {report['computed']} sezon hesaplandı)")
+        
+        # Takım kodları ve gol özellikleri (ucuz; depoda takımlar isim olarak saklanır)
+        return self.add_basic_features()
+    
     def clean_data(self):
         """Veriyi temizler"""
         print("\n🧹 Veriyi temizliyor...")
         
         cleaned_data = []
+        # Tarih metni -> (gün numarası, ISO tarih, yıl, ay); her benzersiz tarih bir kez ayrıştırılır
+        parsed_dates = {'': (0, '', 0, 0)}
         
         for row in self.raw_data:
             # Kritik alanları kontrol et
@@ -90,23 +116,22 @@ class SimpleFootballDataProcessor:
             if row['FTR'] not in ['H', 'D', 'A']:
                 continue
             
-            # Tarih işleme
-            try:
-                date_str = row.get('Date', '')
-                # dd/mm/yyyy formatını parse et
-                if '/' in date_str:
-                    day, month, year = date_str.split('/')
-                    row['Date_Parsed'] = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-                    row['Year'] = int(year)
-                    row['Month'] = int(month)
+            # Takım isimlerini kanonik hale getir
+            row['HomeTeam'] = REGISTRY.canonical(row['HomeTeam'])
+            row['AwayTeam'] = REGISTRY.canonical(row['AwayTeam'])
+            
+            # Tarih işleme (gg/aa/yy ve gg/aa/yyyy; okunamazsa gün 0)
+            date_str = row.get('Date') or ''
+            parsed = parsed_dates.get(date_str)
+            if parsed is None:
+                day = parse_day(date_str)
+                if day is None:
+                    parsed = (0, '', 0, 0)
                 else:
-                    row['Date_Parsed'] = ''
-                    row['Year'] = 0
-                    row['Month'] = 0
-            except:
-                row['Date_Parsed'] = ''
-                row['Year'] = 0
-                row['Month'] = 0
+                    match_date = date.fromordinal(day)
+                    parsed = (day, match_date.isoformat(), match_date.year, match_date.month)
+                parsed_dates[date_str] = parsed
+            row['Day'], row['Date_Parsed'], row['Year'], row['Month'] = parsed
             
             cleaned_data.append(row)
         
@@ -124,7 +149,8 @@ class SimpleFootballDataProcessor:
             all_teams.add(row['HomeTeam'])
             all_teams.add(row['AwayTeam'])
         
-        self.team_mapping = {team: idx for idx, team in enumerate(sorted(all_teams))}
+        # Kimlikler ortak takım kaydından gelir (tüm modüllerde aynı)
+        self.team_mapping = {team: REGISTRY.intern(team) for team in sorted(all_teams)}
         
         # Özellikler ekle
         for row in self.processed_data:
@@ -154,6 +180,27 @@ class SimpleFootballDataProcessor:
         print(f"  ✅ Özellikler eklendi: {len(self.team_mapping)} takım kodlandı")
         return self.processed_data
     
+    def add_elo_features(self):
+        """Maç öncesi Elo reytinglerini ekler (tek kronolojik geçiş)"""
+        print("\n📈 Elo reytingleri hesaplanıyor...")
+        
+        self.elo = EloTimeline()
+        pre_match = self.elo.build(
+            (row['Day'], row['HomeTeam'], row['AwayTeam'], row['FTHG'], row['FTAG'])
+            for row in self.processed_data
+        )
+        
+        initial = self.elo.initial_rating
+        for row, (home_rating, away_rating) in zip(self.processed_data, pre_match):
+            home_rating = initial if home_rating is None else home_rating
+            away_rating = initial if away_rating is None else away_rating
+            row['home_elo'] = home_rating
+            row['away_elo'] = away_rating
+            row['elo_diff'] = home_rating - away_rating
+        
+        print(f"  ✅ Elo reytingleri eklendi: {len(self.elo.histories)} takım")
+        return self.processed_data
+    
     def get_summary(self):
         """Veri özeti"""
         if not self.processed_data:
@@ -257,8 +304,8 @@ class SimpleFootballDataProcessor:
         """Son N maçın formu ekler"""
         print(f"\n📈 Son {last_n_matches} maç formu hesaplanıyor...")
         
-        # Tarihe göre sırala
-        sorted_data = sorted(self.processed_data, key=lambda x: (x.get('Year', 0), x.get('Month', 0)))
+        # Tarihe göre sırala (gün numarası; aynı gündeki maçlar girdi sırasını korur)
+        sorted_data = sorted(self.processed_data, key=lambda x: x.get('Day', 0))
         
         # Her takım için son maçları takip et
         team_form = defaultdict(list)  # team -> [(result, goals_for, goals_against, date), ...]
@@ -313,6 +360,7 @@ def main():
     
     # Özellik ekle
     processed_data = processor.add_basic_features()
+    processor.add_elo_features()
     
     # Form özelliklerini ekle
     form_data = processor.add_form_features(last_n_matches=5)
@@ -11,6 +11,11 @@ import random
 import math
 from collections import defaultdict, Counter
 from simple_data_processing import SimpleFootballDataProcessor
+from team_registry import REGISTRY
+from metrics import stage
+
+# Tahmin aşamasının gecikme histogramı (/metrics)
+INFERENCE_STAGE = stage('inference')
 
 class SimpleFootballPredictor:
     """
@@ -23,6 +28,9 @@ class SimpleFootballPredictor:
         self.team_attack = {}
         self.team_defense = {}
         self.form_weight = 0.3
+        # Güncel Elo reytingleri ve Elo farkının gol farkına etkisi (gol / Elo puanı)
+        self.team_elo = {}
+        self.elo_weight = 0.0
         self.is_trained = False
         
     def prepare_data(self, processed_data):
@@ -121,8 +129,44 @@ class SimpleFootballPredictor:
         
         print(f"  📊 Ev sahibi avantajı: {self.home_advantage:.3f}")
     
-    def train(self, processed_data):
-        """Modeli eğitir"""
+    def calculate_elo_weight(self, processed_data, elo=None):
+        """
+        Elo farkının gol beklentisine etkisini hesaplar
+        
+        Ağırlık, takım güçleriyle açıklanamayan gol farkının maç öncesi
+        elo_diff üzerine eğimidir (en küçük kareler); tahminde güncel
+        reytingler (elo: EloTimeline) kullanılır.
+        """
+        self.team_elo = {team: elo.rating(team) for team in elo.teams} if elo is not None else {}
+        self.elo_weight = 0.0
+        
+        covariance = 0.0
+        variance = 0.0
+        for row in processed_data:
+            elo_diff = row.get('elo_diff')
+            if elo_diff is None:
+                continue
+            home_goals, away_goals, _, _ = self._goal_expectations(
+                row['HomeTeam'], row['AwayTeam'],
+                row.get('home_form_avg', 1.5), row.get('away_form_avg', 1.5), elo_diff=0.0
+            )
+            residual = (row['FTHG'] - row['FTAG']) - (home_goals - away_goals)
+            covariance += residual * elo_diff
+            variance += elo_diff * elo_diff
+        
+        if variance > 0:
+            self.elo_weight = covariance / variance
+        
+        print(f"  📈 Elo ağırlığı: {self.elo_weight * 100:.3f} gol / 100 puan ({len(self.team_elo)} takım)")
+    
+    def train(self, processed_data, elo=None):
+        """
+        Modeli eğitir
+        
+        Args:
+            processed_data (list): İşlenmiş maç satırları (elo_diff varsa Elo etkisi öğrenilir)
+            elo (EloTimeline): Tahminlerde kullanılacak güncel reytingler
+        """
         print("\n🤖 Model eğitimi başlıyor...")
         
         # Takım güçlerini hesapla
@@ -131,40 +175,20 @@ class SimpleFootballPredictor:
         # Ev sahibi avantajını hesapla
         self.calculate_home_advantage(processed_data)
         
+        # Elo etkisini hesapla
+        self.calculate_elo_weight(processed_data, elo)
+        
         self.is_trained = True
         print("  ✅ Model eğitimi tamamlandı!")
     
-    def predict_match(self, home_team, away_team, home_form_avg=1.5, away_form_avg=1.5):
-        """Tek maç tahmini yapar"""
+    def predict_match(self, home_team, away_team, home_form_avg=1.5, away_form_avg=1.5, elo_diff=None):
+        """Tek maç tahmini yapar (elo_diff verilmezse güncel reytinglerden)"""
         if not self.is_trained:
             raise ValueError("❌ Model henüz eğitilmemiş!")
         
-        # Takım güçleri
-        home_strength = self.team_strength.get(home_team, 1.5)
-        away_strength = self.team_strength.get(away_team, 1.5)
-        
-        home_attack = self.team_attack.get(home_team, 1.3)
-        home_defense = self.team_defense.get(home_team, 1.3)
-        away_attack = self.team_attack.get(away_team, 1.3)
-        away_defense = self.team_defense.get(away_team, 1.3)
-        
-        # Form etkisi
-        form_factor = self.form_weight
-        home_strength_adj = home_strength + (home_form_avg - 1.5) * form_factor
-        away_strength_adj = away_strength + (away_form_avg - 1.5) * form_factor
-        
-        # Gol tahminleri (Poisson-benzeri model)
-        # Ev sahibi gol tahmini
-        home_goal_expectation = (
-            home_attack * (2.0 - away_defense) * (1 + self.home_advantage) * 
-            (0.8 + 0.4 * home_strength_adj / 3.0)
-        )
-        
-        # Deplasman gol tahmini
-        away_goal_expectation = (
-            away_attack * (2.0 - home_defense) * (1 - self.home_advantage) * 
-            (0.8 + 0.4 * away_strength_adj / 3.0)
-        )
+        with INFERENCE_STAGE.time():
+            home_goal_expectation, away_goal_expectation, home_strength_adj, away_strength_adj = \
+                self._goal_expectations(home_team, away_team, home_form_avg, away_form_avg, elo_diff)
         
         # Gol sayılarını yuvarla
         home_goals = max(0, round(home_goal_expectation))
@@ -207,6 +231,77 @@ class SimpleFootballPredictor:
             'confidence': round(result_proba, 3)
         }
     
+    def predict_matches(self, fixtures):
+        """Birden çok maçı tahmin eder (predict_match ile aynı sırada)"""
+        return [self.predict_match(home_team, away_team) for home_team, away_team in fixtures]
+    
+    def expected_goals(self, fixtures):
+        """
+        Maçlar için beklenen gol sayıları (Poisson ortalamaları)
+        
+        Args:
+            fixtures (list): (ev sahibi, deplasman) çiftleri
+            
+        Returns:
+            tuple: (ev sahibi beklenen golleri, deplasman beklenen golleri) listeleri
+        """
+        if not self.is_trained:
+            raise ValueError("❌ Model henüz eğitilmemiş!")
+        
+        home_xg = []
+        away_xg = []
+        for home_team, away_team in fixtures:
+            home_goals, away_goals, _, _ = self._goal_expectations(home_team, away_team)
+            home_xg.append(max(0.0, home_goals))
+            away_xg.append(max(0.0, away_goals))
+        
+        return home_xg, away_xg
+    
+    def _goal_expectations(self, home_team, away_team, home_form_avg=1.5, away_form_avg=1.5, elo_diff=None):
+        """Beklenen goller ve forma göre düzeltilmiş takım güçleri"""
+        home_team = REGISTRY.canonical(home_team)
+        away_team = REGISTRY.canonical(away_team)
+        
+        # Elo farkı (maç öncesi değer verilmezse güncel reytinglerden)
+        if elo_diff is None:
+            home_elo = self.team_elo.get(home_team)
+            away_elo = self.team_elo.get(away_team)
+            elo_diff = home_elo - away_elo if home_elo is not None and away_elo is not None else 0.0
+        
+        # Takım güçleri
+        home_strength = self.team_strength.get(home_team, 1.5)
+        away_strength = self.team_strength.get(away_team, 1.5)
+        
+        home_attack = self.team_attack.get(home_team, 1.3)
+        home_defense = self.team_defense.get(home_team, 1.3)
+        away_attack = self.team_attack.get(away_team, 1.3)
+        away_defense = self.team_defense.get(away_team, 1.3)
+        
+        # Form etkisi
+        form_factor = self.form_weight
+        home_strength_adj = home_strength + (home_form_avg - 1.5) * form_factor
+        away_strength_adj = away_strength + (away_form_avg - 1.5) * form_factor
+        
+        # Gol tahminleri (Poisson-benzeri model)
+        # Ev sahibi gol tahmini
+        home_goal_expectation = (
+            home_attack * (2.0 - away_defense) * (1 + self.home_advantage) * 
+            (0.8 + 0.4 * home_strength_adj / 3.0)
+        )
+        
+        # Deplasman gol tahmini
+        away_goal_expectation = (
+            away_attack * (2.0 - home_defense) * (1 - self.home_advantage) * 
+            (0.8 + 0.4 * away_strength_adj / 3.0)
+        )
+        
+        # Elo etkisi gol farkına eşit paylarla eklenir
+        elo_shift = self.elo_weight * elo_diff / 2
+        home_goal_expectation += elo_shift
+        away_goal_expectation -= elo_shift
+        
+        return home_goal_expectation, away_goal_expectation, home_strength_adj, away_strength_adj
+    
     def evaluate_model(self, test_data):
         """Modeli değerlendirir"""
         print("\n📊 Model değerlendiriliyor...")
@@ -224,7 +319,8 @@ class SimpleFootballPredictor:
                     home_team=row['HomeTeam'],
                     away_team=row['AwayTeam'],
                     home_form_avg=row.get('home_form_avg', 1.5),
-                    away_form_avg=row.get('away_form_avg', 1.5)
+                    away_form_avg=row.get('away_form_avg', 1.5),
+                    elo_diff=row.get('elo_diff')
                 )
                 
                 # Sonuç doğruluğu
@@ -267,6 +363,7 @@ class SimpleFootballPredictor:
             f.write("# Simple Football Prediction Model\n")
             f.write(f"home_advantage={self.home_advantage}\n")
             f.write(f"form_weight={self.form_weight}\n")
+            f.write(f"elo_weight={self.elo_weight}\n")
             f.write("\n# Team Strengths\n")
             for team, strength in self.team_strength.items():
                 f.write(f"strength,{team},{strength}\n")
@@ -276,9 +373,42 @@ class SimpleFootballPredictor:
             f.write("\n# Team Defense\n")
             for team, defense in self.team_defense.items():
                 f.write(f"defense,{team},{defense}\n")
+            f.write("\n# Team Elo\n")
+            for team, rating in self.team_elo.items():
+                f.write(f"elo,{team},{rating}\n")
         
         print(f"💾 Model kaydedildi: {file_path}")
 
+    def load_model(self, file_path="simple_football_model.txt"):
+        """save_model ile kaydedilmiş modeli yükler"""
+        tables = {
+            'strength': self.team_strength,
+            'attack': self.team_attack,
+            'defense': self.team_defense,
+            'elo': self.team_elo
+        }
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+
+                if line.startswith('home_advantage='):
+                    self.home_advantage = float(line.split('=', 1)[1])
+                elif line.startswith('form_weight='):
+                    self.form_weight = float(line.split('=', 1)[1])
+                elif line.startswith('elo_weight='):
+                    self.elo_weight = float(line.split('=', 1)[1])
+                else:
+                    kind, team, value = line.rsplit(',', 2)
+                    if kind in tables:
+                        tables[kind][team] = float(value)
+
+        self.is_trained = True
+        print(f"📂 Model yüklendi: {file_path}")
+        return True
+
 def main():
     """Ana fonksiyon"""
     print("🚀 Simple Football Model Training başlıyor...")
@@ -289,6 +419,7 @@ def main():
     processor.load_all_seasons()
     processor.clean_data()
     processor.add_basic_features()
+    processor.add_elo_features()
     form_data = processor.add_form_features(last_n_matches=5)
     processor.processed_data = form_data
     
@@ -304,7 +435,7 @@ def main():
     
     # Model oluştur ve eğit
     model = SimpleFootballPredictor()
-    model.train(train_data)
+    model.train(train_data, elo=processor.elo)
     
     # Model değerlendir
     evaluation = model.evaluate_model(test_data)
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📐 Team Ratings - Dixon-Coles / Poisson takım reytingleri
+Author: Berke Özkul
+Description: Atak, savunma ve ev sahibi avantajı parametrelerini tam sayı
+takım dizileri üzerinde vektörel, yinelemeli en çok olabilirlik ile tahmin
+eder; isteğe bağlı Dixon-Coles düşük skor düzeltmesi ve zaman ağırlıkları
+içerir, parametreleri tek vektör olarak kaydeder
+
+Model:
+    log λ_ev  = μ + γ + atak[ev] + savunma[dep]
+    log λ_dep = μ + atak[dep] + savunma[ev]
+    (atak ve savunma toplamları sıfır)
+"""
+
+import json
+import math
+import time
+
+import numpy as np
+
+from match_dates import parse_dates
+from team_registry import REGISTRY
+
+# Skor matrisinin üst sınırı (takım başına gol)
+MAX_GOALS = 10
+# Reytingleri sıfıra çeken sözde maç ağırlığı (az maçlı takımlar için kararlılık)
+PRIOR_WEIGHT = 1.0
+MAX_ITERATIONS = 200
+TOLERANCE = 1e-6
+
+
+def decay_weights(dates, half_life_days, as_of=None):
+    """
+    Zaman ağırlıkları: w = 0.5 ** (yaş / yarı ömür)
+
+    Args:
+        dates: datetime64 dizisi
+        half_life_days (float): Ağırlığın yarıya indiği gün sayısı
+        as_of: Referans tarih (varsayılan: en yeni maç)
+    """
+    dates = parse_dates(dates)
+    as_of = np.datetime64(as_of, 'D') if as_of is not None else dates.max()
+    age = (as_of - dates).astype(np.float64)
+    weights = np.exp2(-np.clip(age, 0, None) / half_life_days)
+    # Tarihi okunamayan veya referanstan sonraki maçlar dışarıda kalır
+    weights[np.isnan(age) | (age < 0)] = 0.0
+    return weights
+
+
+def poisson_pmf(rates, max_goals=MAX_GOALS):
+    """(m,) oranlar için (m, max_goals + 1) Poisson olasılıkları"""
+    rates = np.asarray(rates, dtype=np.float64)[:, None]
+    k = np.arange(max_goals + 1)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, max_goals + 1)))))
+    return np.exp(k * np.log(np.maximum(rates, 1e-12)) - rates - log_factorial)
+
+
+def score_matrices(home_rates, away_rates, rho=0.0, max_goals=MAX_GOALS):
+    """
+    Maç başına skor olasılık matrisleri (Dixon-Coles düzeltmeli)
+
+    Returns:
+        np.ndarray: (m, max_goals + 1, max_goals + 1), [i, ev golü, dep golü]
+    """
+    home_rates = np.asarray(home_rates, dtype=np.float64)
+    away_rates = np.asarray(away_rates, dtype=np.float64)
+    matrices = poisson_pmf(home_rates, max_goals)[:, :, None] * poisson_pmf(away_rates, max_goals)[:, None, :]
+
+    if rho:
+        matrices[:, 0, 0] *= 1 - home_rates * away_rates * rho
+        matrices[:, 0, 1] *= 1 + home_rates * rho
+        matrices[:, 1, 0] *= 1 + away_rates * rho
+        matrices[:, 1, 1] *= 1 - rho
+
+    # Kesilen kuyruk için yeniden normalleştir
+    return matrices / matrices.sum(axis=(1, 2), keepdims=True)
+
+
+def outcome_probabilities(matrices):
+    """Skor matrislerinden (ev, beraberlik, deplasman) olasılıkları, (m, 3)"""
+    home = np.tril(matrices, -1).sum(axis=(1, 2))
+    draw = np.trace(matrices, axis1=1, axis2=2)
+    away = np.triu(matrices, 1).sum(axis=(1, 2))
+    return np.stack([home, draw, away], axis=1)
+
+
+def _dixon_coles_terms(home_goals, away_goals, home_rates, away_rates):
+    """Düşük skorlu maçlar için τ = 1 + c·ρ katsayıları"""
+    c = np.zeros(len(home_goals))
+    c = np.where((home_goals == 0) & (away_goals == 0), -home_rates * away_rates, c)
+    c = np.where((home_goals == 0) & (away_goals == 1), home_rates, c)
+    c = np.where((home_goals == 1) & (away_goals == 0), away_rates, c)
+    c = np.where((home_goals == 1) & (away_goals == 1), -1.0, c)
+    return c
+
+
+def fit_rho(home_goals, away_goals, home_rates, away_rates, weights=None, iterations=50):
+    """
+    Dixon-Coles ρ: Σ w·log(1 + c·ρ) içbükey olduğu için Newton ile çözülür
+
+    Returns:
+        float: τ'yu tüm maçlarda pozitif tutan aralıkta en iyi ρ
+    """
+    c = _dixon_coles_terms(home_goals, away_goals, home_rates, away_rates)
+    mask = c != 0
+    if not mask.any():
+        return 0.0
+    c = c[mask]
+    w = weights[mask] if weights is not None else np.ones_like(c)
+
+    # 1 + c·ρ > 0 olan aralık
+    upper = np.min(-1.0 / c[c < 0]) if (c < 0).any() else 1.0
+    lower = np.max(-1.0 / c[c > 0]) if (c > 0).any() else -1.0
+    margin = 1e-6 * (upper - lower)
+    lower, upper = lower + margin, upper - margin
+
+    rho = 0.0
+    for _ in range(iterations):
+        tau = 1 + c * rho
+        gradient = np.sum(w * c / tau)
+        hessian = -np.sum(w * (c / tau) ** 2)
+        step = gradient / hessian if hessian else 0.0
+        new_rho = min(max(rho - step, lower), upper)
+        if abs(new_rho - rho) < 1e-10:
+            return float(new_rho)
+        rho = new_rho
+    return float(rho)
+
+
+def fit_poisson(home_index, away_index, home_goals, away_goals, n_teams, weights=None,
+                prior_weight=PRIOR_WEIGHT, max_iterations=MAX_ITERATIONS, tolerance=TOLERANCE):
+    """
+    Atak/savunma/ev avantajı için yinelemeli en çok olabilirlik
+
+    Her parametre bloğunun kapalı form güncellemesi (diğerleri sabitken) np.bincount
+    ile tek geçişte hesaplanır.
+
+    Returns:
+        tuple: (μ, γ, atak, savunma, yineleme sayısı)
+    """
+    home_goals = np.asarray(home_goals, dtype=np.float64)
+    away_goals = np.asarray(away_goals, dtype=np.float64)
+    w = np.ones(len(home_goals)) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    # Sabit paylar: takımın attığı ve yediği (ağırlıklı) goller
+    scored = np.bincount(home_index, w * home_goals, n_teams) + np.bincount(away_index, w * away_goals, n_teams)
+    conceded = np.bincount(away_index, w * home_goals, n_teams) + np.bincount(home_index, w * away_goals, n_teams)
+    total_home = np.sum(w * home_goals)
+    total = total_home + np.sum(w * away_goals)
+
+    mu = math.log(max(total, 1e-9) / max(2 * w.sum(), 1e-9))
+    gamma = 0.0
+    attack = np.zeros(n_teams)
+    defense = np.zeros(n_teams)
+
+    for iteration in range(1, max_iterations + 1):
+        previous = np.concatenate(([mu, gamma], attack, defense))
+
+        # Atak: exp(atak_i) = attığı goller / beklenen (atak hariç)
+        home_base = np.exp(mu + gamma + defense[away_index])
+        away_base = np.exp(mu + defense[home_index])
+        exposure = np.bincount(home_index, w * home_base, n_teams) + np.bincount(away_index, w * away_base, n_teams)
+        attack = np.log((scored + prior_weight) / (exposure + prior_weight))
+
+        # Savunma: exp(savunma_j) = yediği goller / beklenen (savunma hariç)
+        home_base = np.exp(mu + gamma + attack[home_index])
+        away_base = np.exp(mu + attack[away_index])
+        exposure = np.bincount(away_index, w * home_base, n_teams) + np.bincount(home_index, w * away_base, n_teams)
+        defense = np.log((conceded + prior_weight) / (exposure + prior_weight))
+
+        # Ev avantajı ve genel seviye
+        home_strength = np.exp(attack[home_index] + defense[away_index])
+        away_strength = np.exp(attack[away_index] + defense[home_index])
+        gamma = math.log(total_home / np.sum(w * np.exp(mu) * home_strength))
+        mu = math.log(total / np.sum(w * (math.exp(gamma) * home_strength + away_strength)))
+
+        # Tanımlanabilirlik: atak ve savunma ortalaması sıfır
+        mu += attack.mean() + defense.mean()
+        attack -= attack.mean()
+        defense -= defense.mean()
+
+        current = np.concatenate(([mu, gamma], attack, defense))
+        if np.max(np.abs(current - previous)) < tolerance:
+            break
+
+    return mu, gamma, attack, defense, iteration
+
+
+class TeamRatings:
+    """
+    Dixon-Coles / Poisson takım reyting modeli
+    - fit(): isim dizilerinden tahmin (zaman ağırlığı ve ρ isteğe bağlı)
+    - predict_match()/predict_matches()/expected_goals(): diğer tahmincilerle aynı arayüz
+    - save()/load(): takım listesi + tek parametre vektörü (.npz)
+    """
+
+    def __init__(self):
+        self.teams = []
+        self.team_index = {}
+        self.mu = 0.0
+        self.home_advantage = 0.0
+        self.rho = 0.0
+        self.attack = np.zeros(0)
+        self.defense = np.zeros(0)
+        self.info = {}
+        self.is_trained = False
+
+    def fit(self, home_teams, away_teams, home_goals, away_goals, dates=None,
+            half_life_days=None, as_of=None, dixon_coles=True, prior_weight=PRIOR_WEIGHT):
+        """
+        Modeli maç dizilerinden tahmin et
+
+        Args:
+            home_teams, away_teams: Takım isimleri (takma adlar kanonik isme çevrilir)
+            home_goals, away_goals: Gol sayıları
+            dates: Maç tarihleri (zaman ağırlığı için)
+            half_life_days (float): Ağırlık yarı ömrü (None = eşit ağırlık)
+            as_of: Ağırlık referans tarihi (varsayılan: en yeni maç)
+            dixon_coles (bool): Düşük skor düzeltmesi (ρ) tahmin edilsin mi
+
+        Returns:
+            TeamRatings: self
+        """
+        start = time.perf_counter()
+        home_teams = np.asarray(home_teams).astype(str)
+        away_teams = np.asarray(away_teams).astype(str)
+        home_goals = np.asarray(home_goals, dtype=np.float64)
+        away_goals = np.asarray(away_goals, dtype=np.float64)
+
+        # İsimleri tam sayı dizilere çevir (benzersiz isim başına tek kayıt erişimi)
+        raw_names, inverse = np.unique(np.concatenate([home_teams, away_teams]), return_inverse=True)
+        canonical = np.array([REGISTRY.canonical(name) for name in raw_names])
+        teams, team_of_raw = np.unique(canonical, return_inverse=True)
+        indices = team_of_raw[inverse]
+        home_index, away_index = indices[:len(home_teams)], indices[len(home_teams):]
+
+        weights = None
+        if half_life_days:
+            if dates is None:
+                raise ValueError("Zaman ağırlığı için maç tarihleri gerekli")
+            weights = decay_weights(dates, half_life_days, as_of)
+
+        mu, gamma, attack, defense, iterations = fit_poisson(
+            home_index, away_index, home_goals, away_goals, len(teams),
+            weights=weights, prior_weight=prior_weight
+        )
+
+        rho = 0.0
+        if dixon_coles:
+            home_rates = np.exp(mu + gamma + attack[home_index] + defense[away_index])
+            away_rates = np.exp(mu + attack[away_index] + defense[home_index])
+            rho = fit_rho(home_goals, away_goals, home_rates, away_rates, weights)
+
+        self.teams = teams.tolist()
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.mu, self.home_advantage, self.rho = float(mu), float(gamma), rho
+        self.attack, self.defense = attack, defense
+        self.info = {
+            'matches': int(len(home_goals)),
+            'teams': len(self.teams),
+            'iterations': iterations,
+            'half_life_days': half_life_days,
+            'dixon_coles': bool(dixon_coles),
+            'fit_seconds': round(time.perf_counter() - start, 6)
+        }
+        self.is_trained = True
+        return self
+
+    def fit_frame(self, df, **kwargs):
+        """HomeTeam/AwayTeam/FTHG/FTAG(/Date) sütunlu DataFrame ile tahmin"""
+        df = df.dropna(subset=['HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'])
+        dates = df['Date'].to_numpy() if 'Date' in df.columns else None
+        return self.fit(df['HomeTeam'].to_numpy(), df['AwayTeam'].to_numpy(),
+                        df['FTHG'].to_numpy(), df['FTAG'].to_numpy(), dates=dates, **kwargs)
+
+    def _indices(self, teams):
+        """Takım isimlerinden dizinler (bilinmeyenler -1 → ortalama takım)"""
+        return np.array([self.team_index.get(REGISTRY.canonical(team), -1) for team in teams])
+
+    def rates(self, home_teams, away_teams):
+        """Maç başına (λ_ev, λ_dep) beklenen gol dizileri"""
+        if not self.is_trained:
+            raise ValueError("❌ Model henüz eğitilmemiş!")
+
+        home_index = self._indices(home_teams)
+        away_index = self._indices(away_teams)
+        # -1 dizini için sıfır (ortalama) reyting
+        attack = np.append(self.attack, 0.0)
+        defense = np.append(self.defense, 0.0)
+
+        home_rates = np.exp(self.mu + self.home_advantage + attack[home_index] + defense[away_index])
+        away_rates = np.exp(self.mu + attack[away_index] + defense[home_index])
+        return home_rates, away_rates
+
+    def expected_goals(self, fixtures):
+        """
+        Maçlar için beklenen gol sayıları (Poisson ortalamaları)
+
+        Returns:
+            tuple: (ev sahibi beklenen golleri, deplasman beklenen golleri) listeleri
+        """
+        if not fixtures:
+            return [], []
+        home_teams, away_teams = zip(*fixtures)
+        home_rates, away_rates = self.rates(home_teams, away_teams)
+        return home_rates.tolist(), away_rates.tolist()
+
+    def predict_matches(self, fixtures, max_goals=MAX_GOALS):
+        """Birden çok maçı tek vektörel geçişte tahmin et"""
+        if not fixtures:
+            return []
+
+        home_teams, away_teams = zip(*fixtures)
+        home_rates, away_rates = self.rates(home_teams, away_teams)
+        matrices = score_matrices(home_rates, away_rates, self.rho, max_goals)
+        probabilities = outcome_probabilities(matrices)
+
+        # Tahmin edilen sonucun bölgesindeki en olası skor
+        goals = np.arange(max_goals + 1)
+        regions = (goals[:, None] > goals[None, :], goals[:, None] == goals[None, :], goals[:, None] < goals[None, :])
+        outcomes = probabilities.argmax(axis=1)
+
+        predictions = []
+        for i, outcome in enumerate(outcomes):
+            masked = np.where(regions[outcome], matrices[i], -1.0)
+            home_goals, away_goals = np.unravel_index(masked.argmax(), masked.shape)
+            home, draw, away = probabilities[i]
+            predictions.append({
+                'home_goals': int(home_goals),
+                'away_goals': int(away_goals),
+                'result': 'HDA'[outcome],
+                'probabilities': {
+                    'home': round(float(home), 3),
+                    'draw': round(float(draw), 3),
+                    'away': round(float(away), 3)
+                },
+                'confidence': round(float(probabilities[i, outcome]), 3),
+                'expected_goals': {
+                    'home': round(float(home_rates[i]), 3),
+                    'away': round(float(away_rates[i]), 3)
+                }
+            })
+        return predictions
+
+    def predict_match(self, home_team, away_team):
+        """Tek maç tahmini"""
+        return self.predict_matches([(home_team, away_team)])[0]
+
+    def log_loss(self, home_teams, away_teams, results):
+        """Maç sonuçları (H/D/A) için ortalama log kaybı"""
+        home_rates, away_rates = self.rates(home_teams, away_teams)
+        probabilities = outcome_probabilities(score_matrices(home_rates, away_rates, self.rho))
+        outcome = np.array(['HDA'.index(result) for result in results])
+        chosen = probabilities[np.arange(len(outcome)), outcome]
+        return float(-np.mean(np.log(np.clip(chosen, 1e-15, 1))))
+
+    def table(self):
+        """Takım reytingleri (atak - savunma sırasıyla)"""
+        rows = [
+            {'team': team, 'attack': round(float(self.attack[i]), 4), 'defense': round(float(self.defense[i]), 4)}
+            for i, team in enumerate(self.teams)
+        ]
+        rows.sort(key=lambda row: row['defense'] - row['attack'])
+        return rows
+
+    @property
+    def parameters(self):
+        """Tek parametre vektörü: [μ, γ, ρ, atak..., savunma...]"""
+        return np.concatenate(([self.mu, self.home_advantage, self.rho], self.attack, self.defense))
+
+    def save(self, path):
+        """Modeli .npz olarak kaydet (takım listesi + parametre vektörü)"""
+        if not self.is_trained:
+            raise ValueError("❌ Kaydedilecek eğitilmiş model yok!")
+        np.savez(path, teams=np.array(self.teams), parameters=self.parameters,
+                 info=np.array(json.dumps(self.info)))
+        print(f"💾 Reyting modeli kaydedildi: {path}")
+
+    @classmethod
+    def load(cls, path):
+        """save() ile kaydedilmiş modeli yükle"""
+        with np.load(path, allow_pickle=False) as data:
+            teams = data['teams'].tolist()
+            parameters = data['parameters']
+            info = json.loads(str(data['info']))
+
+        n_teams = len(teams)
+        ratings = cls()
+        ratings.teams = teams
+        ratings.team_index = {team: i for i, team in enumerate(teams)}
+        ratings.mu, ratings.home_advantage, ratings.rho = (float(value) for value in parameters[:3])
+        ratings.attack = parameters[3:3 + n_teams].copy()
+        ratings.defense = parameters[3 + n_teams:3 + 2 * n_teams].copy()
+        ratings.info = info
+        ratings.is_trained = True
+        return ratings
+
+
+def main():
+    """Ana fonksiyon - Reytingleri tahmin et, son sezonda değerlendir ve kaydet"""
+    import sys
+    from data_catalog import DataCatalog, CORE_COLUMNS
+
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "../data/"
+    output_path = sys.argv[2] if len(sys.argv) > 2 else "team_ratings.npz"
+
+    df = DataCatalog(data_path).load_frame(columns=CORE_COLUMNS)
+    df = df.dropna(subset=['FTHG', 'FTAG', 'FTR'])
+    seasons = sorted(df['Season'].unique())
+    train, test = df[df['Season'] != seasons[-1]], df[df['Season'] == seasons[-1]]
+
+    print("📐 Dixon-Coles takım reytingleri")
+    print("=" * 60)
+    print(f"📊 {len(df):,} maç, {df['League'].nunique()} lig, {len(seasons)} sezon (test: {seasons[-1]})")
+
+    variants = (
+        ('Poisson', {'dixon_coles': False}),
+        ('Dixon-Coles', {'dixon_coles': True}),
+        ('Dixon-Coles + zaman (1 yıl)', {'dixon_coles': True, 'half_life_days': 365})
+    )
+    for name, options in variants:
+        ratings = TeamRatings().fit_frame(train, **options)
+        loss = ratings.log_loss(test['HomeTeam'], test['AwayTeam'], test['FTR'])
+        print(f"  {name:<28} log-loss {loss:.4f} | {ratings.info['iterations']:>3} yineleme, "
+              f"{ratings.info['fit_seconds'] * 1000:.1f} ms, ρ={ratings.rho:+.3f}")
+
+    ratings = TeamRatings().fit_frame(df, dixon_coles=True, half_life_days=365)
+    print(f"\n🏠 Ev avantajı: x{math.exp(ratings.home_advantage):.3f} gol | ρ = {ratings.rho:+.3f}")
+    for row in ratings.table()[:5]:
+        print(f"  {row['team']:<20} atak {row['attack']:+.3f}  savunma {row['defense']:+.3f}")
+    ratings.save(output_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏷️ Team Registry - Ortak takım kimlikleri
+Author: Berke Özkul
+Description: Tüm yükleyici, model ve API katmanlarının paylaştığı takım
+kaydı: yoğun tam sayı kimlikler, O(1) takma ad/büyük-küçük harf çözümleme
+ve otomatik tamamlama için önek araması (sadece built-in Python)
+"""
+
+import bisect
+import threading
+
+# football-data.co.uk CSV'lerinde ve API'lerde kullanılan kanonik isimler
+CANONICAL_TEAMS = (
+    "Arsenal", "Aston Villa", "Birmingham", "Blackburn", "Blackpool",
+    "Bolton", "Bournemouth", "Brentford", "Brighton", "Burnley",
+    "Cardiff", "Charlton", "Chelsea", "Crystal Palace", "Derby",
+    "Everton", "Fulham", "Huddersfield", "Hull", "Leeds",
+    "Leicester", "Liverpool", "Man City", "Man United", "Middlesbrough",
+    "Newcastle", "Norwich", "Portsmouth", "QPR", "Reading",
+    "Sheffield United", "Southampton", "Stoke", "Sunderland", "Swansea",
+    "Tottenham", "Watford", "West Brom", "West Ham", "Wigan",
+    "Wolves"
+)
+
+# Alternatif isim -> kanonik isim
+ALIASES = {
+    "Manchester City": "Man City",
+    "Man Utd": "Man United",
+    "Manchester United": "Man United",
+    "Manchester Utd": "Man United",
+    "Tottenham Hotspur": "Tottenham",
+    "Spurs": "Tottenham",
+    "Leicester City": "Leicester",
+    "Wolverhampton": "Wolves",
+    "Wolverhampton Wanderers": "Wolves",
+    "Brighton & Hove Albion": "Brighton",
+    "Brighton and Hove Albion": "Brighton",
+    "Newcastle United": "Newcastle",
+    "West Ham United": "West Ham",
+    "West Bromwich Albion": "West Brom",
+    "West Bromwich": "West Brom",
+    "Stoke City": "Stoke",
+    "Swansea City": "Swansea",
+    "Norwich City": "Norwich",
+    "Cardiff City": "Cardiff",
+    "Hull City": "Hull",
+    "Huddersfield Town": "Huddersfield",
+    "Wigan Athletic": "Wigan",
+    "Bolton Wanderers": "Bolton",
+    "Blackburn Rovers": "Blackburn",
+    "Birmingham City": "Birmingham",
+    "Derby County": "Derby",
+    "Queens Park Rangers": "QPR",
+    "Sheffield Utd": "Sheffield United",
+    "Sheff Utd": "Sheffield United",
+    "Leeds United": "Leeds",
+    "AFC Bournemouth": "Bournemouth",
+    "Charlton Athletic": "Charlton",
+    "Portsmouth FC": "Portsmouth",
+    "Reading FC": "Reading",
+}
+
+
+def normalize(name):
+    """Karşılaştırma anahtarı: harf duyarsız, boşlukları sadeleştirilmiş (metin değilse '')"""
+    if not isinstance(name, str):
+        return ''
+    return ' '.join(name.replace('&', ' and ').casefold().split())
+
+
+class TeamRegistry:
+    """
+    Takım isimlerini yoğun tam sayı kimliklere eşleyen kayıt
+    - Kanonik takımlar alfabetik sırayla 0..N-1 kimlik alır
+    - Yeni takımlar intern() ile sona eklenir (kimlikler değişmez)
+    - resolve/id_of tek sözlük erişimiyle çalışır
+    """
+
+    def __init__(self, teams=CANONICAL_TEAMS, aliases=ALIASES):
+        self._lock = threading.Lock()
+        self._names = []
+        self._lookup = {}
+        self._search_index = None
+
+        for team in sorted(teams):
+            self._add(team)
+
+        for alias, team in aliases.items():
+            self._lookup[normalize(alias)] = self._lookup[normalize(team)]
+
+    def _add(self, name):
+        team_id = len(self._names)
+        self._names.append(name)
+        self._lookup[normalize(name)] = team_id
+        self._search_index = None
+        return team_id
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return isinstance(name, str) and normalize(name) in self._lookup
+
+    def __iter__(self):
+        return iter(self.names)
+
+    @property
+    def names(self):
+        """Kimlik sırasıyla kanonik isimler"""
+        return tuple(self._names)
+
+    def id_of(self, name):
+        """İsim veya takma addan kimlik (bilinmiyorsa None)"""
+        if not name or not isinstance(name, str):
+            return None
+        return self._lookup.get(normalize(name))
+
+    def name_of(self, team_id):
+        """Kimlikten kanonik isim"""
+        return self._names[team_id]
+
+    def resolve(self, name):
+        """İsim veya takma addan kanonik isim (bilinmiyorsa None)"""
+        team_id = self.id_of(name)
+        return self._names[team_id] if team_id is not None else None
+
+    def canonical(self, name):
+        """Biliniyorsa kanonik isim, bilinmiyorsa ismin kendisi"""
+        return self.resolve(name) or name
+
+    def intern(self, name):
+        """
+        İsmin kimliğini döndür; bilinmeyen isimleri kayda ekle
+
+        Args:
+            name (str): Takım ismi (veri dosyalarından)
+
+        Returns:
+            int: Takım kimliği
+        """
+        key = normalize(name)
+        team_id = self._lookup.get(key)
+        if team_id is not None:
+            return team_id
+
+        with self._lock:
+            team_id = self._lookup.get(key)
+            if team_id is None:
+                team_id = self._add(' '.join(name.split()))
+        return team_id
+
+    def encode(self, names):
+        """İsim listesini kimlik listesine çevir (bilinmeyenler -1)"""
+        ids = []
+        for name in names:
+            team_id = self.id_of(name)
+            ids.append(team_id if team_id is not None else -1)
+        return ids
+
+    def search(self, prefix, limit=10):
+        """
+        Otomatik tamamlama için önek araması (takma adlar dahil)
+
+        Args:
+            prefix (str): Aranan önek (harf duyarsız)
+            limit (int): En fazla sonuç sayısı
+
+        Returns:
+            list: Eşleşen kanonik isimler (alfabetik, tekrarsız)
+        """
+        if not isinstance(prefix, str):
+            return []
+
+        index = self._search_index
+        if index is None:
+            index = self._build_search_index()
+
+        keys, team_ids = index
+        key = normalize(prefix)
+        position = bisect.bisect_left(keys, key)
+
+        found = []
+        seen = set()
+        while position < len(keys) and keys[position].startswith(key):
+            team_id = team_ids[position]
+            if team_id not in seen:
+                seen.add(team_id)
+                found.append(self._names[team_id])
+            position += 1
+
+        return sorted(found)[:limit]
+
+    def _build_search_index(self):
+        """Sıralı (anahtar, kimlik) dizileri; kelime başlarından da aranır"""
+        entries = set()
+        for key, team_id in self._lookup.items():
+            words = key.split(' ')
+            for i in range(len(words)):
+                entries.add((' '.join(words[i:]), team_id))
+
+        entries = sorted(entries)
+        index = ([key for key, _ in entries], [team_id for _, team_id in entries])
+        self._search_index = index
+        return index
+
+
+# Tüm modüllerin paylaştığı kayıt
+REGISTRY = TeamRegistry()
+
+# Sık kullanılan işlemler için kısa yollar
+resolve = REGISTRY.resolve
+canonical = REGISTRY.canonical
+team_id = REGISTRY.id_of
+search_teams = REGISTRY.search